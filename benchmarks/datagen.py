@@ -0,0 +1,187 @@
+"""Deterministic synthetic address books and notes books for benchmarks.
+
+The same size and seed always produce the same book, so results of
+different commits can be compared.
+"""
+import itertools
+import random
+from datetime import date
+from typing import Iterator, List, Sequence
+
+from src.models.address_book import AddressBook
+from src.models.fields import Email
+from src.models.notes_book import NotesBook
+from src.models.record import Record
+
+DEFAULT_SEED = 42
+
+FIRST_NAMES = [
+    "Olena", "Andrii", "Maria", "Oleksandr", "Iryna", "Taras", "Natalia", "Dmytro", "Yulia", "Serhii",
+    "Kateryna", "Mykola", "Oksana", "Volodymyr", "Tetiana", "Petro", "Anna", "Ivan", "Sofia", "Bohdan",
+    "John", "Jane", "Michael", "Emily", "David", "Sarah", "James", "Laura", "Robert", "Linda",
+]
+LAST_NAMES = [
+    "Melnyk", "Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Kravchenko", "Oliinyk", "Shevchuk",
+    "Polishchuk", "Koval", "Bondar", "Marchenko", "Lysenko", "Rudenko", "Savchenko", "Petrenko",
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Miller", "Davis", "Wilson", "Taylor", "O'Brien",
+]
+PHONE_PREFIXES = ["050", "066", "067", "068", "063", "073", "093", "095", "096", "097", "098", "099"]
+EMAIL_DOMAINS = ["gmail.com", "ukr.net", "example.com", "outlook.com", "i.ua", "yahoo.com"]
+STREETS = ["Shevchenka", "Khreshchatyk", "Lesi Ukrainky", "Franka", "Sadova", "Main", "Oak", "Hrushevskoho"]
+CITIES = ["Kyiv", "Lviv", "Kharkiv", "Odesa", "Dnipro", "Zaporizhzhia", "Vinnytsia", "Poltava"]
+WORDS = (
+    "meeting project budget review call plan report idea book travel doctor gift birthday family "
+    "shopping groceries code release deadline client invoice payment design test bug fix deploy "
+    "weekend trip hotel ticket recipe dinner lunch coffee school homework course lecture exam "
+    "garden car repair insurance bank tax health gym run music movie concert friend party"
+).split()
+TAGS = [
+    "work", "personal", "urgent", "home", "ideas", "todo", "done", "family", "finance", "travel",
+    "health", "shopping", "study", "project", "meeting", "later", "important", "reading", "music", "car",
+]
+
+
+def zipf_weights(count: int, exponent: float = 1.0) -> List[float]:
+    """Get cumulative weights where the item of rank r is chosen proportionally to 1 / r**exponent.
+
+    Args:
+        count (int): Number of items.
+        exponent (float): How strongly the first items dominate.
+
+    Returns:
+        List[float]: Cumulative weights for random.choices.
+    """
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+FIRST_NAME_WEIGHTS = zipf_weights(len(FIRST_NAMES), 0.8)
+LAST_NAME_WEIGHTS = zipf_weights(len(LAST_NAMES), 0.8)
+WORD_WEIGHTS = zipf_weights(len(WORDS))
+TAG_WEIGHTS = zipf_weights(len(TAGS), 1.2)
+FIRST_BIRTHDAY = date(1940, 1, 1).toordinal()
+LAST_BIRTHDAY = date(2010, 12, 31).toordinal()
+
+
+def letters(number: int) -> str:
+    """Encode a number in lowercase letters, so generated names stay valid and unique.
+
+    Args:
+        number (int): A non-negative number.
+
+    Returns:
+        str: The number written with the letters a to z as digits.
+    """
+    text = ""
+    while True:
+        number, digit = divmod(number, 26)
+        text += chr(ord("a") + digit)
+        if not number:
+            return text
+
+
+def pick(rng: random.Random, items: Sequence[str], cum_weights: List[float]) -> str:
+    """Choose one item with the given cumulative weights."""
+    return rng.choices(items, cum_weights=cum_weights)[0]
+
+
+def contact_name(rng: random.Random, number: int) -> str:
+    """Generate a unique contact name.
+
+    Args:
+        rng (random.Random): The random generator.
+        number (int): Sequence number of the contact, which makes the name unique.
+
+    Returns:
+        str: A name such as "Olena Melnykbd".
+    """
+    first = pick(rng, FIRST_NAMES, FIRST_NAME_WEIGHTS)
+    last = pick(rng, LAST_NAMES, LAST_NAME_WEIGHTS)
+    return f"{first} {last}{letters(number)}"
+
+
+def phone_number(rng: random.Random) -> str:
+    """Generate a 10-digit mobile phone number."""
+    return rng.choice(PHONE_PREFIXES) + f"{rng.randrange(10 ** 7):07d}"
+
+
+def generate_contacts(count: int, seed: int = DEFAULT_SEED) -> Iterator[Record]:
+    """Generate contact records with realistic field distributions.
+
+    Every contact has one to three phones; 70% have an email, 80% a
+    birthday between 1940 and 2010 (29 February included) and 50% an
+    address.
+
+    Args:
+        count (int): Number of contacts.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        Iterator[Record]: The generated records.
+    """
+    rng = random.Random(seed)
+    for number in range(count):
+        name = contact_name(rng, number)
+        record = Record(name)
+        for _ in range(rng.choices((1, 2, 3), weights=(60, 30, 10))[0]):
+            record.add_phone(phone_number(rng))
+        if rng.random() < 0.7:
+            user = name.lower().replace(" ", ".").replace("'", "")
+            # Generated addresses are valid; skip the deliverability check, which needs the network
+            record.email = Email.restore(f"{user}@{rng.choice(EMAIL_DOMAINS)}")
+        if rng.random() < 0.8:
+            born = date.fromordinal(rng.randint(FIRST_BIRTHDAY, LAST_BIRTHDAY))
+            record.add_birthday(born.strftime("%d.%m.%Y"))
+        if rng.random() < 0.5:
+            record.add_address([
+                f"{rng.randint(1, 150)} {rng.choice(STREETS)} St",
+                rng.choice(CITIES),
+                "Ukraine",
+                f"{rng.randint(1000, 99999):05d}",
+            ])
+        yield record
+
+
+def generate_address_book(count: int, seed: int = DEFAULT_SEED) -> AddressBook:
+    """Generate an address book of synthetic contacts.
+
+    Args:
+        count (int): Number of contacts.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        AddressBook: The generated book.
+    """
+    book = AddressBook()
+    for record in generate_contacts(count, seed):
+        book.add_record(record)
+    return book
+
+
+def note_text(rng: random.Random, low: int, high: int) -> str:
+    """Generate text of Zipf-distributed words."""
+    return " ".join(rng.choices(WORDS, cum_weights=WORD_WEIGHTS, k=rng.randint(low, high)))
+
+
+def generate_notes_book(count: int, seed: int = DEFAULT_SEED) -> NotesBook:
+    """Generate a notes book of synthetic notes.
+
+    Titles are two to five words, content 5 to 80 words and every note has
+    zero to four tags, with a few words and tags much more common than the
+    rest.
+
+    Args:
+        count (int): Number of notes.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        NotesBook: The generated book.
+    """
+    rng = random.Random(seed)
+    book = NotesBook()
+    for number in range(count):
+        title = f"{note_text(rng, 2, 5).capitalize()} {number}"
+        book.add_note(title, note_text(rng, 5, 80))
+        tags = set(rng.choices(TAGS, cum_weights=TAG_WEIGHTS, k=rng.randint(0, 4)))
+        for tag in sorted(tags):
+            book.add_tag_to_note(title, tag)
+    return book
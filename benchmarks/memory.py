@@ -0,0 +1,90 @@
+"""Measure the memory used by contacts in an AddressBook.
+
+Usage:
+    python -m benchmarks.memory [--contacts N]
+
+The same contacts are also measured in the layout records and fields had
+before they used __slots__, as a baseline: every object keeps an instance
+__dict__, phones are strings and birthdays are dates.
+"""
+import argparse
+import gc
+import pickle
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.datagen import generate_address_book, generate_contacts
+from src.models.address_book import AddressBook
+from src.models.record import Record
+
+
+class DictField:
+    """Field in the layout before __slots__, holding its value in an instance __dict__."""
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+
+class DictRecord:
+    """Record in the layout before __slots__, with one field object per value."""
+
+    def __init__(self, record: Record) -> None:
+        self.name = DictField(record.name.value)
+        self.phones = [DictField(phone.value) for phone in record.phones]
+        self.email = DictField(record.email.value) if record.email else None
+        self.birthday = DictField(record.birthday.value) if record.birthday else None
+        self.address = DictField(record.address.value) if record.address else None
+        self._listener = None
+
+
+class DictBook:
+    """Contacts by normalized name, as the address book held them before __slots__."""
+
+    def __init__(self, count: int) -> None:
+        self.data: Dict[str, DictRecord] = {}
+        normalize_name = AddressBook().normalize_name
+        for record in generate_contacts(count):
+            copy = DictRecord(record)
+            copy._listener = self._on_record_change
+            self.data[normalize_name(copy.name.value)] = copy
+
+    def _on_record_change(self, record: DictRecord, op: str, args: tuple) -> None:
+        """Stand-in for the change callback every record of a book holds."""
+
+
+def measure(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """Build an object and get the memory it keeps allocated.
+
+    Args:
+        build (Callable[[], Any]): Function building the object.
+
+    Returns:
+        Tuple[Any, int]: The object and the bytes it holds.
+    """
+    gc.collect()
+    tracemalloc.start()
+    built = build()
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return built, used
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contacts", type=int, default=100_000, help="number of contacts to generate")
+    args = parser.parse_args(argv)
+
+    baseline, baseline_used = measure(lambda: DictBook(args.contacts))
+    baseline_pickled = len(pickle.dumps(baseline.data))
+    del baseline
+    book, used = measure(lambda: generate_address_book(args.contacts))
+    pickled = len(pickle.dumps(book))
+
+    print(f"contacts:           {args.contacts}")
+    print(f"memory per contact: {used / args.contacts:.0f} bytes (dict layout: {baseline_used / args.contacts:.0f})")
+    print(f"pickle per contact: {pickled / args.contacts:.0f} bytes (dict layout: {baseline_pickled / args.contacts:.0f})")
+
+
+if __name__ == "__main__":
+    main()
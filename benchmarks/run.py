@@ -0,0 +1,450 @@
+"""Benchmark every handler, the storage functions and table rendering.
+
+Usage:
+    python -m benchmarks.run [--sizes 1000 10000] [--cases find] [--output results.json]
+    python -m benchmarks.run --output new.json --compare old.json
+
+Each case is called once untimed, which builds the lazy indexes, then runs
+for at least --min-time seconds (and at least MIN_ITERATIONS calls) on a
+generated book, then once more under tracemalloc to measure its peak
+memory. Calls that raise, such as searches without results, are counted
+as errors. Results can be written as JSON and compared with the results
+of another commit; the command exits with status 1 if a case got slower
+than --threshold allows.
+"""
+import argparse
+import json
+import os
+import pickle
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from tabulate import tabulate
+
+from benchmarks.datagen import DEFAULT_SEED, generate_address_book, generate_notes_book, letters
+from src.handlers.address_handlers import handle_add_address, handle_delete_address, handle_show_address
+from src.handlers.birthday_handlers import (
+    handle_add_birthday,
+    handle_birthdays,
+    handle_delete_birthday,
+    handle_show_birthday,
+)
+from src.handlers.contact_handlers import (
+    add_email_to_contact,
+    handle_add_contact,
+    handle_change_contact,
+    handle_delete_contact,
+    handle_find_by_phone,
+    handle_find_contact,
+    handle_find_phones,
+    handle_fuzzy_search,
+    handle_import_contacts,
+    handle_prefix_search,
+    handle_shared_phones,
+    handle_show_all,
+    handle_show_email,
+    handle_show_phone,
+)
+from src.handlers.note_handlers import (
+    handle_add_note,
+    handle_add_tag,
+    handle_check_tag,
+    handle_delete_note,
+    handle_edit_note,
+    handle_find_note,
+    handle_find_notes_by_tag,
+    handle_prefix_search_notes,
+    handle_query_tags,
+    handle_remove_tag,
+    handle_show_notes,
+)
+from src.models.address_book import AddressBook
+from src.models.mapped_books import MappedAddressBook, contact_row
+from src.models.notes_book import NotesBook
+from src.models.record import Record
+from src.utils.columnar import save_columnar
+from src.utils.export import export_contacts
+from src.utils.journal import Journal
+from src.utils.sharded_storage import ShardedStorage
+from src.utils.storage import load_data, save_data
+
+DEFAULT_SIZES = [1_000, 10_000]
+MIN_ITERATIONS = 5
+RESULTS_FORMAT = 1  # Version of the JSON layout
+
+
+class Case(NamedTuple):
+    """A benchmarked operation.
+
+    ``make_args(i)`` builds the argument of the i-th call outside the timed
+    section; ``run(args)`` is the timed call. Write cases use i to touch a
+    different record on every call.
+    """
+
+    name: str
+    make_args: Callable[[int], Any]
+    run: Callable[[Any], Any]
+    max_iterations: int = 10_000
+
+
+def sample(keys: List[str], count: int = 1000) -> List[str]:
+    """Take evenly spaced keys, so cases do not depend on the book size."""
+    step = max(1, len(keys) // count)
+    return keys[::step][:count]
+
+
+def contact_cases(book: AddressBook) -> List[Case]:
+    """Build the cases of the contact, address and birthday handlers.
+
+    Read cases come first, so write cases cannot change what they measure.
+    """
+    records = list(book.data.items())
+    names = sample([key for key, _ in records])
+    with_email = sample([key for key, record in records if record.email])
+    with_birthday = sample([key for key, record in records if record.birthday])
+    with_address = sample([key for key, record in records if record.address])
+    without_address = sample([key for key, record in records if not record.address])
+    queries = ["olena", "shevchenko", "067", "1985", "gmail", "xyz"]
+    misspelled = [(name[:2] + name[3:]).lower() for name in names]  # One letter dropped
+    phones = [book.find(name).phones[0].value for name in names]
+    prefixes = ["050", "0671", "09912", "0731234"]
+    typed = ["ol", "ol sh", "jo o'b", "an ko", "xyz"]  # Starts of name words, as typed
+
+    def cycle(keys: List[str]) -> Callable[[int], str]:
+        return lambda i: keys[i % len(keys)]
+
+    def change_phone(i: int) -> str:
+        name = names[i % len(names)]
+        old_phone = book.find(name).phones[0].value
+        return f"{name}: {old_phone} {old_phone[::-1]}"
+
+    return [
+        Case("show_phone", cycle(names), lambda args: handle_show_phone(args, book)),
+        Case("show_email", cycle(with_email), lambda args: handle_show_email(args, book)),
+        Case("show_birthday", cycle(with_birthday), lambda args: handle_show_birthday(args, book)),
+        Case("show_address", cycle(with_address), lambda args: handle_show_address(args, book)),
+        Case("find_contact", cycle(queries), lambda args: handle_find_contact(args, book), 200),
+        Case("fuzzy_search", cycle(misspelled), lambda args: handle_fuzzy_search(args, book), 200),
+        Case("prefix_search", cycle(typed), lambda args: handle_prefix_search(args, book), 500),
+        Case("find_by_phone", cycle(phones), lambda args: handle_find_by_phone(args, book)),
+        Case("find_phones", cycle(prefixes), lambda args: handle_find_phones(args, book), 200),
+        Case("shared_phones", lambda i: None, lambda args: handle_shared_phones(book), 200),
+        Case("upcoming_birthdays_7", lambda i: "7", lambda args: handle_birthdays(args, book), 200),
+        Case("upcoming_birthdays_365", lambda i: "365", lambda args: handle_birthdays(args, book), 20),
+        Case("show_all", lambda i: None, lambda args: handle_show_all(book), 20),
+        Case("add_contact", lambda i: f"Bench Contact{letters(i)} 0501234567",
+             lambda args: handle_add_contact(args, book)),
+        Case("add_email", lambda i: f"{names[i % len(names)]}: bench{i}@example.com",
+             lambda args: add_email_to_contact(args, book), 200),
+        Case("change_phone", change_phone, lambda args: handle_change_contact(args, book)),
+        Case("add_birthday", lambda i: f"{names[i % len(names)]}: 15.06.1990",
+             lambda args: handle_add_birthday(args, book)),
+        Case("delete_birthday", cycle(with_birthday), lambda args: handle_delete_birthday(args, book),
+             len(with_birthday)),
+        Case("add_address", lambda i: f"{without_address[i % len(without_address)]}: 1 Main St, Kyiv, Ukraine, 01001",
+             lambda args: handle_add_address(args, book), len(without_address)),
+        Case("delete_address", cycle(with_address), lambda args: handle_delete_address(args, book),
+             len(with_address)),
+        Case("delete_contact", cycle(names), lambda args: handle_delete_contact(args, book), len(names)),
+    ]
+
+
+def note_cases(book: NotesBook) -> List[Case]:
+    """Build the cases of the note handlers, read cases first."""
+    notes = list(book.data.items())
+    titles = sample([title for title, _ in notes])
+    tagged = sample([f"{title}: {note.tags[0]}" for title, note in notes if note.tags])
+    words = ["meeting", "budget review", "exam", "coffee lecture garden", "nothing"]
+
+    def cycle(keys: List[str]) -> Callable[[int], str]:
+        return lambda i: keys[i % len(keys)]
+
+    return [
+        Case("find_note", cycle(words), lambda args: handle_find_note(args, book), 500),
+        Case("check_tag", cycle(tagged), lambda args: handle_check_tag(args, book)),
+        Case("find_notes_by_tag", cycle(["work", "music", "car"]),
+             lambda args: handle_find_notes_by_tag(args, book), 200),
+        Case("query_tags", cycle(["work AND urgent NOT done", "home OR family", "NOT todo"]),
+             lambda args: handle_query_tags(args, book), 200),
+        Case("prefix_search_notes", cycle(["me", "budget wo", "ex st", "co ur"]),
+             lambda args: handle_prefix_search_notes(args, book), 500),
+        Case("show_notes", lambda i: None, lambda args: handle_show_notes(book), 20),
+        Case("add_note", lambda i: f"Benchmark note {i}: Some content about the budget meeting",
+             lambda args: handle_add_note(args, book)),
+        Case("edit_note", lambda i: f"{titles[i % len(titles)]}: Edited content {i}",
+             lambda args: handle_edit_note(args, book)),
+        Case("add_tag", lambda i: f"{titles[i % len(titles)]}: bench{i}", lambda args: handle_add_tag(args, book)),
+        Case("remove_tag", cycle(tagged), lambda args: handle_remove_tag(args, book), len(tagged)),
+        Case("delete_note", cycle(titles), lambda args: handle_delete_note(args, book), len(titles)),
+    ]
+
+
+def open_mapped_book(filename: str, name: str) -> Record:
+    """Open a mapped snapshot and look one contact up, as a cold start would."""
+    book = MappedAddressBook(filename)
+    try:
+        return book.find(name)
+    finally:
+        book.close()
+
+
+def open_sharded_book(book: AddressBook, directory: str) -> ShardedStorage:
+    """Copy a book into shard files and open them, as the first sharded start would."""
+    snapshot = os.path.join(directory, "sharded_source.pkl")
+    save_data(book, snapshot)
+    storage = ShardedStorage(os.path.join(directory, "address_book.shards"), AddressBook,
+                             migrate_from=Journal(snapshot, AddressBook))
+    storage.load()
+    return storage
+
+
+def save_pickle(book: object, filename: str) -> None:
+    """Pickle a book with protocol 5, as a baseline for the codec of save_data."""
+    with open(filename, "wb") as f:
+        pickle.dump(book, f, protocol=5)
+
+
+def load_pickle(filename: str) -> object:
+    """Unpickle a book saved by save_pickle."""
+    with open(filename, "rb") as f:
+        return pickle.load(f)
+
+
+def storage_cases(address_book: AddressBook, notes_book: NotesBook, directory: str) -> List[Case]:
+    """Build the cases of saving and loading encoded, pickled, mapped and sharded books and of exporting and importing contacts."""
+    address_file = os.path.join(directory, "address_book.pkl")
+    address_pickle = os.path.join(directory, "address_book.pickle5")
+    notes_pickle = os.path.join(directory, "notes.pickle5")
+    mapped_file = os.path.join(directory, "address_book.cols")
+    notes_file = os.path.join(directory, "notes.pkl")
+    last_name = next(reversed(address_book.data))
+    names = sample(list(address_book.data))
+    sharded: List[ShardedStorage] = []  # Opened by the first call, on a copy of the book
+
+    def edit_sharded(name: str) -> None:
+        if not sharded:
+            sharded.append(open_sharded_book(address_book, directory))
+        sharded[0].book.find(name).add_birthday("01.01.2000")
+        sharded[0].checkpoint()
+
+    return [
+        Case("save_address_book", lambda i: address_file, lambda args: save_data(address_book, args), 20),
+        Case("load_address_book", lambda i: address_file, lambda args: load_data(args, AddressBook), 20),
+        Case("save_address_book_pickle5", lambda i: address_pickle, lambda args: save_pickle(address_book, args), 20),
+        Case("load_address_book_pickle5", lambda i: address_pickle, load_pickle, 20),
+        Case("save_mapped_address_book", lambda i: mapped_file,
+             lambda args: save_columnar(((key, contact_row(r)) for key, r in address_book.data.items()), args), 20),
+        Case("open_mapped_address_book", lambda i: mapped_file, lambda args: open_mapped_book(args, last_name), 20),
+        Case("save_sharded_edit", lambda i: names[i % len(names)], edit_sharded, 200),
+        Case("save_notes_book", lambda i: notes_file, lambda args: save_data(notes_book, args), 20),
+        Case("load_notes_book", lambda i: notes_file, lambda args: load_data(args, NotesBook), 20),
+        Case("save_notes_book_pickle5", lambda i: notes_pickle, lambda args: save_pickle(notes_book, args), 20),
+        Case("load_notes_book_pickle5", lambda i: notes_pickle, load_pickle, 20),
+        Case("export_contacts_jsonl", lambda i: os.path.join(directory, "contacts.jsonl"),
+             lambda args: export_contacts(address_book.data.values(), args), 20),
+        Case("export_contacts_csv", lambda i: os.path.join(directory, "contacts.csv"),
+             lambda args: export_contacts(address_book.data.values(), args), 20),
+        Case("export_contacts_vcard", lambda i: os.path.join(directory, "contacts.vcf"),
+             lambda args: export_contacts(address_book.data.values(), args), 20),
+        # Imports read the exported files into an empty book
+        Case("import_contacts_csv", lambda i: os.path.join(directory, "contacts.csv"),
+             lambda args: handle_import_contacts(args, AddressBook()), 20),
+        Case("import_contacts_vcard", lambda i: os.path.join(directory, "contacts.vcf"),
+             lambda args: handle_import_contacts(args, AddressBook()), 20),
+    ]
+
+
+def percentile(timings: List[int], fraction: float) -> int:
+    """Get a percentile of sorted timings with the nearest-rank method."""
+    return timings[min(len(timings) - 1, max(0, round(fraction * len(timings)) - 1))]
+
+
+def run_case(case: Case, min_time: float) -> Dict[str, Any]:
+    """Run a case repeatedly and measure it.
+
+    Args:
+        case (Case): The case to run.
+        min_time (float): Seconds the case should run for at least.
+
+    Returns:
+        Dict[str, Any]: The measurements of the case.
+    """
+    # The warm-up and memory calls count towards max_iterations
+    calls = iter(range(case.max_iterations))
+
+    def call() -> bool:
+        """Make the next untimed call of the case; return False if it raised."""
+        try:
+            case.run(case.make_args(next(calls, 0)))
+            return True
+        except Exception:
+            return False
+
+    call()  # The untimed first call builds the lazy indexes the case relies on
+    timings = []
+    errors = 0
+    started = time.perf_counter()
+    while len(timings) < case.max_iterations - 2 and (
+        len(timings) < MIN_ITERATIONS or time.perf_counter() - started < min_time
+    ):
+        args = case.make_args(next(calls))
+        start = time.perf_counter_ns()
+        try:
+            case.run(args)
+        except Exception:
+            errors += 1
+        timings.append(time.perf_counter_ns() - start)
+
+    # Measure memory on a separate call, since tracing slows every allocation down
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        "case": case.name,
+        "iterations": len(timings),
+        "errors": errors,
+        "ops_per_sec": len(timings) / (total / 1e9) if total else None,
+        "mean_ms": total / len(timings) / 1e6,
+        "p50_ms": percentile(timings, 0.50) / 1e6,
+        "p90_ms": percentile(timings, 0.90) / 1e6,
+        "p99_ms": percentile(timings, 0.99) / 1e6,
+        "max_ms": timings[-1] / 1e6,
+        "peak_memory_bytes": peak,
+    }
+
+
+def run_size(size: int, seed: int, min_time: float, selected: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """Generate books of one size and run every selected case on them."""
+    started = time.perf_counter()
+    address_book = generate_address_book(size, seed)
+    notes_book = generate_notes_book(size, seed)
+    print(f"Generated {size} contacts and notes in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        # Storage runs first, while the books still have their generated contents
+        cases = storage_cases(address_book, notes_book, directory)
+        cases += contact_cases(address_book) + note_cases(notes_book)
+        for case in cases:
+            if selected and not any(pattern in case.name for pattern in selected):
+                continue
+            result = run_case(case, min_time)
+            result["size"] = size
+            results.append(result)
+            print(f"  {case.name:<24} p50 {result['p50_ms']:9.3f} ms", file=sys.stderr)
+        for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                print(f"  {entry.name:<24} {entry.stat().st_size / 1024:9.1f} KiB", file=sys.stderr)
+    return results
+
+
+def git_commit() -> Optional[str]:
+    """Get the current commit of the repository, if git is available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """Print the results as a table."""
+    headers = ["size", "case", "iterations", "ops/s", "p50 ms", "p90 ms", "p99 ms", "peak KiB", "errors"]
+    rows = [
+        [
+            r["size"], r["case"], r["iterations"],
+            f"{r['ops_per_sec']:.0f}" if r["ops_per_sec"] else "-",
+            f"{r['p50_ms']:.3f}", f"{r['p90_ms']:.3f}", f"{r['p99_ms']:.3f}",
+            f"{r['peak_memory_bytes'] / 1024:.1f}", r["errors"],
+        ]
+        for r in results
+    ]
+    print(tabulate(rows, headers=headers, tablefmt="simple"))
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> int:
+    """Print how the median latency of every case changed against older results.
+
+    Args:
+        results (List[Dict[str, Any]]): The new results.
+        baseline (Dict[str, Any]): The contents of an older results file.
+        threshold (float): Relative slowdown of the median that counts as a regression.
+
+    Returns:
+        int: Number of regressions.
+    """
+    old = {(r["case"], r["size"]): r for r in baseline["results"]}
+    rows = []
+    regressions = 0
+    for r in results:
+        before = old.get((r["case"], r["size"]))
+        if before is None or not before["p50_ms"]:
+            continue
+        ratio = r["p50_ms"] / before["p50_ms"]
+        regressed = ratio > 1 + threshold
+        regressions += regressed
+        rows.append([
+            r["size"], r["case"], f"{before['p50_ms']:.3f}", f"{r['p50_ms']:.3f}", f"{ratio:.2f}x",
+            "REGRESSION" if regressed else "",
+        ])
+    print(f"\nCompared with {baseline['meta'].get('commit') or 'baseline'}:")
+    print(tabulate(rows, headers=["size", "case", "old p50 ms", "new p50 ms", "ratio", ""], tablefmt="simple"))
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="numbers of contacts and notes to generate (default: 1000 10000)")
+    parser.add_argument("--cases", nargs="+", help="run only the cases whose names contain one of these")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="seed of the data generator")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to run each case for")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare with the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="slowdown of the median that counts as a regression (default: 0.25)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks and return the exit status."""
+    args = parse_args(argv)
+    results = []
+    for size in args.sizes:
+        results += run_size(size, args.seed, args.min_time, args.cases)
+    print_results(results)
+
+    if args.output:
+        meta = {
+            "format": RESULTS_FORMAT,
+            "commit": git_commit(),
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+        }
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
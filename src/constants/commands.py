@@ -9,6 +9,13 @@ class ContactCommands(str, Enum):
     CHANGE_PHONE = "Change Phone"
     SHOW_EMAIL = "Show Email"
     SEARCH_CONTACT = "Search Contact"
+    FUZZY_SEARCH = "Fuzzy Search"
+    IMPORT_CONTACTS = "Import Contacts"
+    EXPORT_CONTACTS = "Export Contacts"
+    SEARCH_AS_YOU_TYPE = "Search as You Type"
+    FIND_BY_PHONE = "Find by Phone"
+    FIND_PHONES_BY_PREFIX = "Find Phones by Prefix"
+    SHOW_SHARED_PHONES = "Show Shared Phones"
 
 class AddressCommands(str, Enum):
     ADD_ADDRESS = "Add Address"
@@ -25,6 +32,9 @@ class NoteCommands(str, Enum):
     REMOVE_TAG = "Remove Tag"
     CHECK_TAG = "Check Tag"
     FIND_NOTES_BY_TAG = "Find Notes by Tag"
+    QUERY_TAGS = "Query Tags"
+    EXPORT_NOTES = "Export Notes"
+    SEARCH_NOTES_AS_YOU_TYPE = "Search Notes as You Type"
 
 class BirthdayCommands(str, Enum):
     ADD_BIRTHDAY = "Add Birthday"
@@ -32,6 +42,51 @@ class BirthdayCommands(str, Enum):
     SHOW_UPCOMING_BIRTHDAYS = "Show Upcoming Birthdays"
     DELETE_BIRTHDAY = "Delete Birthday"
 
+class CommandKind(str, Enum):
+    READ = "read"
+    WRITE = "write"
+
+# Dictionary marking each command as read-only or as one that changes a book
+COMMAND_KINDS = {
+    ContactCommands.ADD_CONTACT: CommandKind.WRITE,
+    ContactCommands.SHOW_ALL_CONTACTS: CommandKind.READ,
+    ContactCommands.FIND_CONTACT: CommandKind.READ,
+    ContactCommands.DELETE_CONTACT: CommandKind.WRITE,
+    ContactCommands.ADD_EMAIL: CommandKind.WRITE,
+    ContactCommands.CHANGE_PHONE: CommandKind.WRITE,
+    ContactCommands.SHOW_EMAIL: CommandKind.READ,
+    ContactCommands.SEARCH_CONTACT: CommandKind.READ,
+    ContactCommands.FUZZY_SEARCH: CommandKind.READ,
+    ContactCommands.IMPORT_CONTACTS: CommandKind.WRITE,
+    ContactCommands.EXPORT_CONTACTS: CommandKind.READ,
+    ContactCommands.SEARCH_AS_YOU_TYPE: CommandKind.READ,
+    ContactCommands.FIND_BY_PHONE: CommandKind.READ,
+    ContactCommands.FIND_PHONES_BY_PREFIX: CommandKind.READ,
+    ContactCommands.SHOW_SHARED_PHONES: CommandKind.READ,
+
+    AddressCommands.ADD_ADDRESS: CommandKind.WRITE,
+    AddressCommands.SHOW_ADDRESS: CommandKind.READ,
+    AddressCommands.DELETE_ADDRESS: CommandKind.WRITE,
+
+    NoteCommands.ADD_NOTE: CommandKind.WRITE,
+    NoteCommands.SHOW_ALL_NOTES: CommandKind.READ,
+    NoteCommands.FIND_NOTE: CommandKind.READ,
+    NoteCommands.EDIT_NOTE: CommandKind.WRITE,
+    NoteCommands.DELETE_NOTE: CommandKind.WRITE,
+    NoteCommands.ADD_TAG: CommandKind.WRITE,
+    NoteCommands.REMOVE_TAG: CommandKind.WRITE,
+    NoteCommands.CHECK_TAG: CommandKind.READ,
+    NoteCommands.FIND_NOTES_BY_TAG: CommandKind.READ,
+    NoteCommands.QUERY_TAGS: CommandKind.READ,
+    NoteCommands.EXPORT_NOTES: CommandKind.READ,
+    NoteCommands.SEARCH_NOTES_AS_YOU_TYPE: CommandKind.READ,
+
+    BirthdayCommands.ADD_BIRTHDAY: CommandKind.WRITE,
+    BirthdayCommands.SHOW_BIRTHDAY: CommandKind.READ,
+    BirthdayCommands.SHOW_UPCOMING_BIRTHDAYS: CommandKind.READ,
+    BirthdayCommands.DELETE_BIRTHDAY: CommandKind.WRITE,
+}
+
 # Dictionary mapping commands to their help messages
 COMMAND_HELP_MESSAGES = {
     ContactCommands.ADD_CONTACT: "Enter contact name and phone number. Example: John Smith 1234567890",
@@ -42,6 +97,13 @@ COMMAND_HELP_MESSAGES = {
     ContactCommands.CHANGE_PHONE: "Enter contact name, old phone, and new phone. Example: John Smith: 1234567890: 0987654321",
     ContactCommands.SHOW_EMAIL: "Enter contact name. Example: John Smith",
     ContactCommands.SEARCH_CONTACT: "Enter search keyword. Example: John",
+    ContactCommands.FUZZY_SEARCH: "Enter a name, typos are allowed. Example: jhon smtih",
+    ContactCommands.IMPORT_CONTACTS: "Enter the path of a CSV or vCard file. Example: contacts.vcf",
+    ContactCommands.EXPORT_CONTACTS: "Enter the path of a JSONL, CSV or vCard file and an optional search keyword. Example: contacts.vcf: John",
+    ContactCommands.SEARCH_AS_YOU_TYPE: "Enter the start of name words. Example: jo sm",
+    ContactCommands.FIND_BY_PHONE: "Enter a phone number. Example: 0501234567",
+    ContactCommands.FIND_PHONES_BY_PREFIX: "Enter the first digits of the numbers. Example: 050",
+    ContactCommands.SHOW_SHARED_PHONES: "Press Enter to continue...",
     
     AddressCommands.ADD_ADDRESS: "Enter contact name and address. Example: John Smith: 123 Main St, Anytown, USA, 12345",
     AddressCommands.SHOW_ADDRESS: "Enter contact name. Example: John Smith",
@@ -49,13 +111,16 @@ COMMAND_HELP_MESSAGES = {
     
     NoteCommands.ADD_NOTE: "Enter note title and content. Example: Meeting Notes: Today's meeting was productive",
     NoteCommands.SHOW_ALL_NOTES: "Press Enter to continue...",
-    NoteCommands.FIND_NOTE: "Enter search keyword. Example: meeting",
+    NoteCommands.FIND_NOTE: "Enter search words. Example: meeting budget",
     NoteCommands.EDIT_NOTE: "Enter note title and new content. Example: Meeting Notes: Updated meeting notes",
     NoteCommands.DELETE_NOTE: "Enter note title to delete. Example: Meeting Notes",
     NoteCommands.ADD_TAG: "Enter note title and tag. Example: Meeting Notes: work",
     NoteCommands.REMOVE_TAG: "Enter note title and tag to remove. Example: Meeting Notes: work",
     NoteCommands.CHECK_TAG: "Enter note title and tag to check. Example: Meeting Notes: work",
     NoteCommands.FIND_NOTES_BY_TAG: "Enter tag to search. Example: work",
+    NoteCommands.QUERY_TAGS: "Enter tags joined with AND, OR, NOT. Example: work AND urgent NOT done",
+    NoteCommands.EXPORT_NOTES: "Enter the path of a JSONL or CSV file and an optional tag. Example: notes.jsonl: work",
+    NoteCommands.SEARCH_NOTES_AS_YOU_TYPE: "Enter the start of title words or tags. Example: meet wo",
     
     BirthdayCommands.ADD_BIRTHDAY: "Enter contact name and birthday. Example: John Smith: 01.01.2000",
     BirthdayCommands.SHOW_BIRTHDAY: "Enter contact name. Example: John Smith",
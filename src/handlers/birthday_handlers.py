@@ -1,4 +1,7 @@
+from typing import Dict, List
+
 from src.models.address_book import AddressBook
+from src.ui.table_view import BIRTHDAY_COLUMNS, TableSource
 from tabulate import tabulate
 from colorama import Fore, Style
 
@@ -98,17 +101,15 @@ def handle_delete_birthday(args_str: str, book: AddressBook) -> str:
 
     return record.delete_birthday()
 
-def handle_birthdays(args_str: str, book: AddressBook) -> str:
-    """Show upcoming birthdays within the specified number of days.
+def _upcoming_birthdays(args_str: str, book: AddressBook) -> List[Dict[str, str]]:
+    """Find the upcoming birthdays for the birthday commands.
     
     Args:
         args_str (str): String containing the number of days to look ahead.
-                         Example: "7"
         book (AddressBook): The address book instance to search in.
     
     Returns:
-        str: Formatted string containing all upcoming birthdays within the specified period.
-             Each line contains contact name, birthday date, and celebration date.
+        List[Dict[str, str]]: The upcoming birthdays in date order.
         
     Raises:
         ValueError: If number of days is not provided.
@@ -119,10 +120,29 @@ def handle_birthdays(args_str: str, book: AddressBook) -> str:
     if not args:
         raise ValueError("Please provide number of days.")
         
-    date_interval, *_ = args
+    date_interval, *_ = args.split()
     upcoming = book.get_upcoming_birthdays(date_interval)
     if len(upcoming) == 0:
         raise ValueError(f"There are no birthdays in the next {date_interval} days.")
+    return upcoming
+
+def handle_birthdays(args_str: str, book: AddressBook) -> str:
+    """Show upcoming birthdays within the specified number of days.
+    
+    Args:
+        args_str (str): String containing the number of days to look ahead.
+                         Example: "7"
+        book (AddressBook): The address book instance to search in.
+    
+    Returns:
+        str: Formatted string containing all upcoming birthdays within the specified period.
+             Each line contains contact name, birthday date, and celebration date.
+        
+    Raises:
+        ValueError: If number of days is not provided.
+        ValueError: If no birthdays are found within the specified period.
+    """
+    upcoming = _upcoming_birthdays(args_str, book)
     headers = {
         "name": "Name",
         "birthday": "Birthday",
@@ -132,3 +152,16 @@ def handle_birthdays(args_str: str, book: AddressBook) -> str:
     return tabulate(
         upcoming, headers=headers, tablefmt="rounded_grid", showindex=rowIDs
     )
+
+def view_birthdays(args_str: str, book: AddressBook) -> TableSource:
+    """Get a scrollable table of the upcoming birthdays.
+    
+    Args:
+        args_str (str): String containing the number of days to look ahead.
+                         Example: "7"
+        book (AddressBook): The address book instance to search in.
+    
+    Returns:
+        TableSource: The upcoming birthdays in date order.
+    """
+    return TableSource(BIRTHDAY_COLUMNS, _upcoming_birthdays(args_str, book))
@@ -1,4 +1,11 @@
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Union
+
 from src.models.address_book import AddressBook
+from src.ui.search_panel import LiveSearch
+from src.ui.table_view import CONTACT_COLUMNS, TableSource
+from src.utils.contact_import import import_contacts
+from src.utils.export import export_contacts
 from colorama import Fore, Style
 
 
@@ -231,4 +238,237 @@ def handle_find_contact(args_str: str, book: AddressBook) -> str:
     if not found_contacts:
         raise KeyError("No matching contacts found.")
 
-    return '\n'.join(str(record) for record in found_contacts)
\ No newline at end of file
+    return '\n'.join(str(record) for record in found_contacts)
+
+def handle_fuzzy_search(args_str: str, book: AddressBook) -> str:
+    """Find contacts by a name that may be misspelled.
+    
+    Args:
+        args_str (str): String containing the name.
+                         Example: "jhon smtih"
+        book (AddressBook): The address book instance to search in.
+    
+    Returns:
+        str: Formatted string containing the most similar contacts with
+             their similarity, most similar first.
+        
+    Raises:
+        IndexError: If no name is provided.
+        KeyError: If no contact has a similar name.
+    """
+    query = args_str.strip()
+
+    if not query:
+        raise IndexError("Please provide a name to search for.")
+
+    matches = book.fuzzy_find(query)
+
+    if not matches:
+        raise KeyError("No similar contacts found.")
+
+    return '\n'.join(f"{record} {Fore.YELLOW}({score}% match){Style.RESET_ALL}" for record, score in matches)
+
+def handle_prefix_search(args_str: str, book: AddressBook) -> str:
+    """Find contacts by the start of the words of their names.
+    
+    Args:
+        args_str (str): String containing the starts of name words.
+                         Example: "jo sm"
+        book (AddressBook): The address book instance to search in.
+    
+    Returns:
+        str: Formatted string containing the contacts that have a name word
+             starting with every word of the query.
+        
+    Raises:
+        IndexError: If no query is provided.
+        KeyError: If no contact matches.
+    """
+    query = args_str.strip()
+
+    if not query:
+        raise IndexError("Please provide the start of a name.")
+
+    search = book.prefix_search()
+    found_contacts = search.entries(search.search(query))
+
+    if not found_contacts:
+        raise KeyError("No matching contacts found.")
+
+    return '\n'.join(str(record) for record in found_contacts)
+
+def format_phone_owners(phone: str, records: list) -> str:
+    """Format a phone number with the names of the contacts that have it.
+    
+    Args:
+        phone (str): The phone number.
+        records (list): The contacts with the number.
+    
+    Returns:
+        str: The number and the names, marked when several contacts share it.
+    """
+    names = ", ".join(record.name.value for record in records)
+    shared = f" {Fore.YELLOW}(shared){Style.RESET_ALL}" if len(records) > 1 else ""
+    return f"{Fore.BLUE}{phone}{Style.RESET_ALL}: {Fore.CYAN}{names}{Style.RESET_ALL}{shared}"
+
+def handle_find_by_phone(args_str: str, book: AddressBook) -> str:
+    """Find who owns a phone number.
+    
+    Args:
+        args_str (str): String containing the phone number.
+                         Example: "0501234567"
+        book (AddressBook): The address book instance to search in.
+    
+    Returns:
+        str: The contacts with the number.
+        
+    Raises:
+        IndexError: If the phone number is not provided.
+        ValueError: If the phone number is not 10 digits.
+        KeyError: If no contact has the number.
+    """
+    phone = args_str.strip()
+
+    if not phone:
+        raise IndexError("Please provide a phone number.")
+    if not (phone.isascii() and phone.isdigit()) or len(phone) != 10:
+        raise ValueError("Phone number must be 10 digits")
+
+    records = book.find_by_phone(phone)
+
+    if not records:
+        raise KeyError("No contact has this phone number.")
+
+    return format_phone_owners(phone, records)
+
+def handle_find_phones(args_str: str, book: AddressBook) -> str:
+    """Find the phone numbers that start with a prefix, such as an area code.
+    
+    Args:
+        args_str (str): String containing the first digits.
+                         Example: "050"
+        book (AddressBook): The address book instance to search in.
+    
+    Returns:
+        str: One line per matching number with the contacts that have it.
+        
+    Raises:
+        IndexError: If the prefix is not provided.
+        ValueError: If the prefix contains anything but digits.
+        KeyError: If no number starts with the prefix.
+    """
+    prefix = args_str.strip()
+
+    if not prefix:
+        raise IndexError("Please provide the first digits of the phone numbers.")
+    if not (prefix.isascii() and prefix.isdigit()):
+        raise ValueError("The prefix must contain only digits.")
+
+    found_phones = book.find_phones(prefix)
+
+    if not found_phones:
+        raise KeyError("No phone numbers start with this prefix.")
+
+    return '\n'.join(format_phone_owners(phone, records) for phone, records in found_phones)
+
+def handle_shared_phones(book: AddressBook) -> str:
+    """Show the phone numbers that several contacts have.
+    
+    Args:
+        book (AddressBook): The address book instance to search in.
+    
+    Returns:
+        str: One line per shared number with the contacts that have it, or a
+            message if there are none.
+    """
+    shared_phones = book.shared_phones()
+
+    if not shared_phones:
+        return f"{Fore.GREEN}No phone numbers are shared by several contacts.{Style.RESET_ALL}"
+
+    return '\n'.join(format_phone_owners(phone, records) for phone, records in shared_phones)
+
+def handle_import_contacts(args_str: str, book: AddressBook,
+                           batch: Callable[[], ContextManager] = nullcontext) -> str:
+    """Import contacts from a CSV or vCard file.
+    
+    Args:
+        args_str (str): Path of the file. Example: "contacts.vcf"
+        book (AddressBook): The address book instance to import into.
+        batch (Callable[[], ContextManager]): Context manager of the storage
+            that saves all imported contacts at once.
+    
+    Returns:
+        str: Number of imported contacts and, if any were rejected, the
+            path of the file listing them.
+        
+    Raises:
+        IndexError: If the path is not provided.
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file type is not supported.
+    """
+    path = args_str.strip()
+
+    if not path:
+        raise IndexError("Please provide the path of a CSV or vCard file.")
+
+    with batch():
+        result = import_contacts(book, path)
+
+    message = f"{Fore.GREEN}Imported {result.imported} contacts.{Style.RESET_ALL}"
+    if result.merged:
+        message += f" {Fore.YELLOW}{result.merged} merged into existing contacts.{Style.RESET_ALL}"
+    if result.rejected:
+        message += f" {Fore.YELLOW}{result.rejected} rejected, see {result.reject_path}{Style.RESET_ALL}"
+    return message
+
+def handle_export_contacts(args_str: str, book: AddressBook) -> str:
+    """Export all contacts, or the contacts matching a search, to a file.
+    
+    Args:
+        args_str (str): Path of a JSONL, CSV or vCard file, optionally
+                         followed by a search keyword.
+                         Example: "contacts.vcf: John"
+        book (AddressBook): The address book instance to export.
+    
+    Returns:
+        str: Number of exported contacts and the path of the file.
+        
+    Raises:
+        IndexError: If the path is not provided.
+        ValueError: If the file type is not supported.
+    """
+    path, _, query = args_str.partition(":")
+    path, query = path.strip(), query.strip()
+
+    if not path:
+        raise IndexError("Please provide the path of a JSONL, CSV or vCard file.")
+
+    records = book.find_contacts(query) if query else book.data.values()
+    count = export_contacts(records, path)
+    return f"{Fore.GREEN}Exported {count} contacts to {path}.{Style.RESET_ALL}"
+
+def view_show_all(book: AddressBook) -> Union[TableSource, str]:
+    """Get a scrollable table of all contacts.
+    
+    Args:
+        book (AddressBook): The address book instance to display.
+    
+    Returns:
+        Union[TableSource, str]: The contacts, read as they are shown, or a
+            message if there are none.
+    """
+    if not book.data:
+        return f"{Fore.YELLOW}No contacts available.{Style.RESET_ALL}"
+    return TableSource(CONTACT_COLUMNS, book.data, book)
+
+def view_prefix_search(book: AddressBook) -> LiveSearch:
+    """Get a search of the contact names that is refined as the query is typed.
+    
+    Args:
+        book (AddressBook): The address book instance to search in.
+    
+    Returns:
+        LiveSearch: The search and the columns of its results.
+    """
+    return LiveSearch(CONTACT_COLUMNS, book.prefix_search())
@@ -1,4 +1,9 @@
-from src.models.notes_book import NotesBook
+from typing import List, Union
+
+from src.models.notes_book import Note, NotesBook
+from src.ui.search_panel import LiveSearch
+from src.ui.table_view import NOTE_COLUMNS, TableSource
+from src.utils.export import export_notes
 from tabulate import tabulate
 from colorama import Fore, Style
 
@@ -35,21 +40,49 @@ def handle_find_note(args_str: str, book: "NotesBook") -> str:
         book (NotesBook): The notes book instance to search in.
     
     Returns:
-        str: Formatted string containing all matching notes or "No matching notes found."
-             Search is case-insensitive and looks for matches in both title and content.
+        str: Formatted string containing the best matching notes, most relevant first.
+             Search is case-insensitive and looks for whole words in the title,
+             content and tags.
         
     Raises:
         ValueError: If no search keyword is provided.
+        KeyError: If no note matches.
     """
     keyword = args_str.strip().lower()
     
     if not keyword:
         raise ValueError("Please provide a search keyword.")
     
-    matching_notes = [
-        str(note) for note in book.data.values()
-        if keyword in note.title.lower() or keyword in note.content.lower()
-    ]
+    matching_notes = [str(note) for note in book.search_notes(keyword)]
+    
+    if not matching_notes:
+        raise KeyError("No matching notes found.")
+    
+    return "\n".join(matching_notes)
+
+def handle_prefix_search_notes(args_str: str, book: "NotesBook") -> str:
+    """Find notes by the start of the words of their titles and tags.
+    
+    Args:
+        args_str (str): String containing the starts of title words or tags.
+                         Example: "meet wo"
+        book (NotesBook): The notes book instance to search in.
+    
+    Returns:
+        str: Formatted string containing the notes that have a title word or
+             tag starting with every word of the query.
+        
+    Raises:
+        ValueError: If no query is provided.
+        KeyError: If no note matches.
+    """
+    query = args_str.strip()
+    
+    if not query:
+        raise ValueError("Please provide the start of a title or tag.")
+    
+    search = book.prefix_search()
+    matching_notes = [str(note) for note in search.entries(search.search(query))]
     
     if not matching_notes:
         raise KeyError("No matching notes found.")
@@ -201,15 +234,19 @@ def handle_check_tag(args_str: str, book: "NotesBook") -> str:
     
     raise KeyError(f"Tag '{tag}' does not exist in note '{title}'.")
 
-def handle_find_notes_by_tag(args_str: str, book: "NotesBook") -> str:
-    """Find notes by a specific tag.
+def _notes_with_tag(args_str: str, book: "NotesBook") -> List[Note]:
+    """Find the notes with a tag for the tag search commands.
     
     Args:
         args_str (str): String containing the tag to search for.
         book (NotesBook): The notes book instance to search in.
     
     Returns:
-        str: Formatted string containing all matching notes in a table format.
+        List[Note]: The notes with the tag.
+        
+    Raises:
+        IndexError: If no tag is provided.
+        KeyError: If no note has the tag.
     """
     tag = args_str.strip()
     
@@ -220,6 +257,45 @@ def handle_find_notes_by_tag(args_str: str, book: "NotesBook") -> str:
     
     if not notes:
         raise KeyError(f"No notes found with tag '{tag}'.")
+    return notes
+
+def _notes_matching(args_str: str, book: "NotesBook") -> List[Note]:
+    """Find the notes whose tags match an expression for the query commands.
+    
+    Args:
+        args_str (str): String containing the tag expression.
+        book (NotesBook): The notes book instance to search in.
+    
+    Returns:
+        List[Note]: The matching notes.
+        
+    Raises:
+        IndexError: If no tag expression is provided.
+        ValueError: If the tag expression is malformed.
+        KeyError: If no note matches the expression.
+    """
+    expression = args_str.strip()
+    
+    if not expression:
+        raise IndexError("Please provide a tag expression to search for.")
+    
+    notes = book.query_tags(expression)
+    
+    if not notes:
+        raise KeyError(f"No notes found matching '{expression}'.")
+    return notes
+
+def handle_find_notes_by_tag(args_str: str, book: "NotesBook") -> str:
+    """Find notes by a specific tag.
+    
+    Args:
+        args_str (str): String containing the tag to search for.
+        book (NotesBook): The notes book instance to search in.
+    
+    Returns:
+        str: Formatted string containing all matching notes in a table format.
+    """
+    notes = _notes_with_tag(args_str, book)
     
     # Create table data with colors
     table_data = []
@@ -241,3 +317,116 @@ def handle_find_notes_by_tag(args_str: str, book: "NotesBook") -> str:
     ]
     
     return tabulate(table_data, headers=headers, tablefmt="simple")
+
+def handle_query_tags(args_str: str, book: "NotesBook") -> str:
+    """Find notes whose tags match an expression with AND, OR and NOT.
+    
+    Args:
+        args_str (str): String containing the tag expression.
+                         Example: "work AND urgent NOT done"
+        book (NotesBook): The notes book instance to search in.
+    
+    Returns:
+        str: Formatted string containing all matching notes in a table format.
+        
+    Raises:
+        IndexError: If no tag expression is provided.
+        ValueError: If the tag expression is malformed.
+        KeyError: If no note matches the expression.
+    """
+    notes = _notes_matching(args_str, book)
+    
+    # Create table data with colors
+    table_data = []
+    for i, note in enumerate(notes, 1):
+        row = [
+            f"{Fore.WHITE}{i}{Style.RESET_ALL}",
+            f"{Fore.CYAN}{note.title}{Style.RESET_ALL}",
+            f"{Fore.BLUE}{note.content}{Style.RESET_ALL}",
+            f"{Fore.CYAN}{', '.join(note.tags) if note.tags else f'{Fore.RED}No tags{Style.RESET_ALL}'}{Style.RESET_ALL}"
+        ]
+        table_data.append(row)
+    
+    # Create headers with colors
+    headers = [
+        f"{Fore.WHITE}#{Style.RESET_ALL}",
+        f"{Fore.WHITE}Title{Style.RESET_ALL}",
+        f"{Fore.WHITE}Content{Style.RESET_ALL}",
+        f"{Fore.WHITE}Tags{Style.RESET_ALL}"
+    ]
+    
+    return tabulate(table_data, headers=headers, tablefmt="simple")
+
+def handle_export_notes(args_str: str, book: "NotesBook") -> str:
+    """Export all notes, or the notes with a tag, to a JSONL or CSV file.
+    
+    Args:
+        args_str (str): Path of the file, optionally followed by a tag.
+                         Example: "notes.jsonl: work"
+        book (NotesBook): The notes book instance to export.
+    
+    Returns:
+        str: Number of exported notes and the path of the file.
+        
+    Raises:
+        IndexError: If the path is not provided.
+        ValueError: If the file type is not supported.
+    """
+    path, _, tag = args_str.partition(":")
+    path, tag = path.strip(), tag.strip()
+    
+    if not path:
+        raise IndexError("Please provide the path of a JSONL or CSV file.")
+    
+    notes = book.find_notes_by_tag(tag) if tag else book.data.values()
+    count = export_notes(notes, path)
+    return f"{Fore.GREEN}Exported {count} notes to {path}.{Style.RESET_ALL}"
+
+def view_show_notes(book: "NotesBook") -> Union[TableSource, str]:
+    """Get a scrollable table of all notes.
+    
+    Args:
+        book (NotesBook): The notes book instance to display.
+    
+    Returns:
+        Union[TableSource, str]: The notes, read as they are shown, or a
+            message if there are none.
+    """
+    if not book.data:
+        return f"{Fore.YELLOW}No notes available.{Style.RESET_ALL}"
+    return TableSource(NOTE_COLUMNS, book.data, book)
+
+def view_find_notes_by_tag(args_str: str, book: "NotesBook") -> TableSource:
+    """Get a scrollable table of the notes with a tag.
+    
+    Args:
+        args_str (str): String containing the tag to search for.
+        book (NotesBook): The notes book instance to search in.
+    
+    Returns:
+        TableSource: The matching notes.
+    """
+    return TableSource(NOTE_COLUMNS, _notes_with_tag(args_str, book))
+
+def view_query_tags(args_str: str, book: "NotesBook") -> TableSource:
+    """Get a scrollable table of the notes whose tags match an expression.
+    
+    Args:
+        args_str (str): String containing the tag expression.
+        book (NotesBook): The notes book instance to search in.
+    
+    Returns:
+        TableSource: The matching notes.
+    """
+    return TableSource(NOTE_COLUMNS, _notes_matching(args_str, book))
+
+def view_prefix_search_notes(book: "NotesBook") -> LiveSearch:
+    """Get a search of the note titles and tags that is refined as the query is typed.
+    
+    Args:
+        book (NotesBook): The notes book instance to search in.
+    
+    Returns:
+        LiveSearch: The search and the columns of its results.
+    """
+    return LiveSearch(NOTE_COLUMNS, book.prefix_search())
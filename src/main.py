@@ -2,14 +2,28 @@
 # from src.utils.command_suggestions import suggest_command
 # from src.utils.command_help import get_help_table
 
-from src.utils.storage import load_data, save_data
+import argparse
+import sys
+from contextlib import ExitStack, nullcontext
+
+from src.utils.journal import Journal
+from src.utils.sqlite_storage import SQLiteStorage
+from src.utils.mapped_storage import MappedStorage
+from src.utils.sharded_storage import ShardedStorage
+from src.utils.writer import BackgroundWriter
+from src.utils.dispatcher import Dispatcher
+from src.utils.email_deliverability import DNS_TIMEOUT, DeliverabilityChecker, make_dns_resolver
 from src.models.address_book import AddressBook
 from src.models.notes_book import NotesBook
+from src.models.sqlite_books import SQLiteAddressBook, SQLiteNotesBook
+from src.models.mapped_books import MappedAddressBook
 from src.constants.commands import (
     ContactCommands,
     AddressCommands,
     NoteCommands,
     BirthdayCommands,
+    CommandKind,
+    COMMAND_KINDS,
 )
 
 from src.handlers.contact_handlers import (
@@ -22,6 +36,15 @@ from src.handlers.contact_handlers import (
     handle_show_phone,
     handle_show_email,
     handle_find_contact,
+    handle_fuzzy_search,
+    handle_import_contacts,
+    handle_export_contacts,
+    handle_prefix_search,
+    handle_find_by_phone,
+    handle_find_phones,
+    handle_shared_phones,
+    view_show_all,
+    view_prefix_search,
 )
 from src.handlers.address_handlers import (
     handle_add_address,
@@ -38,14 +61,24 @@ from src.handlers.note_handlers import (
     handle_remove_tag,
     handle_check_tag,
     handle_find_notes_by_tag,
+    handle_query_tags,
+    handle_export_notes,
+    handle_prefix_search_notes,
+    view_show_notes,
+    view_find_notes_by_tag,
+    view_query_tags,
+    view_prefix_search_notes,
 )
 from src.handlers.birthday_handlers import (
     handle_add_birthday,
     handle_show_birthday,
     handle_birthdays,
     handle_delete_birthday,
+    view_birthdays,
 )
+from src.ui.api_server import ApiServer, BookApi, UnixApiServer, DEFAULT_HOST, DEFAULT_PORT
 from src.ui.terminal_ui import TerminalUI
+from src.ui.batch_runner import BatchRunner
 from src.handlers.address_handlers import (
     handle_add_address,
     handle_show_address,
@@ -65,64 +98,298 @@ from src.handlers.note_handlers import (
 
 ADDRESS_BOOK_NAME = "my_address_book.pkl"
 NOTES_BOOK_NAME = "my_notes.pkl"
+ADDRESS_BOOK_DB = "my_address_book.db"
+NOTES_BOOK_DB = "my_notes.db"
+ADDRESS_BOOK_COLUMNS = "my_address_book.cols"
+ADDRESS_BOOK_SHARDS = "my_address_book.shards"
+NOTES_BOOK_SHARDS = "my_notes.shards"
+
+def open_storages(engine):
+    """Create the storages of the address book and the notes book.
+
+    Args:
+        engine (str): Name of the storage engine, "journal", "sqlite", "mapped"
+            or "sharded".
+
+    Returns:
+        tuple: Storage of the address book and storage of the notes book.
+    """
+    address_journal = Journal(ADDRESS_BOOK_NAME, AddressBook)
+    notes_journal = Journal(NOTES_BOOK_NAME, NotesBook)
+    if engine == "sqlite":
+        # The pickle books are copied into the databases when they are created
+        return (
+            SQLiteStorage(ADDRESS_BOOK_DB, SQLiteAddressBook, migrate_from=address_journal),
+            SQLiteStorage(NOTES_BOOK_DB, SQLiteNotesBook, migrate_from=notes_journal),
+        )
+    if engine == "mapped":
+        # Only contacts have a columnar layout; notes keep their pickle journal
+        return MappedStorage(ADDRESS_BOOK_COLUMNS, MappedAddressBook, migrate_from=address_journal), notes_journal
+    if engine == "sharded":
+        return (
+            ShardedStorage(ADDRESS_BOOK_SHARDS, AddressBook, migrate_from=address_journal),
+            ShardedStorage(NOTES_BOOK_SHARDS, NotesBook, migrate_from=notes_journal),
+        )
+    return address_journal, notes_journal
+
+def parse_args(argv=None):
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(prog="address-book", description="Address book and notes manager.")
+    parser.add_argument(
+        "--storage",
+        choices=["journal", "sqlite", "mapped", "sharded"],
+        default="journal",
+        help="storage engine: pickle snapshots with a change journal (default), an SQLite database, "
+             "contacts in a memory-mapped columnar snapshot with a change journal, "
+             "or books split into shard files that are rewritten only when changed",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="run the commands in FILE ('-' for stdin) instead of the menu and save once at the end",
+    )
+    parser.add_argument(
+        "--check-email",
+        action="store_true",
+        help="check in the background whether the domains of added email addresses accept mail",
+    )
+    parser.add_argument(
+        "--dns-server",
+        action="append",
+        metavar="ADDRESS",
+        help="name server queried by --check-email instead of the system ones; may be repeated",
+    )
+    parser.add_argument(
+        "--dns-timeout",
+        type=float,
+        default=DNS_TIMEOUT,
+        metavar="SECONDS",
+        help=f"seconds --check-email waits for one DNS lookup (default {DNS_TIMEOUT})",
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="serve the books as a JSON API for other local tools instead of showing the menu",
+    )
+    serve_parser.add_argument("--host", default=DEFAULT_HOST, help=f"address to listen on (default {DEFAULT_HOST})")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to listen on (default {DEFAULT_PORT})")
+    serve_parser.add_argument("--socket", metavar="PATH", help="listen on a Unix socket at PATH instead of TCP")
+    return parser.parse_args(argv)
+
+def wrap_handler(handler, storage, writer, is_write):
+    """Wrapper function to run a handler without racing the background writer.
 
-def wrap_handler(handler, address_book=None, notes_book=None):
-    """Wrapper function to save data after handler execution."""
+    Read commands share the writer lock and may run together; write
+    commands hold it alone. A write command that changed its book schedules
+    a checkpoint of the storage on the writer thread and returns without
+    waiting for it. Read commands never touch the disk.
+    """
     def wrapped_handler(args):
-        result = handler(args)
-        if address_book:
-            save_data(address_book, ADDRESS_BOOK_NAME)
-        if notes_book:
-            save_data(notes_book, NOTES_BOOK_NAME)
+        with writer.lock.write() if is_write else writer.lock.read():
+            version = storage.book.version
+            result = handler(args)
+            changed = storage.book.version != version
+        if is_write and changed:
+            writer.mark_dirty(storage)
         return result
     return wrapped_handler
 
-def main():
-    '''
-    Main function to run the address book and notes book.
-    '''
-    address_book = load_data("my_address_book.pkl", AddressBook)
-    notes_book = load_data("my_notes.pkl", NotesBook)
+def wrap_handlers(handlers, storage, writer):
+    """Wrap every handler of a book."""
+    return {
+        command: wrap_handler(handler, storage, writer, COMMAND_KINDS[command] is CommandKind.WRITE)
+        for command, handler in handlers.items()
+    }
 
-    # Create a dictionary of handlers
-    handlers = {
+def build_handlers(address_book, notes_book, address_storage=None):
+    """Create the handlers of every command, bound to their books.
+
+    Args:
+        address_book (AddressBook): The address book.
+        notes_book (NotesBook): The notes book.
+        address_storage (optional): Storage of the address book, used to save
+            bulk imports at once.
+
+    Returns:
+        tuple: Handlers of the address book commands and of the note commands.
+    """
+    # Create dictionaries of handlers for each book
+    address_handlers = {
         # Contact handlers
-        ContactCommands.ADD_CONTACT: wrap_handler(lambda args: handle_add_contact(args, address_book), address_book=address_book),
-        ContactCommands.SHOW_ALL_CONTACTS: wrap_handler(lambda args: handle_show_all(address_book), address_book=address_book),
-        ContactCommands.FIND_CONTACT: wrap_handler(lambda args: handle_show_phone(args, address_book), address_book=address_book),
-        ContactCommands.DELETE_CONTACT: wrap_handler(lambda args: handle_delete_contact(args, address_book), address_book=address_book),
-        ContactCommands.ADD_EMAIL: wrap_handler(lambda args: add_email_to_contact(args, address_book), address_book=address_book),
-        ContactCommands.CHANGE_PHONE: wrap_handler(lambda args: handle_change_contact(args, address_book), address_book=address_book),
-        ContactCommands.SHOW_EMAIL: wrap_handler(lambda args: handle_show_email(args, address_book), address_book=address_book),
-        ContactCommands.SEARCH_CONTACT: wrap_handler(lambda args: handle_find_contact(args, address_book), address_book=address_book),
+        ContactCommands.ADD_CONTACT: lambda args: handle_add_contact(args, address_book),
+        ContactCommands.SHOW_ALL_CONTACTS: lambda args: handle_show_all(address_book),
+        ContactCommands.FIND_CONTACT: lambda args: handle_show_phone(args, address_book),
+        ContactCommands.DELETE_CONTACT: lambda args: handle_delete_contact(args, address_book),
+        ContactCommands.ADD_EMAIL: lambda args: add_email_to_contact(args, address_book),
+        ContactCommands.CHANGE_PHONE: lambda args: handle_change_contact(args, address_book),
+        ContactCommands.SHOW_EMAIL: lambda args: handle_show_email(args, address_book),
+        ContactCommands.SEARCH_CONTACT: lambda args: handle_find_contact(args, address_book),
+        ContactCommands.FUZZY_SEARCH: lambda args: handle_fuzzy_search(args, address_book),
+        ContactCommands.IMPORT_CONTACTS: lambda args: handle_import_contacts(
+            args, address_book, address_storage.batch if address_storage else nullcontext),
+        ContactCommands.EXPORT_CONTACTS: lambda args: handle_export_contacts(args, address_book),
+        ContactCommands.SEARCH_AS_YOU_TYPE: lambda args: handle_prefix_search(args, address_book),
+        ContactCommands.FIND_BY_PHONE: lambda args: handle_find_by_phone(args, address_book),
+        ContactCommands.FIND_PHONES_BY_PREFIX: lambda args: handle_find_phones(args, address_book),
+        ContactCommands.SHOW_SHARED_PHONES: lambda args: handle_shared_phones(address_book),
         
         # Address handlers
-        AddressCommands.ADD_ADDRESS: wrap_handler(lambda args: handle_add_address(args, address_book), address_book=address_book),
-        AddressCommands.SHOW_ADDRESS: wrap_handler(lambda args: handle_show_address(args, address_book), address_book=address_book),
-        AddressCommands.DELETE_ADDRESS: wrap_handler(lambda args: handle_delete_address(args, address_book), address_book=address_book),
-        
-        # Note handlers
-        NoteCommands.ADD_NOTE: wrap_handler(lambda args: handle_add_note(args, notes_book), notes_book=notes_book),
-        NoteCommands.SHOW_ALL_NOTES: wrap_handler(lambda args: handle_show_notes(notes_book), notes_book=notes_book),
-        NoteCommands.FIND_NOTE: wrap_handler(lambda args: handle_find_note(args, notes_book), notes_book=notes_book),
-        NoteCommands.EDIT_NOTE: wrap_handler(lambda args: handle_edit_note(args, notes_book), notes_book=notes_book),
-        NoteCommands.DELETE_NOTE: wrap_handler(lambda args: handle_delete_note(args, notes_book), notes_book=notes_book),
-        NoteCommands.ADD_TAG: wrap_handler(lambda args: handle_add_tag(args, notes_book), notes_book=notes_book),
-        NoteCommands.REMOVE_TAG: wrap_handler(lambda args: handle_remove_tag(args, notes_book), notes_book=notes_book),
-        NoteCommands.CHECK_TAG: wrap_handler(lambda args: handle_check_tag(args, notes_book), notes_book=notes_book),
-        NoteCommands.FIND_NOTES_BY_TAG: wrap_handler(lambda args: handle_find_notes_by_tag(args, notes_book), notes_book=notes_book),
-        
+        AddressCommands.ADD_ADDRESS: lambda args: handle_add_address(args, address_book),
+        AddressCommands.SHOW_ADDRESS: lambda args: handle_show_address(args, address_book),
+        AddressCommands.DELETE_ADDRESS: lambda args: handle_delete_address(args, address_book),
+
         # Birthday handlers
-        BirthdayCommands.ADD_BIRTHDAY: wrap_handler(lambda args: handle_add_birthday(args, address_book), address_book=address_book),
-        BirthdayCommands.SHOW_BIRTHDAY: wrap_handler(lambda args: handle_show_birthday(args, address_book), address_book=address_book),
-        BirthdayCommands.SHOW_UPCOMING_BIRTHDAYS: wrap_handler(lambda args: handle_birthdays(args, address_book), address_book=address_book),
-        BirthdayCommands.DELETE_BIRTHDAY: wrap_handler(lambda args: handle_delete_birthday(args, address_book), address_book=address_book),
+        BirthdayCommands.ADD_BIRTHDAY: lambda args: handle_add_birthday(args, address_book),
+        BirthdayCommands.SHOW_BIRTHDAY: lambda args: handle_show_birthday(args, address_book),
+        BirthdayCommands.SHOW_UPCOMING_BIRTHDAYS: lambda args: handle_birthdays(args, address_book),
+        BirthdayCommands.DELETE_BIRTHDAY: lambda args: handle_delete_birthday(args, address_book),
     }
 
-    # Create and run the UI
-    ui = TerminalUI()
-    ui.run(handlers)
+    note_handlers = {
+        # Note handlers
+        NoteCommands.ADD_NOTE: lambda args: handle_add_note(args, notes_book),
+        NoteCommands.SHOW_ALL_NOTES: lambda args: handle_show_notes(notes_book),
+        NoteCommands.FIND_NOTE: lambda args: handle_find_note(args, notes_book),
+        NoteCommands.EDIT_NOTE: lambda args: handle_edit_note(args, notes_book),
+        NoteCommands.DELETE_NOTE: lambda args: handle_delete_note(args, notes_book),
+        NoteCommands.ADD_TAG: lambda args: handle_add_tag(args, notes_book),
+        NoteCommands.REMOVE_TAG: lambda args: handle_remove_tag(args, notes_book),
+        NoteCommands.CHECK_TAG: lambda args: handle_check_tag(args, notes_book),
+        NoteCommands.FIND_NOTES_BY_TAG: lambda args: handle_find_notes_by_tag(args, notes_book),
+        NoteCommands.QUERY_TAGS: lambda args: handle_query_tags(args, notes_book),
+        NoteCommands.EXPORT_NOTES: lambda args: handle_export_notes(args, notes_book),
+        NoteCommands.SEARCH_NOTES_AS_YOU_TYPE: lambda args: handle_prefix_search_notes(args, notes_book),
+    }
+
+    return address_handlers, note_handlers
+
+def build_views(address_book, notes_book):
+    """Create the handlers that return scrollable tables and live searches for the terminal UI.
+
+    Args:
+        address_book (AddressBook): The address book.
+        notes_book (NotesBook): The notes book.
+
+    Returns:
+        tuple: Table handlers of the address book commands and of the note commands.
+    """
+    address_views = {
+        ContactCommands.SHOW_ALL_CONTACTS: lambda args: view_show_all(address_book),
+        BirthdayCommands.SHOW_UPCOMING_BIRTHDAYS: lambda args: view_birthdays(args, address_book),
+        ContactCommands.SEARCH_AS_YOU_TYPE: lambda args: view_prefix_search(address_book),
+    }
+    note_views = {
+        NoteCommands.SHOW_ALL_NOTES: lambda args: view_show_notes(notes_book),
+        NoteCommands.FIND_NOTES_BY_TAG: lambda args: view_find_notes_by_tag(args, notes_book),
+        NoteCommands.QUERY_TAGS: lambda args: view_query_tags(args, notes_book),
+        NoteCommands.SEARCH_NOTES_AS_YOU_TYPE: lambda args: view_prefix_search_notes(notes_book),
+    }
+    return address_views, note_views
+
+def run_batch(script, address_handlers, note_handlers, storages):
+    """Run the commands of a script and save every changed book once at the end.
+
+    Args:
+        script (str): Path to the script, or "-" to read it from stdin.
+        address_handlers (dict): Handlers of the address book commands.
+        note_handlers (dict): Handlers of the note commands.
+        storages (tuple): Storages of the books.
+
+    Returns:
+        int: Exit status, 1 if any command failed.
+    """
+    runner = BatchRunner()
+    with ExitStack() as stack:
+        lines = sys.stdin if script == "-" else stack.enter_context(open(script, encoding="utf-8"))
+        for storage in storages:
+            stack.enter_context(storage.batch())
+        failed = runner.run({**address_handlers, **note_handlers}, lines)
+    return 1 if failed else 0
+
+def serve(args, handlers, address_book, notes_book, lock):
+    """Serve the books as a JSON API until the process is interrupted.
+
+    Args:
+        args (argparse.Namespace): Arguments of the serve command.
+        handlers (dict): Command handlers that take the lock themselves.
+        address_book (AddressBook): The address book.
+        notes_book (NotesBook): The notes book.
+        lock (ReadWriteLock): The lock guarding the books.
+
+    Returns:
+        int: Exit status.
+    """
+    api = BookApi(handlers, address_book, notes_book, lock)
+    if args.socket:
+        server = UnixApiServer(args.socket, api)
+        where = args.socket
+    else:
+        server = ApiServer((args.host, args.port), api)
+        where = f"http://{args.host}:{server.server_address[1]}"
+    print(f"Serving the address book on {where}. Press Ctrl+C to stop.", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+def main(argv=None):
+    '''
+    Main function to run the address book and notes book.
+    '''
+    args = parse_args(argv)
+    address_storage, notes_storage = open_storages(args.storage)
+    address_book = address_storage.load()
+    notes_book = notes_storage.load()
+    checker = None
+    if args.check_email:
+        checker = DeliverabilityChecker(make_dns_resolver(args.dns_server, args.dns_timeout))
+        checker.watch(address_book)
+
+    address_handlers, note_handlers = build_handlers(address_book, notes_book, address_storage)
+    if args.batch is not None:
+        try:
+            return run_batch(args.batch, address_handlers, note_handlers, (address_storage, notes_storage))
+        finally:
+            if checker is not None:
+                checker.close()
+            address_storage.close()
+            notes_storage.close()
+
+    writer = BackgroundWriter()
+    # Commands, checkpoints and the books themselves share one lock
+    address_book.make_thread_safe(writer.lock)
+    notes_book.make_thread_safe(writer.lock)
+    handlers = {
+        **wrap_handlers(address_handlers, address_storage, writer),
+        **wrap_handlers(note_handlers, notes_storage, writer),
+    }
+
+    try:
+        if args.command == "serve":
+            return serve(args, handlers, address_book, notes_book, writer.lock)
+
+        address_views, note_views = build_views(address_book, notes_book)
+        views = {
+            **wrap_handlers(address_views, address_storage, writer),
+            **wrap_handlers(note_views, notes_storage, writer),
+        }
 
-    # Final save when exiting the program
-    save_data(address_book, ADDRESS_BOOK_NAME)
-    save_data(notes_book, NOTES_BOOK_NAME)
+        # Create and run the UI; handlers run on worker threads
+        dispatcher = Dispatcher()
+        ui = TerminalUI(dispatcher)
+        try:
+            ui.run(handlers, views)
+        finally:
+            dispatcher.close()
+    finally:
+        if checker is not None:
+            checker.close()
+        # Wait for the pending writes before closing the storages
+        try:
+            writer.close()
+        finally:
+            address_storage.close()
+            notes_storage.close()
@@ -1,22 +1,306 @@
 from collections import UserDict
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 from src.models.record import Record
+from src.models.changes import Change, ChangeNotifier
+from src.models.locking import Lockable, reads, writes
+from src.models.phone_index import PhoneIndex
+from src.models.prefix_index import PrefixIndex, PrefixSearch
+from src.models.search_index import BirthdayIndex, TrigramIndex
+from src.utils.dispatcher import cancellable
 from tabulate import tabulate
+from thefuzz import fuzz, process
 from colorama import init, Fore, Style
 
+FUZZY_LIMIT = 10  # Number of best matching contacts returned by fuzzy_find
+FUZZY_CANDIDATES = 200  # Names sharing the most trigrams with the query that are ranked
+FUZZY_CUTOFF = 60  # Minimum similarity, from 0 to 100, of a fuzzy match
+
 
 # Initialize colorama with proper settings
 init(convert=True, strip=False)
 
-class AddressBook(UserDict[str, Record]):
+class AddressBook(Lockable, ChangeNotifier, UserDict[str, Record]):
     """A class for managing a collection of contact records.
     
     This class extends UserDict to provide a dictionary-like interface for storing
     and managing contact records. It includes functionality for adding, finding,
     deleting contacts, and managing their information.
+
+    Every mutation of the book or of one of its records is reported to the
+    subscribed listeners as a Change.
+
+    Search indexes are built on first use and then kept up to date from the
+    same stream of changes. They are never pickled.
+
+    After ``make_thread_safe`` the book can be searched from many threads
+    while another one edits it.
     """
 
+    _search_index: Optional[TrigramIndex] = None
+    _birthday_index: Optional[BirthdayIndex] = None
+    _prefix_index: Optional[PrefixIndex] = None
+    _phone_index: Optional[PhoneIndex] = None
+    _name_index: Optional[TrigramIndex] = None
+    _runtime_attributes = ChangeNotifier._runtime_attributes + Lockable._runtime_attributes + ("_search_index", "_birthday_index", "_prefix_index", "_phone_index", "_name_index")
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the state of the book and re-attach its records.
+        
+        Args:
+            state (dict): The dictionary containing the object's state.
+        """
+        self.__dict__.update(state)
+        for record in self.data.values():
+            record._listener = self._on_record_change
+
+    def _on_record_change(self, record: Record, op: str, args: tuple) -> None:
+        """Forward a mutation of one of the records to the listeners.
+        
+        Args:
+            record (Record): The record that has changed.
+            op (str): Name of the Record method that changed it.
+            args (tuple): Arguments the method was called with.
+        """
+        self._emit(Change(self.normalize_name(record.name.value), op, args, on_record=True))
+
+    def _emit(self, change: Change) -> None:
+        """Update the built indexes and report a change to the listeners.
+        
+        Args:
+            change (Change): The mutation that has just been applied.
+        """
+        self._update_indexes(change.key)
+        super()._emit(change)
+
+    def _built_indexes(self) -> list:
+        """Get the indexes that have already been built.
+        
+        Returns:
+            list: Indexes with ``add(key, record)`` and ``discard(key)`` methods.
+        """
+        indexes = (self._search_index, self._birthday_index, self._prefix_index, self._phone_index, self._name_index)
+        return [index for index in indexes if index is not None]
+
+    def _update_indexes(self, key: str) -> None:
+        """Re-index the record stored under a key after it has changed.
+        
+        Args:
+            key (str): The normalized name of the changed record.
+        """
+        indexes = self._built_indexes()
+        if not indexes:
+            return
+        record = self.data.get(key)
+        for index in indexes:
+            if record is None:
+                index.discard(key)
+            else:
+                index.add(key, record)
+
+    @staticmethod
+    def _search_fields(record: Record) -> List[str]:
+        """Get the lowercase texts of a record that find_contacts searches.
+        
+        Args:
+            record (Record): The record to describe.
+            
+        Returns:
+            List[str]: Name, phone numbers, email and formatted birthday.
+        """
+        fields = [record.name.value.lower()]
+        fields.extend(phone.value for phone in record.phones)
+        if record.email:
+            fields.append(record.email.value.lower())
+        if record.birthday:
+            fields.append(record.birthday.value.strftime('%d.%m.%Y'))
+        return fields
+
+    def _get_search_index(self) -> TrigramIndex:
+        """Get the trigram index of the book, building it on first use.
+        
+        Returns:
+            TrigramIndex: The up-to-date index.
+        """
+        index = self._search_index
+        if index is None or index.needs_rebuild:
+            # Built aside and published whole, so concurrent readers never see it half-built
+            index = TrigramIndex(self._search_fields)
+            index.rebuild(self.data.items())
+            self._search_index = index
+        return index
+
+    @staticmethod
+    def _fuzzy_text(name: str) -> str:
+        """Get the text of a name that fuzzy searches compare trigrams of.
+        
+        Args:
+            name (str): The name or the query.
+            
+        Returns:
+            str: The lowercase words, padded with spaces so the first and
+                last letters of every word are part of a trigram.
+        """
+        return f" {' '.join(name.lower().split())} "
+
+    def _get_name_index(self) -> TrigramIndex:
+        """Get the trigram index of the names alone, building it on first use.
+        
+        Returns:
+            TrigramIndex: The up-to-date index.
+        """
+        index = self._name_index
+        if index is None or index.needs_rebuild:
+            # Built aside and published whole, so concurrent readers never see it half-built
+            index = TrigramIndex(lambda record: [self._fuzzy_text(record.name.value)])
+            index.rebuild(self.data.items())
+            self._name_index = index
+        return index
+
+    def _fuzzy_candidates(self, query: str) -> Dict[str, Record]:
+        """Get the records whose names share the most trigrams with a query.
+        
+        The in-memory book takes them from its name index. Storage engines
+        that can search the names themselves override this.
+        
+        Args:
+            query (str): The name, possibly misspelled.
+            
+        Returns:
+            Dict[str, Record]: At most FUZZY_CANDIDATES records by key.
+        """
+        keys = self._get_name_index().similar(self._fuzzy_text(query), FUZZY_CANDIDATES)
+        return {key: self.data[key] for key in keys}
+
+    @reads
+    def fuzzy_find(self, query: str, limit: int = FUZZY_LIMIT) -> List[Tuple[Record, int]]:
+        """Find the contacts whose names are most similar to a query, allowing typos.
+        
+        Only the names sharing the most trigrams with the query are ranked
+        by similarity, so the cost does not grow with the number of contacts.
+        
+        Args:
+            query (str): The name, possibly misspelled or with words in
+                another order.
+            limit (int): Maximum number of contacts to return.
+            
+        Returns:
+            List[Tuple[Record, int]]: Matching contacts with their similarity
+                from 0 to 100, most similar first.
+        """
+        candidates = self._fuzzy_candidates(query)
+        names = {key: record.name.value for key, record in candidates.items()}
+        matches = process.extractBests(query, names, scorer=fuzz.WRatio, score_cutoff=FUZZY_CUTOFF, limit=limit)
+        return [(candidates[key], score) for _, score, key in matches]
+
+    def _get_prefix_index(self) -> PrefixIndex:
+        """Get the index of the words of the names, building it on first use.
+        
+        Returns:
+            PrefixIndex: The up-to-date index.
+        """
+        index = self._prefix_index
+        if index is None or index.needs_rebuild:
+            # Built aside and published whole, so concurrent readers never see it half-built
+            index = PrefixIndex(lambda record: [record.name.value])
+            index.rebuild(self.data.items())
+            self._prefix_index = index
+        return index
+
+    @reads
+    def prefix_search(self) -> PrefixSearch:
+        """Start a search of the names that narrows its results as the query is typed.
+        
+        Returns:
+            PrefixSearch: Search matching contacts that have a name word
+                starting with every word of the query.
+        """
+        return PrefixSearch(self._get_prefix_index(), self.data.__getitem__)
+
+    def _get_phone_index(self) -> PhoneIndex:
+        """Get the index of the phone numbers, building it on first use.
+        
+        Returns:
+            PhoneIndex: The up-to-date index.
+        """
+        index = self._phone_index
+        if index is None:
+            # Built aside and published whole, so concurrent readers never see it half-built
+            index = PhoneIndex(lambda record: [phone.value for phone in record.phones])
+            index.rebuild(self.data.items())
+            self._phone_index = index
+        return index
+
+    @reads
+    def find_by_phone(self, phone: str) -> List[Record]:
+        """Find the contacts that have a phone number.
+        
+        Args:
+            phone (str): The phone number.
+            
+        Returns:
+            List[Record]: The contacts with the number, by name.
+        """
+        return [self.data[key] for key in self._get_phone_index().owners(phone.strip())]
+
+    @reads
+    def find_phones(self, prefix: str) -> List[Tuple[str, List[Record]]]:
+        """Find the phone numbers that start with a prefix, such as an area code.
+        
+        Args:
+            prefix (str): The first digits of the numbers.
+            
+        Returns:
+            List[Tuple[str, List[Record]]]: The numbers in order, each with
+                the contacts that have it.
+        """
+        return [(phone, [self.data[key] for key in keys])
+                for phone, keys in self._get_phone_index().with_prefix(prefix.strip())]
+
+    @reads
+    def shared_phones(self) -> List[Tuple[str, List[Record]]]:
+        """Find the phone numbers that several contacts have.
+        
+        Returns:
+            List[Tuple[str, List[Record]]]: The numbers in order, each with
+                the contacts that have it.
+        """
+        return [(phone, [self.data[key] for key in keys]) for phone, keys in self._get_phone_index().shared()]
+
+    @staticmethod
+    def _birthday_of(record: Record) -> Optional[date]:
+        """Get the birthday of a record for the birthday index.
+        
+        Args:
+            record (Record): The record to describe.
+            
+        Returns:
+            Optional[date]: The date of birth, or None if it is not set.
+        """
+        return record.birthday.value if record.birthday else None
+
+    def _get_birthday_index(self, today: date, future_date: date) -> BirthdayIndex:
+        """Get an index holding at least the records with a birthday between two dates.
+        
+        The in-memory book keeps one index of all its records, built on first
+        use. Storage engines that can select the records by birthday themselves
+        override this to index only those records.
+        
+        Args:
+            today (date): First day of the interval.
+            future_date (date): Last day of the interval.
+            
+        Returns:
+            BirthdayIndex: The up-to-date index.
+        """
+        index = self._birthday_index
+        if index is None:
+            # Built aside and published whole, so concurrent readers never see it half-built
+            index = BirthdayIndex(self._birthday_of)
+            index.rebuild(self.data.items())
+            self._birthday_index = index
+        return index
+
     def normalize_name(self, name: str) -> str:
         """Normalize names to title case and strip leading/trailing spaces.
         
@@ -28,6 +312,7 @@ class AddressBook(UserDict[str, Record]):
         """
         return " ".join(part.capitalize() for part in name.strip().split())
 
+    @writes
     def add_record(self, record: Record) -> None:
         """Add a new contact record to the address book.
         
@@ -35,8 +320,13 @@ class AddressBook(UserDict[str, Record]):
             record (Record): The contact record to add.
         """
         normalized_name = self.normalize_name(record.name.value)
+        if normalized_name == record.name.value:
+            normalized_name = record.name.value  # Share one string for the key and the name
         self.data[normalized_name] = record
+        record._listener = self._on_record_change
+        self._emit(Change(normalized_name, "add_record", (record,)))
 
+    @reads
     def find(self, name: str) -> Optional[Record]:
         """Find a contact record by name.
         
@@ -49,6 +339,7 @@ class AddressBook(UserDict[str, Record]):
         normalized_name = self.normalize_name(name)
         return self.data.get(normalized_name)
 
+    @writes
     def delete(self, name: str) -> None:
         """Delete a contact record from the address book.
         
@@ -60,13 +351,20 @@ class AddressBook(UserDict[str, Record]):
         """
         normalized_name = self.normalize_name(name)
         if normalized_name in self.data:
-            del self.data[normalized_name]
+            self.data.pop(normalized_name)._listener = None
+            self._emit(Change(normalized_name, "delete", (normalized_name,)))
         else:
             raise KeyError(f"Contact '{name}' not found.")
 
+    @reads
     def get_upcoming_birthdays(self, date_interval: str) -> List[Dict[str, str]]:
         """Get a list of upcoming birthdays within the specified date interval.
         
+        Birthdays are looked up in the birthday index by day of the year and
+        returned in date order. Birthdays on 29 February are celebrated on
+        28 February in common years, and birthdays on a weekend are
+        congratulated on the following Monday.
+        
         Args:
             date_interval (str): Number of days to look ahead for birthdays.
             
@@ -81,35 +379,24 @@ class AddressBook(UserDict[str, Record]):
         except ValueError:
             raise ValueError("Date interval must be an integer.")
         today = datetime.now().date()
-        upcoming_birthdays = {}
         future_date = today + timedelta(days=date_interval)
-        for record in self.data.values():
-            if not record.birthday:
-                continue
-            birthday = record.birthday.value
-            congratulation_date = birthday.replace(year=today.year)
-            if congratulation_date < today:
-                congratulation_date = congratulation_date.replace(year=today.year + 1)
-            while congratulation_date <= future_date:
-                day_of_week = congratulation_date.weekday()
-                if day_of_week == 5:
-                    congratulation_date += timedelta(days=2)
-                elif day_of_week == 6:
-                    congratulation_date += timedelta(days=1)
-                birthday = datetime(congratulation_date.year, birthday.month, birthday.day,).date()
-                year = congratulation_date.year
-                if year not in upcoming_birthdays:
-                    upcoming_birthdays[year] = []
-                upcoming_birthdays[year].append({
-                    "name": record.name.value,
-                    "birthday": birthday.strftime("%d.%m.%Y"),
-                    "congratulation_date": congratulation_date.strftime("%A, %B %d")
-                })
-                congratulation_date = datetime(congratulation_date.year + 1 , birthday.month, birthday.day,).date()
-        sorted_years = sorted(upcoming_birthdays.keys())
-        final_result = [entry for year in sorted_years for entry in upcoming_birthdays[year]]
-        return final_result
+        index = self._get_birthday_index(today, future_date)
+        upcoming_birthdays = []
+        for birthday, key in cancellable(index.between(today, future_date)):
+            congratulation_date = birthday
+            day_of_week = congratulation_date.weekday()
+            if day_of_week == 5:
+                congratulation_date += timedelta(days=2)
+            elif day_of_week == 6:
+                congratulation_date += timedelta(days=1)
+            upcoming_birthdays.append({
+                "name": self.data[key].name.value,
+                "birthday": birthday.strftime("%d.%m.%Y"),
+                "congratulation_date": congratulation_date.strftime("%A, %B %d")
+            })
+        return upcoming_birthdays
 
+    @writes
     def add_contact(self, name: str, phone: Optional[str] = None) -> str:
         """Add a new contact or update an existing one.
         
@@ -132,6 +419,7 @@ class AddressBook(UserDict[str, Record]):
             record.add_phone(phone)
         return message
 
+    @writes
     def change_contact(self, name: str, old_phone: str, new_phone: str) -> str:
         """Change a contact's phone number.
         
@@ -153,6 +441,7 @@ class AddressBook(UserDict[str, Record]):
         record.edit_phone(old_phone, new_phone)
         return f"{Fore.GREEN}Phone number updated.{Style.RESET_ALL}"
 
+    @writes
     def add_email_to_contact(self, name: str, email: str) -> str:
         """Add or update a contact's email address.
         
@@ -173,6 +462,7 @@ class AddressBook(UserDict[str, Record]):
         record.add_email(email)
         return f"{Fore.GREEN}Contact updated with email address.{Style.RESET_ALL}"
 
+    @reads
     def show_phone(self, name: str) -> str:
         """Display a contact's phone numbers.
         
@@ -191,6 +481,7 @@ class AddressBook(UserDict[str, Record]):
             raise KeyError("Contact not found.")
         return f"{Fore.CYAN}{'; '.join(phone.value for phone in record.phones)}{Style.RESET_ALL}"
 
+    @reads
     def show_email(self, name: str) -> str:
         """Display a contact's email address.
         
@@ -198,7 +489,8 @@ class AddressBook(UserDict[str, Record]):
             name (str): The name of the contact.
             
         Returns:
-            str: The contact's email address or a message if none is set.
+            str: The contact's email address or a message if none is set,
+                with a warning if its domain was found not to accept mail.
             
         Raises:
             KeyError: If the contact is not found.
@@ -207,8 +499,11 @@ class AddressBook(UserDict[str, Record]):
         record = self.find(normalized_name)
         if record is None:
             raise KeyError("Contact not found.")
+        if record.email and record.email.deliverable is False:
+            return f"{Fore.MAGENTA}{record.email}{Style.RESET_ALL} {Fore.RED}(domain does not accept mail){Style.RESET_ALL}"
         return f"{Fore.MAGENTA}{str(record.email) if record.email else 'No email set'}{Style.RESET_ALL}"
 
+    @reads
     def show_all(self) -> str:
         """Display all contacts in a formatted table.
         
@@ -220,7 +515,7 @@ class AddressBook(UserDict[str, Record]):
         
         # Create table data with colors
         table_data = []
-        for i, record in enumerate(self.data.values(), 1):
+        for i, record in enumerate(cancellable(self.data.values()), 1):
             row = [
                 f"{Fore.WHITE}{i}{Style.RESET_ALL}",
                 f"{Fore.CYAN}{record.name.value}{Style.RESET_ALL}",
@@ -244,9 +539,13 @@ class AddressBook(UserDict[str, Record]):
         # Generate table with simple format
         return tabulate(table_data, headers=headers, tablefmt="simple")
     
+    @reads
     def find_contacts(self, query: str) -> List[Record]:
         """Search for contacts matching the given query.
         
+        Candidates come from the trigram index and are then checked against
+        the query, so each matching contact is returned once.
+        
         Args:
             query (str): The search query to match against contact information.
             
@@ -254,23 +553,27 @@ class AddressBook(UserDict[str, Record]):
             List[Record]: List of matching contact records.
         """
         query = query.strip().lower()
-        results = []
-
-        for record in self.data.values():
-            if query in record.name.value.lower():
-                results.append(record)
-                continue
-
-            for phone in record.phones:
-                if query in phone.value:
-                    results.append(record)
-                    break  
-            
-            if record.email and query in record.email.value.lower(): 
-                results.append(record)
-
-            if record.birthday and query in record.birthday.value.strftime('%d.%m.%Y'):
-                results.append(record)
+        keys = self._get_search_index().candidates(query)
+        if keys is None:
+            keys = self.data.keys()
 
-        return results
+        return [record for record in map(self.data.__getitem__, cancellable(keys)) if self._matches(record, query)]
 
+    @staticmethod
+    def _matches(record: Record, query: str) -> bool:
+        """Check whether any searchable text of a record contains the query.
+        
+        Args:
+            record (Record): The record to check.
+            query (str): Lowercase text to search for.
+            
+        Returns:
+            bool: True if the name, a phone, the email or the birthday contains the query.
+        """
+        if query in record.name.value.lower():
+            return True
+        if any(query in phone.value for phone in record.phones):
+            return True
+        if record.email and query in record.email.value.lower():
+            return True
+        return bool(record.birthday) and query in record.birthday.value.strftime('%d.%m.%Y')
@@ -0,0 +1,71 @@
+from typing import Callable, NamedTuple, Tuple
+
+
+class Change(NamedTuple):
+    """A single mutation applied to a book.
+
+    Attributes:
+        key (str): Key of the affected entry (normalized contact name or note title).
+        op (str): Name of the method that performed the mutation.
+        args (tuple): Positional arguments the method was called with.
+        on_record (bool): True if ``op`` is a method of the entry itself,
+            False if it is a method of the book.
+    """
+    key: str
+    op: str
+    args: tuple
+    on_record: bool = False
+
+
+ChangeListener = Callable[[Change], None]
+
+
+class ChangeNotifier:
+    """Mixin that lets a book report its mutations to subscribed listeners.
+
+    The book also counts its mutations in ``version``, so callers can tell
+    whether anything changed without comparing contents. Listeners and the
+    counter are runtime-only and are never pickled together with the book.
+    """
+
+    _listeners: Tuple[ChangeListener, ...] = ()
+    version: int = 0
+    # Attributes rebuilt at runtime that are never pickled
+    _runtime_attributes: Tuple[str, ...] = ("_listeners", "version")
+
+    def subscribe(self, listener: ChangeListener) -> None:
+        """Register a listener that is called with every Change.
+
+        Args:
+            listener (ChangeListener): The callable to register.
+        """
+        self._listeners = (*self._listeners, listener)
+
+    def unsubscribe(self, listener: ChangeListener) -> None:
+        """Remove a previously registered listener.
+
+        Args:
+            listener (ChangeListener): The callable to remove.
+        """
+        self._listeners = tuple(l for l in self._listeners if l != listener)
+
+    def _emit(self, change: Change) -> None:
+        """Count a change and pass it to every subscribed listener.
+
+        Args:
+            change (Change): The mutation that has just been applied.
+        """
+        self.version += 1
+        for listener in self._listeners:
+            listener(change)
+
+    def __getstate__(self) -> dict:
+        """Get the picklable state of the book without runtime listeners.
+
+        Returns:
+            dict: The object's state.
+        """
+        state = self.__dict__.copy()
+        for name in self._runtime_attributes:
+            state.pop(name, None)
+        return state
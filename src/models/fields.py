@@ -1,5 +1,6 @@
 from datetime import datetime, date
-from typing import Any
+from functools import lru_cache
+from typing import Any, Optional
 from email_validator import validate_email, EmailNotValidError
 
 import re
@@ -14,8 +15,12 @@ class Field:
     """Base class for all field types in the address book.
     
     This class provides basic functionality for storing and string representation of field values.
+    Fields use __slots__ instead of a per-instance __dict__ to keep contacts
+    small, so every subclass declares the slots that hold its value.
     """
 
+    __slots__ = ()
+
     def __init__(self, value: Any) -> None:
         """Initialize a new field with a value.
         
@@ -24,6 +29,41 @@ class Field:
         """
         self.value = value
 
+    @classmethod
+    def restore(cls, value: Any) -> "Field":
+        """Create a field from a value that has already been validated.
+        
+        Used when loading fields from storage, where running the validation
+        again would only slow loading down.
+        
+        Args:
+            value (Any): The stored value of the field.
+            
+        Returns:
+            Field: A field instance of the class holding the value.
+        """
+        field = cls.__new__(cls)
+        field.__setstate__({"value": value})
+        return field
+
+    def __getstate__(self) -> dict:
+        """Get the picklable state of the field.
+        
+        Returns:
+            dict: The field value under the "value" key.
+        """
+        return {"value": self.value}
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the field from a pickled state.
+        
+        Pickles written before fields had __slots__ hold the same dictionary.
+        
+        Args:
+            state (dict): The dictionary containing the field's state.
+        """
+        self.value = state["value"]
+
     def __str__(self) -> str:
         """Get string representation of the field value.
         
@@ -39,6 +79,8 @@ class Name(Field):
     Names can only contain letters, spaces, hyphens, and apostrophes.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: str) -> None:
         """Initialize a new name field.
         
@@ -69,9 +111,12 @@ class Name(Field):
 class Phone(Field):
     """Field class for storing and validating phone numbers.
     
-    Phone numbers must be exactly 10 digits.
+    Phone numbers must be exactly 10 digits. They are stored as an integer
+    and turned back into a zero-padded string when read.
     """
 
+    __slots__ = ("_number",)
+
     def __init__(self, value: str) -> None:
         """Initialize a new phone field.
         
@@ -81,8 +126,17 @@ class Phone(Field):
         Raises:
             ValidationException: If the phone number is not 10 digits.
         """
-        super().__init__(value)
         self.validate_phone(value)
+        super().__init__(value)
+
+    @property
+    def value(self) -> str:
+        """str: The 10-digit phone number."""
+        return str(self._number).zfill(10)
+
+    @value.setter
+    def value(self, value: str) -> None:
+        self._number = int(value)
 
     def validate_phone(self, value: str) -> None:
         """Validate the phone number format.
@@ -93,16 +147,20 @@ class Phone(Field):
         Raises:
             ValidationException: If the phone number is not 10 digits.
         """
-        if not value.isdigit() or len(value) != 10:
+        # isdigit alone also accepts superscripts and digits of other scripts
+        if not (value.isascii() and value.isdigit()) or len(value) != 10:
             raise ValidationException("Phone number must be 10 digits")
 
 
 class Birthday(Field):
     """Field class for storing and validating birthdays.
     
-    Birthdays must be in DD.MM.YYYY format.
+    Birthdays must be in DD.MM.YYYY format. They are stored as the ordinal
+    of the date.
     """
 
+    __slots__ = ("_ordinal",)
+
     def __init__(self, value: str) -> None:
         """Initialize a new birthday field.
         
@@ -113,16 +171,27 @@ class Birthday(Field):
             ValidationException: If the date format is invalid.
         """
         try:
-            self.value: date = datetime.strptime(value, "%d.%m.%Y").date()
+            self.value = datetime.strptime(value, "%d.%m.%Y").date()
         except ValueError:
             raise ValidationException("Invalid date format. Use DD.MM.YYYY")
 
+    @property
+    def value(self) -> date:
+        """date: The date of birth."""
+        return date.fromordinal(self._ordinal)
+
+    @value.setter
+    def value(self, value: date) -> None:
+        self._ordinal = value.toordinal()
+
 class Address(Field):
     """Field class for storing contact addresses.
     
     Addresses are stored as a list of components.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: str) -> None:
         """Initialize a new address field.
         
@@ -131,12 +200,38 @@ class Address(Field):
         """
         super().__init__(value)    
     
+EMAIL_CACHE_SIZE = 4096  # Number of recently validated addresses remembered
+
+
+@lru_cache(maxsize=EMAIL_CACHE_SIZE)
+def normalize_email(email: str) -> Optional[str]:
+    """Check the syntax of an email address without using the network.
+
+    Results are cached, so adding the same address again, as bulk imports
+    often do, costs a dictionary lookup.
+
+    Args:
+        email (str): The email address to check.
+
+    Returns:
+        Optional[str]: The normalized address, or None if it is not valid.
+    """
+    try:
+        return validate_email(email, check_deliverability=False).normalized
+    except EmailNotValidError:
+        return None
+
+
 class Email(Field):
     """Field class for storing and validating email addresses.
     
-    Uses email-validator package to ensure valid email format.
+    Uses email-validator package to ensure valid email format. Only the
+    syntax is checked here; whether the domain accepts mail is checked later
+    in the background and stored in ``deliverable``.
     """
 
+    __slots__ = ("value", "deliverable")
+
     def __init__(self, email: str) -> None:
         """Initialize a new email field.
         
@@ -146,8 +241,19 @@ class Email(Field):
         Raises:
             ValidationException: If the email format is invalid.
         """
-        try:
-            valid_email = validate_email(email)
-            super().__init__(valid_email.normalized)
-        except EmailNotValidError:
+        normalized = normalize_email(email)
+        if normalized is None:
             raise ValidationException("Please enter a valid email address")
+        super().__init__(normalized)
+        self.deliverable: Optional[bool] = None
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the email from a pickled state.
+        
+        Deliverability is not stored, since it can change over time.
+        
+        Args:
+            state (dict): The dictionary containing the field's state.
+        """
+        super().__setstate__(state)
+        self.deliverable = None
@@ -0,0 +1,80 @@
+from contextlib import nullcontext
+from functools import wraps
+from typing import Callable, ContextManager, Optional, TypeVar
+
+from src.utils.rwlock import ReadWriteLock
+
+F = TypeVar("F", bound=Callable)
+
+
+class NoLock:
+    """Stand-in for a ReadWriteLock that does nothing, used by single-threaded books."""
+
+    def read(self) -> ContextManager[None]:
+        return nullcontext()
+
+    def write(self) -> ContextManager[None]:
+        return nullcontext()
+
+
+NO_LOCK = NoLock()
+
+
+def reads(method: F) -> F:
+    """Run a method of a book while holding the book's lock for reading."""
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        lock = self.lock
+        if lock is NO_LOCK:
+            return method(self, *args, **kwargs)
+        lock.acquire_read()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            lock.release_read()
+    return locked
+
+
+def writes(method: F) -> F:
+    """Run a method of a book while holding the book's lock for writing."""
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        lock = self.lock
+        if lock is NO_LOCK:
+            return method(self, *args, **kwargs)
+        lock.acquire_write()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            lock.release_write()
+    return locked
+
+
+class Lockable:
+    """Mixin that lets a book be shared between threads.
+
+    Books are single-threaded by default and skip the lock entirely. Once
+    ``make_thread_safe`` has been called, methods marked with ``reads`` share
+    the book's reader-writer lock, so any number of searches run together,
+    and methods marked with ``writes`` hold it alone, so no search sees a
+    half-applied change or a dictionary resized under its loop.
+
+    Code that changes a record directly, or iterates over ``data``, must
+    hold ``lock`` itself. The lock is runtime-only and never pickled.
+    """
+
+    lock = NO_LOCK
+    _runtime_attributes = ("lock",)
+
+    def make_thread_safe(self, lock: Optional[ReadWriteLock] = None) -> ReadWriteLock:
+        """Guard the book with a reader-writer lock.
+
+        Args:
+            lock (Optional[ReadWriteLock]): Lock to share with other books or
+                with the callers of the book, a new one if None.
+
+        Returns:
+            ReadWriteLock: The lock guarding the book.
+        """
+        self.lock = lock if lock is not None else ReadWriteLock()
+        return self.lock
@@ -0,0 +1,319 @@
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from datetime import date
+from itertools import chain, islice
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple
+
+from src.models.address_book import AddressBook
+from src.models.fields import Name, Phone, Email, Birthday, Address
+from src.models.locking import writes
+from src.models.record import Record
+from src.models.search_index import BirthdayIndex
+from src.utils.columnar import ColumnarSnapshot, ContactRow, save_columnar
+
+CACHE_SIZE = 1024  # Number of recently used unchanged records kept as Python objects
+
+
+def contact_row(record: Record) -> ContactRow:
+    """Get the stored fields of a record.
+
+    Args:
+        record (Record): The record.
+
+    Returns:
+        ContactRow: Its fields in the types of the columnar snapshot.
+    """
+    return ContactRow(
+        record.name.value,
+        [phone._number for phone in record.phones],
+        record.email.value if record.email else None,
+        record.birthday._ordinal if record.birthday else 0,
+        record.address.value if record.address else None,
+    )
+
+
+class MappedRecords(MutableMapping):
+    """Dictionary-like view of contacts in a memory-mapped columnar snapshot.
+
+    Records are built from the snapshot only when they are accessed, and the
+    most recently used ones are cached. Records added or changed since the
+    snapshot was written are kept in memory until the next snapshot; deleted
+    ones are remembered by key. Iteration follows insertion order, like a
+    dict: the rows of the snapshot first, then the contacts added since.
+    """
+
+    def __init__(self, snapshot: Optional[ColumnarSnapshot], listener: Callable) -> None:
+        """Initialize the view.
+
+        Args:
+            snapshot (Optional[ColumnarSnapshot]): The mapped snapshot, None
+                for a book that has none yet.
+            listener (Callable): Callback attached to every loaded record.
+        """
+        self.snapshot = snapshot
+        self.listener = listener
+        self._changed: Dict[str, Record] = {}
+        self._appended: Dict[str, None] = {}  # Keys not in the snapshot, in insertion order
+        self._deleted: Set[str] = set()  # Keys of snapshot rows that were deleted
+        self._cache: "OrderedDict[str, Record]" = OrderedDict()
+        # Readers on several threads share the cache
+        self._cache_lock = threading.Lock()
+
+    def _row(self, key: str) -> Optional[int]:
+        """Get the snapshot row of a key that has not been deleted."""
+        if self.snapshot is None or key in self._deleted:
+            return None
+        return self.snapshot.find(key)
+
+    def _record(self, row: int, key: str) -> Record:
+        """Get the record of a snapshot row, building it on first access.
+
+        Args:
+            row (int): The row.
+            key (str): The key of the row.
+
+        Returns:
+            Record: The changed, cached or newly built record.
+        """
+        record = self._changed.get(key)
+        if record is not None:
+            return record
+        with self._cache_lock:
+            record = self._cache.get(key)
+            if record is not None:
+                self._cache.move_to_end(key)
+                return record
+        name, phones, email, birthday, address = self.snapshot.row(row)
+        record = Record.__new__(Record)
+        record.__setstate__({
+            "name": Name.restore(name),
+            "phones": [Phone.restore(phone) for phone in phones],
+            "email": Email.restore(email) if email else None,
+            "birthday": Birthday.restore(date.fromordinal(birthday)) if birthday else None,
+            "address": Address.restore(address) if address else None,
+        })
+        record._listener = self.listener
+        with self._cache_lock:
+            # Another thread may have built the same record meanwhile
+            record = self._cache.setdefault(key, record)
+            self._cache.move_to_end(key)
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return record
+
+    def pin(self, key: str, record: Record) -> None:
+        """Keep a record that has been changed in place until the next snapshot.
+
+        Args:
+            key (str): The key of the record.
+            record (Record): The changed record.
+        """
+        self._changed[key] = record
+        with self._cache_lock:
+            self._cache.pop(key, None)
+
+    def birthday_candidates(self, start: int, end: int) -> Iterator[Tuple[str, Record]]:
+        """Stream the contacts that may have a birthday between two days of the year.
+
+        Snapshot rows are selected from the birthday column without building
+        the others; contacts changed since the snapshot are always included.
+
+        Args:
+            start (int): First day as month * 100 + day.
+            end (int): Last day as month * 100 + day, smaller for an
+                interval that wraps around the end of the year.
+
+        Returns:
+            Iterator[Tuple[str, Record]]: Keys and records to check.
+        """
+        if self.snapshot is not None:
+            for row in self.snapshot.birthday_rows(start, end):
+                key = self.snapshot.key(row)
+                if key not in self._deleted and key not in self._changed:
+                    yield key, self._record(row, key)
+        yield from self._changed.items()
+
+    def window(self, start: int, stop: int) -> Iterator[Record]:
+        """Stream the records of a range of positions, in insertion order.
+
+        Without deletions, positions map straight to snapshot rows, so a
+        window far down the table is read without walking the rows before it.
+
+        Args:
+            start (int): Position of the first record.
+            stop (int): Position after the last record.
+
+        Returns:
+            Iterator[Record]: The records of the range.
+        """
+        if self._deleted:
+            return islice(self.values(), start, stop)
+        count = len(self.snapshot) if self.snapshot is not None else 0
+        rows = range(min(start, count), min(stop, count))
+        appended = islice(self._appended, max(0, start - count), max(0, stop - count))
+        return chain((self._record(row, self.snapshot.key(row)) for row in rows),
+                     (self._changed[key] for key in appended))
+
+    def rows(self) -> Iterator[Tuple[str, ContactRow]]:
+        """Stream the keys and stored fields of every contact, in insertion order.
+
+        Unchanged contacts are copied from the snapshot without building records.
+
+        Returns:
+            Iterator[Tuple[str, ContactRow]]: The contents of the next snapshot.
+        """
+        if self.snapshot is not None:
+            for row in range(len(self.snapshot)):
+                key = self.snapshot.key(row)
+                if key in self._deleted:
+                    continue
+                record = self._changed.get(key)
+                yield key, contact_row(record) if record is not None else self.snapshot.row(row)
+        for key in self._appended:
+            yield key, contact_row(self._changed[key])
+
+    def reset(self, snapshot: Optional[ColumnarSnapshot]) -> None:
+        """Switch to a new snapshot that holds every change made so far.
+
+        Args:
+            snapshot (Optional[ColumnarSnapshot]): The new snapshot.
+        """
+        self.snapshot = snapshot
+        self._changed.clear()
+        self._appended.clear()
+        self._deleted.clear()
+        with self._cache_lock:
+            self._cache.clear()
+
+    def __getitem__(self, key: str) -> Record:
+        record = self._changed.get(key)
+        if record is not None:
+            return record
+        row = self._row(key)
+        if row is None:
+            raise KeyError(key)
+        return self._record(row, key)
+
+    def __setitem__(self, key: str, record: Record) -> None:
+        if key not in self._changed and self._row(key) is None:
+            self._appended[key] = None
+        self.pin(key, record)
+        record._listener = self.listener
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._appended:
+            del self._appended[key]
+        elif self._row(key) is not None:
+            self._deleted.add(key)
+        else:
+            raise KeyError(key)
+        self._changed.pop(key, None)
+        with self._cache_lock:
+            self._cache.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._changed or self._row(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        if self.snapshot is not None:
+            for key in self.snapshot.keys():
+                if key not in self._deleted:
+                    yield key
+        yield from self._appended
+
+    def __len__(self) -> int:
+        count = len(self.snapshot) if self.snapshot is not None else 0
+        return count - len(self._deleted) + len(self._appended)
+
+    def items(self) -> Iterator[Tuple[str, Record]]:
+        if self.snapshot is not None:
+            for row in range(len(self.snapshot)):
+                key = self.snapshot.key(row)
+                if key not in self._deleted:
+                    yield key, self._record(row, key)
+        for key in self._appended:
+            yield key, self._changed[key]
+
+    def values(self) -> Iterator[Record]:
+        return (record for _, record in self.items())
+
+
+class MappedAddressBook(AddressBook):
+    """Address book read lazily from a memory-mapped columnar snapshot.
+
+    Opening the book maps the snapshot and reads its header, so start-up
+    does not depend on the number of contacts. Records are built when they
+    are accessed; upcoming birthdays are found from the birthday column
+    without building the other contacts. Changes stay in memory, and in the
+    journal of the storage, until ``save_snapshot`` writes a new snapshot.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """Open the snapshot of the book.
+
+        Args:
+            filename (str): Path of the snapshot; the book starts empty if
+                the file does not exist.
+        """
+        super().__init__()
+        snapshot = ColumnarSnapshot(filename) if os.path.exists(filename) else None
+        self.data = MappedRecords(snapshot, self._on_record_change)
+
+    def _on_record_change(self, record: Record, op: str, args: tuple) -> None:
+        """Keep a changed record in memory and report the change.
+
+        Args:
+            record (Record): The record that has changed.
+            op (str): Name of the Record method that changed it.
+            args (tuple): Arguments the method was called with.
+        """
+        self.data.pin(self.normalize_name(record.name.value), record)
+        super()._on_record_change(record, op, args)
+
+    def _get_birthday_index(self, today: date, future_date: date) -> BirthdayIndex:
+        """Index only the records whose birthday column is near the interval.
+
+        Args:
+            today (date): First day of the interval.
+            future_date (date): Last day of the interval.
+
+        Returns:
+            BirthdayIndex: Index of the candidate records.
+        """
+        index = BirthdayIndex(self._birthday_of)
+        if (future_date - today).days >= 365:
+            index.rebuild(self.data.birthday_candidates(101, 1231))
+        else:
+            # One day of slack on each side keeps 29 February birthdays in range
+            start = today.month * 100 + today.day - 1
+            end = future_date.month * 100 + future_date.day + 1
+            index.rebuild(self.data.birthday_candidates(start, end))
+        return index
+
+    @writes
+    def save_snapshot(self, filename: str) -> int:
+        """Write every contact to a new snapshot and switch to it.
+
+        Args:
+            filename (str): Path of the snapshot.
+
+        Returns:
+            int: Number of contacts written.
+        """
+        old = self.data.snapshot
+        try:
+            count = save_columnar(self.data.rows(), filename, before_replace=old.close if old is not None else None)
+        except BaseException:
+            if old is not None and old.closed:
+                # The old file is still in place; map it again and keep the changes in memory
+                self.data.snapshot = ColumnarSnapshot(filename)
+            raise
+        self.data.reset(ColumnarSnapshot(filename))
+        return count
+
+    def close(self) -> None:
+        """Unmap the snapshot."""
+        if self.data.snapshot is not None:
+            self.data.snapshot.close()
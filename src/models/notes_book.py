@@ -1,6 +1,14 @@
 from collections import UserDict
-from typing import List, Any
+from typing import Dict, Iterable, List, Any, Optional
 from colorama import Fore, Style
+from src.models.changes import Change, ChangeNotifier
+from src.models.locking import Lockable, reads, writes
+from src.models.prefix_index import PrefixIndex, PrefixSearch
+from src.models.tag_index import TagIndex
+from src.models.text_index import TextIndex
+from src.utils.dispatcher import cancellable
+
+SEARCH_LIMIT = 20  # Number of best matching notes returned by search_notes
 
 class ValidationException(Exception):
     """Custom exception for field validation errors."""
@@ -107,7 +115,9 @@ class NoteContent(Field):
 class Note:
     """A class representing a note in the notes book.
     
-    Each note has a title, content, and optional tags.
+    Each note has a title, content, and optional tags. The tags are kept as
+    the keys of a dict, which checks, adds and removes a tag in constant time
+    and keeps them in the order they were added.
     """
 
     def __init__(self, title: str, content: str) -> None:
@@ -119,7 +129,16 @@ class Note:
         """
         self.title = NoteTitle(title).value
         self.content = NoteContent(content).value
-        self.tags = [] 
+        self._tags: Dict[str, None] = {}
+
+    @property
+    def tags(self) -> List[str]:
+        """List[str]: The tags of the note, in the order they were added."""
+        return list(self._tags)
+
+    @tags.setter
+    def tags(self, tags: Iterable[str]) -> None:
+        self._tags = dict.fromkeys(tags)
 
     def add_tag(self, new_tag: str) -> None:
         """Add a new tag to the note.
@@ -130,9 +149,9 @@ class Note:
         Raises:
             TagDuplicateError: If the tag already exists.
         """
-        if new_tag in self.tags:
+        if new_tag in self._tags:
             raise TagDuplicateError(f"Tag '{new_tag}' already exists in the note.")
-        self.tags.append(new_tag)
+        self._tags[new_tag] = None
 
     def remove_tag(self, tag_to_remove: str) -> None:
         """Remove a tag from the note.
@@ -143,9 +162,9 @@ class Note:
         Raises:
             TagNotFound: If the tag doesn't exist.
         """
-        if tag_to_remove not in self.tags:
+        if tag_to_remove not in self._tags:
             raise TagNotFound(f"Tag '{tag_to_remove}' not found in the note.")
-        self.tags.remove(tag_to_remove)
+        del self._tags[tag_to_remove]
 
     def is_tag_exists(self, tag: str) -> bool:
         """Check if a tag exists in the note.
@@ -156,7 +175,28 @@ class Note:
         Returns:
             bool: True if the tag exists, False otherwise.
         """
-        return tag in self.tags
+        return tag in self._tags
+
+    def __getstate__(self) -> dict:
+        """Get the picklable state of the note, with the tags as a list.
+        
+        Returns:
+            dict: The title, content and tags of the note.
+        """
+        return {"title": self.title, "content": self.content, "tags": self.tags}
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the note from a pickled state.
+        
+        Pickles written before the tags were kept in a dict hold the same
+        dictionary.
+        
+        Args:
+            state (dict): The dictionary containing the note's state.
+        """
+        self.title = state["title"]
+        self.content = state["content"]
+        self.tags = state["tags"]
 
     def __str__(self) -> str:
         """Get a string representation of the note.
@@ -164,21 +204,77 @@ class Note:
         Returns:
             str: A formatted string containing the note's title, content, and tags.
         """
-        return f"{self.title}: {self.content} | Tags: {', '.join(self.tags) if self.tags else 'No tags'}"
+        return f"{self.title}: {self.content} | Tags: {', '.join(self._tags) if self._tags else 'No tags'}"
 
-class NotesBook(UserDict):
+class NotesBook(Lockable, ChangeNotifier, UserDict):
     """A class for managing a collection of notes.
     
     This class extends UserDict to provide a dictionary-like interface for storing
     and managing notes. It includes functionality for adding, finding, editing,
     and deleting notes, as well as managing their tags.
+
+    Every mutation is reported to the subscribed listeners as a Change.
+
+    The full-text and tag indexes are built on first use and then kept up
+    to date from the same stream of changes. They are never pickled.
+
+    After ``make_thread_safe`` the book can be searched from many threads
+    while another one edits it.
     """
 
+    _text_index: Optional[TextIndex] = None
+    _tag_index: Optional[TagIndex] = None
+    _prefix_index: Optional[PrefixIndex] = None
+    _runtime_attributes = ChangeNotifier._runtime_attributes + Lockable._runtime_attributes + ("_text_index", "_tag_index", "_prefix_index")
+
     def __init__(self) -> None:
         """Initialize a new notes book."""
         super().__init__()
         self.data: dict[str, Note] = {}
 
+    def _emit(self, change: Change) -> None:
+        """Update the built indexes and report a change to the listeners.
+        
+        Args:
+            change (Change): The mutation that has just been applied.
+        """
+        indexes = [index for index in (self._text_index, self._tag_index, self._prefix_index) if index is not None]
+        if indexes:
+            note = self.data.get(change.key)
+            for index in indexes:
+                if note is None:
+                    index.discard(change.key)
+                else:
+                    index.add(change.key, note)
+        super()._emit(change)
+
+    @staticmethod
+    def _text_fields(note: Note) -> List[str]:
+        """Get the texts of a note that search_notes searches.
+        
+        Args:
+            note (Note): The note to describe.
+            
+        Returns:
+            List[str]: Title, content and tags.
+        """
+        return [note.title, note.content, *note.tags]
+
+    def _get_text_index(self) -> TextIndex:
+        """Get the full-text index of the book, building it on first use.
+        
+        Returns:
+            TextIndex: The up-to-date index.
+        """
+        index = self._text_index
+        if index is None:
+            # Built aside and published whole, so concurrent readers never see it half-built
+            index = TextIndex(self._text_fields)
+            index.rebuild(self.data.items())
+            self._text_index = index
+        return index
+
+    @writes
     def add_note(self, title: str, content: str) -> str:
         """Add a new note to the notes book.
         
@@ -192,10 +288,12 @@ class NotesBook(UserDict):
         try:
             note = Note(title, content)
             self.data[note.title] = note
+            self._emit(Change(note.title, "add_note", (title, content)))
             return "Note added."
         except ValidationException as e:
             return str(e)
 
+    @reads
     def find_notes(self, keyword: str) -> List[Note]:
         """Search for notes containing the given keyword in their title.
         
@@ -206,8 +304,63 @@ class NotesBook(UserDict):
             List[Note]: List of matching notes.
         """
         keyword = keyword.strip().lower()
-        return [note for title, note in self.data.items() if keyword in title.lower()]
+        return [note for title, note in cancellable(self.data.items()) if keyword in title.lower()]
+
+    def _get_tag_index(self) -> TagIndex:
+        """Get the tag index of the book, building it on first use.
+        
+        Returns:
+            TagIndex: The up-to-date index.
+        """
+        index = self._tag_index
+        if index is None or index.needs_rebuild:
+            # Built aside and published whole, so concurrent readers never see it half-built
+            index = TagIndex(lambda note: note.tags)
+            index.rebuild(self.data.items())
+            self._tag_index = index
+        return index
+
+    def _get_prefix_index(self) -> PrefixIndex:
+        """Get the index of the words of the titles and tags, building it on first use.
+        
+        Returns:
+            PrefixIndex: The up-to-date index.
+        """
+        index = self._prefix_index
+        if index is None or index.needs_rebuild:
+            # Built aside and published whole, so concurrent readers never see it half-built
+            index = PrefixIndex(lambda note: [note.title, *note.tags])
+            index.rebuild(self.data.items())
+            self._prefix_index = index
+        return index
+
+    @reads
+    def prefix_search(self) -> PrefixSearch:
+        """Start a search of the titles and tags that narrows its results as the query is typed.
+        
+        Returns:
+            PrefixSearch: Search matching notes that have a title word or tag
+                starting with every word of the query.
+        """
+        return PrefixSearch(self._get_prefix_index(), self.data.__getitem__)
 
+    @reads
+    def search_notes(self, query: str, limit: Optional[int] = SEARCH_LIMIT) -> List[Note]:
+        """Search the titles, content and tags of the notes for any word of the query.
+        
+        Notes are ranked with BM25, so notes containing more of the query
+        words, or rarer ones, come first.
+        
+        Args:
+            query (str): The words to search for.
+            limit (Optional[int]): Maximum number of notes, or None for all.
+            
+        Returns:
+            List[Note]: Matching notes, most relevant first.
+        """
+        return [self.data[title] for title, _ in self._get_text_index().search(query, limit)]
+
+    @writes
     def edit_note(self, title: str, new_content: str) -> str:
         """Edit the content of an existing note.
         
@@ -220,10 +373,12 @@ class NotesBook(UserDict):
         """
         if title in self.data:
             self.data[title].content = NoteContent(new_content).value
+            self._emit(Change(title, "edit_note", (title, new_content)))
             return "Note updated."
             
         raise KeyError(f"Note not found.")
 
+    @writes
     def delete_note(self, title: str) -> str:
         """Delete a note from the notes book.
         
@@ -235,18 +390,21 @@ class NotesBook(UserDict):
         """
         if title in self.data:
             del self.data[title]
+            self._emit(Change(title, "delete_note", (title,)))
             return "Note deleted."
         
         raise KeyError("Note not found.")
 
+    @reads
     def show_all_notes(self) -> str:
         """Display all notes in the notes book.
         
         Returns:
             str: A formatted string containing all notes.
         """
-        return "\n".join(str(note) for note in self.data.values()) or "No notes available."
+        return "\n".join(str(note) for note in cancellable(self.data.values())) or "No notes available."
 
+    @writes
     def add_tag_to_note(self, title: str, new_tag: str) -> str:
         """Add a tag to an existing note.
         
@@ -261,10 +419,12 @@ class NotesBook(UserDict):
             raise KeyError(f"Note not found.")
         try:
             self.data[title].add_tag(new_tag)
+            self._emit(Change(title, "add_tag_to_note", (title, new_tag)))
             return f"Tag '{new_tag}' added to note '{title}'."
         except TagDuplicateError as e:
             raise KeyError(f"Tag already exists.")
 
+    @writes
     def remove_tag_from_note(self, title: str, tag_to_remove: str) -> str:
         """Remove a tag from an existing note.
         
@@ -279,10 +439,12 @@ class NotesBook(UserDict):
             raise KeyError(f"Note not found.")
         try:
             self.data[title].remove_tag(tag_to_remove)
+            self._emit(Change(title, "remove_tag_from_note", (title, tag_to_remove)))
             return f"Tag '{tag_to_remove}' removed from note '{title}'."
         except TagNotFound as e:
             raise KeyError(f"Tag not found.")
 
+    @reads
     def is_tag_exists_in_note(self, title: str, tag: str) -> bool:
         """Check if a tag exists in a specific note.
         
@@ -297,8 +459,9 @@ class NotesBook(UserDict):
             return False
         return self.data[title].is_tag_exists(tag)
     
+    @reads
     def find_notes_by_tag(self, tag: str) -> List[Note]:
-        """Search for notes containing a specific tag.
+        """Search for notes containing a specific tag using the tag index.
         
         Args:
             tag (str): The tag to search for.
@@ -306,7 +469,21 @@ class NotesBook(UserDict):
         Returns:
             List[Note]: List of notes containing the specified tag.
         """
-        tag = tag.strip().lower()
-        return [note for note in self.data.values() if tag in (t.lower() for t in note.tags)]
+        return [self.data[title] for title in self._get_tag_index().find(tag)]
+
+    @reads
+    def query_tags(self, expression: str) -> List[Note]:
+        """Search for notes whose tags match an expression with AND, OR and NOT.
+        
+        Args:
+            expression (str): A query such as "work AND urgent NOT done".
+            
+        Returns:
+            List[Note]: List of matching notes.
+            
+        Raises:
+            ValueError: If the expression is empty or malformed.
+        """
+        return [self.data[title] for title in self._get_tag_index().query(expression)]
 
 
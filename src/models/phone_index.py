@@ -0,0 +1,157 @@
+import bisect
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple
+
+from src.utils.dispatcher import cancellable
+
+
+class PhoneIndex:
+    """Sorted index from phone numbers to the entries that have them.
+
+    Entries are kept in a list sorted by (phone, key), so the owners of a
+    number and the numbers starting with a prefix are adjacent runs found
+    with a binary search. The owners of every number are counted as entries
+    are indexed, so numbers shared by several entries are known without a
+    scan.
+    """
+
+    def __init__(self, phones: Callable[[Any], Iterable[str]]) -> None:
+        """Initialize an empty index.
+
+        Args:
+            phones (Callable[[Any], Iterable[str]]): Function returning the
+                phone numbers of an entry.
+        """
+        self.phones = phones
+        self._entries: List[Tuple[str, str]] = []
+        self._numbers: Dict[str, Tuple[str, ...]] = {}
+        self._counts: Dict[str, int] = {}
+        self._shared: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _count(self, phone: str, change: int) -> None:
+        """Update the number of owners of a phone number.
+
+        Args:
+            phone (str): The phone number.
+            change (int): 1 for a new owner, -1 for a removed one.
+        """
+        count = self._counts.get(phone, 0) + change
+        if count:
+            self._counts[phone] = count
+        else:
+            del self._counts[phone]
+        if count > 1:
+            self._shared.add(phone)
+        else:
+            self._shared.discard(phone)
+
+    def add(self, key: str, entry: Any) -> None:
+        """Index an entry, replacing the previous version with the same key.
+
+        Args:
+            key (str): The key of the entry in its book.
+            entry (Any): The entry to index.
+        """
+        self.discard(key)
+        numbers = tuple(sorted(set(self.phones(entry))))
+        if not numbers:
+            return
+        self._numbers[key] = numbers
+        for phone in numbers:
+            bisect.insort(self._entries, (phone, key))
+            self._count(phone, 1)
+
+    def discard(self, key: str) -> None:
+        """Remove an entry from the index if it is there.
+
+        Args:
+            key (str): The key of the entry in its book.
+        """
+        for phone in self._numbers.pop(key, ()):
+            del self._entries[bisect.bisect_left(self._entries, (phone, key))]
+            self._count(phone, -1)
+
+    def rebuild(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """Index a fresh set of entries from scratch.
+
+        Args:
+            items (Iterable[Tuple[str, Any]]): Keys and entries to index.
+
+        Raises:
+            Cancelled: If the command building the index is cancelled.
+        """
+        self._entries = []
+        self._numbers = {}
+        self._counts = {}
+        self._shared = set()
+        for key, entry in cancellable(items):
+            numbers = tuple(sorted(set(self.phones(entry))))
+            if numbers:
+                self._numbers[key] = numbers
+                self._entries.extend((phone, key) for phone in numbers)
+        self._entries.sort()
+        for phone, _ in self._entries:
+            self._count(phone, 1)
+
+    def owners(self, phone: str) -> List[str]:
+        """Get the keys of the entries that have a phone number.
+
+        Args:
+            phone (str): The phone number.
+
+        Returns:
+            List[str]: The keys, in sorted order.
+        """
+        return [key for _, key in self._run(phone, exact=True)]
+
+    def with_prefix(self, prefix: str) -> Iterator[Tuple[str, List[str]]]:
+        """Stream the phone numbers that start with a prefix and their owners.
+
+        Args:
+            prefix (str): The first digits of the numbers.
+
+        Returns:
+            Iterator[Tuple[str, List[str]]]: Phone numbers in sorted order,
+                each with the sorted keys of its owners.
+        """
+        phone, keys = None, []
+        for number, key in self._run(prefix, exact=False):
+            if number != phone:
+                if keys:
+                    yield phone, keys
+                phone, keys = number, []
+            keys.append(key)
+        if keys:
+            yield phone, keys
+
+    def is_shared(self, phone: str) -> bool:
+        """Check whether several entries have a phone number.
+
+        Args:
+            phone (str): The phone number.
+
+        Returns:
+            bool: True if more than one entry has it.
+        """
+        return phone in self._shared
+
+    def shared(self) -> List[Tuple[str, List[str]]]:
+        """Get the phone numbers that several entries have.
+
+        Returns:
+            List[Tuple[str, List[str]]]: Phone numbers in sorted order, each
+                with the sorted keys of its owners.
+        """
+        return [(phone, self.owners(phone)) for phone in sorted(self._shared)]
+
+    def _run(self, phone: str, exact: bool) -> Iterator[Tuple[str, str]]:
+        """Stream the entries whose number equals, or starts with, a phone number."""
+        position = bisect.bisect_left(self._entries, (phone,))
+        while position < len(self._entries):
+            entry = self._entries[position]
+            if entry[0] != phone if exact else not entry[0].startswith(phone):
+                return
+            yield entry
+            position += 1
@@ -0,0 +1,316 @@
+import bisect
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils.dispatcher import cancellable
+
+MIN_DEAD_FOR_REBUILD = 1024  # Never rebuild small indexes just to drop removed entries
+COMPLETION_LIMIT = 8  # Completions offered for a prefix
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text into the lowercase words matched by prefix searches.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        List[str]: The words of the text.
+    """
+    return text.lower().split()
+
+
+class PrefixIndex:
+    """Index from the words of entries to the entries, searchable by prefix.
+
+    The distinct words are kept in a sorted list, a flattened trie: the words
+    starting with a prefix are the adjacent run found with two bisections.
+    Each word maps to an array of the integer document ids of the entries
+    containing it. Every entry also keeps its words, repeated ones included,
+    joined into one string, so a candidate is checked against further words
+    with substring tests and counts.
+    Removing or re-indexing an entry only marks its old id as dead; the index
+    is rebuilt once most of its ids are dead.
+    """
+
+    def __init__(self, fields: Callable[[Any], Iterable[str]]) -> None:
+        """Initialize an empty index.
+
+        Args:
+            fields (Callable[[Any], Iterable[str]]): Function returning the
+                texts of an entry whose words can be searched by prefix.
+        """
+        self.fields = fields
+        self._words: List[str] = []
+        self._postings: Dict[str, array] = {}
+        self._keys: List[Optional[str]] = []
+        self._texts: List[Optional[str]] = []
+        self._ids: Dict[str, int] = {}
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, key: str, entry: Any) -> None:
+        """Index an entry, replacing the previous version with the same key.
+
+        Args:
+            key (str): The key of the entry in its book.
+            entry (Any): The entry to index.
+        """
+        self.discard(key)
+        doc = self._index(key, entry)
+        for word in set(self._texts[doc].split()):
+            if word not in self._postings:
+                bisect.insort(self._words, word)
+            self._postings.setdefault(word, array("i")).append(doc)
+
+    def _index(self, key: str, entry: Any) -> int:
+        """Give an entry a document id and remember its words.
+
+        Args:
+            key (str): The key of the entry in its book.
+            entry (Any): The entry to index.
+
+        Returns:
+            int: The document id of the entry.
+        """
+        words = []
+        for text in self.fields(entry):
+            words.extend(tokenize(text))
+        doc = len(self._keys)
+        self._keys.append(key)
+        self._texts.append(" " + " ".join(sorted(words)))
+        self._ids[key] = doc
+        return doc
+
+    def discard(self, key: str) -> None:
+        """Remove an entry from the index if it is there.
+
+        Args:
+            key (str): The key of the entry in its book.
+        """
+        doc = self._ids.pop(key, None)
+        if doc is not None:
+            self._keys[doc] = None
+            self._texts[doc] = None
+            self._dead += 1
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """bool: True if most document ids in the arrays belong to removed entries."""
+        return self._dead >= MIN_DEAD_FOR_REBUILD and self._dead * 2 > len(self._keys)
+
+    def rebuild(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """Index a fresh set of entries from scratch.
+
+        The words are sorted once at the end instead of being inserted one
+        at a time.
+
+        Args:
+            items (Iterable[Tuple[str, Any]]): Keys and entries to index.
+
+        Raises:
+            Cancelled: If the command building the index is cancelled.
+        """
+        self._postings = {}
+        self._keys = []
+        self._texts = []
+        self._ids = {}
+        self._dead = 0
+        for key, entry in cancellable(items):
+            doc = self._index(key, entry)
+            for word in set(self._texts[doc].split()):
+                posting = self._postings.get(word)
+                if posting is None:
+                    posting = self._postings[word] = array("i")
+                posting.append(doc)
+        self._words = sorted(self._postings)
+
+    def key(self, doc: int) -> Optional[str]:
+        """Get the key of the entry with a document id, or None if it was removed."""
+        return self._keys[doc]
+
+    def _words_with_prefix(self, prefix: str) -> Iterator[str]:
+        """Iterate over the indexed words that start with a prefix, in order."""
+        for i in range(bisect.bisect_left(self._words, prefix), len(self._words)):
+            word = self._words[i]
+            if not word.startswith(prefix):
+                return
+            yield word
+
+    def completions(self, prefix: str, limit: int = COMPLETION_LIMIT) -> List[str]:
+        """Get the words of live entries that start with a prefix.
+
+        Args:
+            prefix (str): Lowercase start of a word.
+            limit (int): Maximum number of words.
+
+        Returns:
+            List[str]: The words in alphabetical order.
+        """
+        found = []
+        for word in self._words_with_prefix(prefix):
+            if any(self._keys[doc] is not None for doc in self._postings[word]):
+                found.append(word)
+                if len(found) == limit:
+                    break
+        return found
+
+    def search(self, tokens: List[str]) -> List[int]:
+        """Find the entries that have a word starting with every token.
+
+        Each token needs a word of its own, so "jo jo" only matches entries
+        with two words starting with "jo". The entries come from the words
+        starting with the longest token and are then checked against the
+        others.
+
+        Args:
+            tokens (List[str]): Lowercase word prefixes, at least one.
+
+        Returns:
+            List[int]: Document ids of the matching entries, in the order
+                they were indexed.
+        """
+        longest = max(tokens, key=len)
+        docs = set()
+        for word in self._words_with_prefix(longest):
+            docs.update(self._postings[word])
+        others = list(tokens)
+        others.remove(longest)
+        texts = self._texts
+        return self.refine([doc for doc in sorted(docs) if texts[doc] is not None], others, tokens)
+
+    def refine(self, docs: Iterable[int], tokens: List[str], query: Optional[List[str]] = None) -> List[int]:
+        """Keep the entries of an earlier result that match more tokens.
+
+        Args:
+            docs (Iterable[int]): Document ids of live entries from an earlier
+                result of ``search``.
+            tokens (List[str]): Lowercase word prefixes the entries must also
+                match; the ones the result already matches can be left out.
+            query (Optional[List[str]]): All the tokens of the query, which
+                decide how many words each token needs; ``tokens`` if omitted.
+
+        Returns:
+            List[int]: The ids of the entries that have a word of their own
+                starting with every token of the query.
+        """
+        texts = self._texts
+        docs = list(docs)
+        for token, needed in words_needed(tokens, tokens if query is None else query).items():
+            needle = " " + token
+            if needed == 1:
+                docs = [doc for doc in docs if needle in texts[doc]]
+            else:
+                docs = [doc for doc in docs if texts[doc].count(needle) >= needed]
+        return docs
+
+
+def words_needed(tokens: List[str], query: List[str]) -> Dict[str, int]:
+    """Get how many words must start with each token a change of a query affects.
+
+    A word starting with a token also starts with every shorter token that
+    is a prefix of it, so a query matches an entry when, for every token, the
+    entry has at least as many words starting with it as the query has
+    tokens starting with it.
+
+    Args:
+        tokens (List[str]): The new or changed tokens of the query.
+        query (List[str]): All the tokens of the query.
+
+    Returns:
+        Dict[str, int]: The tokens to check, the changed ones and those they
+            extend, with the number of words that must start with each.
+    """
+    return {
+        token: sum(other.startswith(token) for other in query)
+        for token in query
+        if any(changed.startswith(token) for changed in tokens)
+    }
+
+
+def _refines(tokens: List[str], previous: List[str]) -> bool:
+    """Check whether every match of a query also matches an earlier query.
+
+    Args:
+        tokens (List[str]): Tokens of the new query.
+        previous (List[str]): Tokens of the earlier query.
+
+    Returns:
+        bool: True if each earlier token starts the token in its place.
+    """
+    return len(tokens) >= len(previous) and all(new.startswith(old) for new, old in zip(tokens, previous))
+
+
+class PrefixSearch:
+    """Search that narrows its results as the query is typed.
+
+    Each result is kept with its query. When the query grows, the result of
+    the longest earlier query it extends is filtered instead of searching
+    the whole index again, and deleting characters goes back to an earlier
+    result. Sessions are short-lived: they must not outlive a change of the
+    book.
+    """
+
+    def __init__(self, index: PrefixIndex, lookup: Callable[[str], Any]) -> None:
+        """Start a search.
+
+        Args:
+            index (PrefixIndex): The up-to-date index of the book.
+            lookup (Callable[[str], Any]): Function getting an entry by key.
+        """
+        self.index = index
+        self.lookup = lookup
+        self._steps: List[Tuple[List[str], List[int]]] = []
+
+    def search(self, query: str) -> List[int]:
+        """Find the entries matching a query.
+
+        Args:
+            query (str): Words, the last of which may be incomplete.
+
+        Returns:
+            List[int]: Document ids of the matches, empty for an empty query.
+        """
+        tokens = tokenize(query)
+        while self._steps and not _refines(tokens, self._steps[-1][0]):
+            self._steps.pop()
+        if not tokens:
+            return []
+        if self._steps:
+            previous, docs = self._steps[-1]
+            if previous == tokens:
+                return docs
+            changed = [token for i, token in enumerate(tokens) if i >= len(previous) or token != previous[i]]
+            docs = self.index.refine(docs, changed, tokens)
+        else:
+            docs = self.index.search(tokens)
+        self._steps.append((tokens, docs))
+        return docs
+
+    def entries(self, docs: List[int]) -> List[Any]:
+        """Get the entries of some document ids.
+
+        Args:
+            docs (List[int]): Ids from a result of ``search``.
+
+        Returns:
+            List[Any]: The entries.
+        """
+        return [self.lookup(self.index.key(doc)) for doc in docs]
+
+    def completions(self, query: str) -> List[str]:
+        """Get the words that complete the last word of a query.
+
+        Args:
+            query (str): The query being typed.
+
+        Returns:
+            List[str]: Completions of the last word, none if the query ends
+                with a space.
+        """
+        tokens = tokenize(query)
+        if not tokens or query[-1:].isspace():
+            return []
+        return self.index.completions(tokens[-1])
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Callable, List, Optional
 from src.models.fields import Name, Phone, Birthday, Address, Email
 
 
@@ -11,8 +11,13 @@ class Record:
     - Email address
     - Birthday
     - Address
+
+    Records use __slots__ instead of a per-instance __dict__, since an address
+    book may hold a very large number of them.
     """
 
+    __slots__ = ("name", "phones", "email", "birthday", "address", "_listener")
+
     def __init__(self, name: str) -> None:
         """Initialize a new contact record.
         
@@ -24,7 +29,18 @@ class Record:
         self.email: Optional[Email] = None
         self.birthday: Optional[Birthday] = None
         self.address: Address = None
+        self._listener: Optional[Callable[["Record", str, tuple], None]] = None
+
+    def _notify(self, op: str, *args) -> None:
+        """Report a mutation to the address book that owns the record.
         
+        Args:
+            op (str): Name of the method that changed the record.
+            *args: Arguments the method was called with.
+        """
+        if self._listener is not None:
+            self._listener(self, op, args)
+
     def add_phone(self, phone: str) -> None:
         """Add a new phone number to the contact.
         
@@ -32,6 +48,7 @@ class Record:
             phone (str): The phone number to add.
         """
         self.phones.append(Phone(phone))
+        self._notify("add_phone", phone)
 
     def add_email(self, email: str) -> None:
         """Add or update the email address for the contact.
@@ -40,6 +57,7 @@ class Record:
             email (str): The email address to set.
         """
         self.email = Email(email)
+        self._notify("add_email", email)
 
     def edit_phone(self, old_phone: str, new_phone: str) -> None:
         """Edit an existing phone number.
@@ -53,7 +71,9 @@ class Record:
         """
         for p in self.phones:
             if p.value == old_phone:
+                p.validate_phone(new_phone)
                 p.value = new_phone
+                self._notify("edit_phone", old_phone, new_phone)
                 return
         raise ValueError(f"Phone number {old_phone} not found for editing.")
 
@@ -86,6 +106,7 @@ class Record:
         for p in self.phones:
             if p.value == phone:
                 self.phones.remove(p)
+                self._notify("remove_phone", phone)
                 return
         raise ValueError(f"Phone number {phone} not found for removal.")
 
@@ -98,6 +119,7 @@ class Record:
         if self.email is None:
             raise ValueError("No email to remove.")
         self.email = None
+        self._notify("remove_email")
 
     def add_birthday(self, birthday: str) -> None:
         """Add or update the birthday for the contact.
@@ -106,6 +128,7 @@ class Record:
             birthday (str): The birthday in DD.MM.YYYY format.
         """
         self.birthday = Birthday(birthday)
+        self._notify("add_birthday", birthday)
 
     def show_birthday(self) -> str:
         """Get the formatted birthday string.
@@ -132,6 +155,7 @@ class Record:
         if not self.birthday:
             raise ValueError("Birthday not set.")
         self.birthday = None
+        self._notify("delete_birthday")
         return f"The birthday has been removed for {self.name.value}"
 
     def add_address(self, address: List) -> None:
@@ -141,6 +165,7 @@ class Record:
             address (List): List of address components.
         """
         self.address = Address(address)
+        self._notify("add_address", address)
 
     def show_address(self) -> str:
         """Get the formatted address string.
@@ -166,6 +191,7 @@ class Record:
         """
         if self.address:
             self.address = None
+            self._notify("delete_address")
             return f"The address has been removed for {self.name.value}"
         raise ValueError("Address not set.")
 
@@ -194,16 +220,27 @@ class Record:
         email_str = f", email: {self.show_email()}" if self.email else ""
         return f"Contact name: {self.name.value}, phone(s): {'; '.join(p.value for p in self.phones)}{email_str}{birthday_str}"
 
+    def __getstate__(self) -> dict:
+        """Get the picklable state of the record without the owner callback.
+        
+        Returns:
+            dict: The object's state.
+        """
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot != "_listener"}
+
     def __setstate__(self, state: dict) -> None:
         """Restore the state of the object from a dictionary.
         
+        Also loads pickles written before records had __slots__, whose state
+        is the old instance __dict__ and may lack the newer fields.
+        
         Args:
             state (dict): The dictionary containing the object's state.
         """
-        self.__dict__ = state
-        if "address" not in self.__dict__:
-            self.__dict__["address"] = None
-        if "email" not in self.__dict__:
-            self.__dict__["email"] = None
-        if "birthday" not in self.__dict__:
-            self.__dict__["birthday"] = None
+        self.address = None
+        self.email = None
+        self.birthday = None
+        for slot, value in state.items():
+            if slot != "_listener":
+                setattr(self, slot, value)
+        self._listener = None
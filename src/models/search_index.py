@@ -0,0 +1,281 @@
+import bisect
+import calendar
+from array import array
+from collections import Counter
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.utils.dispatcher import cancellable
+
+MIN_DEAD_FOR_REBUILD = 1024  # Never rebuild small indexes just to drop removed entries
+
+
+def trigrams(text: str) -> Set[str]:
+    """Get all three-character substrings of a text.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        Set[str]: The distinct trigrams of the text.
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Inverted index from character trigrams to the entries containing them.
+
+    Every indexed entry gets an integer document id. Each trigram maps to an
+    array of the ids of the entries whose fields contain it, which keeps the
+    index compact for books with millions of entries. Removing or re-indexing
+    an entry only marks its old id as dead; the arrays are rebuilt once most of
+    their ids are dead.
+    """
+
+    def __init__(self, fields: Callable[[Any], Iterable[str]]) -> None:
+        """Initialize an empty index.
+
+        Args:
+            fields (Callable[[Any], Iterable[str]]): Function returning the
+                lowercase texts of an entry that should be searchable.
+        """
+        self.fields = fields
+        self._postings: Dict[str, array] = {}
+        self._keys: List[Optional[str]] = []
+        self._ids: Dict[str, int] = {}
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, key: str, entry: Any) -> None:
+        """Index an entry, replacing the previous version with the same key.
+
+        Args:
+            key (str): The key of the entry in its book.
+            entry (Any): The entry to index.
+        """
+        self.discard(key)
+        doc = len(self._keys)
+        self._keys.append(key)
+        self._ids[key] = doc
+        grams = set()
+        for text in self.fields(entry):
+            grams |= trigrams(text)
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array("i")
+            posting.append(doc)
+
+    def discard(self, key: str) -> None:
+        """Remove an entry from the index if it is there.
+
+        Args:
+            key (str): The key of the entry in its book.
+        """
+        doc = self._ids.pop(key, None)
+        if doc is not None:
+            self._keys[doc] = None
+            self._dead += 1
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """bool: True if most document ids in the arrays belong to removed entries."""
+        return self._dead >= MIN_DEAD_FOR_REBUILD and self._dead * 2 > len(self._keys)
+
+    def rebuild(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """Index a fresh set of entries from scratch.
+
+        Args:
+            items (Iterable[Tuple[str, Any]]): Keys and entries to index.
+
+        Raises:
+            Cancelled: If the command building the index is cancelled.
+        """
+        self._postings = {}
+        self._keys = []
+        self._ids = {}
+        self._dead = 0
+        for key, entry in cancellable(items):
+            self.add(key, entry)
+
+    def candidates(self, query: str) -> Optional[List[str]]:
+        """Get the keys of the entries that may contain the query.
+
+        Every entry containing the query is returned, in the order the
+        entries were indexed, but some returned entries may not contain it.
+
+        Args:
+            query (str): Lowercase text to search for.
+
+        Returns:
+            Optional[List[str]]: Candidate keys, or None if the query is too
+                short to use the index.
+        """
+        grams = trigrams(query)
+        if not grams:
+            return None
+        postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+        docs = set(postings[0])
+        for posting in postings[1:]:
+            # Verifying a few extra candidates is cheaper than scanning a long array
+            if not docs or len(posting) > 8 * len(docs):
+                break
+            docs.intersection_update(posting)
+        keys = (self._keys[doc] for doc in sorted(docs))
+        return [key for key in keys if key is not None]
+
+    def similar(self, query: str, limit: int, max_typos: int = 2) -> List[str]:
+        """Get the keys of the entries that share the most trigrams with the query.
+
+        Unlike ``candidates``, an entry does not need every trigram of the
+        query, so entries that differ from it by a typo are found too. A typo
+        changes at most three trigrams, so an entry within ``max_typos``
+        typos of the query is in at least one of the postings of its
+        3 * max_typos + 1 rarest trigrams, and only those are counted; the
+        common trigrams, shared by large parts of the book, are skipped.
+
+        Args:
+            query (str): Lowercase text to compare the entries with.
+            limit (int): Maximum number of keys to return.
+            max_typos (int): Number of typos the returned entries may differ
+                from the query by.
+
+        Returns:
+            List[str]: Keys of the entries with the most shared trigrams,
+                most similar first.
+        """
+        # Trigrams no entry has are typos themselves and would only take the place of real postings
+        postings = sorted(filter(None, (self._postings.get(gram) for gram in trigrams(query))), key=len)
+        counts: Counter = Counter()
+        for posting in postings[:3 * max_typos + 1]:
+            counts.update(posting)
+        keys = (self._keys[doc] for doc, _ in counts.most_common(limit))
+        return [key for key in keys if key is not None]
+
+
+def day_of_year(month: int, day: int) -> int:
+    """Get the position of a day in a leap year, so 29 February has its own slot.
+
+    Args:
+        month (int): Month of the date.
+        day (int): Day of the month.
+
+    Returns:
+        int: Day number from 1 (1 January) to 366 (31 December).
+    """
+    return date(2000, month, day).timetuple().tm_yday
+
+
+def anniversary(born: date, year: int) -> date:
+    """Get the date of a birthday in a given year.
+
+    Birthdays on 29 February are celebrated on 28 February in common years.
+
+    Args:
+        born (date): The date of birth.
+        year (int): The year of the anniversary.
+
+    Returns:
+        date: The birthday in that year.
+    """
+    if born.month == 2 and born.day == 29 and not calendar.isleap(year):
+        return date(year, 2, 28)
+    return date(year, born.month, born.day)
+
+
+class BirthdayIndex:
+    """Sorted index of entries by the day of the year of their birthday.
+
+    Entries are kept in a list sorted by (day of year, key), so the birthdays
+    of any date range are found with two binary searches.
+    """
+
+    def __init__(self, birthday: Callable[[Any], Optional[date]]) -> None:
+        """Initialize an empty index.
+
+        Args:
+            birthday (Callable[[Any], Optional[date]]): Function returning the
+                birthday of an entry, or None if it has none.
+        """
+        self.birthday = birthday
+        self._entries: List[Tuple[int, str]] = []
+        self._days: Dict[str, int] = {}
+        self._born: Dict[str, date] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: str, entry: Any) -> None:
+        """Index an entry, replacing the previous version with the same key.
+
+        Args:
+            key (str): The key of the entry in its book.
+            entry (Any): The entry to index.
+        """
+        self.discard(key)
+        born = self.birthday(entry)
+        if born is None:
+            return
+        day = day_of_year(born.month, born.day)
+        bisect.insort(self._entries, (day, key))
+        self._days[key] = day
+        self._born[key] = born
+
+    def discard(self, key: str) -> None:
+        """Remove an entry from the index if it is there.
+
+        Args:
+            key (str): The key of the entry in its book.
+        """
+        day = self._days.pop(key, None)
+        if day is None:
+            return
+        del self._born[key]
+        del self._entries[bisect.bisect_left(self._entries, (day, key))]
+
+    def rebuild(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """Index a fresh set of entries from scratch.
+
+        Args:
+            items (Iterable[Tuple[str, Any]]): Keys and entries to index.
+
+        Raises:
+            Cancelled: If the command building the index is cancelled.
+        """
+        self._entries = []
+        self._days = {}
+        self._born = {}
+        for key, entry in cancellable(items):
+            born = self.birthday(entry)
+            if born is not None:
+                day = day_of_year(born.month, born.day)
+                self._entries.append((day, key))
+                self._days[key] = day
+                self._born[key] = born
+        self._entries.sort()
+
+    def between(self, start: date, end: date) -> Iterator[Tuple[date, str]]:
+        """Get the birthdays that fall between two dates, in date order.
+
+        Args:
+            start (date): First day of the range.
+            end (date): Last day of the range, may be several years later.
+
+        Returns:
+            Iterator[Tuple[date, str]]: Birthday date in the range and key of the entry.
+        """
+        for year in range(start.year, end.year + 1):
+            first = max(start, date(year, 1, 1))
+            last = min(end, date(year, 12, 31))
+            if first > last:
+                continue
+            low = day_of_year(first.month, first.day)
+            high = day_of_year(last.month, last.day)
+            if last.month == 2 and last.day == 28 and not calendar.isleap(year):
+                high += 1  # 29 February birthdays are celebrated on the 28th
+            begin = bisect.bisect_left(self._entries, (low,))
+            stop = bisect.bisect_left(self._entries, (high + 1,))
+            for _, key in self._entries[begin:stop]:
+                yield anniversary(self._born[key], year), key
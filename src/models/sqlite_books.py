@@ -0,0 +1,855 @@
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from datetime import date
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.models.address_book import FUZZY_CANDIDATES, AddressBook
+from src.models.fields import Name, Phone, Email, Birthday, Address
+from src.models.locking import reads
+from src.models.notes_book import SEARCH_LIMIT, Note, NotesBook
+from src.models.prefix_index import COMPLETION_LIMIT, tokenize, words_needed
+from src.models.record import Record
+from src.models.search_index import BirthdayIndex, trigrams
+from src.models.tag_index import evaluate_query
+from src.models.text_index import tokenize as text_tokenize
+
+CACHE_SIZE = 1024  # Number of recently used entries kept as Python objects
+MAX_PARAMETERS = 500  # Ids bound in one query, below the limit of old SQLite versions
+FUZZY_TRIGRAMS = 7  # Rarest trigrams of a query searched by fuzzy_find, enough for two typos
+
+CONTACTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    key TEXT PRIMARY KEY,       -- AddressBook.normalize_name(name)
+    name TEXT NOT NULL,
+    phones TEXT NOT NULL,       -- ';'-joined, in the order they were added
+    email TEXT,
+    birthday INTEGER,           -- date ordinal
+    birthday_md INTEGER,        -- month * 100 + day
+    birthday_text TEXT,         -- DD.MM.YYYY, as shown and searched
+    address TEXT                -- JSON list of address parts
+);
+CREATE TABLE IF NOT EXISTS phones (
+    key TEXT NOT NULL,
+    phone TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS phones_phone ON phones(phone);
+CREATE INDEX IF NOT EXISTS phones_key ON phones(key);
+CREATE INDEX IF NOT EXISTS contacts_email ON contacts(email);
+CREATE INDEX IF NOT EXISTS contacts_birthday_md ON contacts(birthday_md);
+"""
+
+# Apostrophes and hyphens are part of words, so names split into the words PrefixIndex uses
+NAME_TOKENIZER = "unicode61 remove_diacritics 0 tokenchars '''-'"
+NOTE_TOKENIZER = "unicode61 remove_diacritics 0"
+
+NOTES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    title TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    tags TEXT NOT NULL          -- JSON list, in the order they were added
+);
+CREATE TABLE IF NOT EXISTS note_tags (
+    title TEXT NOT NULL,
+    tag TEXT NOT NULL           -- lowercase, as searched
+);
+CREATE INDEX IF NOT EXISTS note_tags_tag ON note_tags(tag);
+CREATE INDEX IF NOT EXISTS note_tags_title ON note_tags(title);
+"""
+
+
+def text_search_schema(name: str, table: str, columns: Sequence[str], tokenizer: str) -> str:
+    """Get the SQL creating a full-text table that follows the rows of a table.
+
+    The full-text table only indexes the columns; their values stay in the
+    table, and triggers keep the index in step with every insert, update and
+    delete. The table ``<name>_vocab`` lists the indexed words of each column.
+
+    Args:
+        name (str): Name of the full-text table.
+        table (str): Name of the table holding the text.
+        columns (Sequence[str]): Columns of the table to index.
+        tokenizer (str): FTS5 tokenizer splitting the text into words.
+
+    Returns:
+        str: The statements, safe to run on an existing database.
+    """
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    tokenizer = tokenizer.replace('"', '""')
+    return f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5(
+    {names}, content='{table}', content_rowid='rowid', tokenize="{tokenizer}"
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS {name}_vocab USING fts5vocab({name}, 'col');
+CREATE TRIGGER IF NOT EXISTS {name}_insert AFTER INSERT ON {table} BEGIN
+    INSERT INTO {name}(rowid, {names}) VALUES (new.rowid, {new});
+END;
+CREATE TRIGGER IF NOT EXISTS {name}_delete AFTER DELETE ON {table} BEGIN
+    INSERT INTO {name}({name}, rowid, {names}) VALUES ('delete', old.rowid, {old});
+END;
+CREATE TRIGGER IF NOT EXISTS {name}_update AFTER UPDATE OF {names} ON {table} BEGIN
+    INSERT INTO {name}({name}, rowid, {names}) VALUES ('delete', old.rowid, {old});
+    INSERT INTO {name}(rowid, {names}) VALUES (new.rowid, {new});
+END;
+"""
+
+
+def create_text_search(connection: sqlite3.Connection, name: str, schema: str) -> None:
+    """Create a full-text table, indexing the existing rows if it is new.
+
+    Args:
+        connection (sqlite3.Connection): The open database connection.
+        name (str): Name of the full-text table.
+        schema (str): Statements from ``text_search_schema``.
+
+    Raises:
+        sqlite3.OperationalError: If this SQLite lacks FTS5 or the tokenizer.
+    """
+    exists = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone()
+    connection.executescript(schema)
+    if not exists:
+        # Databases created before the table existed already have rows
+        connection.execute(f"INSERT INTO {name}({name}) VALUES ('rebuild')")
+        connection.commit()
+
+
+def phrase(text: str) -> str:
+    """Quote a text as a phrase of an FTS5 query, so its characters are not operators."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def prefix_end(prefix: str) -> str:
+    """Get the smallest string after every string starting with a non-empty prefix."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class Condition(NamedTuple):
+    """SQL condition with its parameters, combined with ``&``, ``|`` and ``~``."""
+
+    sql: str
+    params: tuple = ()
+
+    def __and__(self, other: "Condition") -> "Condition":
+        return Condition(f"({self.sql}) AND ({other.sql})", self.params + other.params)
+
+    def __or__(self, other: "Condition") -> "Condition":
+        return Condition(f"({self.sql}) OR ({other.sql})", self.params + other.params)
+
+    def __invert__(self) -> "Condition":
+        return Condition(f"NOT ({self.sql})", self.params)
+
+
+class SQLiteMapping(MutableMapping, ABC):
+    """Dictionary-like view over the rows of one SQLite table.
+
+    Rows are turned into Python objects only when they are accessed. The most
+    recently used objects are cached, so an object fetched by a handler is the
+    same one the book sees when the handler changes it. Subclasses map their
+    objects to rows with ``_from_row``, ``_store`` and ``_remove``.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, table: str, key_column: str) -> None:
+        """Initialize the mapping.
+
+        Args:
+            connection (sqlite3.Connection): The open database connection.
+            table (str): Name of the main table.
+            key_column (str): Name of the primary key column.
+        """
+        self.connection = connection
+        self.table = table
+        self.key_column = key_column
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        # Readers on several threads share the cache
+        self._cache_lock = threading.Lock()
+
+    @abstractmethod
+    def _from_row(self, row: tuple) -> Any:
+        """Build an object from a row of the main table."""
+
+    @abstractmethod
+    def _store(self, key: str, value: Any) -> None:
+        """Insert or replace the rows of one object."""
+
+    @abstractmethod
+    def _remove(self, key: str) -> None:
+        """Delete the rows of one object."""
+
+    def _remember(self, key: str, value: Any) -> Any:
+        """Put an object into the cache of recently used objects.
+
+        Args:
+            key (str): The key of the object.
+            value (Any): The object.
+
+        Returns:
+            Any: The cached object.
+        """
+        with self._cache_lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return value
+
+    def _cached(self, key: str) -> Any:
+        """Get a cached object and mark it as recently used.
+
+        Args:
+            key (str): The key of the object.
+
+        Returns:
+            Any: The object, or None if it is not cached.
+        """
+        with self._cache_lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+            return value
+
+    def _materialize(self, row: tuple) -> Any:
+        """Get the object of a row, reusing the cached one if there is one."""
+        cached = self._cached(row[0])
+        if cached is not None:
+            return cached
+        return self._remember(row[0], self._from_row(row))
+
+    def select_items(self, where: str = "", params: Iterable = ()) -> Iterator[Tuple[str, Any]]:
+        """Stream the keys and objects whose rows match a condition, in insertion order.
+
+        Args:
+            where (str): SQL condition on the main table, empty for all rows.
+            params (Iterable): Parameters of the condition.
+
+        Returns:
+            Iterator[Tuple[str, Any]]: The matching keys and objects.
+        """
+        query = f"SELECT * FROM {self.table}"
+        if where:
+            query += f" WHERE {where}"
+        query += " ORDER BY rowid"
+        for row in self.connection.execute(query, params):
+            yield row[0], self._materialize(row)
+
+    def select(self, where: str = "", params: Iterable = ()) -> Iterator[Any]:
+        """Stream the objects whose rows match a condition, in insertion order.
+
+        Args:
+            where (str): SQL condition on the main table, empty for all rows.
+            params (Iterable): Parameters of the condition.
+
+        Returns:
+            Iterator[Any]: The matching objects.
+        """
+        return (value for _, value in self.select_items(where, params))
+
+    def window(self, start: int, stop: int) -> Iterator[Any]:
+        """Stream the objects of a range of positions, in insertion order.
+
+        Args:
+            start (int): Position of the first object.
+            stop (int): Position after the last object.
+
+        Returns:
+            Iterator[Any]: The objects of the range.
+        """
+        query = f"SELECT * FROM {self.table} ORDER BY rowid LIMIT ? OFFSET ?"
+        for row in self.connection.execute(query, (max(0, stop - start), start)):
+            yield self._materialize(row)
+
+    def select_rowids(self, rowids: Sequence[int]) -> List[Any]:
+        """Get the objects of some rows, in insertion order.
+
+        Args:
+            rowids (Sequence[int]): Row ids of the main table.
+
+        Returns:
+            List[Any]: The objects of the rows.
+        """
+        found = []
+        for start in range(0, len(rowids), MAX_PARAMETERS):
+            chunk = rowids[start:start + MAX_PARAMETERS]
+            found.extend(self.select(f"rowid IN ({', '.join('?' * len(chunk))})", chunk))
+        return found
+
+    def save(self, key: str, value: Any) -> None:
+        """Write an object that has been changed in place back to the database.
+
+        Args:
+            key (str): The key of the object.
+            value (Any): The changed object.
+        """
+        self._store(key, value)
+
+    def __getitem__(self, key: str) -> Any:
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        row = self.connection.execute(
+            f"SELECT * FROM {self.table} WHERE {self.key_column} = ?", (key,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return self._remember(key, self._from_row(row))
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._store(key, value)
+        self._remember(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._remove(key)
+        with self._cache_lock:
+            self._cache.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        return self.connection.execute(
+            f"SELECT 1 FROM {self.table} WHERE {self.key_column} = ?", (key,)
+        ).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        query = f"SELECT {self.key_column} FROM {self.table} ORDER BY rowid"
+        return (row[0] for row in self.connection.execute(query))
+
+    def __len__(self) -> int:
+        return self.connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def values(self) -> Iterator[Any]:
+        return self.select()
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return self.select_items()
+
+
+class SQLiteRecords(SQLiteMapping):
+    """Contact records stored in the ``contacts`` and ``phones`` tables."""
+
+    def __init__(self, connection: sqlite3.Connection, listener: Callable) -> None:
+        """Initialize the mapping.
+
+        Args:
+            connection (sqlite3.Connection): The open database connection.
+            listener (Callable): Callback attached to every loaded record.
+        """
+        super().__init__(connection, "contacts", "key")
+        self.listener = listener
+
+    def _from_row(self, row: tuple) -> Record:
+        _, name, phones, email, birthday, _, _, address = row
+        record = Record.__new__(Record)
+        record.__setstate__({
+            "name": Name.restore(name),
+            "phones": [Phone.restore(phone) for phone in phones.split(";") if phone],
+            "email": Email.restore(email) if email else None,
+            "birthday": Birthday.restore(date.fromordinal(birthday)) if birthday else None,
+            "address": Address.restore(json.loads(address)) if address else None,
+        })
+        record._listener = self.listener
+        return record
+
+    def __setitem__(self, key: str, record: Record) -> None:
+        super().__setitem__(key, record)
+        record._listener = self.listener
+
+    def _store(self, key: str, record: Record) -> None:
+        phones = [phone.value for phone in record.phones]
+        birthday = record.birthday.value if record.birthday else None
+        self.connection.execute(
+            """INSERT INTO contacts (key, name, phones, email, birthday, birthday_md, birthday_text, address)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(key) DO UPDATE SET
+                   name = excluded.name, phones = excluded.phones, email = excluded.email,
+                   birthday = excluded.birthday, birthday_md = excluded.birthday_md,
+                   birthday_text = excluded.birthday_text, address = excluded.address""",
+            (
+                key,
+                record.name.value,
+                ";".join(phones),
+                record.email.value if record.email else None,
+                birthday.toordinal() if birthday else None,
+                birthday.month * 100 + birthday.day if birthday else None,
+                birthday.strftime("%d.%m.%Y") if birthday else None,
+                json.dumps(record.address.value) if record.address else None,
+            ),
+        )
+        self.connection.execute("DELETE FROM phones WHERE key = ?", (key,))
+        self.connection.executemany(
+            "INSERT INTO phones (key, phone) VALUES (?, ?)", ((key, phone) for phone in phones)
+        )
+
+    def _remove(self, key: str) -> None:
+        self.connection.execute("DELETE FROM contacts WHERE key = ?", (key,))
+        self.connection.execute("DELETE FROM phones WHERE key = ?", (key,))
+
+
+class SQLiteNotes(SQLiteMapping):
+    """Notes stored in the ``notes`` and ``note_tags`` tables."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        """Initialize the mapping.
+
+        Args:
+            connection (sqlite3.Connection): The open database connection.
+        """
+        super().__init__(connection, "notes", "title")
+
+    def _from_row(self, row: tuple) -> Note:
+        title, content, tags = row
+        note = Note.__new__(Note)
+        note.title = title
+        note.content = content
+        note.tags = json.loads(tags)
+        return note
+
+    def _store(self, title: str, note: Note) -> None:
+        self.connection.execute(
+            """INSERT INTO notes (title, content, tags) VALUES (?, ?, ?)
+               ON CONFLICT(title) DO UPDATE SET content = excluded.content, tags = excluded.tags""",
+            (title, note.content, json.dumps(note.tags)),
+        )
+        self.connection.execute("DELETE FROM note_tags WHERE title = ?", (title,))
+        self.connection.executemany(
+            "INSERT INTO note_tags (title, tag) VALUES (?, ?)",
+            ((title, tag) for tag in {tag.lower() for tag in note.tags}),
+        )
+
+    def _remove(self, title: str) -> None:
+        self.connection.execute("DELETE FROM notes WHERE title = ?", (title,))
+        self.connection.execute("DELETE FROM note_tags WHERE title = ?", (title,))
+
+
+class SQLitePrefixSearch:
+    """Search as you type answered by a full-text table of the database.
+
+    Offers the interface of PrefixSearch without building a PrefixIndex:
+    every query is a prefix query on the full-text table, and completions
+    come from its vocabulary. Results are row ids, in insertion order.
+    """
+
+    def __init__(self, mapping: SQLiteMapping, table: str, columns: Sequence[str],
+                 fields: Callable[..., Iterable[str]]) -> None:
+        """Start a search.
+
+        Args:
+            mapping (SQLiteMapping): The entries of the book.
+            table (str): Name of the full-text table.
+            columns (Sequence[str]): Indexed columns whose words are searched.
+            fields (Callable[..., Iterable[str]]): Function getting the
+                searched texts of an entry from the values of the columns.
+        """
+        self.mapping = mapping
+        self.table = table
+        self.columns = columns
+        self.fields = fields
+
+    def search(self, query: str) -> List[int]:
+        """Find the entries that have a word of their own starting with every word of a query.
+
+        Args:
+            query (str): Words, the last of which may be incomplete.
+
+        Returns:
+            List[int]: Row ids of the matches, empty for an empty query.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        match = " AND ".join(phrase(token) + "*" for token in dict.fromkeys(tokens))
+        match = f"{{{' '.join(self.columns)}}} : ({match})"
+        needed = {token: count for token, count in words_needed(tokens, tokens).items() if count > 1}
+        connection = self.mapping.connection
+        if not needed:
+            rows = connection.execute(
+                f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH ? ORDER BY rowid", (match,)
+            )
+            return [row[0] for row in rows]
+        # A prefix query cannot ask for two different words, so repeated words are counted here
+        rows = connection.execute(
+            f"""SELECT rowid, {', '.join(self.columns)} FROM {self.mapping.table}
+                WHERE rowid IN (SELECT rowid FROM {self.table} WHERE {self.table} MATCH ?) ORDER BY rowid""",
+            (match,),
+        )
+        matches = []
+        for doc, *values in rows:
+            text = " " + " ".join(word for field in self.fields(*values) for word in tokenize(field))
+            if all(text.count(" " + token) >= count for token, count in needed.items()):
+                matches.append(doc)
+        return matches
+
+    def entries(self, docs: List[int]) -> List[Any]:
+        """Get the entries of some row ids.
+
+        Args:
+            docs (List[int]): Ids from a result of ``search``.
+
+        Returns:
+            List[Any]: The entries.
+        """
+        return self.mapping.select_rowids(docs)
+
+    def completions(self, query: str) -> List[str]:
+        """Get the indexed words that complete the last word of a query.
+
+        Args:
+            query (str): The query being typed.
+
+        Returns:
+            List[str]: Completions of the last word in alphabetical order,
+                none if the query ends with a space.
+        """
+        tokens = tokenize(query)
+        if not tokens or query[-1:].isspace():
+            return []
+        rows = self.mapping.connection.execute(
+            f"""SELECT DISTINCT term FROM {self.table}_vocab
+                WHERE term >= ? AND term < ? AND col IN ({', '.join('?' * len(self.columns))})
+                ORDER BY term LIMIT ?""",
+            (tokens[-1], prefix_end(tokens[-1]), *self.columns, COMPLETION_LIMIT),
+        )
+        return [row[0] for row in rows]
+
+
+class SQLiteAddressBook(AddressBook):
+    """Address book stored in an SQLite database instead of memory.
+
+    Opening the book does not load any records. Records are read when they are
+    accessed, and every change of a record is written to its rows right away.
+    Searches use the indexes of the database, including full-text tables of
+    the name words and of the name trigrams, and never build the in-memory
+    indexes of AddressBook.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """Open or create the address book database.
+
+        Args:
+            filename (str): Path to the database file.
+        """
+        super().__init__()
+        # Checkpoints run on the background writer thread, serialized by its lock
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.executescript(CONTACTS_SCHEMA)
+        create_text_search(self.connection, "contact_words",
+                           text_search_schema("contact_words", "contacts", ["name"], NAME_TOKENIZER))
+        try:
+            create_text_search(self.connection, "contact_trigrams",
+                               text_search_schema("contact_trigrams", "contacts", ["name"], "trigram"))
+            self.has_trigrams = True
+        except sqlite3.OperationalError:
+            # The trigram tokenizer needs SQLite 3.34
+            self.has_trigrams = False
+        self.data = SQLiteRecords(self.connection, self._on_record_change)
+
+    def _on_record_change(self, record: Record, op: str, args: tuple) -> None:
+        """Write a changed record to the database and report the change.
+
+        Args:
+            record (Record): The record that has changed.
+            op (str): Name of the Record method that changed it.
+            args (tuple): Arguments the method was called with.
+        """
+        self.data.save(self.normalize_name(record.name.value), record)
+        super()._on_record_change(record, op, args)
+
+    def _get_birthday_index(self, today: date, future_date: date) -> BirthdayIndex:
+        """Index only the records that the database finds near the interval.
+
+        Args:
+            today (date): First day of the interval.
+            future_date (date): Last day of the interval.
+
+        Returns:
+            BirthdayIndex: Index of the candidate records.
+        """
+        index = BirthdayIndex(self._birthday_of)
+        index.rebuild((self.normalize_name(record.name.value), record)
+                      for record in self._birthday_candidates(today, future_date))
+        return index
+
+    def _birthday_candidates(self, today: date, future_date: date) -> Iterable[Record]:
+        """Get the records with a birthday between two dates from the index.
+
+        Args:
+            today (date): First day of the interval.
+            future_date (date): Last day of the interval.
+
+        Returns:
+            Iterable[Record]: Records to check for upcoming birthdays.
+        """
+        if (future_date - today).days >= 365:
+            return self.data.select("birthday_md IS NOT NULL")
+        # One day of slack on each side keeps 29 February birthdays in range
+        start = today.month * 100 + today.day - 1
+        end = future_date.month * 100 + future_date.day + 1
+        if start <= end:
+            return self.data.select("birthday_md BETWEEN ? AND ?", (start, end))
+        return self.data.select("birthday_md >= ? OR birthday_md <= ?", (start, end))
+
+    @reads
+    def find_contacts(self, query: str) -> List[Record]:
+        """Search for contacts matching the given query.
+
+        Args:
+            query (str): The search query to match against contact information.
+
+        Returns:
+            List[Record]: List of matching contact records.
+        """
+        query = query.strip().lower()
+        return list(self.data.select(
+            """instr(lower(name), :q) OR instr(lower(email), :q) OR instr(birthday_text, :q)
+               OR key IN (SELECT key FROM phones WHERE instr(phone, :q))""",
+            {"q": query},
+        ))
+
+    def _fuzzy_candidates(self, query: str) -> Dict[str, Record]:
+        """Get the records whose names share the rarest trigrams of a query from the database.
+
+        As in ``TrigramIndex.similar``, only the rarest trigrams the query
+        shares with the book are searched, enough to find names two typos
+        away, and the names matching the most of them come first.
+
+        Args:
+            query (str): The name, possibly misspelled.
+
+        Returns:
+            Dict[str, Record]: At most FUZZY_CANDIDATES records by key.
+
+        Raises:
+            ValueError: If this SQLite has no trigram tokenizer.
+        """
+        if not self.has_trigrams:
+            raise ValueError("Fuzzy search needs SQLite 3.34 or newer.")
+        counts = []
+        for gram in trigrams(" ".join(query.lower().split())):
+            counts.extend(self.connection.execute(
+                "SELECT term, doc FROM contact_trigrams_vocab WHERE term = ?", (gram,)
+            ))
+        rarest = [gram for gram, _ in sorted(counts, key=itemgetter(1))[:FUZZY_TRIGRAMS]]
+        if not rarest:
+            return {}
+        rows = self.connection.execute(
+            """SELECT contacts.* FROM contact_trigrams JOIN contacts ON contacts.rowid = contact_trigrams.rowid
+               WHERE contact_trigrams MATCH ? ORDER BY bm25(contact_trigrams) LIMIT ?""",
+            (" OR ".join(map(phrase, rarest)), FUZZY_CANDIDATES),
+        )
+        return {row[0]: self.data._materialize(row) for row in rows}
+
+    @reads
+    def prefix_search(self) -> SQLitePrefixSearch:
+        """Start a search of the names answered by the full-text table of name words.
+
+        Returns:
+            SQLitePrefixSearch: Search matching contacts that have a name
+                word starting with every word of the query.
+        """
+        return SQLitePrefixSearch(self.data, "contact_words", ("name",), lambda name: [name])
+
+    def _phone_owners(self, where: str, params: Iterable = ()) -> List[Tuple[str, List[Record]]]:
+        """Get phone numbers matching a condition with the contacts that have them.
+
+        Args:
+            where (str): SQL condition on the ``phones`` table.
+            params (Iterable): Parameters of the condition.
+
+        Returns:
+            List[Tuple[str, List[Record]]]: The numbers in order, each with
+                the contacts that have it, by name.
+        """
+        rows = self.connection.execute(
+            f"SELECT DISTINCT phone, key FROM phones WHERE {where} ORDER BY phone, key", params
+        ).fetchall()
+        return [(phone, [self.data[key] for _, key in owners])
+                for phone, owners in groupby(rows, key=lambda row: row[0])]
+
+    @reads
+    def find_by_phone(self, phone: str) -> List[Record]:
+        """Find the contacts that have a phone number using the phone index.
+
+        Args:
+            phone (str): The phone number.
+
+        Returns:
+            List[Record]: The contacts with the number, by name.
+        """
+        return [record for _, records in self._phone_owners("phone = ?", (phone.strip(),)) for record in records]
+
+    @reads
+    def find_phones(self, prefix: str) -> List[Tuple[str, List[Record]]]:
+        """Find the phone numbers that start with a prefix using the phone index.
+
+        The prefix is turned into a range of numbers, which the index can
+        answer; ``LIKE`` ignores case and so could not use it.
+
+        Args:
+            prefix (str): The first digits of the numbers.
+
+        Returns:
+            List[Tuple[str, List[Record]]]: The numbers in order, each with
+                the contacts that have it.
+        """
+        prefix = prefix.strip()
+        if not prefix:
+            return self._phone_owners("1")
+        end = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return self._phone_owners("phone >= ? AND phone < ?", (prefix, end))
+
+    @reads
+    def shared_phones(self) -> List[Tuple[str, List[Record]]]:
+        """Find the phone numbers that several contacts have using the phone index.
+
+        Returns:
+            List[Tuple[str, List[Record]]]: The numbers in order, each with
+                the contacts that have it.
+        """
+        return self._phone_owners(
+            "phone IN (SELECT phone FROM phones GROUP BY phone HAVING COUNT(DISTINCT key) > 1)"
+        )
+
+    def commit(self) -> None:
+        """Make the changes since the last commit durable."""
+        self.connection.commit()
+
+    def close(self) -> None:
+        """Commit the pending changes and close the database."""
+        self.connection.commit()
+        self.connection.close()
+
+
+class SQLiteNotesBook(NotesBook):
+    """Notes book stored in an SQLite database instead of memory.
+
+    Notes are read when they are accessed and written back as soon as a
+    NotesBook method changes them. Tag searches use an index, and word
+    searches a full-text table of the titles, content and tags; the
+    in-memory indexes of NotesBook are never built.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """Open or create the notes book database.
+
+        Args:
+            filename (str): Path to the database file.
+        """
+        super().__init__()
+        # Checkpoints run on the background writer thread, serialized by its lock
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.executescript(NOTES_SCHEMA)
+        create_text_search(self.connection, "note_words",
+                           text_search_schema("note_words", "notes", ["title", "content", "tags"], NOTE_TOKENIZER))
+        self.data = SQLiteNotes(self.connection)
+        self.subscribe(self._save_note)
+
+    def _save_note(self, change) -> None:
+        """Write a note changed in place by a NotesBook method to the database.
+
+        Args:
+            change (Change): The change reported by the book.
+        """
+        if change.op in ("edit_note", "add_tag_to_note", "remove_tag_from_note"):
+            self.data.save(change.key, self.data[change.key])
+
+    @reads
+    def find_notes(self, keyword: str) -> List[Note]:
+        """Search for notes containing the given keyword in their title.
+
+        Args:
+            keyword (str): The keyword to search for.
+
+        Returns:
+            List[Note]: List of matching notes.
+        """
+        keyword = keyword.strip().lower()
+        return list(self.data.select("instr(lower(title), ?)", (keyword,)))
+
+    @reads
+    def find_notes_by_tag(self, tag: str) -> List[Note]:
+        """Search for notes containing a specific tag using the tag index.
+
+        Args:
+            tag (str): The tag to search for.
+
+        Returns:
+            List[Note]: List of notes containing the specified tag.
+        """
+        return list(self.data.select(*self._tagged(tag)))
+
+    @staticmethod
+    def _tagged(tag: str) -> Condition:
+        """Get the condition on the notes carrying a tag.
+
+        Args:
+            tag (str): The tag, in any case.
+
+        Returns:
+            Condition: Condition using the tag index.
+        """
+        return Condition("title IN (SELECT title FROM note_tags WHERE tag = ?)", (tag.strip().lower(),))
+
+    @reads
+    def query_tags(self, expression: str) -> List[Note]:
+        """Search for notes whose tags match an expression, translated into one SQL query.
+
+        Args:
+            expression (str): A query such as "work AND urgent NOT done".
+
+        Returns:
+            List[Note]: List of matching notes.
+
+        Raises:
+            ValueError: If the expression is empty or malformed.
+        """
+        return list(self.data.select(*evaluate_query(expression, self._tagged, Condition("1"))))
+
+    @reads
+    def search_notes(self, query: str, limit: Optional[int] = SEARCH_LIMIT) -> List[Note]:
+        """Search the titles, content and tags for any word of the query using the full-text table.
+
+        Notes are ranked with the BM25 of SQLite, so notes containing more
+        of the query words, or rarer ones, come first.
+
+        Args:
+            query (str): The words to search for.
+            limit (Optional[int]): Maximum number of notes, or None for all.
+
+        Returns:
+            List[Note]: Matching notes, most relevant first.
+        """
+        words = dict.fromkeys(text_tokenize(query))
+        if not words:
+            return []
+        rows = self.connection.execute(
+            """SELECT notes.* FROM note_words JOIN notes ON notes.rowid = note_words.rowid
+               WHERE note_words MATCH ? ORDER BY bm25(note_words) LIMIT ?""",
+            (" OR ".join(map(phrase, words)), -1 if limit is None else limit),
+        )
+        return [self.data._materialize(row) for row in rows]
+
+    @reads
+    def prefix_search(self) -> SQLitePrefixSearch:
+        """Start a search of the titles and tags answered by the full-text table.
+
+        Returns:
+            SQLitePrefixSearch: Search matching notes that have a title word
+                or tag starting with every word of the query.
+        """
+        return SQLitePrefixSearch(self.data, "note_words", ("title", "tags"), lambda title, tags: [title, *json.loads(tags)])
+
+    def commit(self) -> None:
+        """Make the changes since the last commit durable."""
+        self.connection.commit()
+
+    def close(self) -> None:
+        """Commit the pending changes and close the database."""
+        self.connection.commit()
+        self.connection.close()
@@ -0,0 +1,285 @@
+import re
+import sys
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, TypeVar
+
+from src.utils.dispatcher import cancellable
+
+MIN_DEAD_FOR_REBUILD = 1024  # Never rebuild small indexes just to drop removed entries
+OPERATORS = ("AND", "OR", "NOT")
+QUERY_TOKEN_PATTERN = re.compile(r"[()]|[^\s()]+")
+
+T = TypeVar('T')
+
+
+class TagIndex:
+    """Index from tags to the entries carrying them, stored as bitmaps.
+
+    Every indexed entry gets a bit position and every distinct lowercase tag
+    an interned integer id. Each tag id maps to a Python integer whose set
+    bits are the entries carrying the tag, so AND, OR and NOT queries are
+    evaluated with integer bit operations. Removing an entry only clears its
+    bit; positions are compacted once most of them are dead.
+    """
+
+    def __init__(self, tags: Callable[[Any], Iterable[str]]) -> None:
+        """Initialize an empty index.
+
+        Args:
+            tags (Callable[[Any], Iterable[str]]): Function returning the tags of an entry.
+        """
+        self.tags = tags
+        self._tag_ids: Dict[str, int] = {}
+        self._bitmaps: List[int] = []
+        self._keys: List[Optional[str]] = []
+        self._positions: Dict[str, int] = {}
+        self._entry_tags: Dict[str, FrozenSet[int]] = {}
+        self._live = 0
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _tag_id(self, tag: str) -> int:
+        """Get the id of a tag, assigning the next free id to a new one.
+
+        Args:
+            tag (str): Lowercase tag.
+
+        Returns:
+            int: The id of the tag.
+        """
+        tag_id = self._tag_ids.get(tag)
+        if tag_id is None:
+            tag_id = self._tag_ids[sys.intern(tag)] = len(self._bitmaps)
+            self._bitmaps.append(0)
+        return tag_id
+
+    def add(self, key: str, entry: Any) -> None:
+        """Index an entry, replacing the previous version with the same key.
+
+        Args:
+            key (str): The key of the entry in its book.
+            entry (Any): The entry to index.
+        """
+        position = self._positions.get(key)
+        if position is None:
+            position = self._positions[key] = len(self._keys)
+            self._keys.append(key)
+        else:
+            # Keep the position, so the entry stays in place in the results
+            mask = ~(1 << position)
+            for tag_id in self._entry_tags[key]:
+                self._bitmaps[tag_id] &= mask
+        bit = 1 << position
+        self._live |= bit
+        tag_ids = frozenset(self._tag_id(tag.strip().lower()) for tag in self.tags(entry))
+        for tag_id in tag_ids:
+            self._bitmaps[tag_id] |= bit
+        self._entry_tags[key] = tag_ids
+
+    def discard(self, key: str) -> None:
+        """Remove an entry from the index if it is there.
+
+        Args:
+            key (str): The key of the entry in its book.
+        """
+        position = self._positions.pop(key, None)
+        if position is None:
+            return
+        mask = ~(1 << position)
+        for tag_id in self._entry_tags.pop(key):
+            self._bitmaps[tag_id] &= mask
+        self._live &= mask
+        self._keys[position] = None
+        self._dead += 1
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """bool: True if most bit positions belong to removed entries."""
+        return self._dead >= MIN_DEAD_FOR_REBUILD and self._dead * 2 > len(self._keys)
+
+    def rebuild(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """Index a fresh set of entries from scratch.
+
+        Args:
+            items (Iterable[Tuple[str, Any]]): Keys and entries to index.
+
+        Raises:
+            Cancelled: If the command building the index is cancelled.
+        """
+        self._tag_ids = {}
+        self._bitmaps = []
+        self._keys = []
+        self._positions = {}
+        self._entry_tags = {}
+        self._live = 0
+        self._dead = 0
+        for key, entry in cancellable(items):
+            self.add(key, entry)
+
+    def bitmap(self, tag: str) -> int:
+        """Get the bitmap of the entries carrying a tag.
+
+        Args:
+            tag (str): The tag, in any case.
+
+        Returns:
+            int: Bitmap with the positions of the matching entries set.
+        """
+        tag_id = self._tag_ids.get(tag.strip().lower())
+        return 0 if tag_id is None else self._bitmaps[tag_id]
+
+    def keys(self, bitmap: int) -> List[str]:
+        """Get the keys of the entries in a bitmap, in the order they were indexed.
+
+        Args:
+            bitmap (int): Bitmap of entry positions.
+
+        Returns:
+            List[str]: Keys of the entries.
+        """
+        # Scanning the binary digits costs one pass instead of one big-int operation per key
+        bits = bin(bitmap)[:1:-1]
+        keys = []
+        position = bits.find("1")
+        while position != -1:
+            keys.append(self._keys[position])
+            position = bits.find("1", position + 1)
+        return keys
+
+    def find(self, tag: str) -> List[str]:
+        """Get the keys of the entries carrying a tag.
+
+        Args:
+            tag (str): The tag, in any case.
+
+        Returns:
+            List[str]: Keys of the matching entries.
+        """
+        return self.keys(self.bitmap(tag))
+
+    def query(self, expression: str) -> List[str]:
+        """Get the keys of the entries matching a tag expression.
+
+        Tags are combined with the uppercase operators AND, OR and NOT, which bind in the order NOT,
+        AND, OR, and can be grouped with parentheses. "a NOT b" is read as
+        "a AND NOT b". Consecutive words without an operator between them
+        form one tag, so tags may contain spaces.
+
+        Args:
+            expression (str): A query such as "work AND urgent NOT done".
+
+        Returns:
+            List[str]: Keys of the matching entries.
+
+        Raises:
+            ValueError: If the expression is empty or malformed.
+        """
+        return self.keys(evaluate_query(expression, self.bitmap, self._live))
+
+
+def evaluate_query(expression: str, lookup: Callable[[str], T], everything: T) -> T:
+    """Evaluate a tag expression with the grammar of ``TagIndex.query``.
+
+    The operators are applied to the values of the tags with ``&``, ``|``
+    and ``~``, so the same parser combines bitmaps or any other value that
+    supports them, such as conditions of a database query.
+
+    Args:
+        expression (str): A query such as "work AND urgent NOT done".
+        lookup (Callable[[str], T]): Function getting the value of a tag.
+        everything (T): Value matching every entry, which NOT subtracts from.
+
+    Returns:
+        T: The value of the whole expression.
+
+    Raises:
+        ValueError: If the expression is empty or malformed.
+    """
+    return _QueryParser(QUERY_TOKEN_PATTERN.findall(expression), lookup, everything).parse()
+
+
+class _QueryParser:
+    """Recursive descent parser evaluating a tag expression."""
+
+    def __init__(self, tokens: List[str], lookup: Callable[[str], Any], everything: Any) -> None:
+        """Initialize the parser.
+
+        Args:
+            tokens (List[str]): Words and parentheses of the expression.
+            lookup (Callable[[str], Any]): Function getting the value of a tag.
+            everything (Any): Value matching every entry.
+        """
+        self.tokens = tokens
+        self.lookup = lookup
+        self.everything = everything
+        self.position = 0
+
+    def _peek(self) -> Optional[str]:
+        """Get the next token without consuming it, or None at the end."""
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def _operator(self) -> Optional[str]:
+        """Get the next token if it is an operator, or None if it is not one."""
+        token = self._peek()
+        return token if token in OPERATORS else None
+
+    def parse(self) -> int:
+        """Evaluate the whole expression.
+
+        Returns:
+            Any: The value of the matching entries.
+
+        Raises:
+            ValueError: If the expression is empty or malformed.
+        """
+        if not self.tokens:
+            raise ValueError("Tag query is empty.")
+        result = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected '{self._peek()}' in tag query.")
+        return result
+
+    def _or(self) -> Any:
+        """Evaluate terms joined with OR."""
+        result = self._and()
+        while self._operator() == "OR":
+            self.position += 1
+            result |= self._and()
+        return result
+
+    def _and(self) -> Any:
+        """Evaluate factors joined with AND or NOT."""
+        result = self._not()
+        while self._operator() in ("AND", "NOT"):
+            if self._operator() == "AND":
+                self.position += 1
+            result &= self._not()
+        return result
+
+    def _not(self) -> Any:
+        """Evaluate a factor, negated by any leading NOT."""
+        if self._operator() == "NOT":
+            self.position += 1
+            return self.everything & ~self._not()
+        return self._operand()
+
+    def _operand(self) -> Any:
+        """Evaluate a tag or a parenthesized expression."""
+        token = self._peek()
+        if token is None or token == ")" or self._operator():
+            raise ValueError("Tag query is missing a tag.")
+        self.position += 1
+        if token == "(":
+            result = self._or()
+            if self._peek() != ")":
+                raise ValueError("Tag query is missing ')'.")
+            self.position += 1
+            return result
+        words = [token]
+        while self._peek() not in (None, "(", ")") and not self._operator():
+            words.append(self.tokens[self.position])
+            self.position += 1
+        return self.lookup(" ".join(words))
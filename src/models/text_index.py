@@ -0,0 +1,131 @@
+import heapq
+import math
+import re
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.utils.dispatcher import cancellable
+
+TOKEN_PATTERN = re.compile(r"\w+")
+K1 = 1.2  # How quickly repeated terms stop adding to the score
+B = 0.75  # How much long documents are penalized
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text into lowercase words.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        List[str]: The words of the text in order, with repetitions.
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class TextIndex:
+    """Inverted index from words to the entries containing them, ranked with BM25.
+
+    Each word maps to the keys of the entries containing it and the number of
+    times it occurs there. A query only visits the entries of its own words,
+    so its cost does not depend on the size of the book.
+    """
+
+    def __init__(self, fields: Callable[[Any], Iterable[str]]) -> None:
+        """Initialize an empty index.
+
+        Args:
+            fields (Callable[[Any], Iterable[str]]): Function returning the
+                texts of an entry that should be searchable.
+        """
+        self.fields = fields
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._terms: Dict[str, Tuple[str, ...]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, key: str, entry: Any) -> None:
+        """Index an entry, replacing the previous version with the same key.
+
+        Args:
+            key (str): The key of the entry in its book.
+            entry (Any): The entry to index.
+        """
+        self.discard(key)
+        counts: Dict[str, int] = {}
+        length = 0
+        for text in self.fields(entry):
+            for token in tokenize(text):
+                counts[token] = counts.get(token, 0) + 1
+                length += 1
+        for token, count in counts.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+            posting[key] = count
+        self._terms[key] = tuple(counts)
+        self._lengths[key] = length
+        self._total_length += length
+
+    def discard(self, key: str) -> None:
+        """Remove an entry from the index if it is there.
+
+        Args:
+            key (str): The key of the entry in its book.
+        """
+        terms = self._terms.pop(key, None)
+        if terms is None:
+            return
+        for token in terms:
+            posting = self._postings[token]
+            del posting[key]
+            if not posting:
+                del self._postings[token]
+        self._total_length -= self._lengths.pop(key)
+
+    def rebuild(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """Index a fresh set of entries from scratch.
+
+        Args:
+            items (Iterable[Tuple[str, Any]]): Keys and entries to index.
+
+        Raises:
+            Cancelled: If the command building the index is cancelled.
+        """
+        self._postings = {}
+        self._terms = {}
+        self._lengths = {}
+        self._total_length = 0
+        for key, entry in cancellable(items):
+            self.add(key, entry)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Get the entries containing any word of the query, best matches first.
+
+        Args:
+            query (str): The words to search for.
+            limit (Optional[int]): Maximum number of results, or None for all.
+
+        Returns:
+            List[Tuple[str, float]]: Keys of the matching entries and their BM25 scores.
+        """
+        count = len(self._lengths)
+        if not count:
+            return []
+        average_length = self._total_length / count or 1
+        lengths = self._lengths
+        scores: Dict[str, float] = {}
+        for token in set(tokenize(query)):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for key, frequency in posting.items():
+                norm = K1 * (1 - B + B * lengths[key] / average_length)
+                scores[key] = scores.get(key, 0.0) + idf * frequency * (K1 + 1) / (frequency + norm)
+        if limit is None:
+            return sorted(scores.items(), key=itemgetter(1), reverse=True)
+        return heapq.nlargest(limit, scores.items(), key=itemgetter(1))
@@ -0,0 +1,337 @@
+import json
+import os
+import socketserver
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from src.constants.commands import COMMAND_HELP_MESSAGES, COMMAND_KINDS
+from src.models.address_book import AddressBook
+from src.models.notes_book import NotesBook
+from src.ui.renderer import ANSI_SGR
+from src.utils.export import contact_fields, note_fields
+from src.utils.rwlock import ReadWriteLock
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_LIMIT = 100  # Entries returned by a listing without a limit
+MAX_LIMIT = 10000
+MAX_BODY_SIZE = 1024 * 1024  # Largest accepted request body in bytes
+
+Response = Tuple[int, Any]
+
+
+class ApiError(Exception):
+    """An error answered with an HTTP status and a JSON message."""
+
+    def __init__(self, status: int, message: str) -> None:
+        """Initialize the error.
+
+        Args:
+            status (int): The HTTP status code.
+            message (str): Description of the error for the client.
+        """
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _message(error: Exception) -> str:
+    """Get the message of an error without the quotes KeyError adds."""
+    return str(error.args[0]) if error.args else type(error).__name__
+
+
+def _page(items: Iterable, params: Dict[str, str]) -> List:
+    """Get the page of items selected by the offset and limit parameters.
+
+    Args:
+        items (Iterable): The items, read lazily.
+        params (Dict[str, str]): Query parameters.
+
+    Returns:
+        List: At most ``limit`` items after the first ``offset``.
+
+    Raises:
+        ApiError: If offset or limit is not a non-negative number.
+    """
+    try:
+        offset = int(params.get("offset", 0))
+        limit = min(int(params.get("limit", DEFAULT_LIMIT)), MAX_LIMIT)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "offset and limit must be numbers.")
+    if offset < 0 or limit < 0:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "offset and limit must not be negative.")
+    return list(islice(items, offset, offset + limit))
+
+
+class BookApi:
+    """Answers the requests of the JSON API from the books.
+
+    Commands run through the same handlers as the menu and batch mode, which
+    take the lock themselves. The other endpoints read the books directly and
+    hold the lock for reading while they copy the entries into plain values,
+    so many lookups run together and never see a half-applied write.
+
+    Endpoints:
+        GET  /health                   Number of contacts and notes.
+        GET  /commands                 Commands with their kind and help text.
+        POST /commands/<command>       Run a command; body {"args": "..."}.
+        GET  /contacts?q=&offset=&limit=
+        GET  /contacts/<name>
+        GET  /notes?q=|tag=|query=&offset=&limit=
+        GET  /notes/<title>
+        GET  /birthdays?days=
+    """
+
+    def __init__(self, handlers: Dict[str, Callable[[str], Any]], address_book: AddressBook,
+                 notes_book: NotesBook, lock: ReadWriteLock) -> None:
+        """Initialize the API.
+
+        Args:
+            handlers (Dict[str, Callable[[str], Any]]): Command handlers that
+                take the lock themselves.
+            address_book (AddressBook): The address book.
+            notes_book (NotesBook): The notes book.
+            lock (ReadWriteLock): The lock guarding the books.
+        """
+        self.handlers = handlers
+        self.address_book = address_book
+        self.notes_book = notes_book
+        self.lock = lock
+
+    def handle(self, method: str, target: str, body: bytes = b"") -> Response:
+        """Answer a request.
+
+        Args:
+            method (str): The HTTP method.
+            target (str): The request path with its query string.
+            body (bytes): The request body.
+
+        Returns:
+            Response: The HTTP status and the JSON payload.
+        """
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/", 1)]
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        routes = {
+            "health": (self.health, "GET"),
+            "commands": (self.commands, "GET" if len(parts) == 1 else "POST"),
+            "contacts": (self.contacts, "GET"),
+            "notes": (self.notes, "GET"),
+            "birthdays": (self.birthdays, "GET"),
+        }
+        try:
+            if parts[0] not in routes:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown path {url.path}.")
+            endpoint, allowed = routes[parts[0]]
+            if method != allowed:
+                raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, f"Use {allowed} for {url.path}.")
+            return HTTPStatus.OK, endpoint(parts[1] if len(parts) > 1 else None, params, body)
+        except ApiError as e:
+            return e.status, {"error": e.message}
+
+    def health(self, _: Optional[str], params: Dict[str, str], body: bytes) -> dict:
+        """Report that the server is up and how big the books are."""
+        with self.lock.read():
+            return {"status": "ok", "contacts": len(self.address_book.data), "notes": len(self.notes_book.data)}
+
+    def commands(self, command: Optional[str], params: Dict[str, str], body: bytes) -> Any:
+        """List the commands, or run one with the arguments in the body.
+
+        Args:
+            command (Optional[str]): Name of the command to run, None to list them.
+            params (Dict[str, str]): Query parameters.
+            body (bytes): JSON object with the "args" string of the command.
+
+        Returns:
+            Any: The commands, or the result of the command without colour codes.
+
+        Raises:
+            ApiError: If the command is unknown, the body is malformed or the
+                command fails.
+        """
+        if command is None:
+            return [
+                {"name": name.value, "kind": COMMAND_KINDS[name].value, "help": COMMAND_HELP_MESSAGES.get(name, "")}
+                for name in self.handlers
+            ]
+        if command not in self.handlers:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown command {command}.")
+        try:
+            request = json.loads(body or b"{}")
+            args = request.get("args", "")
+        except (ValueError, AttributeError):
+            raise ApiError(HTTPStatus.BAD_REQUEST, 'The body must be a JSON object like {"args": "..."}.')
+        if not isinstance(args, str):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "args must be a string.")
+        try:
+            result = self.handlers[command](args)
+        except Exception as e:
+            raise ApiError(HTTPStatus.BAD_REQUEST, ANSI_SGR.sub("", _message(e)))
+        return {"result": ANSI_SGR.sub("", str(result))}
+
+    def contacts(self, name: Optional[str], params: Dict[str, str], body: bytes) -> Any:
+        """Get a contact by name, or the contacts matching a search.
+
+        Args:
+            name (Optional[str]): Name of the contact, None to list contacts.
+            params (Dict[str, str]): "q" to search, "offset" and "limit" to page.
+            body (bytes): Unused.
+
+        Returns:
+            Any: The fields of the contact, or of the page of contacts.
+
+        Raises:
+            ApiError: If the contact is not found.
+        """
+        with self.lock.read():
+            if name is not None:
+                record = self.address_book.find(name)
+                if record is None:
+                    raise ApiError(HTTPStatus.NOT_FOUND, f"Contact '{self.address_book.normalize_name(name)}' not found.")
+                return contact_fields(record)
+            query = params.get("q", "").strip()
+            records = self.address_book.find_contacts(query) if query else self.address_book.data.values()
+            return {"contacts": [contact_fields(record) for record in _page(records, params)]}
+
+    def notes(self, title: Optional[str], params: Dict[str, str], body: bytes) -> Any:
+        """Get a note by title, or the notes matching a search.
+
+        Args:
+            title (Optional[str]): Title of the note, None to list notes.
+            params (Dict[str, str]): "q" for a word search, "tag" for a tag,
+                "query" for a tag expression, "offset" and "limit" to page.
+            body (bytes): Unused.
+
+        Returns:
+            Any: The fields of the note, or of the page of notes.
+
+        Raises:
+            ApiError: If the note is not found or the tag expression is malformed.
+        """
+        with self.lock.read():
+            if title is not None:
+                note = self.notes_book.data.get(title)
+                if note is None:
+                    raise ApiError(HTTPStatus.NOT_FOUND, f"Note '{title}' not found.")
+                return note_fields(note)
+            try:
+                if params.get("q", "").strip():
+                    notes = self.notes_book.search_notes(params["q"], limit=None)
+                elif params.get("tag", "").strip():
+                    notes = self.notes_book.find_notes_by_tag(params["tag"].strip())
+                elif params.get("query", "").strip():
+                    notes = self.notes_book.query_tags(params["query"])
+                else:
+                    notes = self.notes_book.data.values()
+            except ValueError as e:
+                raise ApiError(HTTPStatus.BAD_REQUEST, _message(e))
+            return {"notes": [note_fields(note) for note in _page(notes, params)]}
+
+    def birthdays(self, _: Optional[str], params: Dict[str, str], body: bytes) -> dict:
+        """Get the birthdays in the next days.
+
+        Args:
+            _ (Optional[str]): Unused.
+            params (Dict[str, str]): "days" to look ahead, 7 by default.
+            body (bytes): Unused.
+
+        Returns:
+            dict: Names, birthdays and congratulation dates in date order.
+
+        Raises:
+            ApiError: If the number of days is not valid.
+        """
+        with self.lock.read():
+            try:
+                return {"birthdays": self.address_book.get_upcoming_birthdays(params.get("days", "7"))}
+            except ValueError as e:
+                raise ApiError(HTTPStatus.BAD_REQUEST, _message(e))
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    """Serves the requests of one connection, keeping it open between them."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive by default
+    # Buffer the headers and the body into one send; written separately, the
+    # body waits for the client's delayed ACK of the headers on every request
+    wbufsize = 64 * 1024
+
+    def do_GET(self) -> None:
+        self._answer()
+
+    def do_POST(self) -> None:
+        self._answer()
+
+    # Other methods get a JSON 405 from the API instead of an HTML 501
+    do_PUT = do_PATCH = do_DELETE = do_POST
+
+    def _answer(self) -> None:
+        """Read the body, let the API answer and send the JSON response."""
+        header = self.headers.get("Content-Length") or "0"
+        # Without a usable length the body cannot be told from the next request
+        length = int(header) if header.isascii() and header.isdigit() else -1
+        if length < 0:
+            status, payload = HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length."}
+            self.close_connection = True
+        elif length > MAX_BODY_SIZE:
+            status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "The request body is too large."}
+            self.close_connection = True
+        else:
+            body = self.rfile.read(length) if length else b""
+            status, payload = self.server.api.handle(self.command, self.path, body)
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Clients of a Unix socket have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Do not log every request; thousands per second would flood the terminal."""
+
+
+class ApiServer(ThreadingHTTPServer):
+    """HTTP server answering every connection on its own thread."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], api: BookApi) -> None:
+        """Initialize the server and bind it.
+
+        Args:
+            address (Tuple[str, int]): Host and port; port 0 picks a free one.
+            api (BookApi): The API answering the requests.
+        """
+        self.api = api
+        super().__init__(address, ApiRequestHandler)
+
+
+class UnixApiServer(socketserver.ThreadingUnixStreamServer):
+    """HTTP server on a Unix socket, answering every connection on its own thread."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, api: BookApi) -> None:
+        """Initialize the server and bind it, replacing a stale socket file.
+
+        Args:
+            path (str): Path of the socket file.
+            api (BookApi): The API answering the requests.
+        """
+        self.api = api
+        if os.path.exists(path):
+            os.remove(path)
+        super().__init__(path, ApiRequestHandler)
+
+    def server_close(self) -> None:
+        """Close the socket and remove its file."""
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
@@ -0,0 +1,96 @@
+import re
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+
+ANSI_PATTERN = re.compile(r"\x1b\[[0-9;]*m")
+
+
+class BatchRunner:
+    """Runs commands read from a script instead of the interactive menu.
+
+    Each non-empty line holds a command name followed by its arguments, in the
+    same format the menu prompts for, for example::
+
+        Add Contact John Smith 1234567890
+        Add Birthday John Smith: 01.01.2000
+        # Lines starting with '#' are comments
+
+    Command names are matched case-insensitively; the longest matching name
+    wins, so "Find Notes by Tag" is not mistaken for "Find Note". Results go to
+    the output stream as they are produced and errors to the error stream,
+    prefixed with their line number. A failing line does not stop the script.
+    """
+
+    def __init__(self, output: TextIO = sys.stdout, errors: TextIO = sys.stderr,
+                 strip_colors: Optional[bool] = None) -> None:
+        """Initialize the runner.
+
+        Args:
+            output (TextIO): Stream for command results.
+            errors (TextIO): Stream for error messages.
+            strip_colors (Optional[bool]): Remove ANSI colors from the results.
+                By default colors are kept only if the output is a terminal.
+        """
+        self.output = output
+        self.errors = errors
+        if strip_colors is None:
+            strip_colors = not (hasattr(output, "isatty") and output.isatty())
+        self.strip_colors = strip_colors
+
+    @staticmethod
+    def parse(line: str, commands: List[str]) -> Optional[Tuple[str, str]]:
+        """Split a script line into a command and its arguments.
+
+        Args:
+            line (str): The line without its newline.
+            commands (List[str]): Known command names, longest first.
+
+        Returns:
+            Optional[Tuple[str, str]]: The command and its arguments, or None
+                if the line starts with no known command.
+        """
+        lowered = line.lower()
+        for command in commands:
+            name = command.lower()
+            if lowered.startswith(name) and lowered[len(name):len(name) + 1] in ("", " ", ":", "\t"):
+                return command, line[len(name):].lstrip(" :\t")
+        return None
+
+    def _write(self, stream: TextIO, text: str) -> None:
+        """Write a line of text to a stream, without colors if requested."""
+        if self.strip_colors:
+            text = ANSI_PATTERN.sub("", text)
+        print(text, file=stream)
+
+    def run(self, handlers: Dict[str, Callable[[str], str]], lines: Iterable[str]) -> int:
+        """Run every command of a script.
+
+        Args:
+            handlers (Dict[str, Callable[[str], str]]): Handlers by command name.
+            lines (Iterable[str]): Lines of the script; read lazily, so a file
+                or stdin can be passed directly.
+
+        Returns:
+            int: Number of lines that failed.
+        """
+        commands = sorted(handlers, key=len, reverse=True)
+        failed = 0
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parsed = self.parse(line, commands)
+            if parsed is None:
+                failed += 1
+                self._write(self.errors, f"line {number}: Unknown command: {line}")
+                continue
+            command, args = parsed
+            try:
+                result = handlers[command](args)
+            except Exception as e:
+                failed += 1
+                self._write(self.errors, f"line {number}: {e}")
+                continue
+            if result:
+                self._write(self.output, str(result))
+        return failed
@@ -0,0 +1,170 @@
+import curses
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Colour pairs set up by TerminalUI.init_screen
+GREEN, WHITE, RED, YELLOW, BLUE, MAGENTA, CYAN = range(1, 8)
+
+ANSI_SGR = re.compile(r"\x1b\[([0-9;]*)m")
+PARSE_CACHE_SIZE = 4096  # Number of parsed lines kept for redraws
+
+# Foreground colour codes of colorama, normal and light variants
+SGR_PAIRS = {
+    "31": RED, "32": GREEN, "33": YELLOW, "34": BLUE, "35": MAGENTA, "36": CYAN, "37": WHITE,
+    "91": RED, "92": GREEN, "93": YELLOW, "94": BLUE, "95": MAGENTA, "96": CYAN, "97": WHITE,
+}
+# Codes that go back to the default colour of the line
+SGR_RESETS = {"", "0", "39"}
+
+Run = Tuple[str, int]
+FrameLine = Tuple[str, int]
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_line(line: str, default_pair: int) -> Tuple[Run, ...]:
+    """Split a line with ANSI colour codes into runs of text of one colour.
+
+    Args:
+        line (str): The line, possibly containing colorama colour codes.
+        default_pair (int): Colour pair of text before any code and after a reset.
+
+    Returns:
+        Tuple[Run, ...]: Text and colour pair of each run, without the codes.
+            Neighbouring runs of the same colour are merged.
+    """
+    runs: List[Run] = []
+    pair = default_pair
+    position = 0
+    for match in ANSI_SGR.finditer(line):
+        if match.start() > position:
+            _append_run(runs, line[position:match.start()], pair)
+        for code in match[1].split(";"):
+            if code in SGR_RESETS:
+                pair = default_pair
+            else:
+                pair = SGR_PAIRS.get(code, pair)
+        position = match.end()
+    if position < len(line):
+        _append_run(runs, line[position:], pair)
+    return tuple(runs)
+
+
+def _append_run(runs: List[Run], text: str, pair: int) -> None:
+    """Append text to the runs, extending the last run if it has the same colour."""
+    if runs and runs[-1][1] == pair:
+        runs[-1] = (runs[-1][0] + text, pair)
+    else:
+        runs.append((text, pair))
+
+
+class Renderer:
+    """Draws lines with ANSI colour codes on a curses window.
+
+    Each line is parsed once into runs of one colour, and each run is drawn
+    with a single ``addstr``. The renderer remembers what every row shows,
+    so drawing a new frame only touches the rows that differ from the last
+    one, and ``refresh`` sends them to the terminal with a single
+    ``doupdate``.
+    """
+
+    def __init__(self, window, color_pair: Callable[[int], int] = curses.color_pair) -> None:
+        """Initialize the renderer.
+
+        Args:
+            window: The curses window to draw on.
+            color_pair (Callable[[int], int]): Function turning a colour pair
+                number into a curses attribute.
+        """
+        self.window = window
+        self.color_pair = color_pair
+        self._rows: Dict[int, Tuple[Run, ...]] = {}
+        self._size = None
+
+    def draw_frame(self, lines: Sequence[FrameLine]) -> None:
+        """Draw a whole screen of lines from the top of the window.
+
+        Rows below the last line are cleared if they show something.
+
+        Args:
+            lines (Sequence[FrameLine]): Text of every row, with the colour
+                pair of its text outside any colour code.
+        """
+        height, _ = self._check_size()
+        for row, (text, pair) in enumerate(lines[:height]):
+            self.draw_line(row, text, pair)
+        self.clear_from(len(lines))
+
+    def draw_line(self, row: int, text: str, pair: int = WHITE) -> None:
+        """Draw a single row, unless it already shows the same text.
+
+        Args:
+            row (int): The row of the window.
+            text (str): The text, possibly containing colour codes.
+            pair (int): Colour pair of text outside any colour code.
+        """
+        self.draw_runs(row, parse_line(text, pair))
+
+    def draw_runs(self, row: int, runs: Sequence[Run]) -> None:
+        """Draw a single row of runs, unless it already shows the same runs.
+
+        Args:
+            row (int): The row of the window.
+            runs (Sequence[Run]): Text and colour pair of each run.
+        """
+        height, width = self._check_size()
+        runs = tuple(runs)
+        if row >= height or self._rows.get(row) == runs:
+            return
+        self._clear_row(row)
+        x = 0
+        for run_text, run_pair in runs:
+            if x >= width:
+                break
+            run_text = run_text[:width - x]
+            try:
+                self.window.addstr(row, x, run_text, self.color_pair(run_pair))
+            except curses.error:
+                pass  # Writing the bottom-right cell moves the cursor off the window
+            x += len(run_text)
+        self._rows[row] = runs
+
+    def clear_from(self, first_row: int) -> None:
+        """Clear the rows from a row down that show something.
+
+        Args:
+            first_row (int): The first row to clear.
+        """
+        for row in [row for row in self._rows if row >= first_row]:
+            self._clear_row(row)
+            del self._rows[row]
+
+    def invalidate(self) -> None:
+        """Forget what the rows show, so the next frame redraws all of them."""
+        self._rows.clear()
+
+    def refresh(self) -> None:
+        """Send the changed rows to the terminal."""
+        self.window.noutrefresh()
+        curses.doupdate()
+
+    def _clear_row(self, row: int) -> None:
+        """Clear a row of the window."""
+        try:
+            self.window.move(row, 0)
+            self.window.clrtoeol()
+        except curses.error:
+            pass
+
+    def _check_size(self) -> Tuple[int, int]:
+        """Get the size of the window, starting over if it has been resized.
+
+        Returns:
+            Tuple[int, int]: Number of rows and columns.
+        """
+        size = self.window.getmaxyx()
+        if size != self._size:
+            self._size = size
+            self._rows.clear()
+            self.window.erase()
+        return size
@@ -0,0 +1,162 @@
+import curses
+from typing import Any, List, NamedTuple, Sequence
+
+from src.models.prefix_index import PrefixSearch
+from src.ui.renderer import Renderer, Run, CYAN, GREEN, WHITE, YELLOW
+from src.ui.table_view import COLUMN_GAP, MAX_COLUMN_WIDTH, Column, fit
+
+DEBOUNCE_DELAY = 40  # Milliseconds without a key before the query is searched
+ESC = "\x1b"
+BACKSPACE_KEYS = ("\x7f", "\b", curses.KEY_BACKSPACE)
+CLOSE_KEYS = (ESC, "\n", "\r", curses.KEY_ENTER)
+
+
+class LiveSearch(NamedTuple):
+    """A search to show in a SearchPanel.
+
+    Attributes:
+        columns (Sequence[Column]): Columns of the result table.
+        search (PrefixSearch): The search of a book.
+    """
+    columns: Sequence[Column]
+    search: PrefixSearch
+
+
+class SearchPanel:
+    """Panel that searches a book on every keystroke.
+
+    Keys are collected until none has arrived for ``DEBOUNCE_DELAY``
+    milliseconds, so typing quickly runs a single search. Tab completes the
+    last word with the first completion, Up/Down and PgUp/PgDn scroll the
+    results, and Enter or Esc closes the panel.
+    """
+
+    def __init__(self, live: LiveSearch, renderer: Renderer) -> None:
+        """Initialize the panel.
+
+        Args:
+            live (LiveSearch): The search and the columns of its results.
+            renderer (Renderer): Renderer of the window to draw on.
+        """
+        self.live = live
+        self.renderer = renderer
+        self.window = renderer.window
+        self.query = ""
+        self.results: List[int] = []
+        self.completions: List[str] = []
+        self.top = 0
+
+    def page_size(self) -> int:
+        """Get the number of result rows between the header and the footer."""
+        return max(1, self.window.getmaxyx()[0] - 5)
+
+    def update(self) -> None:
+        """Search for the current query."""
+        self.results = self.live.search.search(self.query)
+        self.completions = self.live.search.completions(self.query)
+        self.top = 0
+
+    def press(self, key) -> bool:
+        """Apply a key to the query or the scroll position.
+
+        Args:
+            key: The key, a character or a curses key code.
+
+        Returns:
+            bool: False if the key closes the panel.
+        """
+        if key in CLOSE_KEYS:
+            return False
+        page_size = self.page_size()
+        last_top = max(0, len(self.results) - page_size)
+        if key in BACKSPACE_KEYS:
+            self.query = self.query[:-1]
+        elif key == "\t":
+            if self.completions:
+                self.query = self.query[:len(self.query) - len(self.query.split()[-1])] + self.completions[0] + " "
+        elif key == curses.KEY_DOWN:
+            self.top = min(self.top + 1, last_top)
+        elif key == curses.KEY_UP:
+            self.top = max(self.top - 1, 0)
+        elif key == curses.KEY_NPAGE:
+            self.top = min(self.top + page_size, last_top)
+        elif key == curses.KEY_PPAGE:
+            self.top = max(self.top - page_size, 0)
+        elif isinstance(key, str) and key.isprintable():
+            self.query += key
+        return True
+
+    def frame(self) -> List[List[Run]]:
+        """Lay out the query, the completions and the visible results.
+
+        Returns:
+            List[List[Run]]: Runs of every row.
+        """
+        page_size = self.page_size()
+        entries = self.live.search.entries(self.results[self.top:self.top + page_size])
+        cells = [[column.cell(entry) for column in self.live.columns] for entry in entries]
+        widths = [len(column.title) for column in self.live.columns]
+        for row_cells in cells:
+            for i, (text, _) in enumerate(row_cells):
+                widths[i] = max(widths[i], min(len(text), MAX_COLUMN_WIDTH))
+
+        def line(row_cells: Sequence[Any]) -> List[Run]:
+            runs: List[Run] = []
+            for (text, pair), width in zip(row_cells, widths):
+                runs.append((fit(text, width).ljust(width), pair))
+                runs.append((COLUMN_GAP, WHITE))
+            return runs[:-1]
+
+        lines = [
+            [("Search: ", GREEN), (self.query + "_", WHITE)],
+            [(", ".join(self.completions), CYAN)] if self.completions else [],
+            line([(column.title, WHITE) for column in self.live.columns]),
+            line([("-" * width, WHITE) for width in widths]),
+        ]
+        lines.extend(line(row_cells) for row_cells in cells)
+        lines.extend([] for _ in range(page_size - len(cells)))
+        if self.query.strip():
+            status = f"{len(self.results)} matches"
+            if self.results:
+                status += f", showing {self.top + 1}-{self.top + len(cells)}"
+            lines.append([(status + ". Tab completes, Up/Down scroll, Enter or Esc closes.", YELLOW)])
+        else:
+            lines.append([("Start typing to search. Tab completes, Enter or Esc closes.", YELLOW)])
+        return lines
+
+    def draw(self) -> None:
+        """Draw the panel."""
+        lines = self.frame()
+        for row, runs in enumerate(lines):
+            self.renderer.draw_runs(row, runs)
+        self.renderer.clear_from(len(lines))
+        self.renderer.refresh()
+
+    def read_keys(self) -> List:
+        """Wait for a key, then collect the keys that follow it within the debounce delay.
+
+        Returns:
+            List: The keys, characters or curses key codes.
+        """
+        keys = [self.window.get_wch()]
+        self.window.timeout(DEBOUNCE_DELAY)
+        try:
+            while True:
+                try:
+                    keys.append(self.window.get_wch())
+                except curses.error:
+                    return keys  # No key within the delay
+        finally:
+            self.window.timeout(-1)
+
+    def run(self) -> None:
+        """Search as keys are typed until the panel is closed."""
+        searched = None
+        while True:
+            if self.query != searched:
+                self.update()
+                searched = self.query
+            self.draw()
+            for key in self.read_keys():
+                if not self.press(key):
+                    return
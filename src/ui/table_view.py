@@ -0,0 +1,256 @@
+import curses
+from itertools import islice
+from typing import Any, Callable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from src.ui.renderer import Renderer, Run, BLUE, CYAN, GREEN, RED, WHITE
+
+SAMPLE_ROWS = 100  # Rows measured for the initial column widths
+MAX_COLUMN_WIDTH = 40  # Longer cells are cut off with an ellipsis
+COLUMN_GAP = "  "
+
+Cell = Tuple[str, int]
+
+
+class Column(NamedTuple):
+    """A column of a table view.
+
+    Attributes:
+        title (str): Header of the column.
+        cell (Callable[[Any], Cell]): Function getting the text and colour
+            pair of the cell of a row.
+    """
+    title: str
+    cell: Callable[[Any], Cell]
+
+
+class TableSource:
+    """Rows of a table that are read only when they are shown.
+
+    The rows come from a mapping of a book, streamed in insertion order, or
+    from a sequence such as a list of search results. Only the rows of the
+    visible window are read and formatted.
+
+    The view reads the windows on the UI thread while commands may change
+    the book on the dispatcher, so a mapping of a book is read under the
+    book's lock and read again from the start once the book has changed.
+    """
+
+    def __init__(self, columns: Sequence[Column], rows: Any, book: Any = None) -> None:
+        """Initialize the source.
+
+        Args:
+            columns (Sequence[Column]): The columns of the table.
+            rows (Any): A mapping whose values are the rows, or a sequence of rows.
+            book (Any): The book owning the mapping, or None for rows that
+                no other thread changes.
+        """
+        self.columns = list(columns)
+        self._rows = rows
+        self._book = book
+        self._position = 0
+        self._iterator: Optional[Iterator] = None
+        self._version = 0
+
+    def __len__(self) -> int:
+        """Get the number of rows."""
+        return len(self._rows)
+
+    def window(self, start: int, stop: int) -> List[Any]:
+        """Get the rows of a window of the table.
+
+        Mappings are read with ``islice`` over their values. Reading on from
+        the end of the previous window continues the same iterator, so
+        scrolling down does not read the skipped rows again, unless the book
+        changed in between.
+
+        Args:
+            start (int): Index of the first row.
+            stop (int): Index after the last row.
+
+        Returns:
+            List[Any]: The rows of the window.
+        """
+        if not isinstance(self._rows, Mapping):
+            return list(self._rows[start:stop])
+        if self._book is None:
+            return self._read(start, stop)
+        with self._book.lock.read():
+            return self._read(start, stop)
+
+    def _read(self, start: int, stop: int) -> List[Any]:
+        """Read a window of a mapping; see ``window``."""
+        if hasattr(self._rows, "window"):
+            return list(self._rows.window(start, stop))
+        version = self._book.version if self._book is not None else 0
+        # An iterator over a dictionary that changed since would fail or skip rows
+        if self._iterator is None or start < self._position or version != self._version:
+            self._iterator, self._position, self._version = iter(self._rows.values()), 0, version
+        rows = list(islice(self._iterator, start - self._position, stop - self._position))
+        self._position = start + len(rows) if rows else stop
+        return rows
+
+    def cells(self, row: Any) -> List[Cell]:
+        """Get the cells of a row.
+
+        Args:
+            row (Any): The row.
+
+        Returns:
+            List[Cell]: Text and colour pair of every cell.
+        """
+        return [column.cell(row) for column in self.columns]
+
+
+def fit(text: str, width: int) -> str:
+    """Cut a text off with an ellipsis if it is wider than a column.
+
+    Args:
+        text (str): The text of a cell.
+        width (int): The width of the column.
+
+    Returns:
+        str: The text, at most ``width`` characters long.
+    """
+    text = text.replace("\n", " ")
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+class TableView:
+    """Scrollable view of a table that formats only the visible rows.
+
+    Column widths come from the headers and a sample of the first rows, and
+    grow when wider rows scroll into view. Up/Down move by a row,
+    PgUp/PgDn by a page and Home/End go to the ends of the table; any
+    other key closes the view.
+    """
+
+    def __init__(self, source: TableSource, renderer: Renderer) -> None:
+        """Initialize the view.
+
+        Args:
+            source (TableSource): The rows of the table.
+            renderer (Renderer): Renderer of the window to draw on.
+        """
+        self.source = source
+        self.renderer = renderer
+        self.top = 0
+        self.count = len(source)
+        self.number_width = len(str(self.count))
+        self.widths = [len(column.title) for column in source.columns]
+        self._measure(source.window(0, SAMPLE_ROWS))
+
+    def page_size(self) -> int:
+        """Get the number of rows that fit between the header and the footer."""
+        return max(1, self.renderer.window.getmaxyx()[0] - 3)
+
+    def _measure(self, rows: List[Any]) -> List[List[Cell]]:
+        """Widen the columns to fit the cells of some rows.
+
+        Args:
+            rows (List[Any]): The rows.
+
+        Returns:
+            List[List[Cell]]: The cells of every row.
+        """
+        cells = [self.source.cells(row) for row in rows]
+        for row_cells in cells:
+            for i, (text, _) in enumerate(row_cells):
+                self.widths[i] = max(self.widths[i], min(len(text), MAX_COLUMN_WIDTH))
+        return cells
+
+    def _line(self, number: Cell, cells: List[Cell]) -> List[Run]:
+        """Lay out the cells of a row as runs padded to the column widths."""
+        runs = [(number[0].rjust(self.number_width), number[1])]
+        for (text, pair), width in zip(cells, self.widths):
+            runs.append((COLUMN_GAP, WHITE))
+            runs.append((fit(text, width).ljust(width), pair))
+        return runs
+
+    def frame(self) -> List[List[Run]]:
+        """Lay out the rows of the current window.
+
+        Returns:
+            List[List[Run]]: The header, the separator, the visible rows and
+                the footer.
+        """
+        page_size = self.page_size()
+        rows = self.source.window(self.top, self.top + page_size)
+        cells = self._measure(rows)
+        header = self._line(("#", WHITE), [(column.title, WHITE) for column in self.source.columns])
+        separator = self._line(("-" * self.number_width, WHITE),
+                               [("-" * width, WHITE) for width in self.widths])
+        lines = [header, separator]
+        for number, row_cells in enumerate(cells, self.top + 1):
+            lines.append(self._line((str(number), WHITE), row_cells))
+        lines.extend([] for _ in range(page_size - len(rows)))
+        last = self.top + len(rows)
+        lines.append([(f"Rows {self.top + 1 if rows else 0}-{last} of {self.count}. "
+                       "Up/Down, PgUp/PgDn, Home/End to scroll, any other key to close.", GREEN)])
+        return lines
+
+    def scroll(self, key: int) -> bool:
+        """Move the window for a navigation key.
+
+        Args:
+            key (int): The key code.
+
+        Returns:
+            bool: False if the key is not a navigation key.
+        """
+        page_size = self.page_size()
+        last_top = max(0, self.count - page_size)
+        moves = {
+            curses.KEY_DOWN: self.top + 1,
+            curses.KEY_UP: self.top - 1,
+            curses.KEY_NPAGE: self.top + page_size,
+            curses.KEY_PPAGE: self.top - page_size,
+            curses.KEY_HOME: 0,
+            curses.KEY_END: last_top,
+        }
+        if key not in moves:
+            return False
+        self.top = min(max(moves[key], 0), last_top)
+        return True
+
+    def draw(self) -> None:
+        """Draw the current window of the table."""
+        lines = self.frame()
+        for row, runs in enumerate(lines):
+            self.renderer.draw_runs(row, runs)
+        self.renderer.clear_from(len(lines))
+        self.renderer.refresh()
+
+    def run(self) -> None:
+        """Show the table until a key other than a navigation key is pressed."""
+        while True:
+            self.draw()
+            if not self.scroll(self.renderer.window.getch()):
+                return
+
+
+def _optional(text: Optional[str], missing: str, pair: int) -> Cell:
+    """Get a cell that shows a red placeholder if its text is missing."""
+    return (text, pair) if text else (missing, RED)
+
+
+CONTACT_COLUMNS = [
+    Column("Name", lambda record: (record.name.value, CYAN)),
+    Column("Phone Numbers", lambda record: ("; ".join(phone.value for phone in record.phones), BLUE)),
+    Column("Email", lambda record: _optional(record.email and record.email.value, "No email", CYAN)),
+    Column("Birthday", lambda record: _optional(
+        record.birthday and record.birthday.value.strftime("%d.%m.%Y"), "No birthday", BLUE)),
+    Column("Address", lambda record: _optional(
+        record.address and " ".join(record.address.value), "No address", CYAN)),
+]
+
+NOTE_COLUMNS = [
+    Column("Title", lambda note: (note.title, CYAN)),
+    Column("Content", lambda note: (note.content, BLUE)),
+    Column("Tags", lambda note: _optional(", ".join(note.tags), "No tags", CYAN)),
+]
+
+BIRTHDAY_COLUMNS = [
+    Column("Name", lambda birthday: (birthday["name"], WHITE)),
+    Column("Birthday", lambda birthday: (birthday["birthday"], WHITE)),
+    Column("Congratulation day", lambda birthday: (birthday["congratulation_date"], WHITE)),
+]
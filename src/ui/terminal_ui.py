@@ -1,27 +1,58 @@
 import curses
-from typing import List, Callable, Dict
-from colorama import init as colorama_init
+import time
+from typing import Any, List, Callable, Dict, Optional
+from colorama import init as colorama_init, Fore, Style
 from src.constants.commands import (
     ContactCommands,
     AddressCommands,
     NoteCommands,
     BirthdayCommands,
+    CommandKind,
     COMMAND_HELP_MESSAGES,
+    COMMAND_KINDS,
 )
+from src.utils.dispatcher import Cancelled, Dispatcher
+from src.ui.renderer import Renderer, GREEN, WHITE, RED, YELLOW, BLUE, MAGENTA, CYAN
+from src.ui.search_panel import LiveSearch, SearchPanel
+from src.ui.table_view import TableSource, TableView
 
 
 # Initialize colorama
 colorama_init(convert=True, strip=False)
 
+ESC = 27
+ESC_DELAY = 25  # Milliseconds to wait for the rest of an escape sequence after Esc
+SPINNER = "|/-\\"
+SPINNER_DELAY = 0.15  # Seconds a command runs before the spinner is shown
+SPINNER_INTERVAL = 100  # Milliseconds between spinner frames
+
 class TerminalUI:
-    def __init__(self):
+    def __init__(self, dispatcher: Optional[Dispatcher] = None):
+        """Initialize the UI.
+
+        Args:
+            dispatcher (Optional[Dispatcher]): Runs the handlers on worker
+                threads while the UI shows a spinner. Without one the
+                handlers run on the UI thread.
+        """
+        self.dispatcher = dispatcher
         self.screen = None
+        self.renderer = None
+        self.views = {}
         self.current_menu = 0
         self.table_actions = [
             ContactCommands.SHOW_ALL_CONTACTS,
             NoteCommands.SHOW_ALL_NOTES,
             NoteCommands.FIND_NOTES_BY_TAG,
-            BirthdayCommands.SHOW_UPCOMING_BIRTHDAYS
+            NoteCommands.QUERY_TAGS,
+            BirthdayCommands.SHOW_UPCOMING_BIRTHDAYS,
+            ContactCommands.SEARCH_AS_YOU_TYPE,
+            NoteCommands.SEARCH_NOTES_AS_YOU_TYPE,
+        ]
+        # Commands that read their query key by key instead of from a prompt
+        self.live_actions = [
+            ContactCommands.SEARCH_AS_YOU_TYPE,
+            NoteCommands.SEARCH_NOTES_AS_YOU_TYPE,
         ]
         self.menus = [
             "Contacts",
@@ -38,6 +69,13 @@ class TerminalUI:
             ContactCommands.CHANGE_PHONE,
             ContactCommands.SHOW_EMAIL,
             ContactCommands.SEARCH_CONTACT,
+            ContactCommands.FUZZY_SEARCH,
+            ContactCommands.SEARCH_AS_YOU_TYPE,
+            ContactCommands.FIND_BY_PHONE,
+            ContactCommands.FIND_PHONES_BY_PREFIX,
+            ContactCommands.SHOW_SHARED_PHONES,
+            ContactCommands.IMPORT_CONTACTS,
+            ContactCommands.EXPORT_CONTACTS,
             AddressCommands.ADD_ADDRESS,
             AddressCommands.SHOW_ADDRESS,
             AddressCommands.DELETE_ADDRESS,
@@ -53,6 +91,9 @@ class TerminalUI:
             NoteCommands.REMOVE_TAG,
             NoteCommands.CHECK_TAG,
             NoteCommands.FIND_NOTES_BY_TAG,
+            NoteCommands.QUERY_TAGS,
+            NoteCommands.SEARCH_NOTES_AS_YOU_TYPE,
+            NoteCommands.EXPORT_NOTES,
             "Back"
         ]
         self.birthday_actions = [
@@ -71,58 +112,38 @@ class TerminalUI:
         self.screen = curses.initscr()
         curses.start_color()
         # Initialize all color pairs
-        curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)   # Green
-        curses.init_pair(2, curses.COLOR_WHITE, curses.COLOR_BLACK)   # White
-        curses.init_pair(3, curses.COLOR_RED, curses.COLOR_BLACK)     # Red
-        curses.init_pair(4, curses.COLOR_YELLOW, curses.COLOR_BLACK)  # Yellow
-        curses.init_pair(5, curses.COLOR_BLUE, curses.COLOR_BLACK)    # Blue
-        curses.init_pair(6, curses.COLOR_MAGENTA, curses.COLOR_BLACK) # Magenta
-        curses.init_pair(7, curses.COLOR_CYAN, curses.COLOR_BLACK)    # Cyan
+        curses.init_pair(GREEN, curses.COLOR_GREEN, curses.COLOR_BLACK)
+        curses.init_pair(WHITE, curses.COLOR_WHITE, curses.COLOR_BLACK)
+        curses.init_pair(RED, curses.COLOR_RED, curses.COLOR_BLACK)
+        curses.init_pair(YELLOW, curses.COLOR_YELLOW, curses.COLOR_BLACK)
+        curses.init_pair(BLUE, curses.COLOR_BLUE, curses.COLOR_BLACK)
+        curses.init_pair(MAGENTA, curses.COLOR_MAGENTA, curses.COLOR_BLACK)
+        curses.init_pair(CYAN, curses.COLOR_CYAN, curses.COLOR_BLACK)
         curses.curs_set(0)
         self.screen.keypad(1)
         curses.noecho()  # Start with echo off
+        curses.set_escdelay(ESC_DELAY)
+        self.renderer = Renderer(self.screen)
 
     def draw_menu(self, title: str, options: List[str], selected: int):
-        """Draw a menu with the given title and options."""
-        try:
-            self.screen.clear()
-            # Get terminal dimensions
-            max_y, max_x = self.screen.getmaxyx()
-            
-            # Draw title
-            if max_y > 0 and max_x > 0:
-                title_display = title[:max_x-1]  # Truncate title if too long
-                self.screen.addstr(0, 0, title_display, curses.color_pair(1))
-                self.screen.addstr(0, len(title_display), " " * (max_x - len(title_display)))
-            
-            # Draw options
-            for i, option in enumerate(options):
-                if i + 2 >= max_y:  # Skip if we're out of screen space
-                    break
-                # Convert enum to string if it's an enum value
-                option_str = str(option.value) if hasattr(option, 'value') else str(option)
-                option_display = f"{'>' if i == selected else ' '} {option_str}"[:max_x-1]
-                try:
-                    self.screen.addstr(i + 2, 2, option_display, 
-                                     curses.color_pair(1) if i == selected else curses.color_pair(2))
-                except curses.error:
-                    continue  # Skip if we can't write to this line
-            
-            self.screen.refresh()
-        except curses.error:
-            # If we can't draw the menu, show a simple message
-            self.screen.clear()
-            self.screen.addstr(0, 0, "Terminal window too small. Please resize and try again.")
-            self.screen.refresh()
+        """Draw a menu with the given title and options.
+
+        Moving the selection only redraws the two options that changed.
+        """
+        max_x = self.screen.getmaxyx()[1]
+        lines = [(title[:max_x-1], GREEN), ("", WHITE)]
+        for i, option in enumerate(options):
+            # Convert enum to string if it's an enum value
+            option_str = str(option.value) if hasattr(option, 'value') else str(option)
+            lines.append((f"  {'>' if i == selected else ' '} {option_str}", GREEN if i == selected else WHITE))
+        self.renderer.draw_frame(lines)
+        self.renderer.refresh()
 
     def get_user_input(self, prompt: str) -> str:
         """Get user input with a prompt."""
         # Show prompt
-        try:
-            self.screen.addstr(curses.LINES - 2, 0, prompt, curses.color_pair(2))
-            self.screen.refresh()
-        except curses.error:
-            pass
+        self.renderer.draw_line(curses.LINES - 2, prompt, WHITE)
+        self.renderer.refresh()
 
         # Create input window
         input_win = curses.newwin(1, curses.COLS, curses.LINES - 1, 0)
@@ -142,127 +163,81 @@ class TerminalUI:
         finally:
             # Clean up
             curses.noecho()
-            try:
-                self.screen.addstr(curses.LINES - 1, 0, " " * curses.COLS)
-                self.screen.refresh()
-            except curses.error:
-                pass
+            input_win.erase()
+            input_win.refresh()
+
+    def show_text(self, text: str, pair: int = WHITE):
+        """Show text with ANSI color codes and wait for a key.
+
+        Args:
+            text (str): The text to show.
+            pair (int): Color pair of the text outside any color code.
+        """
+        height = self.screen.getmaxyx()[0]
+        lines = [(line, pair) for line in text.split('\n')[:height - 1]]
+        lines += [("", WHITE)] * (height - 1 - len(lines))
+        lines.append(("Press any key to continue...", WHITE))
+        self.renderer.draw_frame(lines)
+        self.renderer.refresh()
+        self.screen.getch()
 
     def show_message(self, message: str, is_error: bool = False):
         """Show a message to the user with support for ANSI color codes."""
-        self.screen.clear()
-        
-        # Split message into lines
-        lines = message.split('\n')
-        current_y = 0
-        
-        for line in lines:
-            if current_y >= curses.LINES - 1:
-                break
-                
-            # Process ANSI color codes
-            current_x = 0
-            i = 0
-            # Initialize default color
-            color = curses.color_pair(3) if is_error else curses.color_pair(2)
-            
-            while i < len(line):
-                if line[i] == '\x1b':  # ANSI escape sequence
-                    # Find the end of the escape sequence
-                    end = line.find('m', i)
-                    if end != -1:
-                        # Extract the color code
-                        color_code = line[i:end+1]
-                        # Convert colorama codes to curses colors
-                        if '31' in color_code:  # Red
-                            color = curses.color_pair(3)
-                        elif '32' in color_code:  # Green
-                            color = curses.color_pair(1)
-                        else:  # Default to white
-                            color = curses.color_pair(2)
-                        i = end + 1
-                        continue
-                
-                # Print the character with current color
-                try:
-                    self.screen.addstr(current_y, current_x, line[i], color)
-                    current_x += 1
-                except curses.error:
-                    pass
-                i += 1
-            
-            current_y += 1
-        
-        # Show continue prompt
-        try:
-            self.screen.addstr(curses.LINES - 1, 0, "Press any key to continue...", curses.color_pair(2))
-        except curses.error:
-            pass
-        
-        self.screen.refresh()
-        self.screen.getch()
+        self.show_text(message, RED if is_error else WHITE)
 
-    def show_table(self, table_str: str):
-        """Show a table with support for ANSI color codes."""
-        self.screen.clear()
-        
-        # Split table into lines
-        lines = table_str.split('\n')
-        current_y = 0
-        
-        for line in lines:
-            if current_y >= curses.LINES - 1:
-                break
-                
-            # Process ANSI color codes
-            current_x = 0
-            i = 0
-            # Initialize default color
-            color = curses.color_pair(2)  # Default to white
-            
-            while i < len(line):
-                if line[i] == '\x1b':  # ANSI escape sequence
-                    # Find the end of the escape sequence
-                    end = line.find('m', i)
-                    if end != -1:
-                        # Extract the color code
-                        color_code = line[i:end+1]
-                        # Convert colorama codes to curses colors
-                        if '31' in color_code:  # Red
-                            color = curses.color_pair(3)
-                        elif '32' in color_code:  # Green
-                            color = curses.color_pair(1)
-                        elif '33' in color_code:  # Yellow
-                            color = curses.color_pair(4)
-                        elif '34' in color_code:  # Blue
-                            color = curses.color_pair(5)
-                        elif '35' in color_code:  # Magenta
-                            color = curses.color_pair(6)
-                        elif '36' in color_code:  # Cyan
-                            color = curses.color_pair(7)
-                        else:  # Default to white
-                            color = curses.color_pair(2)
-                        i = end + 1
-                        continue
-                
-                # Print the character with current color
-                try:
-                    self.screen.addstr(current_y, current_x, line[i], color)
-                    current_x += 1
-                except curses.error:
-                    pass
-                i += 1
-            
-            current_y += 1
-        
-        # Show continue prompt
+    def show_table(self, table):
+        """Show a table with support for ANSI color codes.
+
+        Args:
+            table: A TableSource, shown in a scrollable view that formats
+                only the visible rows, a LiveSearch, shown in a panel that
+                searches as the query is typed, or a formatted table or message.
+        """
+        if isinstance(table, TableSource):
+            TableView(table, self.renderer).run()
+        elif isinstance(table, LiveSearch):
+            SearchPanel(table, self.renderer).run()
+        else:
+            self.show_text(table)
+
+    def run_command(self, action, handler: Callable[[str], Any], input_str: str) -> Any:
+        """Run a handler, on a worker thread if there is a dispatcher.
+
+        While the handler runs, a spinner with the elapsed time is shown on
+        the bottom row and keys are still read; Esc cancels a read command.
+
+        Args:
+            action: The command.
+            handler (Callable[[str], Any]): Handler of the command.
+            input_str (str): Arguments of the command.
+
+        Returns:
+            Any: The result of the handler.
+
+        Raises:
+            Cancelled: If the command is cancelled with Esc.
+        """
+        if self.dispatcher is None:
+            return handler(input_str)
+        job = self.dispatcher.submit(handler, input_str, COMMAND_KINDS.get(action) is CommandKind.WRITE)
+        if job.wait(SPINNER_DELAY):
+            return job.result()
+        name = action.value if hasattr(action, 'value') else str(action)
+        hint = " (Esc to cancel)" if job.cancellable else ""
+        started = time.monotonic() - SPINNER_DELAY
+        frame = 0
+        self.screen.timeout(SPINNER_INTERVAL)
         try:
-            self.screen.addstr(curses.LINES - 1, 0, "Press any key to continue...", curses.color_pair(2))
-        except curses.error:
-            pass
-        
-        self.screen.refresh()
-        self.screen.getch()
+            while not job.done():
+                elapsed = time.monotonic() - started
+                self.renderer.draw_line(curses.LINES - 1, f"{SPINNER[frame % len(SPINNER)]} {name}... {elapsed:.1f}s{hint}", YELLOW)
+                self.renderer.refresh()
+                frame += 1
+                if self.screen.getch() == ESC and job.cancel():
+                    raise Cancelled(f"{name} cancelled.")
+        finally:
+            self.screen.timeout(-1)
+        return job.result()
 
     def cleanup(self):
         """Clean up the curses screen."""
@@ -271,8 +246,16 @@ class TerminalUI:
             curses.curs_set(1)  # Restore cursor
             curses.endwin()
 
-    def run(self, handlers: Dict[str, Callable]):
-        """Run the main UI loop."""
+    def run(self, handlers: Dict[str, Callable], views: Optional[Dict[str, Callable]] = None):
+        """Run the main UI loop.
+
+        Args:
+            handlers (Dict[str, Callable]): Handlers by command name.
+            views (Optional[Dict[str, Callable]]): Handlers of table commands
+                that return a TableSource, used instead of the handlers that
+                format the whole table.
+        """
+        self.views = views or {}
         try:
             self.init_screen()
             while True:
@@ -327,11 +310,13 @@ class TerminalUI:
                 elif action in handlers:
                     try:
                         prompt = self.command_prompts.get(action, "Enter arguments:")
-                        input_str = self.get_user_input(prompt)
-                        result = handlers[action](input_str)
+                        input_str = "" if action in self.live_actions else self.get_user_input(prompt)
+                        result = self.run_command(action, self.views.get(action, handlers[action]), input_str)
                         if action in self.table_actions:
                             self.show_table(result)
                         else:
                             self.show_message(result)
+                    except Cancelled as e:
+                        self.show_message(f"{Fore.YELLOW}{e}{Style.RESET_ALL}")
                     except Exception as e:
                         self.show_message(str(e), is_error=True) 
\ No newline at end of file
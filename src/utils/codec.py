@@ -0,0 +1,302 @@
+import struct
+from typing import Callable, List, Tuple
+
+from src.models.address_book import AddressBook
+from src.models.fields import Address, Birthday, Email, Name, Phone
+from src.models.notes_book import Note, NotesBook
+from src.models.record import Record
+
+MAGIC = b"ABCODEC"  # Tells codec files apart from pickles, which start with b"\x80"
+SCHEMA_VERSION = 1
+HEADER = struct.Struct("<7sBB")  # Magic, schema version, kind of book
+
+ADDRESS_BOOK_KIND = 1
+NOTES_BOOK_KIND = 2
+
+# Bits of the flags byte that starts every entry, set for the optional fields it holds
+HAS_NAME = 1  # The name or title differs from the key
+HAS_EMAIL = 2
+HAS_BIRTHDAY = 4
+HAS_ADDRESS = 8
+
+
+class CodecError(ValueError):
+    """Raised when data is not a codec file this version can read."""
+    pass
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """Append a non-negative integer in 7-bit groups, low group first."""
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_str(out: bytearray, text: str) -> None:
+    """Append a string as its UTF-8 length followed by its bytes."""
+    data = text.encode("utf-8")
+    _write_varint(out, len(data))
+    out += data
+
+
+def _write_strs(out: bytearray, texts: List[str]) -> None:
+    """Append a count followed by that many strings."""
+    _write_varint(out, len(texts))
+    for text in texts:
+        _write_str(out, text)
+
+
+def _encode_record(out: bytearray, key: str, record: Record) -> None:
+    """Append one contact."""
+    name = record.name.value
+    flags = (HAS_NAME if name != key else 0) | (HAS_EMAIL if record.email else 0) \
+        | (HAS_BIRTHDAY if record.birthday else 0) | (HAS_ADDRESS if record.address else 0)
+    out.append(flags)
+    _write_str(out, key)
+    if flags & HAS_NAME:
+        _write_str(out, name)
+    _write_varint(out, len(record.phones))
+    for phone in record.phones:
+        _write_varint(out, phone._number)
+    if flags & HAS_EMAIL:
+        _write_str(out, record.email.value)
+    if flags & HAS_BIRTHDAY:
+        _write_varint(out, record.birthday._ordinal)
+    if flags & HAS_ADDRESS:
+        _write_strs(out, record.address.value)
+
+
+def _encode_note(out: bytearray, key: str, note: Note) -> None:
+    """Append one note."""
+    flags = HAS_NAME if note.title != key else 0
+    out.append(flags)
+    _write_str(out, key)
+    if flags & HAS_NAME:
+        _write_str(out, note.title)
+    _write_str(out, note.content)
+    _write_strs(out, note.tags)
+
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    """Read a varint.
+
+    Args:
+        data (bytes): The encoded data.
+        position (int): Position of the varint.
+
+    Returns:
+        Tuple[int, int]: The value and the position after it.
+    """
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+# The decoders below read every entry in one loop with the common cases
+# inlined: most lengths and counts fit in a single byte, and a call per
+# field would cost more than decoding it.
+
+def _read_strs(data: bytes, position: int) -> Tuple[List[str], int]:
+    """Read a count followed by that many strings."""
+    count = data[position]
+    position += 1
+    if count >= 0x80:
+        count, position = _read_varint(data, position - 1)
+    texts = []
+    for _ in range(count):
+        length = data[position]
+        position += 1
+        if length >= 0x80:
+            length, position = _read_varint(data, position - 1)
+        texts.append(data[position:position + length].decode("utf-8"))
+        position += length
+    return texts, position
+
+
+def _decode_records(data: bytes, position: int, count: int) -> Tuple[dict, int]:
+    """Read contacts, building their fields without validating them again."""
+    entries = {}
+    new_record, new_name, new_phone = Record.__new__, Name.__new__, Phone.__new__
+    for _ in range(count):
+        flags = data[position]
+        length = data[position + 1]
+        position += 2
+        if length >= 0x80:
+            length, position = _read_varint(data, position - 1)
+        key = data[position:position + length].decode("utf-8")
+        position += length
+        record = new_record(Record)
+        record._listener = None
+        name = new_name(Name)
+        if flags & HAS_NAME:
+            length, position = _read_varint(data, position)
+            name.value = data[position:position + length].decode("utf-8")
+            position += length
+        else:
+            name.value = key
+        record.name = name
+        length = data[position]
+        position += 1
+        if length >= 0x80:
+            length, position = _read_varint(data, position - 1)
+        phones = []
+        for _ in range(length):
+            number = shift = 0
+            while True:
+                byte = data[position]
+                position += 1
+                number |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            phone = new_phone(Phone)
+            phone._number = number
+            phones.append(phone)
+        record.phones = phones
+        if flags & HAS_EMAIL:
+            length, position = _read_varint(data, position)
+            record.email = Email.restore(data[position:position + length].decode("utf-8"))
+            position += length
+        else:
+            record.email = None
+        if flags & HAS_BIRTHDAY:
+            birthday = Birthday.__new__(Birthday)
+            birthday._ordinal, position = _read_varint(data, position)
+            record.birthday = birthday
+        else:
+            record.birthday = None
+        if flags & HAS_ADDRESS:
+            parts, position = _read_strs(data, position)
+            record.address = Address.restore(parts)
+        else:
+            record.address = None
+        entries[key] = record
+    return entries, position
+
+
+def _decode_notes(data: bytes, position: int, count: int) -> Tuple[dict, int]:
+    """Read notes."""
+    entries = {}
+    new_note = Note.__new__
+    for _ in range(count):
+        flags = data[position]
+        length = data[position + 1]
+        position += 2
+        if length >= 0x80:
+            length, position = _read_varint(data, position - 1)
+        key = data[position:position + length].decode("utf-8")
+        position += length
+        note = new_note(Note)
+        if flags & HAS_NAME:
+            length, position = _read_varint(data, position)
+            note.title = data[position:position + length].decode("utf-8")
+            position += length
+        else:
+            note.title = key
+        length, position = _read_varint(data, position)
+        note.content = data[position:position + length].decode("utf-8")
+        position += length
+        note.tags, position = _read_strs(data, position)
+        entries[key] = note
+    return entries, position
+
+
+# Kind of book -> (book class, entry encoder, entry decoder)
+BOOK_KINDS = {
+    ADDRESS_BOOK_KIND: (AddressBook, _encode_record, _decode_records),
+    NOTES_BOOK_KIND: (NotesBook, _encode_note, _decode_notes),
+}
+KIND_OF_CLASS = {book_class: kind for kind, (book_class, _, _) in BOOK_KINDS.items()}
+
+
+def can_encode(book: object) -> bool:
+    """Check whether the codec can store a book.
+
+    Subclasses, such as the SQLite and mapped books, are left to pickle,
+    which records their class.
+
+    Args:
+        book (object): The book to store.
+
+    Returns:
+        bool: True for an AddressBook or a NotesBook.
+    """
+    return type(book) in KIND_OF_CLASS
+
+
+def is_encoded(data: bytes) -> bool:
+    """Check whether data starts like a codec file.
+
+    Args:
+        data (bytes): The first bytes of a file, at least as many as the magic.
+
+    Returns:
+        bool: True if the data starts with the codec magic.
+    """
+    return data[:len(MAGIC)] == MAGIC
+
+
+def encode_book(book: object) -> bytearray:
+    """Encode an address book or a notes book.
+
+    Every entry is a flags byte, its key and its fields. Strings are stored
+    as their UTF-8 length followed by their bytes, and integers (lengths,
+    counts, phone numbers and birthday ordinals) as varints.
+
+    Args:
+        book (object): An AddressBook or a NotesBook.
+
+    Returns:
+        bytearray: The encoded book.
+
+    Raises:
+        TypeError: If the codec cannot store the book.
+    """
+    if not can_encode(book):
+        raise TypeError(f"Cannot encode {type(book).__name__}.")
+    kind = KIND_OF_CLASS[type(book)]
+    encode_entry = BOOK_KINDS[kind][1]
+    out = bytearray(HEADER.pack(MAGIC, SCHEMA_VERSION, kind))
+    _write_varint(out, len(book.data))
+    for key, value in book.data.items():
+        encode_entry(out, key, value)
+    return out
+
+
+def decode_book(data: bytes, restore: Callable[[type, dict], object]) -> object:
+    """Decode a book written by encode_book.
+
+    Args:
+        data (bytes): The encoded book.
+        restore (Callable[[type, dict], object]): Creates a book of a class
+            from its entries by key.
+
+    Returns:
+        object: The decoded book.
+
+    Raises:
+        CodecError: If the data is not a codec file, is of another schema
+            version or is truncated.
+    """
+    if len(data) < HEADER.size or not is_encoded(data):
+        raise CodecError("The data is not an encoded book.")
+    _, version, kind = HEADER.unpack_from(data)
+    if version != SCHEMA_VERSION:
+        raise CodecError(f"Unsupported schema version {version}.")
+    if kind not in BOOK_KINDS:
+        raise CodecError(f"Unknown kind of book {kind}.")
+    book_class, _, decode_entries = BOOK_KINDS[kind]
+    try:
+        count, position = _read_varint(data, HEADER.size)
+        entries, position = decode_entries(data, position, count)
+    except (IndexError, UnicodeDecodeError) as e:
+        raise CodecError("The encoded book is truncated or corrupt.") from e
+    if position != len(data):
+        raise CodecError("The encoded book is truncated or corrupt.")
+    return restore(book_class, entries)
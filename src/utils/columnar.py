@@ -0,0 +1,285 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from datetime import date
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+MAGIC = b"ABCOLS\x00\x01"  # Identifies the file and the version of the layout
+BYTE_ORDERS = {"little": 1, "big": 2}
+ALIGNMENT = 8  # Sections start at multiples of 8 bytes so typed views are aligned
+
+# Sections in file order, with the array typecode of their items ("B" for string heaps)
+SECTIONS = (
+    ("order", "I"),             # Rows sorted by key, for binary search
+    ("key_offsets", "Q"),       # count + 1 offsets into ``keys``
+    ("keys", "B"),              # UTF-8 normalized names
+    ("name_offsets", "Q"),      # Empty when the name is the key itself
+    ("names", "B"),
+    ("phone_starts", "I"),      # count + 1 indexes into ``phones``
+    ("phones", "Q"),            # Phone numbers as integers
+    ("birthdays", "i"),         # Date ordinals, 0 for no birthday
+    ("birthday_days", "H"),     # month * 100 + day, 0 for no birthday
+    ("email_offsets", "Q"),     # Empty when there is no email
+    ("emails", "B"),
+    ("address_offsets", "Q"),   # Empty when there is no address
+    ("addresses", "B"),         # JSON lists of address parts
+)
+HEADER = struct.Struct("<8sB7xQ" + "QQ" * len(SECTIONS))  # Magic, byte order, count, (offset, size) per section
+
+
+class ContactRow(NamedTuple):
+    """The stored fields of one contact, in the types its Record fields restore from.
+
+    Attributes:
+        name (str): The name as entered.
+        phones (List[int]): Phone numbers as integers.
+        email (Optional[str]): The normalized email address.
+        birthday (int): Ordinal of the date of birth, 0 if it is not set.
+        address (Optional[list]): The address parts.
+    """
+    name: str
+    phones: List[int]
+    email: Optional[str]
+    birthday: int
+    address: Optional[list]
+
+
+class _Heap:
+    """Strings appended one after another, with the offset where each one ends."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.offsets = array("Q", [0])
+
+    def append(self, text: Optional[str]) -> None:
+        if text:
+            self.data += text.encode("utf-8")
+        self.offsets.append(len(self.data))
+
+
+def write_columnar(rows: Iterable[Tuple[str, ContactRow]], f) -> int:
+    """Write contacts in the columnar layout.
+
+    Args:
+        rows (Iterable[Tuple[str, ContactRow]]): Keys and fields of the
+            contacts, in the order they are iterated.
+        f: Binary file open for writing at position 0.
+
+    Returns:
+        int: Number of contacts written.
+    """
+    keys, names, emails, addresses = _Heap(), _Heap(), _Heap(), _Heap()
+    phone_starts, phones = array("I", [0]), array("Q")
+    birthdays, birthday_days = array("i"), array("H")
+    key_list: List[str] = []
+    for key, row in rows:
+        key_list.append(key)
+        keys.append(key)
+        names.append(None if row.name == key else row.name)
+        phones.extend(row.phones)
+        phone_starts.append(len(phones))
+        birthdays.append(row.birthday)
+        if row.birthday:
+            born = date.fromordinal(row.birthday)
+            birthday_days.append(born.month * 100 + born.day)
+        else:
+            birthday_days.append(0)
+        emails.append(row.email)
+        addresses.append(json.dumps(row.address) if row.address else None)
+    order = array("I", sorted(range(len(key_list)), key=key_list.__getitem__))
+    sections = {
+        "order": order, "key_offsets": keys.offsets, "keys": keys.data,
+        "name_offsets": names.offsets, "names": names.data,
+        "phone_starts": phone_starts, "phones": phones,
+        "birthdays": birthdays, "birthday_days": birthday_days,
+        "email_offsets": emails.offsets, "emails": emails.data,
+        "address_offsets": addresses.offsets, "addresses": addresses.data,
+    }
+    table = []
+    position = HEADER.size
+    for name, _ in SECTIONS:
+        position += -position % ALIGNMENT
+        size = len(memoryview(sections[name]).cast("B"))
+        table += [position, size]
+        position += size
+    f.write(HEADER.pack(MAGIC, BYTE_ORDERS[sys.byteorder], len(key_list), *table))
+    for (name, _), offset in zip(SECTIONS, table[::2]):
+        f.write(b"\0" * (offset - f.tell()))
+        f.write(sections[name])
+    return len(key_list)
+
+
+def save_columnar(rows: Iterable[Tuple[str, ContactRow]], filename: str,
+                  before_replace: Optional[Callable[[], None]] = None) -> int:
+    """Atomically replace a file with contacts in the columnar layout.
+
+    The file is written to a temporary file in the same directory, synced to
+    disk and renamed over the old one, like the pickle snapshots.
+
+    Args:
+        rows (Iterable[Tuple[str, ContactRow]]): Keys and fields of the contacts.
+        filename (str): Path of the snapshot.
+        before_replace (Optional[Callable[[], None]]): Called after the new
+            file is written and before it replaces the old one, to unmap the
+            old file where mapped files cannot be replaced.
+
+    Returns:
+        int: Number of contacts written.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_name = tempfile.mkstemp(prefix=os.path.basename(filename) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            count = write_columnar(rows, f)
+            f.flush()
+            os.fsync(f.fileno())
+        if before_replace is not None:
+            before_replace()
+        os.replace(temp_name, filename)
+    except BaseException:
+        os.remove(temp_name)
+        raise
+    return count
+
+
+class ColumnarSnapshot:
+    """Read-only view of a columnar snapshot mapped into memory.
+
+    Opening the snapshot maps the file and reads its header; no contact is
+    decoded until it is asked for. Columns are typed ``memoryview`` slices
+    of the map, so reading a field copies only that field.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """Map a snapshot file.
+
+        Args:
+            filename (str): Path of the snapshot.
+
+        Raises:
+            ValueError: If the file is not a columnar snapshot of this
+                version or was written with another byte order.
+        """
+        with open(filename, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: List[memoryview] = []
+        try:
+            if len(self._map) < HEADER.size:
+                raise ValueError(f"{filename} is not a columnar snapshot.")
+            magic, byte_order, self.count, *table = HEADER.unpack_from(self._map)
+            if magic != MAGIC:
+                raise ValueError(f"{filename} is not a columnar snapshot.")
+            if byte_order != BYTE_ORDERS[sys.byteorder]:
+                raise ValueError(f"{filename} was written on a machine with another byte order.")
+            view = self._view(memoryview(self._map))
+            columns = {}
+            for (name, typecode), offset, size in zip(SECTIONS, table[::2], table[1::2]):
+                column = self._view(view[offset:offset + size])
+                columns[name] = column if typecode == "B" else self._view(column.cast(typecode))
+        except BaseException:
+            self.close()
+            raise
+        self._order = columns["order"]
+        self._key_offsets, self._keys = columns["key_offsets"], columns["keys"]
+        self._name_offsets, self._names = columns["name_offsets"], columns["names"]
+        self._phone_starts, self._phones = columns["phone_starts"], columns["phones"]
+        self._birthdays, self._birthday_days = columns["birthdays"], columns["birthday_days"]
+        self._email_offsets, self._emails = columns["email_offsets"], columns["emails"]
+        self._address_offsets, self._addresses = columns["address_offsets"], columns["addresses"]
+
+    def _view(self, view: memoryview) -> memoryview:
+        """Remember a view of the map so it can be released before the map is closed."""
+        self._views.append(view)
+        return view
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _key_bytes(self, row: int) -> bytes:
+        return bytes(self._keys[self._key_offsets[row]:self._key_offsets[row + 1]])
+
+    def key(self, row: int) -> str:
+        """Get the key of a row.
+
+        Args:
+            row (int): Position of the contact in the snapshot.
+
+        Returns:
+            str: The normalized name.
+        """
+        return str(self._keys[self._key_offsets[row]:self._key_offsets[row + 1]], "utf-8")
+
+    def keys(self) -> Iterator[str]:
+        """Stream the keys in row order."""
+        return map(self.key, range(self.count))
+
+    def find(self, key: str) -> Optional[int]:
+        """Find the row of a key by binary search over the sorted order.
+
+        Args:
+            key (str): The normalized name.
+
+        Returns:
+            Optional[int]: The row, or None if the snapshot has no such key.
+        """
+        target = key.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_bytes(self._order[middle]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._key_bytes(self._order[low]) == target:
+            return self._order[low]
+        return None
+
+    def row(self, row: int) -> ContactRow:
+        """Decode the fields of a row.
+
+        Args:
+            row (int): Position of the contact in the snapshot.
+
+        Returns:
+            ContactRow: The stored fields.
+        """
+        start, end = self._name_offsets[row], self._name_offsets[row + 1]
+        name = str(self._names[start:end], "utf-8") if end > start else self.key(row)
+        start, end = self._email_offsets[row], self._email_offsets[row + 1]
+        email = str(self._emails[start:end], "utf-8") if end > start else None
+        start, end = self._address_offsets[row], self._address_offsets[row + 1]
+        address = json.loads(str(self._addresses[start:end], "utf-8")) if end > start else None
+        phones = self._phones[self._phone_starts[row]:self._phone_starts[row + 1]].tolist()
+        return ContactRow(name, phones, email, self._birthdays[row], address)
+
+    def birthday_rows(self, start: int, end: int) -> List[int]:
+        """Get the rows with a birthday between two days of the year.
+
+        Args:
+            start (int): First day as month * 100 + day.
+            end (int): Last day as month * 100 + day; smaller than ``start``
+                for an interval that wraps around the end of the year.
+
+        Returns:
+            List[int]: The rows, in row order.
+        """
+        days = self._birthday_days
+        if start <= end:
+            return [row for row, day in enumerate(days) if start <= day <= end]
+        return [row for row, day in enumerate(days) if day and (day >= start or day <= end)]
+
+    @property
+    def closed(self) -> bool:
+        """bool: True once the file has been unmapped."""
+        return self._map.closed
+
+    def close(self) -> None:
+        """Release the views and unmap the file."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
@@ -0,0 +1,445 @@
+import csv
+import multiprocessing
+import os
+import re
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from src.models.address_book import AddressBook
+from src.models.fields import ValidationException
+from src.models.record import Record
+
+CHUNK_SIZE = 1000  # Rows validated together by one worker process
+WORKERS = os.cpu_count() or 1
+REJECT_SUFFIX = ".rejected.csv"
+
+CSV_EXTENSIONS = (".csv",)
+VCARD_EXTENSIONS = (".vcf", ".vcard")
+
+# Header names accepted for each column of a CSV file
+CSV_COLUMNS = {
+    "name": "name",
+    "phone": "phones",
+    "phones": "phones",
+    "email": "email",
+    "birthday": "birthday",
+    "address": "address",
+}
+LIST_SEPARATOR = re.compile(r"[;,]")
+ISO_DATE = re.compile(r"^(\d{4})-?(\d{2})-?(\d{2})")
+
+
+class ImportRow(NamedTuple):
+    """A contact read from an import file, before validation.
+
+    Attributes:
+        line (int): Line of the file where the contact starts.
+        fields (dict): Texts of the contact under the keys "name", "phones"
+            (a list), "email", "birthday" (DD.MM.YYYY) and "address" (a list).
+        raw (str): The contact as written in the file, for the reject file.
+    """
+    line: int
+    fields: dict
+    raw: str
+
+
+class ImportResult(NamedTuple):
+    """Outcome of an import.
+
+    Attributes:
+        imported (int): Number of contacts added to the book or merged into it.
+        rejected (int): Number of contacts written to the reject file.
+        reject_path (str): Path of the reject file.
+        merged (int): Number of the imported contacts that were merged into
+            an existing contact of the same name.
+    """
+    imported: int
+    rejected: int
+    reject_path: str
+    merged: int = 0
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[ImportRow]:
+    """Read contacts from a CSV file with a header row.
+
+    Columns are matched by header, case-insensitively, and unknown columns are
+    ignored. Several phone numbers are separated by ";" and address
+    components by ",".
+
+    Args:
+        lines (Iterable[str]): Lines of the file, read lazily.
+
+    Yields:
+        ImportRow: One contact per data row.
+    """
+    consumed: List[str] = []
+
+    def source() -> Iterator[str]:
+        for line in lines:
+            consumed.append(line)
+            yield line
+
+    reader = csv.reader(source())
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [CSV_COLUMNS.get(column.strip().lower()) for column in header]
+    consumed.clear()
+    line = reader.line_num + 1
+    for row in reader:
+        raw = "".join(consumed)
+        consumed.clear()
+        if any(cell.strip() for cell in row):
+            fields = {}
+            for column, cell in zip(columns, row):
+                cell = cell.strip()
+                if column and cell:
+                    fields[column] = cell
+            if "phones" in fields:
+                fields["phones"] = [phone for phone in LIST_SEPARATOR.split(fields["phones"]) if phone.strip()]
+            if "address" in fields:
+                fields["address"] = [part.strip() for part in fields["address"].split(",") if part.strip()]
+            yield ImportRow(line, fields, raw)
+        line = reader.line_num + 1
+
+
+def _unfold(lines: Iterable[str]) -> Iterator[Tuple[int, str, str]]:
+    """Join the folded lines of a vCard file.
+
+    Args:
+        lines (Iterable[str]): Lines of the file, read lazily.
+
+    Yields:
+        Tuple[int, str, str]: Number of the first physical line, the logical
+            line and its raw text.
+    """
+    number, logical, raw = 0, None, ""
+    for current, line in enumerate(lines, 1):
+        if logical is not None and line[:1] in (" ", "\t"):
+            logical += line[1:].rstrip("\r\n")
+            raw += line
+            continue
+        if logical is not None:
+            yield number, logical, raw
+        number, logical, raw = current, line.rstrip("\r\n"), line
+    if logical is not None:
+        yield number, logical, raw
+
+
+def _split_property(line: str) -> Tuple[str, str]:
+    """Split a vCard content line into its property name and value.
+
+    Args:
+        line (str): An unfolded content line such as "TEL;TYPE=cell:1234567890".
+
+    Returns:
+        Tuple[str, str]: The uppercase property name without group or
+            parameters, and the value.
+    """
+    quoted = False
+    for position, char in enumerate(line):
+        if char == '"':
+            quoted = not quoted
+        elif char == ":" and not quoted:
+            name = line[:position].split(";", 1)[0]
+            return name.rsplit(".", 1)[-1].upper(), line[position + 1:]
+    return line.upper(), ""
+
+
+def _split_value(value: str, separator: str) -> List[str]:
+    """Split a structured vCard value and unescape its components.
+
+    Args:
+        value (str): The raw value.
+        separator (str): ";" or ",".
+
+    Returns:
+        List[str]: The unescaped components.
+    """
+    parts, current, escaped = [], [], False
+    for char in value:
+        if escaped:
+            current.append("\n" if char in "nN" else char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == separator:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def _vcard_fields(properties: List[Tuple[str, str]]) -> dict:
+    """Collect the fields of a contact from the properties of a vCard.
+
+    Args:
+        properties (List[Tuple[str, str]]): Property names and values.
+
+    Returns:
+        dict: The fields in the format of ImportRow.
+    """
+    fields: Dict[str, object] = {}
+    phones, structured_name = [], ""
+    for name, value in properties:
+        if name == "FN" and value.strip():
+            fields["name"] = _split_value(value, ";")[0].strip()
+        elif name == "N" and "name" not in fields:
+            family, given, additional = (_split_value(value, ";") + ["", "", ""])[:3]
+            structured_name = " ".join(part.strip() for part in (given, additional, family) if part.strip())
+        elif name == "TEL":
+            phone = value[4:] if value.lower().startswith("tel:") else value
+            phones.append(phone)
+        elif name == "EMAIL" and "email" not in fields:
+            fields["email"] = value.strip()
+        elif name == "BDAY":
+            match = ISO_DATE.match(value.strip())
+            # Dates without a year ("--0131") are kept as they are and rejected
+            fields["birthday"] = f"{match[3]}.{match[2]}.{match[1]}" if match else value.strip()
+        elif name == "ADR" and "address" not in fields:
+            parts = [part.strip() for part in _split_value(value, ";")]
+            fields["address"] = [part for part in parts if part]
+    if "name" not in fields and structured_name:
+        fields["name"] = structured_name
+    if phones:
+        fields["phones"] = phones
+    return fields
+
+
+def read_vcard(lines: Iterable[str]) -> Iterator[ImportRow]:
+    """Read contacts from a vCard 3.0 or 4.0 file.
+
+    The name comes from FN, or from N if there is no FN. Every TEL property
+    becomes a phone number, while only the first EMAIL and ADR are used, since
+    a contact has one of each. BDAY must be a full date.
+
+    Args:
+        lines (Iterable[str]): Lines of the file, read lazily.
+
+    Yields:
+        ImportRow: One contact per card. A card that is not closed by
+            END:VCARD is yielded with an "error" field.
+    """
+    start, properties, raw = None, [], []
+    for number, line, text in _unfold(lines):
+        name, value = _split_property(line)
+        if name == "BEGIN" and value.strip().upper() == "VCARD":
+            if start is not None:
+                yield ImportRow(start, {"error": "vCard is not closed by END:VCARD"}, "".join(raw))
+            start, properties, raw = number, [], [text]
+        elif start is None:
+            continue
+        elif name == "END" and value.strip().upper() == "VCARD":
+            raw.append(text)
+            yield ImportRow(start, _vcard_fields(properties), "".join(raw))
+            start = None
+        else:
+            properties.append((name, value))
+            raw.append(text)
+    if start is not None:
+        yield ImportRow(start, {"error": "vCard is not closed by END:VCARD"}, "".join(raw))
+
+
+def build_record(fields: dict) -> Record:
+    """Create a contact from the fields of an import row.
+
+    Every field goes through the validation of its field class.
+
+    Args:
+        fields (dict): The fields in the format of ImportRow.
+
+    Returns:
+        Record: The new contact.
+
+    Raises:
+        ValidationException: If the contact has no name or a field is invalid.
+        ValueError: If the file could not be parsed.
+    """
+    if "error" in fields:
+        raise ValueError(fields["error"])
+    if not fields.get("name"):
+        raise ValidationException("Contact has no name.")
+    record = Record(fields["name"])
+    for phone in fields.get("phones", ()):
+        record.add_phone("".join(char for char in phone if char.isdigit()))
+    if fields.get("email"):
+        record.add_email(fields["email"])
+    if fields.get("birthday"):
+        record.add_birthday(fields["birthday"])
+    if fields.get("address"):
+        record.add_address(fields["address"])
+    return record
+
+
+def merge_record(existing: Record, record: Record) -> None:
+    """Merge an imported contact into the existing contact of the same name.
+
+    Phones the contact does not have yet are added; the email, birthday and
+    address are only filled in where the contact has none, so nothing the
+    book already holds is overwritten.
+
+    Args:
+        existing (Record): The contact in the book.
+        record (Record): The imported contact.
+    """
+    phones = {phone.value for phone in existing.phones}
+    for phone in record.phones:
+        if phone.value not in phones:
+            existing.add_phone(phone.value)
+            phones.add(phone.value)
+    if record.email and not existing.email:
+        existing.add_email(record.email.value)
+    if record.birthday and not existing.birthday:
+        existing.add_birthday(record.show_birthday())
+    if record.address and not existing.address:
+        existing.add_address(record.address.value)
+
+
+def validate_chunk(rows: List[ImportRow]) -> List[Tuple[Optional[Record], Optional[str]]]:
+    """Validate a chunk of rows; runs in a worker process.
+
+    Args:
+        rows (List[ImportRow]): The rows to validate.
+
+    Returns:
+        List[Tuple[Optional[Record], Optional[str]]]: For every row, the new
+            contact and None, or None and the error message.
+    """
+    results = []
+    for row in rows:
+        try:
+            results.append((build_record(row.fields), None))
+        except (ValidationException, ValueError) as e:
+            results.append((None, str(e)))
+    return results
+
+
+def _chunks(rows: Iterable[ImportRow], size: int) -> Iterator[List[ImportRow]]:
+    """Split rows into lists of at most ``size`` rows."""
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def validate(rows: Iterable[ImportRow], executor: Optional[Executor] = None,
+             chunk_size: int = CHUNK_SIZE, window: int = 2 * WORKERS,
+             ) -> Iterator[Tuple[ImportRow, Optional[Record], Optional[str]]]:
+    """Validate rows in chunks, on an executor if one is given.
+
+    At most ``window`` chunks are read ahead of the caller, so memory does not
+    grow with the size of the input. Results come back in input order.
+
+    Args:
+        rows (Iterable[ImportRow]): The rows to validate, read lazily.
+        executor (Optional[Executor]): Pool to validate the chunks on, or
+            None to validate them in this process.
+        chunk_size (int): Number of rows sent to a worker at a time.
+        window (int): Maximum number of chunks being validated at once.
+
+    Yields:
+        Tuple[ImportRow, Optional[Record], Optional[str]]: Every row with its
+            contact or its error message.
+    """
+    chunks = _chunks(rows, chunk_size)
+    if executor is None:
+        for chunk in chunks:
+            yield from ((row, *result) for row, result in zip(chunk, validate_chunk(chunk)))
+        return
+    pending = deque()
+    for chunk in chunks:
+        pending.append((chunk, executor.submit(validate_chunk, chunk)))
+        if len(pending) >= window:
+            chunk, future = pending.popleft()
+            yield from ((row, *result) for row, result in zip(chunk, future.result()))
+    while pending:
+        chunk, future = pending.popleft()
+        yield from ((row, *result) for row, result in zip(chunk, future.result()))
+
+
+def read_rows(path: str, lines: Iterable[str]) -> Iterator[ImportRow]:
+    """Read the contacts of a file in the format given by its extension.
+
+    Args:
+        path (str): Path of the file.
+        lines (Iterable[str]): Lines of the file.
+
+    Returns:
+        Iterator[ImportRow]: The contacts of the file.
+
+    Raises:
+        ValueError: If the extension is neither CSV nor vCard.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in CSV_EXTENSIONS:
+        return read_csv(lines)
+    if extension in VCARD_EXTENSIONS:
+        return read_vcard(lines)
+    raise ValueError("Unsupported file type. Use a .csv or .vcf file.")
+
+
+def import_contacts(book: AddressBook, path: str, reject_path: Optional[str] = None,
+                    workers: int = WORKERS, chunk_size: int = CHUNK_SIZE) -> ImportResult:
+    """Import contacts from a CSV or vCard file into an address book.
+
+    The file is streamed through reading, validation and merging, so only a
+    few chunks are held in memory at a time. Chunks are validated on a pool
+    of worker processes; a file that fits in a single chunk is validated in
+    this process, since starting the pool would take longer. The workers are
+    spawned rather than forked: the import runs on a dispatcher thread while
+    the book is locked, and a forked child would inherit that lock state.
+    Valid contacts are added with ``add_record``, or merged with
+    ``merge_record`` into an existing contact of the same name. Invalid ones
+    are written to the reject file with their line and error, which is only
+    created if a contact is rejected.
+
+    Args:
+        book (AddressBook): The book to import into.
+        path (str): Path of the CSV or vCard file.
+        reject_path (Optional[str]): Path of the reject file, by default the
+            path of the input with the extension replaced by ".rejected.csv".
+        workers (int): Number of worker processes, 1 to validate in this process.
+        chunk_size (int): Number of rows validated at a time.
+
+    Returns:
+        ImportResult: The numbers of imported, merged and rejected contacts.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file type is not supported.
+    """
+    if reject_path is None:
+        reject_path = os.path.splitext(path)[0] + REJECT_SUFFIX
+    imported = rejected = merged = 0
+    with ExitStack() as stack:
+        lines = stack.enter_context(open(path, encoding="utf-8-sig", newline=""))
+        rows = read_rows(path, lines)
+        head = list(islice(rows, chunk_size + 1))
+        executor = None
+        if workers > 1 and len(head) > chunk_size:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            )
+        rows = chain(head, rows)
+        writer = None
+        for row, record, error in validate(rows, executor, chunk_size, 2 * workers):
+            if record is not None:
+                existing = book.find(record.name.value)
+                if existing is None:
+                    book.add_record(record)
+                else:
+                    merge_record(existing, record)
+                    merged += 1
+                imported += 1
+                continue
+            if writer is None:
+                reject_file = stack.enter_context(open(reject_path, "w", encoding="utf-8", newline=""))
+                writer = csv.writer(reject_file)
+                writer.writerow(["line", "error", "record"])
+            writer.writerow([row.line, error, row.raw.rstrip("\r\n")])
+            rejected += 1
+    return ImportResult(imported, rejected, reject_path, merged)
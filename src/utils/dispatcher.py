@@ -0,0 +1,161 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+READ_WORKERS = 2  # Threads running read commands; a cancelled read may still be finishing on one
+CHECK_INTERVAL = 1000  # Items a long loop processes between two cancellation checks
+
+T = TypeVar('T')
+
+_state = threading.local()
+
+
+class Cancelled(Exception):
+    """Raised in a worker thread when the command it runs has been cancelled."""
+
+
+def check_cancelled() -> None:
+    """Stop the current command if it has been cancelled.
+
+    Long loops call this between steps. Outside a dispatched command it
+    does nothing.
+
+    Raises:
+        Cancelled: If the command running on this thread has been cancelled.
+    """
+    event = getattr(_state, "cancel_event", None)
+    if event is not None and event.is_set():
+        raise Cancelled("Command cancelled.")
+
+
+def cancellable(items: Iterable[T], every: int = CHECK_INTERVAL) -> Iterator[T]:
+    """Iterate over items, stopping if the current command is cancelled.
+
+    Scans and index builds run over whole books while holding their read
+    lock, so they check for cancellation every few items; a cancelled read
+    then releases the lock instead of keeping writes waiting until it ends.
+    Outside a dispatched command the items are passed through unchecked.
+
+    Args:
+        items (Iterable[T]): The items to iterate over.
+        every (int): Number of items between two checks.
+
+    Returns:
+        Iterator[T]: The items.
+
+    Raises:
+        Cancelled: If the command running on this thread has been cancelled.
+    """
+    event = getattr(_state, "cancel_event", None)
+    if event is None:
+        yield from items
+        return
+    for i, item in enumerate(items):
+        if i % every == 0 and event.is_set():
+            raise Cancelled("Command cancelled.")
+        yield item
+
+
+class Job:
+    """A command submitted to a Dispatcher."""
+
+    def __init__(self, future: Future, cancel_event: threading.Event, cancellable: bool) -> None:
+        """Initialize the job.
+
+        Args:
+            future (Future): Future of the handler call.
+            cancel_event (threading.Event): Event set when the job is cancelled.
+            cancellable (bool): Whether the job may be cancelled.
+        """
+        self.future = future
+        self.cancellable = cancellable
+        self._cancel_event = cancel_event
+
+    def done(self) -> bool:
+        """Check whether the handler has finished."""
+        return self.future.done()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the handler to finish.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait, None to wait until it finishes.
+
+        Returns:
+            bool: True if the handler has finished.
+        """
+        wait([self.future], timeout)
+        return self.future.done()
+
+    def result(self) -> Any:
+        """Get the result of the handler.
+
+        Returns:
+            Any: The value returned by the handler.
+
+        Raises:
+            Exception: The error raised by the handler.
+        """
+        return self.future.result()
+
+    def cancel(self) -> bool:
+        """Cancel the job.
+
+        A job that has not started yet is dropped. A running job stops at its
+        next ``check_cancelled`` call; its result is discarded either way.
+
+        Returns:
+            bool: False if the job cannot be cancelled.
+        """
+        if not self.cancellable:
+            return False
+        self._cancel_event.set()
+        self.future.cancel()
+        return True
+
+
+class Dispatcher:
+    """Runs command handlers on worker threads so the UI stays responsive.
+
+    Write commands run one at a time, in order, on a single thread. Read
+    commands run on a small pool and can be cancelled. Handlers still take
+    the writer lock around the book, so a read never sees a half-applied
+    write.
+    """
+
+    def __init__(self, read_workers: int = READ_WORKERS) -> None:
+        """Initialize the dispatcher and its thread pools.
+
+        Args:
+            read_workers (int): Number of threads running read commands.
+        """
+        self._writes = ThreadPoolExecutor(max_workers=1, thread_name_prefix="write-command")
+        self._reads = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="read-command")
+
+    def submit(self, handler: Callable[[str], Any], args: str, is_write: bool) -> Job:
+        """Start a handler on a worker thread.
+
+        Args:
+            handler (Callable[[str], Any]): The command handler.
+            args (str): Arguments of the command.
+            is_write (bool): Whether the command changes a book.
+
+        Returns:
+            Job: The running command. Only read commands can be cancelled.
+        """
+        cancel_event = threading.Event()
+
+        def run() -> Any:
+            _state.cancel_event = cancel_event
+            try:
+                return handler(args)
+            finally:
+                _state.cancel_event = None
+
+        executor = self._writes if is_write else self._reads
+        return Job(executor.submit(run), cancel_event, cancellable=not is_write)
+
+    def close(self) -> None:
+        """Wait for the submitted writes and drop the reads that have not started."""
+        self._reads.shutdown(wait=False, cancel_futures=True)
+        self._writes.shutdown(wait=True)
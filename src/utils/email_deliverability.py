@@ -0,0 +1,158 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+import dns.resolver
+from email_validator import EmailUndeliverableError
+from email_validator.deliverability import caching_resolver, validate_email_deliverability
+
+from src.models.address_book import AddressBook
+from src.models.changes import Change
+from src.models.fields import Email
+
+DNS_TIMEOUT = 5  # Seconds to wait for one DNS lookup
+WORKERS = 4  # Number of lookups running at the same time
+
+# Answers proving that a domain does not accept mail; other wrapped errors only mean the lookup failed
+DNS_ANSWERS = (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)
+
+Resolver = Callable[[str], Optional[bool]]
+
+
+def dns_resolver(domain: str, resolver: Optional[dns.resolver.Resolver] = None) -> Optional[bool]:
+    """Check in DNS whether a domain accepts mail.
+
+    Args:
+        domain (str): The domain of an email address.
+        resolver (Optional[dns.resolver.Resolver]): Resolver to query, or
+            None for the system resolver with a timeout of DNS_TIMEOUT.
+
+    Returns:
+        Optional[bool]: True if the domain has MX, A or AAAA records and does
+            not reject mail, False if DNS says it does not accept mail, and
+            None if the lookup timed out or failed.
+    """
+    try:
+        if resolver is None:
+            info = validate_email_deliverability(domain, domain, timeout=DNS_TIMEOUT)
+        else:
+            info = validate_email_deliverability(domain, domain, dns_resolver=resolver)
+    except EmailUndeliverableError as e:
+        if e.__cause__ is not None and not isinstance(e.__cause__, DNS_ANSWERS):
+            return None
+        return False
+    # Timeouts and failing name servers are reported as unknown instead of raised
+    return None if "unknown-deliverability" in info else True
+
+
+def make_dns_resolver(nameservers: Optional[List[str]] = None, timeout: float = DNS_TIMEOUT) -> Resolver:
+    """Build a DNS check that queries the given name servers.
+
+    Args:
+        nameservers (Optional[List[str]]): IP addresses of the name servers,
+            or None for the ones the system is configured with.
+        timeout (float): Seconds to wait for one lookup.
+
+    Returns:
+        Resolver: Function telling whether a domain accepts mail.
+
+    Raises:
+        ValueError: If a name server is not an IP address.
+    """
+    resolver = dns.resolver.Resolver(configure=not nameservers)
+    if nameservers:
+        resolver.nameservers = list(nameservers)
+    return partial(dns_resolver, resolver=caching_resolver(timeout=timeout, dns_resolver=resolver))
+
+
+class DeliverabilityChecker:
+    """Checks on a thread pool whether the domains of email addresses accept mail.
+
+    Commands only validate the syntax of an address and return at once. The
+    checker looks the domain up afterwards and stores the answer in the
+    ``deliverable`` attribute of the Email field. Every domain is looked up
+    once per session; lookups that fail or cannot tell are forgotten, so the
+    next address with the domain tries again.
+    """
+
+    def __init__(self, resolver: Resolver = dns_resolver, workers: int = WORKERS) -> None:
+        """Initialize the checker and its thread pool.
+
+        Args:
+            resolver (Resolver): Function telling whether a domain accepts mail,
+                or None if it cannot tell. Tests pass a stub instead of the
+                DNS lookup.
+            workers (int): Number of lookups running at the same time.
+        """
+        self.resolver = resolver
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="email-check")
+        self._lookups: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def check(self, email: Email) -> Future:
+        """Schedule the deliverability check of an email address.
+
+        Args:
+            email (Email): The email field to update when the answer arrives.
+
+        Returns:
+            Future: Completed once the field is updated, with True, False or
+                None, or with the error of a failed lookup. The field stays
+                unknown when the answer is None or an error.
+        """
+        domain = email.value.rsplit("@", 1)[-1].lower()
+        with self._lock:
+            lookup = self._lookups.get(domain)
+            is_new = lookup is None
+            if is_new:
+                lookup = self._lookups[domain] = self._executor.submit(self.resolver, domain)
+        if is_new:
+            # Outside the lock: the callback runs at once if the lookup has already finished
+            lookup.add_done_callback(lambda done: self._forget_unknown(domain, done))
+        checked: Future = Future()
+
+        def attach(done: Future) -> None:
+            if done.cancelled():
+                checked.cancel()
+            elif done.exception() is not None:
+                checked.set_exception(done.exception())
+            else:
+                email.deliverable = done.result()
+                checked.set_result(email.deliverable)
+
+        lookup.add_done_callback(attach)
+        return checked
+
+    def _forget_unknown(self, domain: str, lookup: Future) -> None:
+        """Drop a finished lookup that did not tell whether the domain accepts mail.
+
+        Args:
+            domain (str): The looked up domain.
+            lookup (Future): The finished lookup.
+        """
+        if not lookup.cancelled() and lookup.exception() is None and lookup.result() is not None:
+            return
+        with self._lock:
+            if self._lookups.get(domain) is lookup:
+                del self._lookups[domain]
+
+    def watch(self, book: AddressBook) -> None:
+        """Check every email address added to a book from now on.
+
+        Args:
+            book (AddressBook): The book to subscribe to.
+        """
+        def on_change(change: Change) -> None:
+            if change.op not in ("add_email", "add_record"):
+                return
+            record = book.data.get(change.key)
+            if record is not None and record.email is not None:
+                self.check(record.email)
+
+        book.subscribe(on_change)
+
+    def close(self) -> None:
+        """Stop the thread pool without waiting for the pending lookups."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
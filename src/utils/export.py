@@ -0,0 +1,252 @@
+import csv
+import io
+import json
+import os
+from itertools import chain, islice
+from typing import Callable, Dict, Iterable, Iterator, TextIO
+
+from src.models.notes_book import Note
+from src.models.record import Record
+from src.utils.dispatcher import Cancelled, check_cancelled
+
+CHUNK_SIZE = 1000  # Records serialized before each write
+BUFFER_SIZE = 1024 * 1024  # Size of the file buffer in bytes
+VCARD_LINE_LENGTH = 75  # Longest vCard line before it is folded
+
+CONTACT_COLUMNS = ["name", "phones", "email", "birthday", "address"]
+NOTE_COLUMNS = ["title", "content", "tags"]
+
+
+def contact_fields(record: Record) -> dict:
+    """Get the fields of a contact as plain values.
+
+    Args:
+        record (Record): The contact.
+
+    Returns:
+        dict: Name, list of phones, email, birthday in DD.MM.YYYY format and
+            list of address components, None where a field is not set.
+    """
+    return {
+        "name": record.name.value,
+        "phones": [phone.value for phone in record.phones],
+        "email": record.email.value if record.email else None,
+        "birthday": record.birthday.value.strftime("%d.%m.%Y") if record.birthday else None,
+        "address": [part.strip() for part in record.address.value] if record.address else None,
+    }
+
+
+def note_fields(note: Note) -> dict:
+    """Get the fields of a note as plain values.
+
+    Args:
+        note (Note): The note.
+
+    Returns:
+        dict: Title, content and list of tags.
+    """
+    return {"title": note.title, "content": note.content, "tags": list(note.tags)}
+
+
+def jsonl_lines(items: Iterable, fields: Callable[[object], dict]) -> Iterator[str]:
+    """Serialize items as JSON Lines.
+
+    Args:
+        items (Iterable): Contacts or notes.
+        fields (Callable[[object], dict]): Function getting the fields of an item.
+
+    Yields:
+        str: One JSON object per line.
+    """
+    for item in items:
+        yield json.dumps(fields(item), ensure_ascii=False) + "\n"
+
+
+def _csv_contact_row(record: Record) -> list:
+    """Get the CSV cells of a contact, in the format read by the importer."""
+    fields = contact_fields(record)
+    return [
+        fields["name"],
+        ";".join(fields["phones"]),
+        fields["email"] or "",
+        fields["birthday"] or "",
+        ", ".join(fields["address"] or ()),
+    ]
+
+
+def _csv_note_row(note: Note) -> list:
+    """Get the CSV cells of a note, with the tags separated by ";"."""
+    return [note.title, note.content, ";".join(note.tags)]
+
+
+def csv_lines(items: Iterable, header: list, row: Callable[[object], list]) -> Iterator[str]:
+    """Serialize items as CSV with a header row.
+
+    Args:
+        items (Iterable): Contacts or notes.
+        header (list): Column names.
+        row (Callable[[object], list]): Function getting the cells of an item.
+
+    Yields:
+        str: The header, then one row per item. Cells containing line
+            breaks are quoted, so a row may span several lines.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for cells in chain([header], map(row, items)):
+        writer.writerow(cells)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def _escape(value: str) -> str:
+    """Escape a vCard text value."""
+    return (value.replace("\\", "\\\\").replace(",", "\\,")
+            .replace(";", "\\;").replace("\n", "\\n"))
+
+
+def _fold(line: str) -> str:
+    """Fold a vCard content line into lines of at most 75 characters.
+
+    The limit of the standard is 75 octets; counting characters keeps ASCII
+    lines within it and only lets lines with other characters run longer.
+
+    Returns:
+        str: The folded line ending with CRLF.
+    """
+    if len(line) <= VCARD_LINE_LENGTH:
+        return line + "\r\n"
+    parts = [line[:VCARD_LINE_LENGTH]]
+    for start in range(VCARD_LINE_LENGTH, len(line), VCARD_LINE_LENGTH - 1):
+        parts.append(" " + line[start:start + VCARD_LINE_LENGTH - 1])
+    return "\r\n".join(parts) + "\r\n"
+
+
+def vcard_lines(records: Iterable[Record]) -> Iterator[str]:
+    """Serialize contacts as vCard 4.0.
+
+    The address components fill the street, locality, region, postal code
+    and country of ADR, in this order, as the importer reads them back.
+
+    Args:
+        records (Iterable[Record]): The contacts.
+
+    Yields:
+        str: One card per contact.
+    """
+    for record in records:
+        fields = contact_fields(record)
+        lines = ["BEGIN:VCARD", "VERSION:4.0", f"FN:{_escape(fields['name'])}"]
+        lines.extend(f"TEL;TYPE=voice:{phone}" for phone in fields["phones"])
+        if fields["email"]:
+            lines.append(f"EMAIL:{fields['email']}")
+        if record.birthday:
+            lines.append(f"BDAY:{record.birthday.value.strftime('%Y%m%d')}")
+        if fields["address"]:
+            parts = [_escape(part) for part in fields["address"]]
+            parts[4:] = [", ".join(parts[4:])] if len(parts) > 4 else []
+            lines.append("ADR:;;" + ";".join(parts))
+        lines.append("END:VCARD")
+        yield "".join(map(_fold, lines))
+
+
+CONTACT_FORMATS: Dict[str, Callable[[Iterable[Record]], Iterator[str]]] = {
+    ".jsonl": lambda records: jsonl_lines(records, contact_fields),
+    ".csv": lambda records: csv_lines(records, CONTACT_COLUMNS, _csv_contact_row),
+    ".vcf": vcard_lines,
+}
+
+NOTE_FORMATS: Dict[str, Callable[[Iterable[Note]], Iterator[str]]] = {
+    ".jsonl": lambda notes: jsonl_lines(notes, note_fields),
+    ".csv": lambda notes: csv_lines(notes, NOTE_COLUMNS, _csv_note_row),
+}
+
+
+def write_chunked(lines: Iterable[str], f: TextIO, chunk_size: int = CHUNK_SIZE) -> None:
+    """Write serialized items with one write call per chunk.
+
+    Args:
+        lines (Iterable[str]): Serialized items, produced lazily.
+        f (TextIO): The file to write to.
+        chunk_size (int): Number of items joined into one write.
+    """
+    lines = iter(lines)
+    while chunk := list(islice(lines, chunk_size)):
+        f.write("".join(chunk))
+        check_cancelled()
+
+
+def export(items: Iterable, path: str, formats: Dict[str, Callable], chunk_size: int = CHUNK_SIZE) -> int:
+    """Write items to a file in the format given by its extension.
+
+    Items are serialized one at a time and written in chunks, so memory does
+    not grow with the number of items.
+
+    Args:
+        items (Iterable): Contacts or notes, read lazily.
+        path (str): Path of the file to write.
+        formats (Dict[str, Callable]): Serializers by file extension.
+        chunk_size (int): Number of items written at a time.
+
+    Returns:
+        int: Number of exported items.
+
+    Raises:
+        ValueError: If the extension is not one of the formats.
+        Cancelled: If the command is cancelled; the partial file is removed.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in formats:
+        raise ValueError(f"Unsupported file type. Use one of: {', '.join(formats)}.")
+    count = 0
+
+    def counted() -> Iterator:
+        nonlocal count
+        for item in items:
+            count += 1
+            yield item
+
+    try:
+        with open(path, "w", encoding="utf-8", newline="", buffering=BUFFER_SIZE) as f:
+            write_chunked(formats[extension](counted()), f, chunk_size)
+    except Cancelled:
+        os.remove(path)  # Do not leave a partial export behind
+        raise
+    return count
+
+
+def export_contacts(records: Iterable[Record], path: str, chunk_size: int = CHUNK_SIZE) -> int:
+    """Export contacts to a JSONL, CSV or vCard file.
+
+    Args:
+        records (Iterable[Record]): The contacts, for example
+            ``book.data.values()`` or the result of ``find_contacts``.
+        path (str): Path of the .jsonl, .csv or .vcf file to write.
+        chunk_size (int): Number of contacts written at a time.
+
+    Returns:
+        int: Number of exported contacts.
+
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    return export(records, path, CONTACT_FORMATS, chunk_size)
+
+
+def export_notes(notes: Iterable[Note], path: str, chunk_size: int = CHUNK_SIZE) -> int:
+    """Export notes to a JSONL or CSV file.
+
+    Args:
+        notes (Iterable[Note]): The notes, for example ``book.data.values()``
+            or the result of ``find_notes_by_tag``.
+        path (str): Path of the .jsonl or .csv file to write.
+        chunk_size (int): Number of notes written at a time.
+
+    Returns:
+        int: Number of exported notes.
+
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    return export(notes, path, NOTE_FORMATS, chunk_size)
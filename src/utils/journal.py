@@ -0,0 +1,191 @@
+import os
+import pickle
+from contextlib import contextmanager
+from typing import Iterator, Optional, Type, TypeVar
+
+from src.models.changes import Change
+from src.utils.storage import load_data, save_data
+
+T = TypeVar('T', bound=object)
+
+JOURNAL_SUFFIX = ".log"
+COMPACT_THRESHOLD = 1024 * 1024  # Fold the log into the snapshot after 1 MiB
+
+
+def snapshot_id(filename: str) -> Optional[tuple]:
+    """Identify the current version of a snapshot file.
+
+    Args:
+        filename (str): Path to the snapshot file.
+
+    Returns:
+        Optional[tuple]: Inode, size and modification time of the file, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def replay(book: object, log_filename: str, expected_id: Optional[tuple]) -> int:
+    """Apply the changes stored in a journal file to a book.
+
+    The log starts with the id of the snapshot it was written against. A log
+    that belongs to another snapshot is stale (it has already been compacted)
+    and is removed. A truncated entry at the end of the log, left by a crash
+    in the middle of a write, is cut off.
+
+    Args:
+        book (object): The book loaded from the snapshot.
+        log_filename (str): Path to the journal file.
+        expected_id (Optional[tuple]): Id of the snapshot the book was loaded from.
+
+    Returns:
+        int: Number of replayed changes.
+    """
+    try:
+        f = open(log_filename, "r+b")
+    except FileNotFoundError:
+        return 0
+    count = 0
+    with f:
+        try:
+            header = pickle.load(f)
+        except (EOFError, pickle.UnpicklingError):
+            stale = True
+        else:
+            stale = header != expected_id
+        while not stale:
+            position = f.tell()
+            try:
+                key, op, args, on_record = pickle.load(f)
+            except EOFError:
+                break
+            except (pickle.UnpicklingError, ValueError):
+                f.truncate(position)
+                break
+            target = book.data[key] if on_record else book
+            getattr(target, op)(*args)
+            count += 1
+        if not stale and f.tell() != os.fstat(f.fileno()).st_size:
+            f.truncate(position)
+    if stale:
+        os.remove(log_filename)
+    return count
+
+
+class Journal:
+    """Append-only mutation log kept next to a pickle snapshot.
+
+    Every change reported by the book is appended to ``<filename>.log`` instead
+    of rewriting the whole snapshot. Loading reads the snapshot and replays the
+    log on top of it. The log is folded into a fresh snapshot only once it grows
+    past the compaction threshold.
+    """
+
+    def __init__(self, filename: str, default_item: Type[T], compact_threshold: int = COMPACT_THRESHOLD) -> None:
+        """Initialize a journal for a snapshot file.
+
+        Args:
+            filename (str): Path to the snapshot file.
+            default_item (Type[T]): Book class to create if there is no snapshot yet.
+            compact_threshold (int): Log size in bytes that triggers compaction.
+        """
+        self.filename = filename
+        self.log_filename = filename + JOURNAL_SUFFIX
+        self.default_item = default_item
+        self.compact_threshold = compact_threshold
+        self.book = None
+        self._log = None
+        self._in_batch = False
+
+    def load(self) -> object:
+        """Load the snapshot, replay the log and start journaling the book.
+
+        Returns:
+            object: The loaded book.
+        """
+        book = load_data(self.filename, self.default_item)
+        replay(book, self.log_filename, snapshot_id(self.filename))
+        book.subscribe(self.append)
+        self.book = book
+        return book
+
+    def append(self, change: Change) -> None:
+        """Append a single change to the log.
+
+        Args:
+            change (Change): The change reported by the book.
+        """
+        if self._log is None:
+            self._log = open(self.log_filename, "ab")
+            if self._log.tell() == 0:
+                pickle.dump(snapshot_id(self.filename), self._log)
+        pickle.dump(tuple(change), self._log)
+        self._log.flush()
+
+    def log_size(self) -> int:
+        """Get the current size of the log.
+
+        Returns:
+            int: Size of the log file in bytes.
+        """
+        if self._log is not None:
+            return self._log.tell()
+        try:
+            return os.path.getsize(self.log_filename)
+        except FileNotFoundError:
+            return 0
+
+    def checkpoint(self) -> None:
+        """Compact the log if it has grown past the threshold."""
+        if self.log_size() >= self.compact_threshold:
+            self.compact()
+
+    def compact(self) -> None:
+        """Write a fresh snapshot of the book and discard the log."""
+        self.write_snapshot()
+        self._close_log()
+        try:
+            os.remove(self.log_filename)
+        except FileNotFoundError:
+            pass
+
+    def write_snapshot(self) -> None:
+        """Atomically replace the snapshot file with the current book."""
+        with self.book.lock.read():
+            save_data(self.book, self.filename)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Apply many changes with a single write at the end.
+
+        Changes made inside the block are not appended to the log. If the
+        book changed, a fresh snapshot is written when the block ends, even
+        if it ends with an error, so the file matches the book in memory.
+        A batch nested in another one is part of the outer batch.
+        """
+        if self._in_batch:
+            yield
+            return
+        self._in_batch = True
+        version = self.book.version
+        self.book.unsubscribe(self.append)
+        try:
+            yield
+        finally:
+            self._in_batch = False
+            self.book.subscribe(self.append)
+            if self.book.version != version:
+                self.compact()
+
+    def close(self) -> None:
+        """Stop writing to the log. Pending changes stay in it for the next load."""
+        self._close_log()
+
+    def _close_log(self) -> None:
+        """Close the log file handle if it is open."""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
@@ -0,0 +1,57 @@
+import os
+from typing import Optional, Type, TypeVar
+
+from src.models.mapped_books import contact_row
+from src.utils.columnar import save_columnar
+from src.utils.journal import COMPACT_THRESHOLD, Journal, replay, snapshot_id
+
+T = TypeVar('T', bound=object)
+
+
+class MappedStorage(Journal):
+    """Journal whose snapshot is a memory-mapped columnar file instead of a pickle.
+
+    Loading maps the snapshot and replays the log on top of it, so opening
+    a large book costs about as much as opening a small one. Compaction
+    writes a new columnar snapshot and discards the log, like Journal.
+    """
+
+    def __init__(self, filename: str, default_item: Type[T], migrate_from: Optional[Journal] = None,
+                 compact_threshold: int = COMPACT_THRESHOLD) -> None:
+        """Initialize the storage.
+
+        Args:
+            filename (str): Path to the columnar snapshot.
+            default_item (Type[T]): Mapped book class to open the snapshot with.
+            migrate_from (Optional[Journal]): Journaled pickle book to copy into
+                a new snapshot.
+            compact_threshold (int): Log size in bytes that triggers compaction.
+        """
+        super().__init__(filename, default_item, compact_threshold)
+        self.migrate_from = migrate_from
+
+    def load(self) -> object:
+        """Map the snapshot, copying the pickle book into it on first use, and replay the log.
+
+        Returns:
+            object: The opened book.
+        """
+        if not os.path.exists(self.filename) and self.migrate_from is not None:
+            old_book = self.migrate_from.load()
+            self.migrate_from.close()
+            if old_book.data:
+                save_columnar(((key, contact_row(record)) for key, record in old_book.data.items()), self.filename)
+        book = self.default_item(self.filename)
+        replay(book, self.log_filename, snapshot_id(self.filename))
+        book.subscribe(self.append)
+        self.book = book
+        return book
+
+    def write_snapshot(self) -> None:
+        """Write a new columnar snapshot and switch the book to it."""
+        self.book.save_snapshot(self.filename)
+
+    def close(self) -> None:
+        """Stop writing to the log and unmap the snapshot."""
+        super().close()
+        self.book.close()
@@ -0,0 +1,100 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class ReadWriteLock:
+    """Lock held by any number of readers or by a single writer.
+
+    Waiting writers go first: once a writer is waiting, new readers wait
+    behind it, so a steady stream of reads cannot starve writes. Both modes
+    are reentrant, and the thread holding the write lock may also read. A
+    reader cannot upgrade to the write lock, since two upgrading readers
+    would wait for each other forever.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an unlocked lock."""
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        self._local = threading.local()
+
+    def acquire_read(self) -> None:
+        """Wait until the lock can be held for reading and take it."""
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth or self._writer == threading.get_ident():
+            local.depth = depth + 1
+            return
+        with self._condition:
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        local.depth = 1
+
+    def release_read(self) -> None:
+        """Release a read lock taken by the current thread."""
+        local = self._local
+        local.depth -= 1
+        if local.depth or self._writer == threading.get_ident():
+            return
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """Wait until the lock can be held for writing and take it.
+
+        Raises:
+            RuntimeError: If the current thread holds the lock for reading.
+        """
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writer_depth += 1
+            return
+        if getattr(self._local, "depth", 0):
+            raise RuntimeError("A read lock cannot be upgraded to a write lock.")
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self) -> None:
+        """Release a write lock taken by the current thread."""
+        self._writer_depth -= 1
+        if self._writer_depth:
+            return
+        with self._condition:
+            self._writer = None
+            self._condition.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Hold the lock for reading while the block runs."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Hold the lock for writing while the block runs.
+
+        Raises:
+            RuntimeError: If the current thread holds the lock for reading.
+        """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
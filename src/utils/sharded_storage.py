@@ -0,0 +1,186 @@
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Type, TypeVar
+
+from src.models.changes import Change
+from src.utils.journal import Journal
+from src.utils.storage import load_data, restore_book, save_data
+
+T = TypeVar('T', bound=object)
+
+SHARD_COUNT = 16  # Number of shard files of a new book
+MAX_WORKERS = 8  # Threads that read or write shard files at the same time
+MANIFEST_NAME = "manifest.pkl"
+
+
+def shard_of(key: str, shard_count: int) -> int:
+    """Get the shard that stores a key.
+
+    The shard depends only on the key, not on the hash seed of the process,
+    so it is the same on every start.
+
+    Args:
+        key (str): Key of the entry (normalized contact name or note title).
+        shard_count (int): Number of shards of the book.
+
+    Returns:
+        int: Index of the shard.
+    """
+    return zlib.crc32(key.encode("utf-8")) % shard_count
+
+
+class ShardedStorage:
+    """Persistence for books split over several pickle files.
+
+    Entries are assigned to a shard by a hash of their key, and every shard
+    is stored in its own file in a directory. Changes reported by the book
+    mark their shard as dirty, and a checkpoint rewrites only the dirty
+    shards, so the cost of saving an edit grows with the size of a shard
+    instead of the size of the book. Shards are read and written by a pool
+    of threads.
+
+    Offers the same interface as Journal. As with SQLiteStorage, changes
+    become durable at each checkpoint. Every shard file is replaced
+    atomically, and an entry never moves between shards, so a crash during
+    a checkpoint leaves each entry either in its old or in its new state.
+    """
+
+    def __init__(self, directory: str, default_item: Type[T], migrate_from: Optional[Journal] = None,
+                 shard_count: int = SHARD_COUNT) -> None:
+        """Initialize the storage.
+
+        Args:
+            directory (str): Path to the directory of the shard files.
+            default_item (Type[T]): Book class to create.
+            migrate_from (Optional[Journal]): Journaled pickle book to copy into
+                new shards.
+            shard_count (int): Number of shards of a new book; an existing book
+                keeps the number it was created with.
+        """
+        self.directory = directory
+        self.default_item = default_item
+        self.migrate_from = migrate_from
+        self.shard_count = shard_count
+        self.book = None
+        # Keys of every shard with the position of the entry in the book, to restore its order
+        self._shards: List[Dict[str, int]] = []
+        self._dirty: Set[int] = set()
+        self._next_position = 0
+
+    @property
+    def manifest_filename(self) -> str:
+        """str: Path to the file that records the number of shards."""
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    def shard_filename(self, shard: int) -> str:
+        """Get the path to the file of a shard.
+
+        Args:
+            shard (int): Index of the shard.
+
+        Returns:
+            str: Path to the shard file.
+        """
+        return os.path.join(self.directory, f"shard-{shard:03d}.pkl")
+
+    def load(self) -> object:
+        """Read every shard, copying the pickle book into new shards on first use.
+
+        Returns:
+            object: The loaded book.
+        """
+        if os.path.exists(self.manifest_filename):
+            self.shard_count = load_data(self.manifest_filename, dict)["shards"]
+            with ThreadPoolExecutor(min(self.shard_count, MAX_WORKERS)) as pool:
+                shards = list(pool.map(lambda shard: load_data(self.shard_filename(shard), list),
+                                       range(self.shard_count)))
+            entries = sorted(entry for shard in shards for entry in shard)
+            self.book = restore_book(self.default_item, {key: value for _, key, value in entries})
+            self._shards = [{key: position for position, key, _ in shard} for shard in shards]
+            self._next_position = entries[-1][0] + 1 if entries else 0
+        else:
+            self._shards = [{} for _ in range(self.shard_count)]
+            if self.migrate_from is not None:
+                self.book = self.migrate_from.load()
+                self.migrate_from.close()
+                self.book.unsubscribe(self.migrate_from.append)
+            else:
+                self.book = self.default_item()
+            for key in self.book.data:
+                self._place(key)
+            os.makedirs(self.directory, exist_ok=True)
+            self._dirty = set(range(self.shard_count))
+            self.checkpoint()
+            # Written last, so a directory without it is migrated again
+            save_data({"shards": self.shard_count}, self.manifest_filename)
+        self.book.subscribe(self._on_change)
+        return self.book
+
+    def _place(self, key: str) -> int:
+        """Give a new key the next position in its shard.
+
+        Args:
+            key (str): Key of the entry.
+
+        Returns:
+            int: Index of the shard.
+        """
+        shard = shard_of(key, self.shard_count)
+        self._shards[shard][key] = self._next_position
+        self._next_position += 1
+        return shard
+
+    def _on_change(self, change: Change) -> None:
+        """Mark the shard of a changed entry as dirty.
+
+        Args:
+            change (Change): The change reported by the book.
+        """
+        shard = shard_of(change.key, self.shard_count)
+        if change.key not in self.book.data:
+            self._shards[shard].pop(change.key, None)
+        elif change.key not in self._shards[shard]:
+            self._place(change.key)
+        self._dirty.add(shard)
+
+    def dirty_shards(self) -> List[int]:
+        """Get the shards changed since the last checkpoint.
+
+        Returns:
+            List[int]: Indexes of the dirty shards, in order.
+        """
+        return sorted(self._dirty)
+
+    def _entries(self, shard: int) -> List[Tuple[int, str, object]]:
+        """Get the position, key and value of every entry in a shard."""
+        return [(position, key, self.book.data[key]) for key, position in self._shards[shard].items()]
+
+    def checkpoint(self) -> None:
+        """Rewrite the shards changed since the last checkpoint."""
+        if not self._dirty:
+            return
+        with self.book.lock.read():
+            shards = self.dirty_shards()
+            jobs = [(self._entries(shard), self.shard_filename(shard)) for shard in shards]
+            if len(jobs) == 1:
+                save_data(*jobs[0])
+            else:
+                with ThreadPoolExecutor(min(len(jobs), MAX_WORKERS)) as pool:
+                    # Waits for every shard, re-raising the first error
+                    list(pool.map(lambda job: save_data(*job), jobs))
+            self._dirty.difference_update(shards)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Apply many changes and write the touched shards once when the block ends."""
+        try:
+            yield
+        finally:
+            self.checkpoint()
+
+    def close(self) -> None:
+        """Write the pending changes and stop tracking the book."""
+        self.checkpoint()
+        self.book.unsubscribe(self._on_change)
@@ -0,0 +1,61 @@
+import os
+from contextlib import contextmanager
+from typing import Iterator, Optional, Type, TypeVar
+
+from src.utils.journal import Journal
+
+T = TypeVar('T', bound=object)
+
+
+class SQLiteStorage:
+    """Persistence for books kept in an SQLite database.
+
+    Offers the same interface as Journal, so the application can switch
+    between storage engines. Changes are written to the database as they
+    happen and become durable at each checkpoint.
+    """
+
+    def __init__(self, filename: str, default_item: Type[T], migrate_from: Optional[Journal] = None) -> None:
+        """Initialize the storage.
+
+        Args:
+            filename (str): Path to the database file.
+            default_item (Type[T]): SQLite book class to open the database with.
+            migrate_from (Optional[Journal]): Journaled pickle book to copy into a new database.
+        """
+        self.filename = filename
+        self.default_item = default_item
+        self.migrate_from = migrate_from
+        self.book = None
+
+    def load(self) -> object:
+        """Open the database, copying the pickle book into it on first use.
+
+        Returns:
+            object: The opened book.
+        """
+        is_new = not os.path.exists(self.filename)
+        book = self.default_item(self.filename)
+        if is_new and self.migrate_from is not None:
+            old_book = self.migrate_from.load()
+            self.migrate_from.close()
+            book.data.update(old_book.data)
+            book.commit()
+        self.book = book
+        return book
+
+    def checkpoint(self) -> None:
+        """Commit the changes made since the last checkpoint."""
+        self.book.commit()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Apply many changes in a single transaction, committed when the block ends."""
+        try:
+            yield
+        finally:
+            self.checkpoint()
+
+    def close(self) -> None:
+        """Commit the pending changes and close the database."""
+        self.book.close()
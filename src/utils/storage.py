@@ -1,16 +1,64 @@
+import os
 import pickle
+import tempfile
 from typing import Type, TypeVar
 
+from src.utils.codec import MAGIC, can_encode, decode_book, encode_book, is_encoded
+
 T = TypeVar('T', bound=object)
 
+def restore_book(book_class: Type[T], data: dict) -> object:
+    """Create a book holding the given entries, the way unpickling would.
+
+    Args:
+        book_class (Type[T]): Book class to create.
+        data (dict): Entries of the book by key.
+
+    Returns:
+        object: The book, with its records attached to it.
+    """
+    book = book_class.__new__(book_class)
+    state = {"data": data}
+    if hasattr(book, "__setstate__"):
+        book.__setstate__(state)
+    else:
+        book.__dict__.update(state)
+    return book
+
 def load_data(filename: str, default_item: Type[T]) -> object:
+    """Load a book saved by save_data.
+
+    Files written with the binary codec are recognized by their header;
+    anything else is unpickled, so files saved by older versions still load
+    and are rewritten with the codec on the next save.
+    """
     try:
         with open(filename, "rb") as f:
-            return pickle.load(f)
+            if not is_encoded(f.peek(len(MAGIC))):
+                return pickle.load(f)
+            return decode_book(f.read(), restore_book)
     except FileNotFoundError:
-        return default_item() 
+        return default_item()
 
 def save_data(book: object, filename: str) -> None:
-    with open(filename, "wb") as f:
-        pickle.dump(book, f)
+    """Atomically replace the file with the book.
 
+    Address books and notes books are written with the binary codec, other
+    objects are pickled. The data is written to a temporary file in the same
+    directory, synced to disk and then renamed over the old file, so a crash
+    never leaves a truncated file behind.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_name = tempfile.mkstemp(prefix=os.path.basename(filename) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if can_encode(book):
+                f.write(encode_book(book))
+            else:
+                pickle.dump(book, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_name, filename)
+    except BaseException:
+        os.remove(temp_name)
+        raise
@@ -0,0 +1,149 @@
+import threading
+import time
+from typing import List, Optional
+
+from src.utils.rwlock import ReadWriteLock
+
+DEBOUNCE_DELAY = 0.5  # Seconds without new changes before a burst is written
+RETRY_DELAY = 1.0  # Seconds before a failed checkpoint is first retried
+MAX_RETRY_DELAY = 60.0  # Longest wait between two retries
+
+
+class BackgroundWriter:
+    """Persists changed books on a background thread.
+
+    Handlers only mark their storage as dirty and return immediately. The
+    writer waits until no new changes have arrived for ``delay`` seconds and
+    then checkpoints every dirty storage once, so a burst of edits costs a
+    single write. Storages whose checkpoint fails stay dirty and are retried
+    after a delay that doubles with every failure.
+
+    Books are not thread-safe, so writes and checkpoints must not run at the
+    same time as anything else. Read commands hold ``lock`` for reading and
+    may run together; write commands and checkpoints hold it for writing.
+    """
+
+    def __init__(self, delay: float = DEBOUNCE_DELAY) -> None:
+        """Initialize the writer and start its thread.
+
+        Args:
+            delay (float): Quiet period in seconds before dirty storages are written.
+        """
+        self.delay = delay
+        self.lock = ReadWriteLock()
+        self.error: Optional[BaseException] = None
+        self._condition = threading.Condition()
+        self._pending: List[object] = []
+        self._last_change = 0.0
+        self._flush_requested = False
+        self._busy = False
+        self._closed = False
+        self._attempts = 0
+        self._failures = 0
+        self._retry_at = 0.0
+        self._thread = threading.Thread(target=self._run, name="background-writer", daemon=True)
+        self._thread.start()
+
+    def mark_dirty(self, storage: object) -> None:
+        """Schedule a checkpoint of a storage whose book has changed.
+
+        Args:
+            storage (object): A storage with a ``checkpoint()`` method.
+        """
+        with self._condition:
+            if storage not in self._pending:
+                self._pending.append(storage)
+            self._last_change = time.monotonic()
+            self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Write all pending changes now and wait until they are stored.
+
+        A failed write is not retried in a loop: the changes stay pending and
+        its error is raised.
+
+        Raises:
+            Exception: The error of a failed background write, if any.
+        """
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            # Only a write started after this call can fail it
+            started = self._attempts + self._busy
+            while (self._pending or self._busy) and not (self.error is not None and self._attempts > started):
+                self._condition.wait()
+        self._raise_error()
+
+    def close(self) -> None:
+        """Flush the pending changes and stop the writer thread.
+
+        Pending changes are written once more, even if they failed before.
+
+        Raises:
+            Exception: The error of a failed background write, if any.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        """Re-raise the error of a failed background write in the calling thread."""
+        error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def _run(self) -> None:
+        """Wait for dirty storages and checkpoint them in coalesced batches.
+
+        A failed batch goes back to the pending storages, except for the ones
+        already written, and is retried after the backoff delay. A flush or a
+        close retries at once; if the write still fails while closing, the
+        thread stops and leaves the error to ``close``.
+        """
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                # Let a burst of edits settle, and wait out the backoff after a failure
+                while not (self._flush_requested or self._closed):
+                    remaining = max(self._last_change + self.delay, self._retry_at) - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                storages, self._pending = self._pending, []
+                self._flush_requested = False
+                closing = self._closed
+                self._busy = True
+            written = 0
+            failed = False
+            try:
+                with self.lock.write():
+                    for storage in storages:
+                        storage.checkpoint()
+                        written += 1
+            except Exception as e:
+                failed = True
+                with self._condition:
+                    self.error = e
+                    # Storages marked dirty during the write are already pending again
+                    self._pending[:0] = [storage for storage in storages[written:] if storage not in self._pending]
+                    self._failures += 1
+                    backoff = min(RETRY_DELAY * 2 ** (self._failures - 1), MAX_RETRY_DELAY)
+                    self._retry_at = time.monotonic() + backoff
+            else:
+                with self._condition:
+                    # Everything that failed before is stored now
+                    self.error = None
+                    self._failures = 0
+                    self._retry_at = 0.0
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._attempts += 1
+                    self._condition.notify_all()
+            if failed and closing:
+                return
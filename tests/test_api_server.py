@@ -0,0 +1,94 @@
+import http.client
+import json
+import threading
+import pytest
+from src.main import build_handlers
+from src.models.address_book import AddressBook
+from src.models.notes_book import NotesBook
+from src.ui.api_server import ApiServer, BookApi
+from src.utils.rwlock import ReadWriteLock
+
+@pytest.fixture
+def api():
+    address_book = AddressBook()
+    address_book.add_contact("John Smith", "1234567890")
+    address_book.add_contact("Jane Doe", "5551234567")
+    notes_book = NotesBook()
+    notes_book.add_note("Meeting Notes", "Budget review")
+    notes_book.add_tag_to_note("Meeting Notes", "work")
+    address_handlers, note_handlers = build_handlers(address_book, notes_book)
+    return BookApi({**address_handlers, **note_handlers}, address_book, notes_book, ReadWriteLock())
+
+def test_contacts_are_looked_up_and_searched(api):
+    status, contact = api.handle("GET", "/contacts/john%20smith")
+    assert status == 200
+    assert contact["name"] == "John Smith"
+    assert contact["phones"] == ["1234567890"]
+
+    status, found = api.handle("GET", "/contacts?q=doe")
+    assert [contact["name"] for contact in found["contacts"]] == ["Jane Doe"]
+
+    status, page = api.handle("GET", "/contacts?offset=1&limit=5")
+    assert [contact["name"] for contact in page["contacts"]] == ["Jane Doe"]
+
+def test_commands_run_through_the_handlers(api):
+    status, answer = api.handle("POST", "/commands/Add%20Contact", b'{"args": "Bob Brown 5550001111"}')
+    assert (status, answer) == (200, {"result": "Contact added."})
+    assert api.handle("GET", "/contacts/bob%20brown")[0] == 200
+
+    status, answer = api.handle("POST", "/commands/Add%20Contact", b'{"args": "Bob"}')
+    assert status == 400
+    assert "\x1b" not in answer["error"]
+
+    commands = {command["name"]: command["kind"] for command in api.handle("GET", "/commands")[1]}
+    assert commands["Add Contact"] == "write"
+    assert commands["Find Note"] == "read"
+
+def test_notes_are_found_by_words_and_tags(api):
+    assert api.handle("GET", "/notes?q=budget")[1]["notes"][0]["title"] == "Meeting Notes"
+    assert api.handle("GET", "/notes?tag=work")[1]["notes"][0]["title"] == "Meeting Notes"
+    assert api.handle("GET", "/notes?query=work%20AND%20NOT%20home")[1]["notes"][0]["title"] == "Meeting Notes"
+    assert api.handle("GET", "/notes?query=(work")[0] == 400
+
+def test_errors_are_answered_as_json(api):
+    assert api.handle("GET", "/contacts/nobody") == (404, {"error": "Contact 'Nobody' not found."})
+    assert api.handle("GET", "/elsewhere")[0] == 404
+    assert api.handle("DELETE", "/contacts/john%20smith")[0] == 405
+    assert api.handle("POST", "/commands/Add%20Contact", b"[1]")[0] == 400
+    assert api.handle("GET", "/contacts?limit=many")[0] == 400
+
+def test_server_answers_many_requests_on_one_connection(api):
+    server = ApiServer(("127.0.0.1", 0), api)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        for _ in range(50):
+            connection.request("GET", "/contacts/jane%20doe")
+            response = connection.getresponse()
+            assert response.status == 200
+            assert json.loads(response.read())["name"] == "Jane Doe"
+        connection.request("GET", "/health")
+        assert json.loads(connection.getresponse().read()) == {"status": "ok", "contacts": 2, "notes": 1}
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+@pytest.mark.parametrize("length", ["abc", "-1", "²"])
+def test_invalid_content_length_is_a_bad_request(api, length):
+    server = ApiServer(("127.0.0.1", 0), api)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        connection.putrequest("POST", "/commands/Add%20Contact")
+        connection.putheader("Content-Length", length.encode("utf-8"))
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 400
+        assert json.loads(response.read()) == {"error": "Invalid Content-Length."}
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
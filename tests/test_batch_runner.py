@@ -0,0 +1,89 @@
+import io
+import os
+import pytest
+import src.main as app
+from src.models.address_book import AddressBook
+from src.models.notes_book import NotesBook
+from src.ui.batch_runner import BatchRunner
+from src.utils.journal import Journal
+from src.utils.storage import load_data
+
+SCRIPT = """\
+# Contacts
+Add Contact John Smith 1234567890
+add contact Jane Doe 0987654321
+Add Birthday John Smith: 01.01.2000
+Add Email Jane Doe: jane@example.com
+Change Phone John Smith: 1234567890 1112223333
+Show Email Jane Doe
+
+Add Note Meeting: Budget review
+Add Tag Meeting: work
+Find Notes by Tag work
+Find Note budget
+Delete Contact Nobody
+Fly Away
+"""
+
+@pytest.fixture
+def books():
+    return AddressBook(), NotesBook()
+
+def run(books, script=SCRIPT):
+    output, errors = io.StringIO(), io.StringIO()
+    address_handlers, note_handlers = app.build_handlers(*books)
+    failed = BatchRunner(output, errors).run({**address_handlers, **note_handlers}, io.StringIO(script))
+    return failed, output.getvalue(), errors.getvalue()
+
+def test_longest_command_name_wins():
+    commands = sorted(["Find Note", "Find Notes by Tag", "Add Tag"], key=len, reverse=True)
+    assert BatchRunner.parse("find notes by tag work", commands) == ("Find Notes by Tag", "work")
+    assert BatchRunner.parse("Find Note: budget", commands) == ("Find Note", "budget")
+    assert BatchRunner.parse("Find Notebook", commands) is None
+
+def test_script_runs_every_command(books):
+    address_book, notes_book = books
+    failed, output, errors = run(books)
+
+    assert address_book.find("John Smith").phones[0].value == "1112223333"
+    assert address_book.find("John Smith").show_birthday() == "01.01.2000"
+    assert "jane@example.com" in output
+    assert "Meeting" in output
+    assert notes_book.find_notes_by_tag("work")[0].title == "Meeting"
+    assert "\x1b[" not in output
+
+    assert failed == 2
+    assert errors.splitlines() == [
+        "line 13: Contact 'Nobody' not found.",
+        "line 14: Unknown command: Fly Away",
+    ]
+
+def test_batch_saves_once_at_the_end(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "script.txt").write_text(SCRIPT)
+
+    assert app.main(["--batch", "script.txt"]) == 1
+
+    # No journal was written; the changes went straight into the snapshots
+    assert sorted(os.listdir(tmp_path)) == ["my_address_book.pkl", "my_notes.pkl", "script.txt"]
+    book = load_data("my_address_book.pkl", AddressBook)
+    assert book.find("Jane Doe").email.value == "jane@example.com"
+
+def test_journal_batch_without_changes_writes_nothing(tmp_path):
+    journal = Journal(str(tmp_path / "book.pkl"), AddressBook)
+    journal.load()
+    with journal.batch():
+        pass
+    assert os.listdir(tmp_path) == []
+
+def test_journal_keeps_logging_after_a_batch(tmp_path):
+    filename = str(tmp_path / "book.pkl")
+    journal = Journal(filename, AddressBook)
+    book = journal.load()
+    with journal.batch():
+        book.add_contact("John Smith", "1234567890")
+    book.add_contact("Jane Doe", "0987654321")
+    journal.close()
+
+    reloaded = Journal(filename, AddressBook).load()
+    assert sorted(reloaded.data) == ["Jane Doe", "John Smith"]
@@ -0,0 +1,37 @@
+import json
+from benchmarks.datagen import generate_address_book, generate_notes_book
+from benchmarks.run import main
+from benchmarks import memory
+
+def test_generated_books_are_repeatable():
+    first, second = generate_address_book(200, seed=7), generate_address_book(200, seed=7)
+    assert [str(record) for record in first.values()] == [str(record) for record in second.values()]
+    assert len(generate_notes_book(50)) == 50
+
+def test_generated_contacts_are_valid():
+    book = generate_address_book(500)
+    assert len(book) == 500
+    assert all(1 <= len(record.phones) <= 3 for record in book.values())
+    assert any(record.email for record in book.values())
+    assert any(record.address for record in book.values())
+
+def test_results_are_written_and_compared(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    assert main(["--sizes", "100", "--min-time", "0", "--cases", "show_phone", "--output", str(output)]) == 0
+    results = json.loads(output.read_text())["results"]
+    assert [(r["case"], r["size"]) for r in results] == [("show_phone", 100)]
+    assert results[0]["p50_ms"] <= results[0]["p99_ms"]
+
+    # A baseline that was much faster makes the comparison fail
+    baseline = json.loads(output.read_text())
+    baseline["results"][0]["p50_ms"] /= 1000
+    (tmp_path / "old.json").write_text(json.dumps(baseline))
+    assert main(["--sizes", "100", "--min-time", "0", "--cases", "show_phone",
+                 "--compare", str(tmp_path / "old.json")]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
+
+def test_memory_is_compared_with_the_dict_layout(capsys):
+    memory.main(["--contacts", "2000"])
+    lines = capsys.readouterr().out.splitlines()
+    current, baseline = (int(part.split()[-1].rstrip(")")) for part in lines[1].split(" bytes "))
+    assert current < baseline
@@ -0,0 +1,57 @@
+import pytest
+from datetime import date, datetime, timedelta
+from src.models.address_book import AddressBook
+from src.models.search_index import BirthdayIndex
+
+@pytest.fixture
+def index():
+    index = BirthdayIndex(lambda born: born)
+    index.rebuild([
+        ("New Year", date(1990, 1, 1)),
+        ("Leap", date(2000, 2, 29)),
+        ("March", date(1985, 3, 1)),
+        ("Eve", date(1970, 12, 31)),
+    ])
+    return index
+
+def keys(hits):
+    return [key for _, key in hits]
+
+def test_range_within_a_year(index):
+    assert keys(index.between(date(2025, 1, 1), date(2025, 2, 27))) == ["New Year"]
+
+def test_range_wraps_around_new_year(index):
+    hits = list(index.between(date(2025, 12, 30), date(2026, 1, 5)))
+    assert hits == [(date(2025, 12, 31), "Eve"), (date(2026, 1, 1), "New Year")]
+
+def test_leap_day_is_celebrated_on_28_february_in_common_years(index):
+    assert list(index.between(date(2025, 2, 28), date(2025, 2, 28))) == [(date(2025, 2, 28), "Leap")]
+    assert keys(index.between(date(2025, 3, 1), date(2025, 3, 1))) == ["March"]
+    assert list(index.between(date(2028, 2, 28), date(2028, 2, 29))) == [(date(2028, 2, 29), "Leap")]
+
+def test_long_range_returns_every_anniversary(index):
+    hits = list(index.between(date(2025, 6, 1), date(2027, 5, 31)))
+    assert len(hits) == 8
+    assert hits == sorted(hits)
+
+def test_index_follows_additions_and_removals(index):
+    index.add("Spring", date(1999, 3, 1))
+    index.discard("March")
+    index.add("Eve", date(1970, 3, 1))
+    assert keys(index.between(date(2025, 3, 1), date(2025, 3, 1))) == ["Eve", "Spring"]
+    assert keys(index.between(date(2025, 12, 1), date(2025, 12, 31))) == []
+
+def test_upcoming_birthdays_follow_record_changes():
+    book = AddressBook()
+    soon = datetime.now().date() + timedelta(days=3)
+    book.add_contact("John Smith", "1234567890")
+    book.add_contact("Jane Doe", "0987654321")
+    assert book.get_upcoming_birthdays("7") == []  # Builds the index
+
+    book.find("John Smith").add_birthday(soon.replace(year=1990).strftime("%d.%m.%Y"))
+    upcoming = book.get_upcoming_birthdays("7")
+    assert [entry["name"] for entry in upcoming] == ["John Smith"]
+    assert upcoming[0]["birthday"] == soon.strftime("%d.%m.%Y")
+
+    book.delete("John Smith")
+    assert book.get_upcoming_birthdays("7") == []
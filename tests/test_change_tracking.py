@@ -0,0 +1,53 @@
+import pytest
+from src.models.address_book import AddressBook
+from src.models.notes_book import NotesBook
+from src.constants.commands import (
+    ContactCommands,
+    AddressCommands,
+    NoteCommands,
+    BirthdayCommands,
+    COMMAND_KINDS,
+)
+from src.handlers.contact_handlers import handle_add_contact, handle_find_contact, handle_show_all
+from src.handlers.birthday_handlers import handle_add_birthday, handle_show_birthday
+from src.handlers.note_handlers import handle_add_note, handle_add_tag, handle_find_notes_by_tag
+
+@pytest.fixture
+def address_book():
+    return AddressBook()
+
+@pytest.fixture
+def notes_book():
+    return NotesBook()
+
+def test_every_command_has_a_kind():
+    for commands in (ContactCommands, AddressCommands, NoteCommands, BirthdayCommands):
+        for command in commands:
+            assert command in COMMAND_KINDS
+
+def test_record_changes_bump_book_version(address_book):
+    handle_add_contact("John Smith 1234567890", address_book)
+    version = address_book.version
+    assert version > 0
+
+    handle_add_birthday("John Smith: 01.01.2000", address_book)
+    assert address_book.version > version
+
+def test_reads_do_not_bump_book_version(address_book):
+    handle_add_contact("John Smith 1234567890", address_book)
+    handle_add_birthday("John Smith: 01.01.2000", address_book)
+    version = address_book.version
+
+    handle_find_contact("John", address_book)
+    handle_show_all(address_book)
+    handle_show_birthday("John Smith", address_book)
+    assert address_book.version == version
+
+def test_note_changes_bump_book_version(notes_book):
+    handle_add_note("Meeting Notes: Important meeting tomorrow", notes_book)
+    handle_add_tag("Meeting Notes: work", notes_book)
+    version = notes_book.version
+    assert version == 2
+
+    handle_find_notes_by_tag("work", notes_book)
+    assert notes_book.version == version
@@ -0,0 +1,77 @@
+import pickle
+import pytest
+from src.models.address_book import AddressBook
+from src.models.mapped_books import MappedAddressBook
+from src.models.notes_book import NotesBook
+from src.models.record import Record
+from src.utils.codec import CodecError, can_encode, decode_book, encode_book, is_encoded
+from src.utils.storage import load_data, restore_book, save_data
+
+@pytest.fixture
+def address_book():
+    book = AddressBook()
+    book.add_contact("John Smith", "1234567890")
+    book.find("John Smith").add_phone("0000000001")
+    book.find("John Smith").add_birthday("29.02.2000")
+    book.find("John Smith").add_address(["123 Main St", " Київ", " USA", " 12345"])
+    book.add_contact("Zoe O'Brien", "0987654321")
+    book.add_email_to_contact("Zoe O'Brien", "zoe@example.com")
+    book.add_record(Record("jane doe"))  # Stored under "Jane Doe", without phones
+    return book
+
+@pytest.fixture
+def notes_book():
+    book = NotesBook()
+    book.add_note("Meeting Notes", "Important meeting tomorrow " * 20)
+    book.add_tag_to_note("Meeting Notes", "work")
+    book.add_tag_to_note("Meeting Notes", "робота")
+    book.add_note("Shopping", "Milk")
+    return book
+
+def test_address_book_round_trip(address_book):
+    decoded = decode_book(bytes(encode_book(address_book)), restore_book)
+
+    assert type(decoded) is AddressBook
+    assert list(decoded.data) == list(address_book.data)
+    assert [str(record) for record in decoded.data.values()] == [str(record) for record in address_book.data.values()]
+    assert decoded.find("Jane Doe").name.value == "jane doe"
+    assert decoded.find("John Smith").address.value == ["123 Main St", " Київ", " USA", " 12345"]
+    assert decoded.find("John Smith").birthday.value == address_book.find("John Smith").birthday.value
+    # Records report their changes to the decoded book
+    decoded.find("John Smith").remove_phone("0000000001")
+    assert decoded.version == 1
+
+def test_notes_book_round_trip(notes_book):
+    decoded = decode_book(bytes(encode_book(notes_book)), restore_book)
+
+    assert type(decoded) is NotesBook
+    assert [str(note) for note in decoded.data.values()] == [str(note) for note in notes_book.data.values()]
+    assert [note.title for note in decoded.find_notes_by_tag("робота")] == ["Meeting Notes"]
+
+def test_pickle_files_are_migrated_on_save(tmp_path, address_book):
+    filename = str(tmp_path / "book.pkl")
+    with open(filename, "wb") as f:
+        pickle.dump(address_book, f)
+
+    book = load_data(filename, AddressBook)
+    assert [str(record) for record in book.data.values()] == [str(record) for record in address_book.data.values()]
+
+    save_data(book, filename)
+    with open(filename, "rb") as f:
+        assert is_encoded(f.read())
+    assert list(load_data(filename, AddressBook).data) == list(address_book.data)
+
+def test_other_objects_are_pickled(tmp_path):
+    assert not can_encode(MappedAddressBook(str(tmp_path / "missing.cols")))
+    filename = str(tmp_path / "manifest.pkl")
+    save_data({"shards": 4}, filename)
+    assert load_data(filename, dict) == {"shards": 4}
+
+def test_damaged_data_is_rejected(address_book):
+    data = bytes(encode_book(address_book))
+    with pytest.raises(CodecError):
+        decode_book(data[:-3], restore_book)
+    with pytest.raises(CodecError):
+        decode_book(data[:7] + b"\x63" + data[8:], restore_book)  # Schema version 99
+    with pytest.raises(CodecError):
+        decode_book(pickle.dumps(address_book), restore_book)
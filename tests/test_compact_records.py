@@ -0,0 +1,67 @@
+import base64
+import pickle
+from datetime import date
+import pytest
+from src.models.address_book import AddressBook
+from src.models.fields import Birthday, Phone, ValidationException
+from src.models.record import Record
+
+# AddressBook pickled before records and fields had __slots__
+LEGACY_BOOK = base64.b64decode(
+    "gASVwwEAAAAAAACMF3NyYy5tb2RlbHMuYWRkcmVzc19ib29rlIwLQWRkcmVzc0Jvb2uUk5QpgZR9lIwEZGF0YZR9lCiMCkpvaG4gU21p"
+    "dGiUjBFzcmMubW9kZWxzLnJlY29yZJSMBlJlY29yZJSTlCmBlH2UKIwEbmFtZZSMEXNyYy5tb2RlbHMuZmllbGRzlIwETmFtZZSTlCmB"
+    "lH2UjAV2YWx1ZZSMCkpvaG4gU21pdGiUc2KMBnBob25lc5RdlGgOjAVQaG9uZZSTlCmBlH2UaBOMCjAxMjM0NTY3ODmUc2JhjAVlbWFp"
+    "bJRoDowFRW1haWyUk5QpgZR9lGgTjBBqb2huQGV4YW1wbGUuY29tlHNijAhiaXJ0aGRheZRoDowIQmlydGhkYXmUk5QpgZR9lGgTjAhk"
+    "YXRldGltZZSMBGRhdGWUk5RDBAfQAh2UhZRSlHNijAdhZGRyZXNzlGgOjAdBZGRyZXNzlJOUKYGUfZRoE12UKIwJMSBNYWluIFN0lIwE"
+    "S3lpdpRlc2J1YowISmFuZSBEb2WUaAopgZR9lChoDWgQKYGUfZRoE4wISmFuZSBEb2WUc2JoFV2UaBxOaCJOaC1OdWJ1c2Iu"
+)
+
+def test_records_and_fields_have_no_instance_dict():
+    record = Record("John Smith")
+    record.add_phone("0123456789")
+    record.add_birthday("01.01.2000")
+    for obj in (record, record.name, record.phones[0], record.birthday):
+        assert not hasattr(obj, "__dict__")
+
+def test_phone_keeps_leading_zeros():
+    phone = Phone("0012345678")
+    assert phone.value == "0012345678"
+    assert str(phone) == "0012345678"
+
+def test_birthday_is_read_back_as_a_date():
+    assert Birthday("29.02.2000").value == date(2000, 2, 29)
+
+def test_edit_phone_validates_the_new_number():
+    record = Record("John Smith")
+    record.add_phone("0123456789")
+    with pytest.raises(ValidationException):
+        record.edit_phone("0123456789", "12ab")
+    assert record.phones[0].value == "0123456789"
+
+@pytest.mark.parametrize("number", ["012345678\u00b2", "\u0660\u0661\u0662\u0663\u0664\u0665\u0666\u0667\u0668\u0669"])
+def test_phone_accepts_only_ascii_digits(number):
+    with pytest.raises(ValidationException):
+        Phone(number)
+
+def test_legacy_pickle_still_loads():
+    book = pickle.loads(LEGACY_BOOK)
+    record = book.find("John Smith")
+    assert record.phones[0].value == "0123456789"
+    assert record.birthday.value == date(2000, 2, 29)
+    assert record.email.value == "john@example.com"
+    assert record.address.value == ["1 Main St", "Kyiv"]
+    assert book.find("Jane Doe").birthday is None
+
+    # Loaded records still report their changes to the book
+    version = book.version
+    record.add_phone("1112223333")
+    assert book.version == version + 1
+
+def test_pickle_round_trip():
+    book = AddressBook()
+    book.add_contact("John Smith", "0123456789")
+    book.find("John Smith").add_birthday("15.03.1990")
+    copy = pickle.loads(pickle.dumps(book))
+    record = copy.find("John Smith")
+    assert record.phones[0].value == "0123456789"
+    assert record.show_birthday() == "15.03.1990"
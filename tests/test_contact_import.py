@@ -0,0 +1,178 @@
+import csv
+import io
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from src.models.address_book import AddressBook
+from src.handlers.contact_handlers import handle_import_contacts
+from src.utils.contact_import import import_contacts, read_csv, read_vcard, validate
+from src.utils.journal import Journal
+
+CSV_TEXT = """\
+Name,Phones,Email,Birthday,Address,Company
+John Smith,1234567890;0987654321,john@example.com,01.01.2000,"123 Main St, Anytown, USA, 12345",ACME
+Jane Doe,555-123-4567,,,,
+Bad Phone,12345,,,,
+"Multi
+Line",12345,,,,
+Bad Email,1234567890,not-an-email,,,
+"""
+
+VCARD_TEXT = """\
+BEGIN:VCARD
+VERSION:3.0
+N:Smith;John;;;
+FN:John Smith
+TEL;TYPE=CELL:(123) 456-7890
+TEL;TYPE=HOME:0987654321
+EMAIL;TYPE=INTERNET:john@example.com
+BDAY:2000-01-31
+ADR;TYPE=HOME:;;123 Main St;Anytown;;12345;US
+END:VCARD
+BEGIN:VCARD
+VERSION:4.0
+N:Doe;Jane;;;
+TEL;VALUE=uri:tel:555-123-4567
+BDAY:19900
+ 215
+END:VCARD
+BEGIN:VCARD
+VERSION:4.0
+FN:No Year
+BDAY:--0131
+END:VCARD
+BEGIN:VCARD
+FN:Unclosed
+"""
+
+@pytest.fixture
+def book():
+    return AddressBook()
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+def test_read_csv_maps_columns_and_keeps_raw_rows():
+    rows = list(read_csv(io.StringIO(CSV_TEXT)))
+
+    assert [row.line for row in rows] == [2, 3, 4, 5, 7]
+    assert rows[0].fields == {
+        "name": "John Smith",
+        "phones": ["1234567890", "0987654321"],
+        "email": "john@example.com",
+        "birthday": "01.01.2000",
+        "address": ["123 Main St", "Anytown", "USA", "12345"],
+    }
+    assert rows[3].raw == '"Multi\nLine",12345,,,,\n'
+
+def test_read_vcard_unfolds_lines_and_reads_both_versions():
+    rows = list(read_vcard(io.StringIO(VCARD_TEXT)))
+
+    assert [row.line for row in rows] == [1, 11, 18, 23]
+    assert rows[0].fields == {
+        "name": "John Smith",
+        "phones": ["(123) 456-7890", "0987654321"],
+        "email": "john@example.com",
+        "birthday": "31.01.2000",
+        "address": ["123 Main St", "Anytown", "12345", "US"],
+    }
+    # The name comes from N when FN is missing
+    assert rows[1].fields == {"name": "Jane Doe", "phones": ["555-123-4567"], "birthday": "15.02.1990"}
+    assert rows[3].fields == {"error": "vCard is not closed by END:VCARD"}
+
+def test_import_csv_writes_rejects(tmp_path, book):
+    path = write(tmp_path, "contacts.csv", CSV_TEXT)
+
+    result = import_contacts(book, path)
+
+    assert (result.imported, result.rejected) == (2, 3)
+    john = book.find("John Smith")
+    assert [phone.value for phone in john.phones] == ["1234567890", "0987654321"]
+    assert john.show_birthday() == "01.01.2000"
+    assert book.find("Jane Doe").phones[0].value == "5551234567"
+
+    with open(result.reject_path, newline="") as f:
+        rejects = list(csv.reader(f))
+    assert rejects[0] == ["line", "error", "record"]
+    assert [row[:2] for row in rejects[1:]] == [
+        ["4", "Phone number must be 10 digits"],
+        ["5", "Phone number must be 10 digits"],
+        ["7", "Please enter a valid email address"],
+    ]
+    assert rejects[2][2] == '"Multi\nLine",12345,,,,'
+
+def test_import_vcard(tmp_path, book):
+    path = write(tmp_path, "contacts.vcf", VCARD_TEXT)
+
+    result = import_contacts(book, path)
+
+    assert (result.imported, result.rejected) == (2, 2)
+    assert result.reject_path == str(tmp_path / "contacts.rejected.csv")
+    assert book.find("John Smith").address.value == ["123 Main St", "Anytown", "12345", "US"]
+    assert book.find("Jane Doe").show_birthday() == "15.02.1990"
+
+def test_import_without_rejects_creates_no_reject_file(tmp_path, book):
+    path = write(tmp_path, "contacts.csv", "name,phone\nJohn Smith,1234567890\n")
+
+    assert import_contacts(book, path).rejected == 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["contacts.csv"]
+
+def test_import_merges_into_existing_contacts(tmp_path, book):
+    book.add_contact("John Smith", "1234567890")
+    book.find("John Smith").add_email("old@example.com")
+    path = write(tmp_path, "contacts.csv", CSV_TEXT)
+
+    result = import_contacts(book, path)
+
+    assert (result.imported, result.merged) == (2, 1)
+    john = book.find("John Smith")
+    assert [phone.value for phone in john.phones] == ["1234567890", "0987654321"]
+    assert john.email.value == "old@example.com"
+    assert john.show_birthday() == "01.01.2000"
+    assert john.address.value == ["123 Main St", "Anytown", "USA", "12345"]
+
+def test_import_in_chunks_on_a_process_pool(tmp_path, book):
+    lines = ["name,phone"] + [f"Person {chr(65 + i % 26)}{chr(65 + i // 26)},{i:010d}" for i in range(200)]
+    lines[51] = "Bad Row,123"
+    path = write(tmp_path, "contacts.csv", "\n".join(lines) + "\n")
+
+    result = import_contacts(book, path, workers=2, chunk_size=16)
+
+    assert (result.imported, result.rejected) == (199, 1)
+    assert book.find("Person AA").phones[0].value == "0000000000"
+    assert "Bad Row" not in book.data
+
+def test_validate_reads_a_bounded_window_ahead():
+    consumed = []
+    def rows():
+        for row in read_csv(io.StringIO("name\n" + "John Smith\n" * 100)):
+            consumed.append(row)
+            yield row
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = validate(rows(), executor, chunk_size=5, window=2)
+        next(results)
+        assert len(consumed) <= 3 * 5
+
+def test_import_rejects_unknown_file_types(tmp_path, book):
+    path = write(tmp_path, "contacts.txt", "John Smith\n")
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        import_contacts(book, path)
+
+def test_handle_import_contacts_saves_once(tmp_path):
+    path = write(tmp_path, "contacts.csv", CSV_TEXT)
+    journal = Journal(str(tmp_path / "book.pkl"), AddressBook)
+    book = journal.load()
+
+    message = handle_import_contacts(path, book, journal.batch)
+
+    assert "Imported 2 contacts." in message
+    assert "3 rejected" in message
+    # The contacts went straight into the snapshot, not into the log
+    assert not (tmp_path / "book.pkl.log").exists()
+    assert sorted(Journal(str(tmp_path / "book.pkl"), AddressBook).load().data) == ["Jane Doe", "John Smith"]
+
+def test_handle_import_contacts_requires_a_path(book):
+    with pytest.raises(IndexError):
+        handle_import_contacts("  ", book)
@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+import pytest
+from src.models.address_book import AddressBook
+from src.utils.dispatcher import Cancelled, Dispatcher, check_cancelled
+from src.utils.export import export_contacts
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = Dispatcher()
+    yield dispatcher
+    dispatcher.close()
+
+def test_handlers_run_on_worker_threads(dispatcher):
+    job = dispatcher.submit(lambda args: (args, threading.current_thread().name), "John", is_write=False)
+
+    args, thread = job.result()
+    assert args == "John"
+    assert thread.startswith("read-command")
+
+def test_writes_run_one_at_a_time_in_order(dispatcher):
+    running, order, overlaps = [], [], []
+
+    def write(args):
+        running.append(args)
+        overlaps.append(len(running))
+        time.sleep(0.01)
+        order.append(args)
+        running.remove(args)
+
+    jobs = [dispatcher.submit(write, str(i), is_write=True) for i in range(5)]
+    for job in jobs:
+        job.result()
+
+    assert order == ["0", "1", "2", "3", "4"]
+    assert max(overlaps) == 1
+
+def test_a_running_read_stops_when_cancelled(dispatcher):
+    started = threading.Event()
+
+    def query(args):
+        started.set()
+        while True:
+            check_cancelled()
+            time.sleep(0.001)
+
+    job = dispatcher.submit(query, "", is_write=False)
+    started.wait()
+
+    assert job.cancel()
+    assert job.wait(5)
+
+def test_writes_cannot_be_cancelled(dispatcher):
+    release = threading.Event()
+    job = dispatcher.submit(lambda args: release.wait(5) and "saved", "", is_write=True)
+
+    assert not job.cancel()
+    release.set()
+    assert job.result() == "saved"
+
+def test_check_cancelled_does_nothing_outside_a_command():
+    check_cancelled()
+
+def test_cancelled_export_removes_the_partial_file(tmp_path, dispatcher):
+    book = AddressBook()
+    for name in ("John Smith", "Jane Doe", "Bob Brown"):
+        book.add_contact(name, "1234567890")
+    path = str(tmp_path / "contacts.jsonl")
+    holder = {}
+
+    def records():
+        for record in book.data.values():
+            # Cancel the export after its first chunk
+            if record.name.value == "Jane Doe":
+                holder["job"].cancel()
+            yield record
+
+    started = threading.Event()
+
+    def export(args):
+        started.wait(5)
+        return export_contacts(records(), path, chunk_size=1)
+
+    holder["job"] = dispatcher.submit(export, "", is_write=False)
+    started.set()
+
+    with pytest.raises(Cancelled):
+        holder["job"].future.result(5)
+    assert not os.path.exists(path)
+
+def test_a_cancelled_index_build_releases_the_book(dispatcher):
+    book = AddressBook()
+    book.make_thread_safe()
+    for i in range(3000):
+        book.add_contact(f"Contact {chr(97 + i % 26)}{chr(97 + i // 26 % 26)}{chr(97 + i // 676)}", "1234567890")
+    holder = {}
+
+    class Contacts(dict):
+        def items(self):
+            for i, item in enumerate(super().items()):
+                # Cancel the search halfway through building the index
+                if i == 1500:
+                    holder["job"].cancel()
+                yield item
+
+    book.data = Contacts(book.data)
+    started = threading.Event()
+
+    def search(args):
+        started.wait(5)
+        return book.find_contacts(args)
+
+    holder["job"] = dispatcher.submit(search, "contact", is_write=False)
+    started.set()
+
+    with pytest.raises(Cancelled):
+        holder["job"].future.result(5)
+    # The read lock was released, and the half-built index was never published
+    write = dispatcher.submit(lambda args: book.add_contact(args, "0987654321"), "Late Writer", is_write=True)
+    assert "Contact added" in write.future.result(5)
+    assert book._search_index is None
@@ -0,0 +1,115 @@
+import threading
+import pytest
+from src.models.address_book import AddressBook
+from src.models.fields import Email, ValidationException, normalize_email
+from src.utils.email_deliverability import DeliverabilityChecker
+
+class StubResolver:
+    def __init__(self, deliverable_domains):
+        self.deliverable_domains = deliverable_domains
+        self.lookups = []
+        self.release = threading.Event()
+
+    def __call__(self, domain):
+        self.release.wait(5)
+        self.lookups.append(domain)
+        return domain in self.deliverable_domains
+
+@pytest.fixture
+def resolver():
+    return StubResolver({"gmail.com"})
+
+def test_syntax_is_checked_offline_and_cached():
+    normalize_email.cache_clear()
+    assert Email("John@Gmail.com").value == "John@gmail.com"
+    Email("John@Gmail.com")
+    assert normalize_email.cache_info().hits == 1
+    with pytest.raises(ValidationException):
+        Email("john@")
+    assert Email("john@example.com").deliverable is None
+
+def test_deliverability_is_attached_after_the_command(resolver):
+    checker = DeliverabilityChecker(resolver)
+    book = AddressBook()
+    checker.watch(book)
+    book.add_contact("John Smith", "1234567890")
+    book.add_contact("Jane Doe", "0987654321")
+
+    book.add_email_to_contact("John Smith", "john@gmail.com")
+    book.add_email_to_contact("Jane Doe", "jane@nowhere.invalid-tld.com")
+    # The commands returned before any lookup finished
+    assert book.find("John Smith").email.deliverable is None
+
+    resolver.release.set()
+    checker.check(book.find("John Smith").email).result(timeout=5)
+    checker.check(book.find("Jane Doe").email).result(timeout=5)
+    assert book.find("John Smith").email.deliverable is True
+    assert book.find("Jane Doe").email.deliverable is False
+    assert "does not accept mail" in book.show_email("Jane Doe")
+    checker.close()
+
+def test_each_domain_is_looked_up_once(resolver):
+    resolver.release.set()
+    checker = DeliverabilityChecker(resolver)
+    lookups = [checker.check(Email(f"user{i}@gmail.com")) for i in range(20)]
+    for lookup in lookups:
+        lookup.result(timeout=5)
+    assert resolver.lookups == ["gmail.com"]
+    checker.close()
+
+def test_failed_lookup_leaves_deliverability_unknown():
+    def broken(domain):
+        raise OSError("network is down")
+
+    checker = DeliverabilityChecker(broken)
+    email = Email("john@gmail.com")
+    with pytest.raises(OSError):
+        checker.check(email).result(timeout=5)
+    assert email.deliverable is None
+    checker.close()
+
+def test_lookups_that_cannot_tell_are_retried():
+    answers = [OSError("network is down"), None, True]
+    lookups = []
+
+    def flaky(domain):
+        lookups.append(domain)
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    checker = DeliverabilityChecker(flaky)
+    email = Email("john@gmail.com")
+    with pytest.raises(OSError):
+        checker.check(email).result(timeout=5)
+    # A timeout is unknown, not deliverable
+    assert checker.check(email).result(timeout=5) is None
+    assert email.deliverable is None
+    assert checker.check(email).result(timeout=5) is True
+    assert checker.check(email).result(timeout=5) is True
+    assert lookups == ["gmail.com"] * 3
+    checker.close()
+
+def test_dns_timeouts_are_unknown(monkeypatch):
+    from src.utils import email_deliverability
+
+    monkeypatch.setattr(email_deliverability, "validate_email_deliverability",
+                        lambda *args, **kwargs: {"unknown-deliverability": "timeout"})
+    assert email_deliverability.dns_resolver("gmail.com") is None
+    monkeypatch.setattr(email_deliverability, "validate_email_deliverability",
+                        lambda *args, **kwargs: {"mx": [(10, "mx.gmail.com")]})
+    assert email_deliverability.dns_resolver("gmail.com") is True
+
+def test_name_servers_and_timeout_can_be_configured(monkeypatch):
+    from src.utils import email_deliverability
+
+    queried = []
+    def validate(domain, domain_i18n, timeout=None, dns_resolver=None):
+        queried.append((timeout, dns_resolver.nameservers, dns_resolver.lifetime))
+        return {"mx": [(10, "mx.gmail.com")]}
+
+    monkeypatch.setattr(email_deliverability, "validate_email_deliverability", validate)
+    resolver = email_deliverability.make_dns_resolver(["1.1.1.1"], timeout=2)
+    assert resolver("gmail.com") is True
+    assert queried == [(None, ["1.1.1.1"], 2)]
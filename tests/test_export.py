@@ -0,0 +1,122 @@
+import io
+import json
+import pytest
+from src.models.address_book import AddressBook
+from src.models.notes_book import NotesBook
+from src.handlers.contact_handlers import handle_export_contacts
+from src.handlers.note_handlers import handle_export_notes
+from src.utils.contact_import import import_contacts
+from src.utils.export import export_contacts, export_notes, vcard_lines, write_chunked
+
+@pytest.fixture
+def book():
+    book = AddressBook()
+    book.add_contact("John Smith", "1234567890")
+    john = book.find("John Smith")
+    john.add_phone("0987654321")
+    john.add_email("john@example.com")
+    john.add_birthday("29.02.2000")
+    john.add_address(["123 Main St", " Anytown", " Springfield; North", " 12345", " USA"])
+    book.add_contact("Jane Doe", "5551234567")
+    return book
+
+@pytest.fixture
+def notes_book():
+    notes_book = NotesBook()
+    notes_book.add_note("Meeting", "Budget review,\nthen \"lunch\"")
+    notes_book.add_tag_to_note("Meeting", "work")
+    notes_book.add_note("Recipe", "Pancakes")
+    return notes_book
+
+def test_export_contacts_to_jsonl(tmp_path, book):
+    path = str(tmp_path / "contacts.jsonl")
+
+    assert export_contacts(book.data.values(), path) == 2
+
+    with open(path) as f:
+        lines = [json.loads(line) for line in f]
+    assert lines == [
+        {
+            "name": "John Smith",
+            "phones": ["1234567890", "0987654321"],
+            "email": "john@example.com",
+            "birthday": "29.02.2000",
+            "address": ["123 Main St", "Anytown", "Springfield; North", "12345", "USA"],
+        },
+        {"name": "Jane Doe", "phones": ["5551234567"], "email": None, "birthday": None, "address": None},
+    ]
+
+@pytest.mark.parametrize("name", ["contacts.csv", "contacts.vcf"])
+def test_exported_contacts_import_back(tmp_path, book, name):
+    path = str(tmp_path / name)
+    export_contacts(book.data.values(), path)
+
+    imported = AddressBook()
+    result = import_contacts(imported, path)
+
+    assert (result.imported, result.rejected) == (2, 0)
+    for key, record in book.data.items():
+        assert str(imported.data[key]) == str(record)
+    assert imported.find("John Smith").address.value == ["123 Main St", "Anytown", "Springfield; North", "12345", "USA"]
+
+def test_vcard_lines_are_folded_and_escaped(book):
+    book.find("Jane Doe").add_address(["Apartment 12, " + "Long Street Name " * 6, "Town", "Region", "00000"])
+    card = list(vcard_lines([book.find("Jane Doe")]))[0]
+
+    lines = card.split("\r\n")
+    assert card.endswith("END:VCARD\r\n")
+    assert all(len(line) <= 75 for line in lines)
+    assert lines[4].startswith("ADR:;;Apartment 12\\, Long Street")
+    assert lines[5].startswith(" ")
+
+def test_export_only_the_search_results(tmp_path, book):
+    path = str(tmp_path / "found.csv")
+
+    message = handle_export_contacts(f"{path}: john", book)
+
+    assert "Exported 1 contacts" in message
+    with open(path) as f:
+        assert f.read().splitlines()[1].startswith("John Smith,")
+
+def test_export_notes_with_a_tag(tmp_path, notes_book):
+    path = str(tmp_path / "notes.jsonl")
+
+    assert "Exported 1 notes" in handle_export_notes(f"{path}: work", notes_book)
+    with open(path) as f:
+        assert [json.loads(line) for line in f] == [
+            {"title": "Meeting", "content": "Budget review,\nthen \"lunch\"", "tags": ["work"]},
+        ]
+
+def test_export_all_notes_to_csv(tmp_path, notes_book):
+    path = str(tmp_path / "notes.csv")
+
+    assert export_notes(notes_book.data.values(), path) == 2
+    with open(path, newline="") as f:
+        assert f.read() == 'title,content,tags\nMeeting,"Budget review,\nthen ""lunch""",work\nRecipe,Pancakes,\n'
+
+def test_notes_cannot_be_exported_to_vcard(tmp_path, notes_book):
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        handle_export_notes(str(tmp_path / "notes.vcf"), notes_book)
+
+def test_export_requires_a_path(book):
+    with pytest.raises(IndexError):
+        handle_export_contacts(": john", book)
+
+def test_items_are_written_in_chunks():
+    class CountingWriter(io.StringIO):
+        writes = 0
+        def write(self, text):
+            self.writes += 1
+            return super().write(text)
+
+    produced = []
+    def lines():
+        for i in range(10):
+            produced.append(i)
+            yield f"{i}\n"
+
+    f = CountingWriter()
+    write_chunked(lines(), f, chunk_size=4)
+
+    assert f.writes == 3
+    assert f.getvalue() == "".join(f"{i}\n" for i in range(10))
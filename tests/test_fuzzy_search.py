@@ -0,0 +1,50 @@
+import pytest
+from src.models.address_book import AddressBook
+from src.models.search_index import TrigramIndex
+from src.handlers.contact_handlers import (
+    handle_add_contact,
+    handle_change_contact,
+    handle_delete_contact,
+    handle_fuzzy_search,
+)
+
+@pytest.fixture
+def address_book():
+    book = AddressBook()
+    handle_add_contact("John Smith 0501234567", book)
+    handle_add_contact("Joan Smithers 0441112233", book)
+    handle_add_contact("Olena Shevchenko 0671234567", book)
+    handle_add_contact("Mia Stone 0509990000", book)
+    return book
+
+def test_similar_prefers_shared_trigrams():
+    index = TrigramIndex(lambda text: [text])
+    index.rebuild([("a", " john smith "), ("b", " mia stone "), ("c", " joan smithers ")])
+
+    assert index.similar(" jhon smith ", 2)[0] == "a"
+    assert "b" not in index.similar(" jhon smith ", 2)
+
+def test_fuzzy_find_ranks_closest_name_first(address_book):
+    matches = address_book.fuzzy_find("jhon smtih")
+    assert matches[0][0].name.value == "John Smith"
+    assert [score for _, score in matches] == sorted((score for _, score in matches), reverse=True)
+    assert address_book.fuzzy_find("olna shevchenk")[0][0].name.value == "Olena Shevchenko"
+    assert address_book.fuzzy_find("qqqqqq") == []
+
+def test_index_follows_edits(address_book):
+    address_book.fuzzy_find("mia")  # Builds the index
+    handle_add_contact("Jonathan Smythe 0509998877", address_book)
+    handle_delete_contact("John Smith", address_book)
+    handle_change_contact("Mia Stone: 0509990000 0509990001", address_book)
+
+    names = [record.name.value for record, _ in address_book.fuzzy_find("jonathon smyth")]
+    assert names[0] == "Jonathan Smythe"
+    assert "John Smith" not in names
+    assert "0509990001" in handle_fuzzy_search("mia ston", address_book)
+
+def test_handle_fuzzy_search_errors(address_book):
+    assert "% match" in handle_fuzzy_search("olena", address_book)
+    with pytest.raises(IndexError):
+        handle_fuzzy_search("  ", address_book)
+    with pytest.raises(KeyError):
+        handle_fuzzy_search("xyzxyz", address_book)
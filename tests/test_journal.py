@@ -0,0 +1,82 @@
+import os
+import pytest
+from src.models.address_book import AddressBook
+from src.models.notes_book import NotesBook
+from src.utils.journal import Journal
+from src.utils.storage import save_data
+
+@pytest.fixture
+def snapshot(tmp_path):
+    return str(tmp_path / "book.pkl")
+
+def test_changes_are_replayed_on_load(snapshot):
+    journal = Journal(snapshot, AddressBook)
+    book = journal.load()
+    book.add_contact("John Smith", "1234567890")
+    book.find("John Smith").add_birthday("01.01.2000")
+    book.change_contact("John Smith", "1234567890", "0987654321")
+    book.add_contact("Jane Doe", "1111111111")
+    book.delete("Jane Doe")
+    journal.close()
+
+    # Nothing was written to the snapshot, only to the log
+    assert not os.path.exists(snapshot)
+
+    reloaded = Journal(snapshot, AddressBook).load()
+    record = reloaded.find("John Smith")
+    assert [phone.value for phone in record.phones] == ["0987654321"]
+    assert record.show_birthday() == "01.01.2000"
+    assert reloaded.find("Jane Doe") is None
+
+def test_notes_are_replayed_on_load(snapshot):
+    journal = Journal(snapshot, NotesBook)
+    book = journal.load()
+    book.add_note("Meeting Notes", "Important meeting tomorrow")
+    book.edit_note("Meeting Notes", "Meeting cancelled")
+    book.add_tag_to_note("Meeting Notes", "work")
+    journal.close()
+
+    note = Journal(snapshot, NotesBook).load().data["Meeting Notes"]
+    assert note.content == "Meeting cancelled"
+    assert note.tags == ["work"]
+
+def test_compaction_after_threshold(snapshot):
+    journal = Journal(snapshot, AddressBook, compact_threshold=1)
+    book = journal.load()
+    book.add_contact("John Smith", "1234567890")
+    journal.checkpoint()
+
+    assert os.path.exists(snapshot)
+    assert not os.path.exists(journal.log_filename)
+
+    # New changes go to a fresh log on top of the new snapshot
+    book.find("John Smith").add_phone("0987654321")
+    journal.close()
+    record = Journal(snapshot, AddressBook).load().find("John Smith")
+    assert len(record.phones) == 2
+
+def test_stale_log_is_ignored(snapshot):
+    journal = Journal(snapshot, AddressBook)
+    book = journal.load()
+    book.add_contact("John Smith", "1234567890")
+    journal.close()
+
+    # Simulate a crash after the snapshot was written but before the log was removed
+    save_data(book, snapshot)
+
+    record = Journal(snapshot, AddressBook).load().find("John Smith")
+    assert len(record.phones) == 1
+    assert not os.path.exists(journal.log_filename)
+
+def test_truncated_entry_is_dropped(snapshot):
+    journal = Journal(snapshot, AddressBook)
+    book = journal.load()
+    book.add_contact("John Smith", "1234567890")
+    book.find("John Smith").add_phone("0987654321")
+    journal.close()
+
+    with open(journal.log_filename, "r+b") as f:
+        f.truncate(os.path.getsize(journal.log_filename) - 3)
+
+    record = Journal(snapshot, AddressBook).load().find("John Smith")
+    assert [phone.value for phone in record.phones] == ["1234567890"]
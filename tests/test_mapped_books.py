@@ -0,0 +1,106 @@
+import os
+import pytest
+from datetime import datetime, timedelta
+from src.models.address_book import AddressBook
+from src.models.mapped_books import MappedAddressBook, contact_row
+from src.models.record import Record
+from src.utils.columnar import ColumnarSnapshot, save_columnar
+from src.utils.journal import Journal
+from src.utils.mapped_storage import MappedStorage
+from src.utils.storage import save_data
+from src.handlers.contact_handlers import handle_add_contact, handle_change_contact, handle_delete_contact
+from src.handlers.birthday_handlers import handle_add_birthday
+from src.handlers.address_handlers import handle_add_address, handle_show_address
+
+@pytest.fixture
+def book():
+    book = AddressBook()
+    handle_add_contact("John Smith 1234567890", book)
+    jane = Record("jane doe")  # Stored under "Jane Doe"
+    jane.add_phone("0987654321")
+    book.add_record(jane)
+    handle_add_birthday("John Smith: 01.01.2000", book)
+    handle_add_address("John Smith: 123 Main St, Anytown, USA, 12345", book)
+    book.add_email_to_contact("Jane Doe", "jane@example.com")
+    book.find("Jane Doe").add_phone("5551234567")
+    for name in ("Zoe Young", "Adam Brown", "Mia Stone"):
+        handle_add_contact(f"{name} 0000000001", book)
+    return book
+
+def snapshot_of(book, filename):
+    save_columnar(((key, contact_row(record)) for key, record in book.data.items()), filename)
+    return filename
+
+def test_snapshot_holds_every_field(tmp_path, book):
+    filename = snapshot_of(book, str(tmp_path / "book.cols"))
+    mapped = MappedAddressBook(filename)
+
+    assert list(mapped.data) == list(book.data)
+    assert [str(record) for record in mapped.data.values()] == [str(record) for record in book.data.values()]
+    assert mapped.find("jane doe").name.value == "jane doe"
+    assert mapped.find("Jane Doe").email.value == "jane@example.com"
+    assert "Anytown" in handle_show_address("John Smith", mapped)
+    assert mapped.find("Nobody") is None
+    mapped.close()
+
+def test_records_are_built_on_access(tmp_path, book):
+    mapped = MappedAddressBook(snapshot_of(book, str(tmp_path / "book.cols")))
+    assert len(mapped) == 5
+    assert len(mapped.data._cache) == 0
+
+    record = mapped.find("Mia Stone")
+    assert mapped.find("mia stone") is record
+    assert list(mapped.data._cache) == ["Mia Stone"]
+    assert [r.name.value for r in mapped.data.window(3, 10)] == ["Adam Brown", "Mia Stone"]
+    mapped.close()
+
+def test_upcoming_birthdays_read_the_birthday_column(tmp_path):
+    book = AddressBook()
+    today = datetime.now().date()
+    for days, name in ((3, "Soon Person"), (40, "Later Person")):
+        handle_add_contact(f"{name} 1234567890", book)
+        born = (today + timedelta(days=days)).replace(year=1990)
+        handle_add_birthday(f"{name}: {born.strftime('%d.%m.%Y')}", book)
+    handle_add_contact("Plain Person 1234567890", book)
+    mapped = MappedAddressBook(snapshot_of(book, str(tmp_path / "book.cols")))
+
+    assert [entry["name"] for entry in mapped.get_upcoming_birthdays("7")] == ["Soon Person"]
+    assert "Plain Person" not in mapped.data._cache
+    assert len(mapped.get_upcoming_birthdays("100")) == 2
+    mapped.close()
+
+def test_changes_are_journaled_and_compacted(tmp_path, book):
+    pickle_file, filename = str(tmp_path / "book.pkl"), str(tmp_path / "book.cols")
+    save_data(book, pickle_file)
+    storage = MappedStorage(filename, MappedAddressBook, migrate_from=Journal(pickle_file, AddressBook))
+    mapped = storage.load()
+    assert len(mapped) == 5
+
+    handle_change_contact("John Smith: 1234567890 1112223333", mapped)
+    handle_delete_contact("Zoe Young", mapped)
+    handle_add_contact("Zoe Young 2223334444", mapped)
+    handle_add_contact("New Person 3334445555", mapped)
+    storage.close()
+
+    storage = MappedStorage(filename, MappedAddressBook)
+    mapped = storage.load()
+    assert list(mapped.data) == ["John Smith", "Jane Doe", "Adam Brown", "Mia Stone", "Zoe Young", "New Person"]
+    assert [phone.value for phone in mapped.find("John Smith").phones] == ["1112223333"]
+    assert [phone.value for phone in mapped.find("Zoe Young").phones] == ["2223334444"]
+
+    storage.compact()
+    assert not os.path.exists(storage.log_filename)
+    assert len(mapped.data._changed) == 0
+    assert [phone.value for phone in mapped.find("Zoe Young").phones] == ["2223334444"]
+    storage.close()
+
+    mapped = MappedStorage(filename, MappedAddressBook).load()
+    assert len(mapped) == 6
+    assert mapped.find("New Person") is not None
+    mapped.close()
+
+def test_other_files_are_rejected(tmp_path):
+    filename = str(tmp_path / "book.pkl")
+    save_data(AddressBook(), filename)
+    with pytest.raises(ValueError):
+        ColumnarSnapshot(filename)
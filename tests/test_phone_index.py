@@ -0,0 +1,87 @@
+import pytest
+from src.models.address_book import AddressBook
+from src.models.phone_index import PhoneIndex
+from src.handlers.contact_handlers import (
+    handle_add_contact,
+    handle_change_contact,
+    handle_delete_contact,
+    handle_find_by_phone,
+    handle_find_phones,
+    handle_shared_phones,
+)
+
+@pytest.fixture
+def index():
+    index = PhoneIndex(lambda phones: phones)
+    index.rebuild([
+        ("Home", ["0501234567", "0441112233"]),
+        ("Office", ["0501234567"]),
+        ("Mobile", ["0509998877", "0509998877"]),
+        ("Nobody", []),
+    ])
+    return index
+
+def test_owners_and_prefixes(index):
+    assert index.owners("0501234567") == ["Home", "Office"]
+    assert index.owners("0441112233") == ["Home"]
+    assert index.owners("0500000000") == []
+    assert list(index.with_prefix("050")) == [("0501234567", ["Home", "Office"]), ("0509998877", ["Mobile"])]
+    assert list(index.with_prefix("09")) == []
+    # A number listed twice by one entry is indexed once
+    assert len(index) == 4
+
+def test_shared_numbers_follow_changes(index):
+    assert index.shared() == [("0501234567", ["Home", "Office"])]
+    index.add("Office", ["0441112233"])
+    assert index.shared() == [("0441112233", ["Home", "Office"])]
+    assert not index.is_shared("0501234567")
+    index.discard("Home")
+    assert index.shared() == []
+    assert index.owners("0501234567") == []
+
+@pytest.fixture
+def address_book():
+    book = AddressBook()
+    handle_add_contact("John Smith 0501234567", book)
+    handle_add_contact("Jane Doe 0441112233", book)
+    handle_add_contact("Jane Doe 0501234567", book)
+    return book
+
+def test_find_by_phone(address_book):
+    result = handle_find_by_phone("0501234567", address_book)
+    assert "Jane Doe, John Smith" in result
+    assert "(shared)" in result
+    assert "(shared)" not in handle_find_by_phone("0441112233", address_book)
+
+    with pytest.raises(KeyError):
+        handle_find_by_phone("0000000000", address_book)
+    with pytest.raises(ValueError):
+        handle_find_by_phone("050", address_book)
+    with pytest.raises(IndexError):
+        handle_find_by_phone("", address_book)
+    # Only ASCII digits, as in Phone
+    with pytest.raises(ValueError):
+        handle_find_by_phone("\u0660\u0665\u0660\u0661\u0662\u0663\u0664\u0665\u0666\u0667", address_book)
+    with pytest.raises(ValueError):
+        handle_find_phones("\u0660\u0665\u0660", address_book)
+
+def test_index_follows_edits(address_book):
+    handle_find_phones("0", address_book)  # Builds the index
+    handle_change_contact("John Smith: 0501234567 0509998877", address_book)
+    handle_add_contact("Mia Stone 0509990000", address_book)
+    handle_delete_contact("Jane Doe", address_book)
+
+    assert "John Smith" in handle_find_by_phone("0509998877", address_book)
+    with pytest.raises(KeyError):
+        handle_find_by_phone("0501234567", address_book)
+    lines = handle_find_phones("05099", address_book).splitlines()
+    assert ["0509990000" in lines[0], "0509998877" in lines[1]] == [True, True]
+    with pytest.raises(KeyError):
+        handle_find_phones("044", address_book)
+    with pytest.raises(ValueError):
+        handle_find_phones("05a", address_book)
+
+def test_shared_phones(address_book):
+    assert "0501234567" in handle_shared_phones(address_book)
+    address_book.find("John Smith").remove_phone("0501234567")
+    assert "No phone numbers are shared" in handle_shared_phones(address_book)
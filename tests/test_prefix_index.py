@@ -0,0 +1,163 @@
+import curses
+import pytest
+from src.models.address_book import AddressBook
+from src.models.notes_book import NotesBook
+from src.models.prefix_index import PrefixIndex, PrefixSearch
+from src.handlers.contact_handlers import handle_prefix_search, view_prefix_search
+from src.handlers.note_handlers import handle_prefix_search_notes
+from src.ui.renderer import Renderer
+from src.ui.search_panel import SearchPanel
+
+@pytest.fixture
+def book():
+    book = AddressBook()
+    for name in ("John Smith", "Johnny Smithers", "Jane Doe", "Joan Smith", "Bob Johnson"):
+        book.add_contact(name, "1234567890")
+    return book
+
+def names(search, docs):
+    return [record.name.value for record in search.entries(docs)]
+
+def test_every_query_word_starts_a_name_word(book):
+    search = book.prefix_search()
+
+    assert names(search, search.search("jo")) == ["John Smith", "Johnny Smithers", "Joan Smith", "Bob Johnson"]
+    assert names(search, search.search("smi jo")) == ["John Smith", "Johnny Smithers", "Joan Smith"]
+    assert names(search, search.search("John")) == ["John Smith", "Johnny Smithers", "Bob Johnson"]
+    assert search.search("ohn") == []
+    assert search.search("  ") == []
+
+def test_longer_queries_filter_the_previous_result(book):
+    index = book._get_prefix_index()
+    calls = []
+    original = index.search
+    index.search = lambda tokens: calls.append(tokens) or original(tokens)
+    search = PrefixSearch(index, book.data.__getitem__)
+
+    for query in ("j", "jo", "joh", "john ", "john s", "john sm", "john s", "jo", "ja"):
+        search.search(query)
+
+    # Only the first query and the one that does not extend "j..." by position
+    assert calls == [["j"]]
+    assert names(search, search.search("john s")) == ["John Smith", "Johnny Smithers"]
+    assert names(search, search.search("ja")) == ["Jane Doe"]
+    assert names(search, search.search("bob")) == ["Bob Johnson"]
+    assert calls == [["j"], ["bob"]]
+
+def test_completions_come_from_live_entries(book):
+    search = book.prefix_search()
+    assert search.completions("jo") == ["joan", "john", "johnny", "johnson"]
+    assert search.completions("john ") == []
+
+    book.delete("Johnny Smithers")
+    book.find("Joan Smith").add_phone("5550001111")
+
+    search = book.prefix_search()
+    assert search.completions("jo") == ["joan", "john", "johnson"]
+    assert names(search, search.search("smith")) == ["John Smith", "Joan Smith"]
+
+def test_index_follows_added_contacts(book):
+    book.prefix_search()
+    book.add_contact("Aaron Jones", "5551234567")
+
+    search = book.prefix_search()
+    assert names(search, search.search("jo")) == ["John Smith", "Johnny Smithers", "Joan Smith", "Bob Johnson", "Aaron Jones"]
+    assert search.completions("a") == ["aaron"]
+
+def test_rebuild_drops_removed_entries():
+    index = PrefixIndex(lambda name: [name])
+    index.rebuild((name, name) for name in ("Zed Alpha", "Zed Beta"))
+    index.discard("Zed Alpha")
+
+    assert index.search(["zed"]) == [1]
+    assert index.completions("al") == []
+    assert len(index) == 1
+
+def test_notes_are_found_by_title_words_and_tags():
+    notes_book = NotesBook()
+    notes_book.add_note("Meeting Notes", "Budget")
+    notes_book.add_tag_to_note("Meeting Notes", "work")
+    notes_book.add_note("Shopping", "Milk")
+    notes_book.add_tag_to_note("Shopping", "home")
+
+    assert "Meeting Notes" in handle_prefix_search_notes("meet wo", notes_book)
+    assert "Shopping" in handle_prefix_search_notes("ho", notes_book)
+    with pytest.raises(KeyError):
+        handle_prefix_search_notes("meet ho", notes_book)
+    with pytest.raises(ValueError):
+        handle_prefix_search_notes(" ", notes_book)
+
+def test_handle_prefix_search(book):
+    assert handle_prefix_search("jo sm", book).count("Contact name") == 3
+    with pytest.raises(KeyError):
+        handle_prefix_search("zz", book)
+    with pytest.raises(IndexError):
+        handle_prefix_search("", book)
+
+
+class KeyWindow:
+    """A curses window that replays keys in bursts and ignores drawing."""
+
+    def __init__(self, bursts, height=12, width=80):
+        self.size = (height, width)
+        self.bursts = [list(burst) for burst in bursts]
+        self.waiting = True
+
+    def getmaxyx(self):
+        return self.size
+
+    def addstr(self, y, x, text, attribute):
+        pass
+
+    def move(self, y, x):
+        pass
+
+    def clrtoeol(self):
+        pass
+
+    def erase(self):
+        pass
+
+    def noutrefresh(self):
+        pass
+
+    def timeout(self, delay):
+        self.waiting = delay < 0
+
+    def get_wch(self):
+        # A burst ends when the panel stops blocking and finds no key within the delay
+        if not self.bursts[0]:
+            if self.waiting:
+                self.bursts.pop(0)
+            else:
+                raise curses.error("no input")
+        return self.bursts[0].pop(0)
+
+def test_panel_searches_once_per_burst_of_keys(monkeypatch, book):
+    monkeypatch.setattr(curses, "doupdate", lambda: None)
+    live = view_prefix_search(book)
+    queries = []
+    original = live.search.search
+    monkeypatch.setattr(live.search, "search", lambda query: queries.append(query) or original(query))
+    window = KeyWindow([["j", "o", "h"], ["\t"], ["s", "x", "\x7f"], ["\n"]])
+    panel = SearchPanel(live, Renderer(window, color_pair=lambda pair: pair))
+
+    panel.run()
+
+    assert queries == ["", "joh", "john ", "john s"]
+    assert names(live.search, panel.results) == ["John Smith", "Johnny Smithers"]
+    status = panel.frame()[-1][0][0]
+    assert status.startswith("2 matches, showing 1-2.")
+
+def test_repeated_words_need_words_of_their_own(book):
+    book.add_contact("Jo Jo", "1234567890")
+    book.add_contact("John Jones", "1234567890")
+    search = book.prefix_search()
+
+    assert names(search, search.search("jo jo")) == ["Jo Jo", "John Jones"]
+    assert names(search, search.search("jo jon")) == ["John Jones"]
+    assert names(search, search.search("jo j")) == ["Jo Jo", "John Jones"]
+    # Refining "j" with a second token needs a second word starting with "j"
+    search = book.prefix_search()
+    search.search("j")
+    assert names(search, search.search("j jo")) == ["Jo Jo", "John Jones"]
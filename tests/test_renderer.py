@@ -0,0 +1,91 @@
+import pytest
+from colorama import Fore, Style
+from src.ui.renderer import Renderer, parse_line, GREEN, WHITE, RED, YELLOW, CYAN
+
+
+class FakeWindow:
+    """Records the drawing calls a renderer makes."""
+
+    def __init__(self, height=10, width=40):
+        self.size = (height, width)
+        self.calls = []
+
+    def getmaxyx(self):
+        return self.size
+
+    def addstr(self, y, x, text, attribute):
+        self.calls.append(("addstr", y, x, text, attribute))
+
+    def move(self, y, x):
+        self.calls.append(("move", y, x))
+
+    def clrtoeol(self):
+        self.calls.append(("clrtoeol",))
+
+    def erase(self):
+        self.calls.append(("erase",))
+
+    def drawn(self):
+        calls = [call[1:] for call in self.calls if call[0] == "addstr"]
+        self.calls.clear()
+        return calls
+
+
+@pytest.fixture
+def window():
+    return FakeWindow()
+
+@pytest.fixture
+def renderer(window):
+    renderer = Renderer(window, color_pair=lambda pair: pair)
+    return renderer
+
+def test_parse_line_splits_colour_runs():
+    line = f"{Fore.GREEN}Added{Style.RESET_ALL} to {Fore.CYAN}John{Fore.RED}{Style.RESET_ALL}!"
+
+    assert parse_line(line, WHITE) == (("Added", GREEN), (" to ", WHITE), ("John", CYAN), ("!", WHITE))
+    # Text outside codes and after a reset takes the default colour
+    assert parse_line(f"x{Fore.YELLOW}y{Fore.RESET}z", RED) == (("x", RED), ("y", YELLOW), ("z", RED))
+    assert parse_line("\x1b[1;33mBold yellow", WHITE) == (("Bold yellow", YELLOW),)
+    assert parse_line("", WHITE) == ()
+
+def test_each_run_is_drawn_with_one_call(renderer, window):
+    renderer.draw_frame([(f"{Fore.CYAN}John Smith{Style.RESET_ALL}  {Fore.BLUE}1234567890{Style.RESET_ALL}", WHITE)])
+
+    assert window.drawn() == [(0, 0, "John Smith", CYAN), (0, 10, "  ", WHITE), (0, 12, "1234567890", 5)]
+
+def test_only_changed_lines_are_redrawn(renderer, window):
+    menu = [("Menu", GREEN), ("  > Contacts", GREEN), ("    Notes", WHITE), ("    Exit", WHITE)]
+    renderer.draw_frame(menu)
+    window.calls.clear()
+
+    menu[1:3] = [("    Contacts", WHITE), ("  > Notes", GREEN)]
+    renderer.draw_frame(menu)
+
+    assert window.drawn() == [(1, 0, "    Contacts", WHITE), (2, 0, "  > Notes", GREEN)]
+
+def test_rows_left_from_the_last_frame_are_cleared(renderer, window):
+    renderer.draw_frame([("one", WHITE), ("two", WHITE), ("three", WHITE)])
+    window.calls.clear()
+
+    renderer.draw_frame([("one", WHITE)])
+
+    assert window.calls == [("move", 1, 0), ("clrtoeol",), ("move", 2, 0), ("clrtoeol",)]
+
+def test_lines_are_clipped_to_the_window(window):
+    window.size = (2, 8)
+    renderer = Renderer(window, color_pair=lambda pair: pair)
+
+    renderer.draw_frame([(f"{Fore.RED}12345{Fore.GREEN}67890", WHITE), ("second", WHITE), ("hidden", WHITE)])
+
+    assert window.drawn() == [(0, 0, "12345", RED), (0, 5, "678", GREEN), (1, 0, "second", WHITE)]
+
+def test_resize_redraws_everything(renderer, window):
+    renderer.draw_frame([("one", WHITE), ("two", WHITE)])
+    window.calls.clear()
+
+    window.size = (20, 80)
+    renderer.draw_frame([("one", WHITE), ("two", WHITE)])
+
+    assert window.calls[0] == ("erase",)
+    assert window.drawn() == [(0, 0, "one", WHITE), (1, 0, "two", WHITE)]
@@ -0,0 +1,98 @@
+import threading
+import time
+import pytest
+from src.utils.rwlock import ReadWriteLock
+
+def test_readers_hold_the_lock_together():
+    lock = ReadWriteLock()
+    inside = threading.Barrier(3, timeout=5)
+
+    def read():
+        with lock.read():
+            inside.wait()  # Breaks unless all three readers are inside at once
+
+    threads = [threading.Thread(target=read) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not inside.broken
+
+def test_writer_waits_for_readers_and_excludes_them():
+    lock = ReadWriteLock()
+    events = []
+    reading = threading.Event()
+
+    def write():
+        with lock.write():
+            events.append("write")
+            time.sleep(0.05)
+            events.append("written")
+
+    with lock.read():
+        writer = threading.Thread(target=write)
+        writer.start()
+        time.sleep(0.05)
+        events.append("read done")
+    writer.join()
+
+    def read():
+        with lock.read():
+            events.append("read")
+
+    assert events == ["read done", "write", "written"]
+    reader = threading.Thread(target=read)
+    with lock.write():
+        reader.start()
+        time.sleep(0.05)
+        assert "read" not in events
+    reader.join()
+    assert events[-1] == "read"
+
+def test_waiting_writer_goes_before_new_readers():
+    lock = ReadWriteLock()
+    order = []
+
+    def write():
+        with lock.write():
+            order.append("write")
+
+    def read():
+        with lock.read():
+            order.append("read")
+
+    with lock.read():
+        writer = threading.Thread(target=write)
+        writer.start()
+        while not lock._waiting_writers:
+            time.sleep(0.001)
+        reader = threading.Thread(target=read)
+        reader.start()
+        time.sleep(0.05)
+        assert order == []
+    writer.join()
+    reader.join()
+
+    assert order == ["write", "read"]
+
+def test_lock_is_reentrant():
+    lock = ReadWriteLock()
+    with lock.write():
+        with lock.write():
+            with lock.read():
+                pass
+        assert lock._writer == threading.get_ident()
+    with lock.read():
+        with lock.read():
+            pass
+    assert (lock._writer, lock._readers) == (None, 0)
+
+def test_read_lock_cannot_be_upgraded():
+    lock = ReadWriteLock()
+    with lock.read():
+        with pytest.raises(RuntimeError):
+            with lock.write():
+                pass
+    with lock.write():
+        pass
@@ -0,0 +1,64 @@
+import pytest
+from src.models.address_book import AddressBook
+from src.models.search_index import TrigramIndex, trigrams
+
+@pytest.fixture
+def address_book():
+    book = AddressBook()
+    book.add_contact("John Smith", "2000123456")
+    book.find("John Smith").add_birthday("01.01.2000")
+    book.add_contact("Johnny Doe", "0987654321")
+    book.add_contact("Jane Roe", "5550001111")
+    return book
+
+def names(records):
+    return [record.name.value for record in records]
+
+def test_trigrams():
+    assert trigrams("john") == {"joh", "ohn"}
+    assert trigrams("jo") == set()
+
+def test_record_matching_several_fields_is_returned_once(address_book):
+    assert names(address_book.find_contacts("2000")) == ["John Smith"]
+
+def test_find_contacts_by_each_field(address_book):
+    assert names(address_book.find_contacts("JOHN")) == ["John Smith", "Johnny Doe"]
+    assert names(address_book.find_contacts("0987")) == ["Johnny Doe"]
+    assert names(address_book.find_contacts("01.01")) == ["John Smith"]
+    assert names(address_book.find_contacts("xyz")) == []
+
+def test_short_queries_fall_back_to_a_scan(address_book):
+    assert names(address_book.find_contacts("ja")) == ["Jane Roe"]
+    assert names(address_book.find_contacts("")) == ["John Smith", "Johnny Doe", "Jane Roe"]
+
+def test_index_follows_record_changes(address_book):
+    address_book.find_contacts("john")  # Build the index
+
+    address_book.find("Jane Roe").edit_phone("5550001111", "7770001111")
+    assert names(address_book.find_contacts("555")) == []
+    assert names(address_book.find_contacts("777")) == ["Jane Roe"]
+
+    address_book.find("Johnny Doe").add_birthday("15.03.1990")
+    assert names(address_book.find_contacts("15.03")) == ["Johnny Doe"]
+
+    address_book.find("John Smith").delete_birthday()
+    assert names(address_book.find_contacts("01.01")) == []
+
+    address_book.delete("Johnny Doe")
+    assert names(address_book.find_contacts("john")) == ["John Smith"]
+
+    address_book.add_contact("Johanna Poe", "1231231231")
+    assert names(address_book.find_contacts("joh")) == ["John Smith", "Johanna Poe"]
+
+def test_index_rebuild_drops_removed_entries():
+    index = TrigramIndex(lambda text: [text])
+    for i in range(3000):
+        index.add(str(i), f"entry {i}")
+    for i in range(2000):
+        index.discard(str(i))
+    assert index.needs_rebuild
+
+    index.rebuild((str(i), f"entry {i}") for i in range(2000, 3000))
+    assert not index.needs_rebuild
+    assert len(index) == 1000
+    assert index.candidates("entry 2999") == ["2999"]
@@ -0,0 +1,83 @@
+import os
+import pytest
+from src.models.address_book import AddressBook
+from src.models.notes_book import NotesBook
+from src.utils.journal import Journal
+from src.utils.sharded_storage import ShardedStorage, shard_of
+
+NAMES = ["John Smith", "Jane Doe", "Zoe Young", "Adam Brown", "Mia Stone", "Leo King"]
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path / "book.shards")
+
+def modification_times(storage):
+    return [os.stat(storage.shard_filename(shard)).st_mtime_ns for shard in range(storage.shard_count)]
+
+def test_books_are_restored_in_order(directory):
+    storage = ShardedStorage(directory, AddressBook, shard_count=4)
+    book = storage.load()
+    for number, name in enumerate(NAMES):
+        book.add_contact(name, f"{number:010d}")
+    book.find("Jane Doe").add_birthday("01.01.2000")
+    book.delete("Zoe Young")
+    book.add_contact("Zoe Young", "1112223333")
+    storage.close()
+
+    reloaded = ShardedStorage(directory, AddressBook).load()
+    assert list(reloaded.data) == ["John Smith", "Jane Doe", "Adam Brown", "Mia Stone", "Leo King", "Zoe Young"]
+    assert reloaded.find("Jane Doe").show_birthday() == "01.01.2000"
+    # Records report their changes to the restored book
+    reloaded.find("John Smith").add_phone("5555555555")
+    assert reloaded.version == 1
+
+def test_only_changed_shards_are_rewritten(directory):
+    storage = ShardedStorage(directory, AddressBook, shard_count=4)
+    book = storage.load()
+    for number, name in enumerate(NAMES):
+        book.add_contact(name, f"{number:010d}")
+    storage.checkpoint()
+    before = modification_times(storage)
+
+    book.find("Mia Stone").add_phone("5555555555")
+    touched = shard_of("Mia Stone", 4)
+    assert storage.dirty_shards() == [touched]
+    storage.checkpoint()
+    assert storage.dirty_shards() == []
+
+    after = modification_times(storage)
+    assert [shard for shard in range(4) if before[shard] != after[shard]] == [touched]
+    storage.close()
+
+def test_notes_are_sharded(directory):
+    storage = ShardedStorage(directory, NotesBook, shard_count=3)
+    book = storage.load()
+    with storage.batch():
+        book.add_note("Meeting Notes", "Important meeting tomorrow")
+        book.add_note("Shopping", "Milk and bread")
+        book.add_tag_to_note("Shopping", "home")
+        book.delete_note("Meeting Notes")
+    assert storage.dirty_shards() == []
+    storage.close()
+
+    reloaded = ShardedStorage(directory, NotesBook).load()
+    assert list(reloaded.data) == ["Shopping"]
+    assert reloaded.find_notes_by_tag("home")[0].title == "Shopping"
+
+def test_pickle_book_is_migrated(tmp_path, directory):
+    journal = Journal(str(tmp_path / "book.pkl"), AddressBook)
+    old_book = journal.load()
+    for number, name in enumerate(NAMES):
+        old_book.add_contact(name, f"{number:010d}")
+    journal.close()
+
+    storage = ShardedStorage(directory, AddressBook, migrate_from=Journal(str(tmp_path / "book.pkl"), AddressBook), shard_count=5)
+    book = storage.load()
+    assert list(book.data) == NAMES
+    book.delete("Leo King")
+    storage.close()
+
+    # The shard count of the existing book wins over the argument
+    reloaded_storage = ShardedStorage(directory, AddressBook, shard_count=16)
+    assert list(reloaded_storage.load().data) == NAMES[:-1]
+    assert reloaded_storage.shard_count == 5
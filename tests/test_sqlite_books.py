@@ -0,0 +1,207 @@
+import pytest
+from datetime import datetime, timedelta
+from src.models.address_book import AddressBook
+from src.models.notes_book import NotesBook
+from src.models.sqlite_books import SQLiteAddressBook, SQLiteNotesBook
+from src.utils.journal import Journal
+from src.utils.sqlite_storage import SQLiteStorage
+from src.handlers.contact_handlers import (
+    handle_add_contact,
+    handle_change_contact,
+    handle_delete_contact,
+    handle_find_contact,
+    handle_show_all,
+)
+from src.handlers.birthday_handlers import handle_add_birthday
+from src.handlers.address_handlers import handle_add_address, handle_show_address
+from src.handlers.note_handlers import (
+    handle_add_note,
+    handle_edit_note,
+    handle_add_tag,
+    handle_remove_tag,
+    handle_find_notes_by_tag,
+)
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "book.db")
+
+def test_contacts_persist_between_sessions(db_path):
+    book = SQLiteAddressBook(db_path)
+    handle_add_contact("John Smith 1234567890", book)
+    handle_add_contact("Jane Doe 0987654321", book)
+    handle_change_contact("John Smith: 1234567890 1112223333", book)
+    handle_add_birthday("John Smith: 01.01.2000", book)
+    handle_add_address("John Smith: 123 Main St, Anytown, USA, 12345", book)
+    handle_delete_contact("Jane Doe", book)
+    book.close()
+
+    book = SQLiteAddressBook(db_path)
+    assert len(book) == 1
+    record = book.find("john smith")
+    assert [phone.value for phone in record.phones] == ["1112223333"]
+    assert record.show_birthday() == "01.01.2000"
+    assert "Anytown" in handle_show_address("John Smith", book)
+    assert "John Smith" in handle_show_all(book)
+    book.close()
+
+def test_find_contacts(db_path):
+    book = SQLiteAddressBook(db_path)
+    handle_add_contact("John Smith 1234567890", book)
+    handle_add_contact("Johnny Doe 0987654321", book)
+    handle_add_birthday("Johnny Doe: 15.03.1990", book)
+
+    assert [r.name.value for r in book.find_contacts("john")] == ["John Smith", "Johnny Doe"]
+    assert [r.name.value for r in book.find_contacts("0987")] == ["Johnny Doe"]
+    assert [r.name.value for r in book.find_contacts("15.03")] == ["Johnny Doe"]
+    assert "Johnny Doe" in handle_find_contact("Johnny", book)
+    with pytest.raises(KeyError):
+        handle_find_contact("Jane", book)
+    book.close()
+
+def test_upcoming_birthdays_use_only_matching_rows(db_path):
+    book = SQLiteAddressBook(db_path)
+    soon = datetime.now().date() + timedelta(days=3)
+    later = datetime.now().date() + timedelta(days=100)
+    book.add_contact("John Smith", "1234567890")
+    book.find("John Smith").add_birthday(soon.replace(year=1990).strftime("%d.%m.%Y"))
+    book.add_contact("Jane Doe", "0987654321")
+    book.find("Jane Doe").add_birthday(later.replace(year=1990).strftime("%d.%m.%Y"))
+
+    upcoming = book.get_upcoming_birthdays("7")
+    assert [entry["name"] for entry in upcoming] == ["John Smith"]
+    book.close()
+
+def test_notes_persist_between_sessions(db_path):
+    book = SQLiteNotesBook(db_path)
+    handle_add_note("Meeting Notes: Important meeting tomorrow", book)
+    handle_add_note("Todo List: Buy groceries", book)
+    handle_edit_note("Meeting Notes: Meeting cancelled", book)
+    handle_add_tag("Meeting Notes: Work", book)
+    handle_add_tag("Todo List: home", book)
+    handle_add_tag("Todo List: work", book)
+    handle_remove_tag("Todo List: home", book)
+    book.close()
+
+    book = SQLiteNotesBook(db_path)
+    assert book.data["Meeting Notes"].content == "Meeting cancelled"
+    assert book.data["Todo List"].tags == ["work"]
+    assert [note.title for note in book.find_notes_by_tag("work")] == ["Meeting Notes", "Todo List"]
+    assert "Todo List" in handle_find_notes_by_tag("WORK", book)
+    book.delete_note("Todo List")
+    assert [note.title for note in book.find_notes_by_tag("work")] == ["Meeting Notes"]
+    book.close()
+
+def test_pickle_books_are_migrated(tmp_path):
+    journal = Journal(str(tmp_path / "book.pkl"), AddressBook)
+    book = journal.load()
+    book.add_contact("John Smith", "1234567890")
+    journal.close()
+
+    storage = SQLiteStorage(
+        str(tmp_path / "book.db"),
+        SQLiteAddressBook,
+        migrate_from=Journal(str(tmp_path / "book.pkl"), AddressBook),
+    )
+    book = storage.load()
+    book.find("John Smith").add_phone("0987654321")
+    storage.close()
+
+    book = SQLiteAddressBook(str(tmp_path / "book.db"))
+    assert len(book.find("John Smith").phones) == 2
+    book.close()
+
+def test_phone_lookups_do_not_load_every_contact(db_path):
+    book = SQLiteAddressBook(db_path)
+    handle_add_contact("John Smith 0501234567", book)
+    handle_add_contact("Jane Doe 0501234567", book)
+    handle_add_contact("Jane Doe 0441112233", book)
+    for i in range(50):
+        handle_add_contact(f"Other Contact{chr(97 + i % 26)}{chr(97 + i // 26)} 067{i:07d}", book)
+    book.close()
+
+    book = SQLiteAddressBook(db_path)
+    assert [r.name.value for r in book.find_by_phone("0501234567")] == ["Jane Doe", "John Smith"]
+    assert [(phone, [r.name.value for r in records]) for phone, records in book.find_phones("050")] == [
+        ("0501234567", ["Jane Doe", "John Smith"])
+    ]
+    assert [phone for phone, _ in book.find_phones("04")] == ["0441112233"]
+    assert [phone for phone, _ in book.shared_phones()] == ["0501234567"]
+    # Only the owners were read from the database, and no index was built in memory
+    assert set(book.data._cache) == {"Jane Doe", "John Smith"}
+    assert book._phone_index is None
+
+    book.find("John Smith").remove_phone("0501234567")
+    assert book.shared_phones() == []
+    book.close()
+
+def test_name_searches_use_the_full_text_tables(db_path):
+    book = SQLiteAddressBook(db_path)
+    for name in ("John Smith", "Johnny Smithers", "Jo Jo", "Zoe O'Brien", "Olena Shevchenko"):
+        book.add_contact(name, "1234567890")
+    book.delete("Johnny Smithers")
+    book.close()
+
+    book = SQLiteAddressBook(db_path)
+    search = book.prefix_search()
+    assert [r.name.value for r in search.entries(search.search("jo"))] == ["John Smith", "Jo Jo"]
+    assert [r.name.value for r in search.entries(search.search("jo jo"))] == ["Jo Jo"]
+    assert [r.name.value for r in search.entries(search.search("o'b"))] == ["Zoe O'Brien"]
+    assert search.completions("jo") == ["jo", "john"]
+    assert [record.name.value for record, _ in book.fuzzy_find("olna shevchenk")] == ["Olena Shevchenko"]
+    assert book._prefix_index is None and book._name_index is None
+    book.close()
+
+def test_note_searches_use_the_database(db_path):
+    book = SQLiteNotesBook(db_path)
+    handle_add_note("Meeting Notes: Budget meeting with the team", book)
+    handle_add_note("Todo List: Buy groceries", book)
+    handle_add_note("Budget: Plan the yearly budget budget", book)
+    handle_add_tag("Meeting Notes: work", book)
+    handle_add_tag("Meeting Notes: urgent", book)
+    handle_add_tag("Todo List: home", book)
+    handle_add_tag("Budget: work", book)
+    handle_edit_note("Todo List: Buy milk", book)
+    book.close()
+
+    book = SQLiteNotesBook(db_path)
+    assert [note.title for note in book.search_notes("budget")] == ["Budget", "Meeting Notes"]
+    assert [note.title for note in book.search_notes("milk")] == ["Todo List"]
+    assert book.search_notes("groceries") == []
+    assert [note.title for note in book.query_tags("work NOT urgent")] == ["Budget"]
+    assert [note.title for note in book.query_tags("home OR urgent")] == ["Meeting Notes", "Todo List"]
+    with pytest.raises(ValueError):
+        book.query_tags("work AND")
+    search = book.prefix_search()
+    assert [note.title for note in search.entries(search.search("wo me"))] == ["Meeting Notes"]
+    assert search.completions("b") == ["budget"]
+    assert book._text_index is None and book._tag_index is None and book._prefix_index is None
+    book.close()
+
+def test_full_text_tables_are_filled_for_older_databases(db_path):
+    import sqlite3
+    from src.models.sqlite_books import CONTACTS_SCHEMA
+    connection = sqlite3.connect(db_path)
+    connection.executescript(CONTACTS_SCHEMA)
+    connection.execute(
+        "INSERT INTO contacts (key, name, phones) VALUES ('John Smith', 'John Smith', '1234567890')"
+    )
+    connection.commit()
+    connection.close()
+
+    book = SQLiteAddressBook(db_path)
+    search = book.prefix_search()
+    assert [r.name.value for r in search.entries(search.search("smi"))] == ["John Smith"]
+    assert [record.name.value for record, _ in book.fuzzy_find("jhon smith")] == ["John Smith"]
+    book.close()
+
+def test_mappings_must_implement_the_row_hooks(db_path):
+    import sqlite3
+    from src.models.sqlite_books import SQLiteMapping
+
+    class Incomplete(SQLiteMapping):
+        def _from_row(self, row):
+            return row
+
+    with pytest.raises(TypeError):
+        Incomplete(sqlite3.connect(db_path), "contacts", "key")
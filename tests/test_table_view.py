@@ -0,0 +1,176 @@
+import curses
+import pytest
+from src.models.address_book import AddressBook
+from src.models.notes_book import NotesBook
+from src.models.sqlite_books import SQLiteAddressBook
+from src.handlers.contact_handlers import view_show_all
+from src.handlers.note_handlers import handle_find_notes_by_tag, view_find_notes_by_tag, view_show_notes
+from src.ui.renderer import Renderer, GREEN, WHITE
+from src.ui.table_view import Column, TableSource, TableView, fit, MAX_COLUMN_WIDTH
+
+
+class FakeWindow:
+    """A curses window that replays keys and ignores drawing."""
+
+    def __init__(self, height=8, width=80, keys=()):
+        self.size = (height, width)
+        self.keys = list(keys)
+
+    def getmaxyx(self):
+        return self.size
+
+    def addstr(self, y, x, text, attribute):
+        pass
+
+    def move(self, y, x):
+        pass
+
+    def clrtoeol(self):
+        pass
+
+    def erase(self):
+        pass
+
+    def noutrefresh(self):
+        pass
+
+    def getch(self):
+        return self.keys.pop(0)
+
+
+class CountingColumn:
+    """Column cell that counts the rows it formats."""
+
+    def __init__(self):
+        self.formatted = []
+
+    def __call__(self, row):
+        self.formatted.append(row)
+        return (str(row), WHITE)
+
+
+@pytest.fixture
+def column():
+    return CountingColumn()
+
+def make_view(rows, column, height=8):
+    source = TableSource([Column("Value", column)], rows)
+    return TableView(source, Renderer(FakeWindow(height), color_pair=lambda pair: pair))
+
+def text(line):
+    return "".join(run_text for run_text, _ in line)
+
+def test_only_the_sampled_and_visible_rows_are_formatted(column):
+    view = make_view({i: i for i in range(100_000)}, column)
+    column.formatted.clear()
+
+    lines = view.frame()
+
+    # Header, separator, five rows and the footer fit in eight lines
+    assert column.formatted == [0, 1, 2, 3, 4]
+    assert text(lines[2]).split() == ["1", "0"]
+    assert lines[-1] == [("Rows 1-5 of 100000. Up/Down, PgUp/PgDn, Home/End to scroll, any other key to close.", GREEN)]
+
+def test_scrolling_down_continues_the_same_iterator():
+    class Values(dict):
+        read = 0
+        def values(self):
+            for value in super().values():
+                self.read += 1
+                yield value
+
+    rows = Values((i, i) for i in range(1000))
+    source = TableSource([Column("Value", lambda row: (str(row), WHITE))], rows)
+
+    assert source.window(0, 5) == [0, 1, 2, 3, 4]
+    assert source.window(5, 10) == [5, 6, 7, 8, 9]
+    assert source.window(20, 22) == [20, 21]
+    assert rows.read == 22
+    # Scrolling back up starts over
+    assert source.window(1, 2) == [1]
+    assert rows.read == 24
+
+def test_rows_of_a_book_are_read_under_its_lock_and_follow_changes():
+    import threading
+    book = AddressBook()
+    lock = book.make_thread_safe()
+    for i in range(20):
+        book.add_contact(f"Contact {chr(97 + i)}", "1234567890")
+    source = view_show_all(book)
+    assert [r.name.value for r in source.window(0, 2)] == ["Contact a", "Contact b"]
+
+    # A change between windows starts the iterator over instead of failing
+    book.delete("Contact c")
+    book.add_contact("Contact z", "1234567890")
+    assert [r.name.value for r in source.window(2, 4)] == ["Contact d", "Contact e"]
+
+    read = []
+    with lock.write():
+        reader = threading.Thread(target=lambda: read.append(source.window(4, 5)))
+        reader.start()
+        reader.join(0.2)
+        assert not read  # The window waits for the writer
+    reader.join(5)
+    assert [r.name.value for r in read[0]] == ["Contact f"]
+
+def test_navigation_keys_stay_within_the_table(column):
+    view = make_view(list(range(12)), column)
+
+    assert view.scroll(curses.KEY_UP) and view.top == 0
+    view.scroll(curses.KEY_NPAGE)
+    assert view.top == 5
+    view.scroll(curses.KEY_NPAGE)
+    assert view.top == 7
+    view.scroll(curses.KEY_END)
+    assert text(view.frame()[-2]).split() == ["12", "11"]
+    view.scroll(curses.KEY_PPAGE)
+    assert view.top == 2
+    view.scroll(curses.KEY_HOME)
+    assert view.top == 0
+    assert not view.scroll(ord("q"))
+
+def test_columns_grow_when_wider_rows_scroll_into_view(column):
+    view = make_view(["short"] * 150 + ["a much longer value"] + ["x" * 100], column)
+    assert view.widths == [len("short")]
+
+    view.scroll(curses.KEY_END)
+    view.frame()
+
+    assert view.widths == [MAX_COLUMN_WIDTH]
+    assert fit("x" * 100, MAX_COLUMN_WIDTH) == "x" * (MAX_COLUMN_WIDTH - 1) + "…"
+    assert fit("two\nlines", 20) == "two lines"
+
+def test_run_closes_on_a_key_other_than_navigation(monkeypatch, column):
+    monkeypatch.setattr(curses, "doupdate", lambda: None)
+    view = make_view(list(range(20)), column)
+    view.renderer.window.keys = [curses.KEY_DOWN, curses.KEY_DOWN, ord("q"), curses.KEY_DOWN]
+
+    view.run()
+
+    assert view.top == 2
+    assert view.renderer.window.keys == [curses.KEY_DOWN]
+
+def test_views_share_validation_with_the_handlers():
+    book = NotesBook()
+    book.add_note("Meeting", "Budget review")
+    book.add_tag_to_note("Meeting", "work")
+
+    assert [note.title for note in view_find_notes_by_tag("work", book).window(0, 10)] == ["Meeting"]
+    for view in (handle_find_notes_by_tag, view_find_notes_by_tag):
+        with pytest.raises(KeyError):
+            view("home", book)
+    assert "No notes available" in view_show_notes(NotesBook())
+    assert "No contacts available" in view_show_all(AddressBook())
+
+def test_sqlite_rows_are_read_a_window_at_a_time(tmp_path):
+    book = SQLiteAddressBook(str(tmp_path / "book.db"))
+    names = [f"Contact {first}{second}" for first in "ABC" for second in "ABCDEFGHIJ"]
+    for i, name in enumerate(names):
+        book.add_contact(name, f"{i:010}")
+
+    source = view_show_all(book)
+
+    assert len(source) == 30
+    assert [record.name.value for record in source.window(10, 13)] == names[10:13]
+    assert source.cells(source.window(0, 1)[0])[2][0] == "No email"
+    book.close()
@@ -0,0 +1,89 @@
+import pytest
+from src.models.notes_book import NotesBook
+from src.models.tag_index import TagIndex
+from src.handlers.note_handlers import handle_query_tags
+
+@pytest.fixture
+def notes_book():
+    book = NotesBook()
+    for title, tags in [
+        ("Report", ["Work", "Urgent"]),
+        ("Invoice", ["work", "urgent", "done"]),
+        ("Groceries", ["home"]),
+        ("Standup", ["work", "daily meeting"]),
+    ]:
+        book.add_note(title, f"Content of {title}")
+        for tag in tags:
+            book.add_tag_to_note(title, tag)
+    return book
+
+def titles(notes):
+    return [note.title for note in notes]
+
+def test_find_notes_by_tag_ignores_case(notes_book):
+    assert titles(notes_book.find_notes_by_tag("WORK")) == ["Report", "Invoice", "Standup"]
+    assert titles(notes_book.find_notes_by_tag("missing")) == []
+
+def test_query_operators(notes_book):
+    assert titles(notes_book.query_tags("work AND urgent NOT done")) == ["Report"]
+    assert titles(notes_book.query_tags("home OR done")) == ["Invoice", "Groceries"]
+    assert titles(notes_book.query_tags("NOT work")) == ["Groceries"]
+    assert titles(notes_book.query_tags("work AND (done OR daily meeting)")) == ["Invoice", "Standup"]
+    assert titles(notes_book.query_tags("urgent OR home AND work")) == ["Report", "Invoice"]
+
+def test_malformed_queries_are_rejected(notes_book):
+    for expression in ["", "work AND", "(work", "work )", "OR home"]:
+        with pytest.raises(ValueError):
+            notes_book.query_tags(expression)
+
+def test_index_follows_note_changes(notes_book):
+    notes_book.query_tags("work")  # Build the index
+
+    notes_book.remove_tag_from_note("Invoice", "done")
+    assert titles(notes_book.query_tags("work NOT done")) == ["Report", "Invoice", "Standup"]
+
+    notes_book.delete_note("Report")
+    notes_book.add_note("Plan", "Next quarter")
+    notes_book.add_tag_to_note("Plan", "urgent")
+    assert titles(notes_book.query_tags("urgent")) == ["Invoice", "Plan"]
+    assert titles(notes_book.query_tags("NOT urgent")) == ["Groceries", "Standup"]
+
+def test_handle_query_tags(notes_book):
+    assert "Report" in handle_query_tags("work AND urgent NOT done", notes_book)
+    with pytest.raises(IndexError):
+        handle_query_tags(" ", notes_book)
+    with pytest.raises(KeyError):
+        handle_query_tags("home AND work", notes_book)
+
+def test_index_rebuild_compacts_positions():
+    index = TagIndex(lambda tags: tags)
+    for i in range(3000):
+        index.add(str(i), ["even" if i % 2 == 0 else "odd"])
+    for i in range(2000):
+        index.discard(str(i))
+    assert index.needs_rebuild
+
+    index.rebuild((str(i), ["even" if i % 2 == 0 else "odd"]) for i in range(2000, 3000))
+    assert not index.needs_rebuild
+    assert len(index) == 1000
+    assert index.find("odd")[:2] == ["2001", "2003"]
+
+def test_note_tags_keep_their_order_and_survive_pickling():
+    import pickle
+    from src.models.notes_book import Note, TagDuplicateError
+
+    note = Note("Report", "Quarterly numbers")
+    for tag in ["work", "urgent", "q3"]:
+        note.add_tag(tag)
+    note.remove_tag("urgent")
+    with pytest.raises(TagDuplicateError):
+        note.add_tag("work")
+    assert note.tags == ["work", "q3"]
+    assert note.is_tag_exists("q3") and not note.is_tag_exists("urgent")
+
+    restored = pickle.loads(pickle.dumps(note))
+    assert restored.tags == ["work", "q3"]
+    # Notes pickled when the tags were a list have the same state
+    legacy = Note.__new__(Note)
+    legacy.__setstate__({"title": "Old", "content": "Text", "tags": ["home"]})
+    assert legacy.is_tag_exists("home")
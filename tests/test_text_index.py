@@ -0,0 +1,49 @@
+import pytest
+from src.models.notes_book import NotesBook
+from src.models.text_index import TextIndex, tokenize
+
+@pytest.fixture
+def notes_book():
+    book = NotesBook()
+    book.add_note("Meeting Notes", "Important meeting tomorrow about the budget")
+    book.add_note("Todo List", "Buy groceries and call about the meeting")
+    book.add_note("Recipe", "Soup with carrots")
+    return book
+
+def titles(notes):
+    return [note.title for note in notes]
+
+def test_tokenize():
+    assert tokenize("Buy milk, eggs & BREAD!") == ["buy", "milk", "eggs", "bread"]
+
+def test_most_relevant_notes_come_first(notes_book):
+    assert titles(notes_book.search_notes("meeting")) == ["Meeting Notes", "Todo List"]
+    assert titles(notes_book.search_notes("groceries meeting")) == ["Todo List", "Meeting Notes"]
+    assert titles(notes_book.search_notes("unknown")) == []
+
+def test_limit_keeps_the_best_notes(notes_book):
+    assert titles(notes_book.search_notes("meeting soup", limit=2)) == ["Recipe", "Meeting Notes"]
+
+def test_index_follows_note_changes(notes_book):
+    notes_book.search_notes("soup")  # Build the index
+
+    notes_book.edit_note("Recipe", "Salad with tomatoes")
+    assert titles(notes_book.search_notes("soup")) == []
+    assert titles(notes_book.search_notes("salad")) == ["Recipe"]
+
+    notes_book.add_tag_to_note("Recipe", "Dinner")
+    assert titles(notes_book.search_notes("dinner")) == ["Recipe"]
+    notes_book.remove_tag_from_note("Recipe", "Dinner")
+    assert titles(notes_book.search_notes("dinner")) == []
+
+    notes_book.delete_note("Meeting Notes")
+    assert titles(notes_book.search_notes("meeting")) == ["Todo List"]
+
+def test_discard_removes_unused_words():
+    index = TextIndex(lambda text: [text])
+    index.add("a", "one two")
+    index.add("b", "two three")
+    index.discard("a")
+    assert index.search("one") == []
+    assert [key for key, _ in index.search("two")] == ["b"]
+    assert len(index) == 1
@@ -0,0 +1,107 @@
+import threading
+import pytest
+from src.models.address_book import AddressBook
+from src.models.locking import NO_LOCK
+from src.models.notes_book import NotesBook
+from src.utils.rwlock import ReadWriteLock
+
+READERS = 6
+ROUNDS = 300
+
+def hammer(readers, writers):
+    """Run reader and writer functions on their own threads and collect their errors."""
+    errors = []
+    stop = threading.Event()
+
+    def run(work, forever):
+        try:
+            i = 0
+            while not stop.is_set() if forever else i < ROUNDS:
+                work(i)
+                i += 1
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+
+    reader_threads = [threading.Thread(target=run, args=(work, True)) for work in readers]
+    writer_threads = [threading.Thread(target=run, args=(work, False)) for work in writers]
+    for thread in reader_threads + writer_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    stop.set()
+    for thread in reader_threads:
+        thread.join()
+    return errors
+
+def letters(i):
+    return "".join(chr(ord("a") + int(digit)) for digit in str(i))
+
+def test_contacts_are_searched_while_they_change():
+    book = AddressBook()
+    book.make_thread_safe()
+    for i in range(200):
+        book.add_contact(f"Base {letters(i)}", "1234567890")
+
+    def add_and_delete(i):
+        book.add_contact(f"Temp {letters(i)}", "5551234567")
+        book.add_email_to_contact(f"Temp {letters(i)}", "temp@example.com")
+        if i % 2:
+            book.delete(f"Temp {letters(i)}")
+
+    def search(i):
+        # A two-letter query has no trigrams, so it scans every record
+        assert len(book.find_contacts("ba")) >= 200
+        assert len(book.find_contacts("base")) == 200
+        book.show_all()
+
+    def lookup(i):
+        assert book.find("Base Bb") is not None
+        book.get_upcoming_birthdays("30")
+
+    errors = hammer([search, search, lookup] * (READERS // 3), [add_and_delete])
+
+    assert errors == []
+    assert len(book.find_contacts("temp")) == ROUNDS // 2
+    assert len(book.find_contacts("555")) == ROUNDS // 2
+
+def test_notes_are_searched_while_they_change():
+    notes_book = NotesBook()
+    notes_book.make_thread_safe()
+    for i in range(100):
+        notes_book.add_note(f"Base {letters(i)}", "Weekly budget review")
+        notes_book.add_tag_to_note(f"Base {letters(i)}", "work")
+
+    def edit(i):
+        title = f"Temp {letters(i)}"
+        # Readers must not see the note tagged "work" but not yet "urgent"
+        with notes_book.lock.write():
+            notes_book.add_note(title, "Quarterly budget")
+            notes_book.add_tag_to_note(title, "work")
+            notes_book.add_tag_to_note(title, "urgent")
+        if i % 2:
+            notes_book.delete_note(title)
+
+    def search(i):
+        assert len(notes_book.search_notes("budget", limit=None)) >= 100
+        assert len(notes_book.query_tags("work AND NOT urgent")) == 100
+        notes_book.show_all_notes()
+
+    errors = hammer([search] * READERS, [edit])
+
+    assert errors == []
+    assert len(notes_book.query_tags("urgent")) == ROUNDS // 2
+
+def test_books_share_a_lock_and_it_is_not_pickled():
+    lock = ReadWriteLock()
+    book, notes_book = AddressBook(), NotesBook()
+    assert book.lock is NO_LOCK
+
+    assert book.make_thread_safe(lock) is lock
+    notes_book.make_thread_safe(lock)
+    assert notes_book.lock is lock
+    assert "lock" not in book.__getstate__()
+
+    with lock.read():
+        with pytest.raises(RuntimeError):
+            book.add_contact("John Smith", "1234567890")
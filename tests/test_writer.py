@@ -0,0 +1,83 @@
+import os
+import pickle
+import threading
+import pytest
+from src.models.address_book import AddressBook
+from src.utils.storage import load_data, save_data
+from src.utils.writer import BackgroundWriter
+
+class CountingStorage:
+    def __init__(self, fail=False):
+        self.checkpoints = 0
+        self.fail = fail
+        self.threads = set()
+
+    def checkpoint(self):
+        self.threads.add(threading.current_thread().name)
+        self.checkpoints += 1
+        if self.fail:
+            raise OSError("disk full")
+
+def test_burst_of_changes_is_written_once():
+    storage = CountingStorage()
+    writer = BackgroundWriter(delay=0.2)
+    for _ in range(100):
+        writer.mark_dirty(storage)
+    writer.close()
+
+    assert storage.checkpoints == 1
+    assert storage.threads == {"background-writer"}
+
+def test_flush_waits_for_pending_writes():
+    first, second = CountingStorage(), CountingStorage()
+    writer = BackgroundWriter(delay=60)
+    writer.mark_dirty(first)
+    writer.mark_dirty(second)
+    writer.flush()
+
+    assert (first.checkpoints, second.checkpoints) == (1, 1)
+    writer.close()
+
+def test_close_without_changes_writes_nothing():
+    storage = CountingStorage()
+    writer = BackgroundWriter()
+    writer.close()
+    assert storage.checkpoints == 0
+
+def test_background_error_is_raised_on_flush():
+    writer = BackgroundWriter(delay=0)
+    writer.mark_dirty(CountingStorage(fail=True))
+    with pytest.raises(OSError):
+        writer.flush()
+    # The changes are still pending, so closing tries once more
+    with pytest.raises(OSError):
+        writer.close()
+
+def test_failed_checkpoints_are_retried(monkeypatch):
+    monkeypatch.setattr("src.utils.writer.RETRY_DELAY", 0.05)
+    storage, other = CountingStorage(fail=True), CountingStorage()
+    writer = BackgroundWriter(delay=0)
+    writer.mark_dirty(other)
+    writer.mark_dirty(storage)
+    while storage.checkpoints < 2:
+        threading.Event().wait(0.01)
+    storage.fail = False
+    writer.flush()
+
+    assert storage.checkpoints >= 3
+    # Only the storage that failed was written again
+    assert other.checkpoints == 1
+    writer.close()
+
+def test_save_data_replaces_file_atomically(tmp_path):
+    filename = str(tmp_path / "book.pkl")
+    book = AddressBook()
+    book.add_contact("John Smith", "1234567890")
+    save_data(book, filename)
+
+    # A failing pickle must leave the previous snapshot untouched
+    with pytest.raises((pickle.PicklingError, AttributeError, TypeError)):
+        save_data(lambda: None, filename)
+
+    assert load_data(filename, AddressBook).find("John Smith") is not None
+    assert os.listdir(tmp_path) == ["book.pkl"]